@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Compare deep-copying book data against copy-on-write updates in processors.
+
+Builds a large book (10k catalog entries, chapters with a sizeable `extra`
+payload) and times the cleaner on it, once with the current copy-on-write
+implementation and once with the previous deepcopy-based behaviour.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import tempfile
+import timeit
+from pathlib import Path
+from typing import Any
+
+from novel_downloader.plugins.processors.cleaner import CleanerProcessor
+from novel_downloader.schemas import BookInfoDict, ChapterDict
+
+N_CHAPTERS = 10_000
+N_VOLUMES = 50
+
+
+def make_book() -> tuple[BookInfoDict, list[ChapterDict]]:
+    per_vol = N_CHAPTERS // N_VOLUMES
+    book_info: Any = {
+        "book_name": "Book",
+        "author": "Author",
+        "cover_url": "",
+        "update_time": "",
+        "summary": "summary " * 50,
+        "extra": {},
+        "volumes": [
+            {
+                "volume_name": f"Volume {v}",
+                "chapters": [
+                    {
+                        "title": f"Chapter {v * per_vol + i}",
+                        "url": f"https://example.com/{v * per_vol + i}",
+                        "chapterId": str(v * per_vol + i),
+                    }
+                    for i in range(per_vol)
+                ],
+            }
+            for v in range(N_VOLUMES)
+        ],
+    }
+    chapters: list[ChapterDict] = [
+        {
+            "id": str(i),
+            "title": f"Chapter {i}",
+            "content": "\n".join(f"Paragraph {p} of chapter {i}." for p in range(40)),
+            "extra": {
+                "resources": [
+                    {"type": "image", "paragraph_index": p, "url": f"img{p}.jpg"}
+                    for p in range(20)
+                ],
+                "author_say": "note " * 100,
+            },
+        }
+        for i in range(1000)
+    ]
+    return book_info, chapters
+
+
+class DeepcopyCleaner(CleanerProcessor):
+    """The cleaner as it behaved before copy-on-write."""
+
+    def process_book_info(self, book_info: BookInfoDict) -> BookInfoDict:
+        bi = copy.deepcopy(book_info)
+        bi["book_name"] = self._clean_title(bi["book_name"])
+        bi["author"] = self._clean_title(bi["author"])
+        bi["summary"] = self._clean_content(bi["summary"])
+        for vol in bi["volumes"]:
+            vol["volume_name"] = self._clean_title(vol["volume_name"])
+            for cinfo in vol["chapters"]:
+                cinfo["title"] = self._clean_title(cinfo["title"])
+        return bi
+
+    def process_chapter(self, chapter: ChapterDict) -> ChapterDict:
+        ch = copy.deepcopy(chapter)
+        ch["title"] = self._clean_title(ch["title"])
+        ch["content"] = self._clean_content(ch["content"])
+        return ch
+
+
+def main() -> None:
+    book_info, chapters = make_book()
+    n_trials = 5
+
+    with tempfile.TemporaryDirectory() as tmp:
+        rules = Path(tmp) / "removes.json"
+        rules.write_text(json.dumps(["广告"]), encoding="utf-8")
+        config = {"content_removes": str(rules), "title_removes": str(rules)}
+
+        for label, proc in (
+            ("deepcopy     ", DeepcopyCleaner(config)),
+            ("copy-on-write", CleanerProcessor(config)),
+        ):
+            t_info = timeit.timeit(
+                lambda p=proc: p.process_book_info(book_info), number=n_trials
+            )
+            t_chap = timeit.timeit(
+                lambda p=proc: [p.process_chapter(c) for c in chapters],
+                number=n_trials,
+            )
+            print(
+                f"{label}: book_info {t_info / n_trials * 1000:8.2f} ms, "
+                f"{len(chapters)} chapters {t_chap / n_trials * 1000:8.2f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
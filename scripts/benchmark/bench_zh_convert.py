@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Compare the built-in zh_convert engine against the `opencc` package.
+
+Generates ~1M characters of simplified text from the OpenCC dictionaries
+(phrases mixed with single characters) and times processor setup (cold
+and from the table cache) and a full s2t conversion with both engines.
+"""
+
+from __future__ import annotations
+
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from novel_downloader.libs.textutils.zhconv import read_opencc_dict
+from novel_downloader.plugins.processors import zh_convert
+from novel_downloader.plugins.processors.zh_convert import ZhConvertProcessor
+
+N_CHARS = 1_000_000
+
+
+def make_text(dict_dir: Path) -> str:
+    rng = random.Random(0)
+    # novel text is almost entirely in the BMP
+    phrases = [
+        p
+        for p in read_opencc_dict(dict_dir / "STPhrases.txt")
+        if all(ord(c) < 0x10000 for c in p)
+    ]
+    chars = [
+        c for c in read_opencc_dict(dict_dir / "STCharacters.txt") if ord(c) < 0x10000
+    ]
+    parts: list[str] = []
+    size = 0
+    while size < N_CHARS:
+        part = rng.choice(phrases) + "".join(rng.choices(chars, k=8)) + "，"
+        parts.append(part)
+        size += len(part)
+    return "".join(parts)
+
+
+def main() -> None:
+    dict_dir = ZhConvertProcessor._opencc_dict_dir()
+    if dict_dir is None:
+        raise SystemExit("opencc-python-reimplemented is not installed")
+    text = make_text(dict_dir)
+    config = {"direction": "s2t"}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        zh_convert.TABLE_CACHE_DIR = Path(tmp)
+        for label in ("builtin (cold)", "builtin (cache)"):
+            start = time.perf_counter()
+            proc = ZhConvertProcessor(config)
+            setup = time.perf_counter() - start
+            print(f"{label:16}: setup {setup * 1000:8.1f} ms")
+
+        start = time.perf_counter()
+        builtin = proc._convert_text(text)
+        print(f"{'builtin':16}: {len(text)} chars {time.perf_counter() - start:6.2f} s")
+
+    start = time.perf_counter()
+    proc = ZhConvertProcessor({**config, "engine": "opencc"})
+    reference = proc._convert_text(text)
+    print(f"{'opencc':16}: {len(text)} chars {time.perf_counter() - start:6.2f} s")
+
+    same = sum(a == b for a, b in zip(builtin, reference, strict=False))
+    print(f"identical characters: {same / len(reference):.4%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,18 @@
 from .config import ConfigCmd
 from .download import DownloadCmd
 from .export import ExportCmd
+from .maintain import MaintainCmd
+from .migrate import MigrateCmd
 from .search import SearchCmd
+from .search_local import SearchLocalCmd
 
-commands = [CleanCmd, ConfigCmd, DownloadCmd, ExportCmd, SearchCmd]
+commands = [
+    CleanCmd,
+    ConfigCmd,
+    DownloadCmd,
+    ExportCmd,
+    MaintainCmd,
+    MigrateCmd,
+    SearchCmd,
+    SearchLocalCmd,
+]
@@ -156,6 +156,8 @@ def run(cls, args: Namespace) -> None:
         download_ui = CLIDownloadUI()
 
         client = registrar.get_client(site, adapter.get_client_config(site))
+        # processing is skipped along with the export
+        processors = [] if args.no_export else adapter.get_processor_configs(site)
 
         async def download_books() -> None:
             try:
@@ -169,7 +171,9 @@ async def download_books() -> None:
                             return
 
                     for book in books:
-                        await client.download_book(book, ui=download_ui)
+                        await client.download_book(
+                            book, ui=download_ui, processors=processors
+                        )
             except ValueError as e:
                 ui.warn(
                     t("'{site}' is currently not supported: {err}").format(
@@ -193,7 +197,7 @@ async def download_books() -> None:
             for book in download_ui.completed_books:
                 client.process_book(
                     book,
-                    processors=adapter.get_processor_configs(site),
+                    processors=processors,
                     ui=process_ui,
                 )
                 client.export_book(
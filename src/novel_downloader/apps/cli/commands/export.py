@@ -14,6 +14,7 @@
 from novel_downloader.infra.config import ConfigAdapter
 from novel_downloader.infra.i18n import t
 from novel_downloader.plugins import registrar
+from novel_downloader.plugins.export_pool import ExportPool
 from novel_downloader.schemas import BookConfig
 
 from ..ui_adapters import CLIExportUI
@@ -113,17 +114,25 @@ def run(cls, args: Namespace) -> None:
         books = cls._parse_book_args(book_ids, args.start, args.end)
 
         client = registrar.get_client(site, adapter.get_client_config(site))
+        exporter_cfg = adapter.get_exporter_config(site)
 
         export_ui = CLIExportUI()
 
-        for book in books:
-            client.export_book(
-                book,
-                cfg=adapter.get_exporter_config(site),
-                formats=formats,
-                stage=stage,
-                ui=export_ui,
-            )
+        # a single book keeps its workers for its own volumes
+        with ExportPool(min(exporter_cfg.export_workers, len(books))) as pool:
+            futures = [
+                pool.submit(
+                    client,
+                    book,
+                    cfg=exporter_cfg,
+                    formats=formats,
+                    stage=stage,
+                    ui=export_ui,
+                )
+                for book in books
+            ]
+            for future in futures:
+                future.result()
 
     @staticmethod
     def _parse_book_args(
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+novel_downloader.apps.cli.commands.maintain
+-------------------------------------------
+
+"""
+
+import os
+from argparse import ArgumentParser, Namespace
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from novel_downloader.apps.cli import ui
+from novel_downloader.apps.utils import load_or_init_config
+from novel_downloader.infra.config import ConfigAdapter
+from novel_downloader.infra.i18n import t
+from novel_downloader.infra.persistence.maintenance import (
+    DatabaseReport,
+    MediaReport,
+    delete_orphan_media,
+    find_databases,
+    maintain_database,
+    scan_orphan_media,
+)
+from novel_downloader.infra.persistence.site_storage import SITE_DB_FILENAME
+
+from .base import Command
+
+_MB = 1024 * 1024
+
+
+class MaintainCmd(Command):
+    name = "maintain"
+    help = t("Check, compact and garbage-collect downloaded data.")
+
+    @classmethod
+    def add_arguments(cls, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            "--site",
+            help=t("Source site key (optional; all sites if omitted)"),
+        )
+        parser.add_argument(
+            "--config", type=str, help=t("Path to the configuration file")
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            metavar="N",
+            help=t("Number of parallel workers (default: CPU count)"),
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help=t("Only report; do not vacuum databases or delete files"),
+        )
+        parser.add_argument(
+            "--no-gc",
+            action="store_true",
+            help=t("Skip removal of unreferenced media files"),
+        )
+        parser.add_argument(
+            "-y", "--yes", action="store_true", help=t("Skip confirmation prompt")
+        )
+
+    @classmethod
+    def run(cls, args: Namespace) -> None:
+        config_path: Path | None = Path(args.config) if args.config else None
+        config_data = load_or_init_config(config_path)
+        if config_data is None:
+            return
+
+        adapter = ConfigAdapter(config=config_data)
+        raw_data_base = adapter.get_raw_data_dir()
+        workers = max(1, args.workers or os.cpu_count() or 4)
+
+        databases = find_databases(raw_data_base, args.site)
+        book_dirs = cls._book_dirs(raw_data_base, args.site)
+        if not databases and not book_dirs:
+            ui.info(t("No data found at {path}.").format(path=raw_data_base))
+            return
+
+        # ---- databases ----
+        with (
+            ui.status(
+                t("Checking {count} database(s)...").format(count=len(databases))
+            ),
+            ThreadPoolExecutor(max_workers=workers) as pool,
+        ):
+            db_reports = list(
+                pool.map(
+                    lambda p: maintain_database(p, vacuum=not args.dry_run),
+                    databases,
+                )
+            )
+        cls._report_databases(db_reports, args.dry_run)
+
+        # ---- media ----
+        if args.no_gc or not book_dirs:
+            return
+
+        with (
+            ui.status(
+                t("Scanning media of {count} book(s)...").format(count=len(book_dirs))
+            ),
+            ThreadPoolExecutor(max_workers=workers) as pool,
+        ):
+            media_reports = list(
+                pool.map(
+                    lambda d: scan_orphan_media(d, d.parent / SITE_DB_FILENAME),
+                    book_dirs,
+                )
+            )
+        cls._collect_media(media_reports, dry_run=args.dry_run, yes=args.yes)
+
+    @staticmethod
+    def _book_dirs(raw_data_base: Path, site: str | None) -> list[Path]:
+        if not raw_data_base.is_dir():
+            return []
+        site_dirs = (
+            [raw_data_base / site]
+            if site
+            else sorted(p for p in raw_data_base.iterdir() if p.is_dir())
+        )
+        return [
+            book_dir
+            for site_dir in site_dirs
+            if site_dir.is_dir()
+            for book_dir in sorted(site_dir.iterdir())
+            if book_dir.is_dir()
+        ]
+
+    @staticmethod
+    def _report_databases(reports: list[DatabaseReport], dry_run: bool) -> None:
+        for rep in reports:
+            if rep.error:
+                ui.error(
+                    t("Database {path}: {error}").format(path=rep.path, error=rep.error)
+                )
+            elif rep.integrity != "ok":
+                ui.error(
+                    t("Integrity check failed for {path}: {detail}").format(
+                        path=rep.path, detail=rep.integrity
+                    )
+                )
+
+        healthy = sum(1 for rep in reports if rep.ok)
+        ui.info(
+            t("Databases checked: {count} ({healthy} healthy)").format(
+                count=len(reports), healthy=healthy
+            )
+        )
+        if dry_run:
+            reclaimable = sum(rep.reclaimable for rep in reports)
+            ui.info(
+                t("Reclaimable by VACUUM: {size:.2f} MB").format(size=reclaimable / _MB)
+            )
+        else:
+            reclaimed = sum(rep.reclaimed for rep in reports)
+            ui.success(
+                t("Reclaimed by VACUUM: {size:.2f} MB").format(size=reclaimed / _MB)
+            )
+
+    @staticmethod
+    def _collect_media(reports: list[MediaReport], *, dry_run: bool, yes: bool) -> None:
+        for rep in reports:
+            if rep.error:
+                ui.warn(
+                    t("Skipped media of {path}: {error}").format(
+                        path=rep.book_dir, error=rep.error
+                    )
+                )
+
+        orphans = [path for rep in reports for path in rep.orphans]
+        orphan_bytes = sum(rep.orphan_bytes for rep in reports)
+        if not orphans:
+            ui.info(t("No unreferenced media files found."))
+            return
+
+        ui.info(
+            t("Unreferenced media files: {count} ({size:.2f} MB)").format(
+                count=len(orphans), size=orphan_bytes / _MB
+            )
+        )
+        if dry_run:
+            return
+
+        if not yes:
+            question = t("Delete unreferenced media files?")
+            if not ui.confirm(question, default=False):
+                ui.warn(t("Cancelled."))
+                return
+
+        removed = sum(delete_orphan_media(rep) for rep in reports)
+        ui.success(t("Removed {count} media file(s).").format(count=removed))
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+novel_downloader.apps.cli.commands.migrate
+------------------------------------------
+
+"""
+
+from argparse import ArgumentParser, Namespace
+from pathlib import Path
+
+from novel_downloader.apps.cli import ui
+from novel_downloader.apps.utils import load_or_init_config
+from novel_downloader.infra.config import ConfigAdapter
+from novel_downloader.infra.i18n import t
+from novel_downloader.infra.persistence.site_storage import migrate_book_storage
+
+from .base import Command
+
+
+class MigrateCmd(Command):
+    name = "migrate"
+    help = t("Move per-book chapter databases into one database per site.")
+
+    @classmethod
+    def add_arguments(cls, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            "--site",
+            help=t("Source site key (optional; all sites if omitted)"),
+        )
+        parser.add_argument(
+            "--config", type=str, help=t("Path to the configuration file")
+        )
+        parser.add_argument(
+            "--remove",
+            action="store_true",
+            help=t("Delete per-book database files after migrating."),
+        )
+        parser.add_argument(
+            "-y", "--yes", action="store_true", help=t("Skip confirmation prompt")
+        )
+
+    @classmethod
+    def run(cls, args: Namespace) -> None:
+        config_path: Path | None = Path(args.config) if args.config else None
+        config_data = load_or_init_config(config_path)
+        if config_data is None:
+            return
+
+        adapter = ConfigAdapter(config=config_data)
+        raw_data_base = adapter.get_raw_data_dir()
+
+        if args.site:
+            site_dirs = [raw_data_base / args.site]
+        elif raw_data_base.is_dir():
+            site_dirs = sorted(p for p in raw_data_base.iterdir() if p.is_dir())
+        else:
+            site_dirs = []
+
+        site_dirs = [p for p in site_dirs if p.is_dir()]
+        if not site_dirs:
+            ui.info(t("No data found at {path}.").format(path=raw_data_base))
+            return
+
+        if args.remove and not args.yes:
+            question = t("Per-book database files will be deleted. Continue?")
+            if not ui.confirm(question, default=False):
+                ui.warn(t("Cancelled."))
+                return
+
+        total = 0
+        for site_dir in site_dirs:
+            try:
+                count = migrate_book_storage(site_dir, remove=args.remove)
+            except Exception as exc:
+                ui.error(
+                    t("Failed to migrate site '{site}': {error}").format(
+                        site=site_dir.name, error=exc
+                    )
+                )
+                continue
+            if count:
+                ui.info(
+                    t("Migrated {count} database file(s) for site '{site}'.").format(
+                        count=count, site=site_dir.name
+                    )
+                )
+            total += count
+
+        ui.success(t("Migration finished: {count} file(s).").format(count=total))
+        ui.info(t('Set storage_layout = "site" in the config to use the new layout.'))
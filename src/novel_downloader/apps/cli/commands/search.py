@@ -112,6 +112,7 @@ async def _run() -> None:
             login_ui = CLILoginUI()
             download_ui = CLIDownloadUI()
             client = registrar.get_client(site, adapter.get_client_config(site))
+            processors = adapter.get_processor_configs(site)
 
             try:
                 async with client:
@@ -124,7 +125,9 @@ async def _run() -> None:
                             return
 
                     for book in books:
-                        await client.download_book(book, ui=download_ui)
+                        await client.download_book(
+                            book, ui=download_ui, processors=processors
+                        )
             except ValueError as e:
                 ui.warn(
                     t("'{site}' is currently not supported: {err}").format(
@@ -145,7 +148,7 @@ async def _run() -> None:
             for book in download_ui.completed_books:
                 client.process_book(
                     book,
-                    processors=adapter.get_processor_configs(site),
+                    processors=processors,
                     ui=process_ui,
                 )
                 client.export_book(
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+novel_downloader.apps.cli.commands.search_local
+-----------------------------------------------
+
+"""
+
+import time
+from argparse import ArgumentParser, Namespace
+from pathlib import Path
+
+from novel_downloader.apps.cli import ui
+from novel_downloader.apps.utils import load_or_init_config
+from novel_downloader.infra.config import ConfigAdapter
+from novel_downloader.infra.i18n import t
+from novel_downloader.infra.persistence.search_index import (
+    SEARCH_INDEX_FILENAME,
+    ChapterSearchIndex,
+)
+from novel_downloader.plugins import registrar
+
+from .base import Command
+
+
+class SearchLocalCmd(Command):
+    name = "search-local"
+    help = t("Full-text search over downloaded chapters.")
+
+    @classmethod
+    def add_arguments(cls, parser: ArgumentParser) -> None:
+        parser.add_argument("keyword", help=t("Search keyword"))
+        parser.add_argument(
+            "--site",
+            "-s",
+            action="append",
+            metavar="SITE",
+            help=t("Restrict search to specific site key(s). Default: all sites."),
+        )
+        parser.add_argument(
+            "--book",
+            metavar="BOOK_ID",
+            help=t("Restrict search to a single book ID"),
+        )
+        parser.add_argument(
+            "--config", type=str, help=t("Path to the configuration file")
+        )
+        parser.add_argument(
+            "--limit",
+            "-l",
+            type=int,
+            default=20,
+            metavar="N",
+            help=t("Maximum number of results (default: 20)"),
+        )
+        parser.add_argument(
+            "--reindex",
+            action="store_true",
+            help=t("Update the index from downloaded data before searching"),
+        )
+        parser.add_argument(
+            "--stage",
+            type=str,
+            help=t("Stage to index (e.g. raw, cleaner). Defaults to last stage."),
+        )
+
+    @classmethod
+    def run(cls, args: Namespace) -> None:
+        config_path: Path | None = Path(args.config) if args.config else None
+        config_data = load_or_init_config(config_path)
+        if config_data is None:
+            return
+
+        adapter = ConfigAdapter(config=config_data)
+        raw_data_base = adapter.get_raw_data_dir()
+        index_path = raw_data_base / SEARCH_INDEX_FILENAME
+        sites: list[str] = list(args.site or [])
+
+        if args.reindex:
+            cls._reindex(adapter, raw_data_base, sites, args.book, args.stage)
+
+        if not index_path.is_file():
+            ui.warn(t("No search index found. Run with --reindex to build it."))
+            return
+
+        started = time.perf_counter()
+        with ChapterSearchIndex(index_path) as index:
+            hits = index.search(
+                args.keyword,
+                sites=sites,
+                book_id=args.book,
+                limit=args.limit,
+            )
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        if not hits:
+            ui.warn(t("No results found."))
+            return
+
+        rows = [
+            (
+                str(i),
+                hit["site"],
+                hit["book_name"] or hit["book_id"],
+                hit["chapter_id"],
+                hit["title"],
+                hit["snippet"],
+            )
+            for i, hit in enumerate(hits, 1)
+        ]
+        ui.render_table(
+            t("Local search: {keyword}").format(keyword=args.keyword),
+            ["#", t("Site"), t("Book"), t("Chapter ID"), t("Chapter"), t("Snippet")],
+            rows,
+        )
+        ui.info(
+            t("{count} result(s) in {ms:.1f} ms").format(count=len(hits), ms=elapsed_ms)
+        )
+
+    @staticmethod
+    def _reindex(
+        adapter: ConfigAdapter,
+        raw_data_base: Path,
+        sites: list[str],
+        book_id: str | None,
+        stage: str | None,
+    ) -> None:
+        """
+        Synchronize downloaded books into the search index.
+        """
+        if not sites and raw_data_base.is_dir():
+            sites = sorted(p.name for p in raw_data_base.iterdir() if p.is_dir())
+
+        total = 0
+        for site in sites:
+            site_dir = raw_data_base / site
+            if not site_dir.is_dir():
+                continue
+            try:
+                client = registrar.get_client(site, adapter.get_client_config(site))
+            except Exception as exc:
+                ui.warn(
+                    t("Skipping site '{site}': {error}").format(site=site, error=exc)
+                )
+                continue
+
+            book_ids = (
+                [book_id]
+                if book_id
+                else sorted(p.name for p in site_dir.iterdir() if p.is_dir())
+            )
+            for bid in book_ids:
+                try:
+                    total += client.index_book(bid, stage=stage)
+                except Exception as exc:
+                    ui.error(
+                        t("Failed to index book {book_id}: {error}").format(
+                            book_id=bid, error=exc
+                        )
+                    )
+
+        ui.info(t("Search index updated: {count} chapter(s).").format(count=total))
@@ -141,6 +141,7 @@ async def _do_download(adapter: ConfigAdapter, site: str, book: BookConfig) -> N
     client = registrar.get_client(site, config=adapter.get_client_config(site))
     login_ui = CLILoginUI()
     download_ui = CLIDownloadUI()
+    processors = adapter.get_processor_configs(site)
 
     try:
         async with client:
@@ -153,7 +154,7 @@ async def _do_download(adapter: ConfigAdapter, site: str, book: BookConfig) -> N
                     ui.warn(t("Login failed."))
                     return
 
-            await client.download_book(book, ui=download_ui)
+            await client.download_book(book, ui=download_ui, processors=processors)
 
     except ValueError as e:
         ui.warn(
@@ -169,7 +170,7 @@ async def _do_download(adapter: ConfigAdapter, site: str, book: BookConfig) -> N
     process_ui = CLIProcessUI()
     client.process_book(
         book,
-        processors=adapter.get_processor_configs(site),
+        processors=processors,
         ui=process_ui,
     )
 
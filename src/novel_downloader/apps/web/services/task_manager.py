@@ -12,6 +12,7 @@
 
 from novel_downloader.infra.config import ConfigAdapter, load_config
 from novel_downloader.plugins import ClientProtocol, registrar
+from novel_downloader.plugins.export_pool import ExportPool
 from novel_downloader.schemas import BookConfig
 
 from ..models import DownloadTask, Status
@@ -27,7 +28,8 @@ class TaskManager:
       * Tasks from the same site run sequentially.
       * Tasks from different sites can run in parallel.
       * Workers automatically exit when their site's queue becomes empty.
-      * A dedicated export worker runs synchronous export tasks sequentially.
+      * A dedicated export worker hands export tasks to a pool per site,
+        which runs up to `export_workers` of them at once.
     """
 
     def __init__(self) -> None:
@@ -44,6 +46,8 @@ def __init__(self) -> None:
         self._export_worker_task: asyncio.Task[None] | None = None
 
         self._clients: dict[str, ClientProtocol] = {}
+        self._export_pools: dict[str, ExportPool] = {}
+        self._export_jobs: set[asyncio.Task[None]] = set()
 
         self._lock = asyncio.Lock()
         self._adapter = ConfigAdapter(load_config())
@@ -102,6 +106,8 @@ async def close(self) -> None:
         if self._process_worker_task:
             all_tasks.append(self._process_worker_task)
 
+        all_tasks.extend(self._export_jobs)
+
         for worker_task in all_tasks:
             worker_task.cancel()
 
@@ -113,8 +119,14 @@ async def close(self) -> None:
                 print(f"Worker error during shutdown: {result!r}")
 
         self._worker_tasks.clear()
+        self._export_jobs.clear()
         self._export_worker_task = self._process_worker_task = None
 
+        pools = list(self._export_pools.values())
+        self._export_pools.clear()
+        for pool in pools:
+            await asyncio.to_thread(pool.close)
+
     # ---------- internals ----------
     def _get_client(self, site: str) -> ClientProtocol:
         """Get or create a client instance for a site."""
@@ -125,6 +137,13 @@ def _get_client(self, site: str) -> ClientProtocol:
 
         return self._clients[site]
 
+    def _get_export_pool(self, site: str) -> ExportPool:
+        """Get or create the export pool for a site."""
+        if site not in self._export_pools:
+            cfg = self._adapter.get_exporter_config(site)
+            self._export_pools[site] = ExportPool(cfg.export_workers)
+        return self._export_pools[site]
+
     def _ensure_worker(
         self, name: str, worker_fn: Callable[[], Coroutine[Any, Any, None]]
     ) -> None:
@@ -183,7 +202,9 @@ async def download_books() -> None:
                     if not success:
                         return
                 await client.download_book(
-                    BookConfig(book_id=task.book_id), ui=download_ui
+                    BookConfig(book_id=task.book_id),
+                    ui=download_ui,
+                    processors=adapter.get_processor_configs(task.site),
                 )
 
         task.asyncio_task = asyncio.create_task(download_books())
@@ -228,29 +249,36 @@ async def _process_worker(self) -> None:
                 self._process_waiting.task_done()
 
     async def _export_worker(self) -> None:
-        """Dedicated worker for synchronous export tasks."""
+        """Dedicated worker dispatching export tasks to the site pools."""
         while True:
             current_task = await self._export_waiting.get()
             if current_task.status == Status.CANCELLED:
                 self._export_waiting.task_done()
                 continue
-            try:
-                client = self._get_client(current_task.site)
-                await asyncio.to_thread(
-                    client.export_book,
+            job = asyncio.create_task(self._run_export(current_task))
+            self._export_jobs.add(job)
+            job.add_done_callback(self._export_jobs.discard)
+
+    async def _run_export(self, current_task: DownloadTask) -> None:
+        """Export one book in its site's pool and record the outcome."""
+        try:
+            pool = self._get_export_pool(current_task.site)
+            await asyncio.wrap_future(
+                pool.submit(
+                    self._get_client(current_task.site),
                     BookConfig(book_id=current_task.book_id),
                     cfg=self._adapter.get_exporter_config(current_task.site),
                     ui=WebExportUI(current_task),
                 )
-                current_task.status = Status.COMPLETED
-            except asyncio.CancelledError:
-                current_task.status = Status.CANCELLED
-                break
-            except Exception as e:
-                current_task.status = Status.FAILED
-                current_task.error = str(e)
-            finally:
-                self._export_waiting.task_done()
+            )
+            current_task.status = Status.COMPLETED
+        except asyncio.CancelledError:
+            current_task.status = Status.CANCELLED
+        except Exception as e:
+            current_task.status = Status.FAILED
+            current_task.error = str(e)
+        finally:
+            self._export_waiting.task_done()
 
 
 manager = TaskManager()
@@ -120,6 +120,11 @@ def get_client_config(self, site: str) -> ClientConfig:
             retry_times=cfg.get("retry_times", 3),
             backoff_factor=cfg.get("backoff_factor", 2.0),
             storage_batch_size=cfg.get("storage_batch_size", 1),
+            storage_layout=cfg.get("storage_layout", "book"),
+            search_index=bool(cfg.get("search_index", False)),
+            process_workers=cfg.get("process_workers", 1),
+            fuse_processors=bool(cfg.get("fuse_processors", False)),
+            stream_processing=bool(cfg.get("stream_processing", False)),
             cache_book_info=bool(cfg.get("cache_book_info", True)),
             cache_chapter=cfg.get("cache_chapter", True),
             fetch_inaccessible=cfg.get("fetch_inaccessible", False),
@@ -148,6 +153,20 @@ def get_exporter_config(self, site: str) -> ExporterConfig:
             filename_template=out.get("filename_template", "{title}_{author}"),
             include_picture=out.get("include_picture", True),
             split_mode=out.get("split_mode", "book"),
+            compress_level=int(out.get("compress_level", 6)),
+            compress_workers=int(out.get("compress_workers", 4)),
+            incremental=out.get("incremental", False),
+            txt_compression=out.get("txt_compression", "none"),
+            html_workers=int(out.get("html_workers", 4)),
+            image_format=out.get("image_format", "original"),
+            image_max_width=int(out.get("image_max_width", 0)),
+            image_max_height=int(out.get("image_max_height", 0)),
+            image_quality=int(out.get("image_quality", 85)),
+            image_workers=int(out.get("image_workers", 4)),
+            font_subset=out.get("font_subset", False),
+            font_format=out.get("font_format", "original"),
+            font_workers=int(out.get("font_workers", 2)),
+            export_workers=int(out.get("export_workers", 1)),
         )
 
     def get_login_config(self, site: str) -> dict[str, str]:
@@ -448,7 +467,19 @@ def _to_processor_cfgs(data: list[dict[str, Any]]) -> list[ProcessorConfig]:
 
             overwrite = bool(row.get("overwrite", False))
             # Pass everything else as options.
-            opts = {k: v for k, v in row.items() if k not in ("name", "overwrite")}
-            result.append(ProcessorConfig(name=name, overwrite=overwrite, options=opts))
+            checkpoint = bool(row.get("checkpoint", False))
+            opts = {
+                k: v
+                for k, v in row.items()
+                if k not in ("name", "overwrite", "checkpoint")
+            }
+            result.append(
+                ProcessorConfig(
+                    name=name,
+                    overwrite=overwrite,
+                    checkpoint=checkpoint,
+                    options=opts,
+                )
+            )
 
         return result
@@ -7,13 +7,16 @@
 
 from importlib.resources import files
 
-from platformdirs import user_config_path
+from platformdirs import user_cache_path, user_config_path
 
 PACKAGE_NAME = "novel_downloader"  # Python package name
 
 # Base config directory (e.g. ~/AppData/Local/novel_downloader/)
 STATE_PATH = user_config_path(PACKAGE_NAME, appauthor=False) / "state.json"
 
+# Per-user cache directory for compiled processor data
+USER_CACHE_DIR = user_cache_path(PACKAGE_NAME, appauthor=False)
+
 RES = files("novel_downloader.resources")
 
 # Config
@@ -11,9 +11,11 @@
 __all__ = ["ChapterStorage"]
 
 import contextlib
+import hashlib
 import json
 import sqlite3
 import types
+from collections.abc import Iterable
 from pathlib import Path
 from typing import Any, Self
 
@@ -25,16 +27,55 @@
   title        TEXT    NOT NULL,
   content      TEXT    NOT NULL,
   need_refetch BOOLEAN NOT NULL DEFAULT 0,
-  extra        TEXT
+  extra        TEXT,
+  content_hash TEXT,
+  updated_seq  INTEGER NOT NULL DEFAULT 0
 );
 """
 
+_CREATE_INDEX_SQL = """
+CREATE INDEX IF NOT EXISTS idx_chapters_updated_seq ON chapters(updated_seq);
+"""
+
+# Highest updated_seq ever assigned; deleting the newest rows must not let
+# their numbers be handed out again
+_CREATE_SEQ_SQL = """
+CREATE TABLE IF NOT EXISTS chapter_seq (
+  last_seq     INTEGER NOT NULL
+);
+"""
+
+# Columns added after the initial schema; migrated in place on connect.
+_MIGRATE_COLUMNS: dict[str, str] = {
+    "content_hash": "TEXT",
+    "updated_seq": "INTEGER NOT NULL DEFAULT 0",
+}
+
+_UPSERT_SQL = """
+INSERT INTO chapters (
+  {scope_cols}id, title, content, need_refetch, extra, content_hash, updated_seq
+)
+VALUES ({scope_marks}?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT({scope_cols}id) DO UPDATE SET
+    title=excluded.title,
+    content=excluded.content,
+    need_refetch=excluded.need_refetch,
+    extra=excluded.extra,
+    content_hash=excluded.content_hash,
+    updated_seq=excluded.updated_seq
+WHERE chapters.content_hash IS NOT excluded.content_hash
+"""
+
 
 class ChapterStorage:
     """
     Manage storage of chapters in an SQLite database.
     """
 
+    # Extra key columns that partition a shared `chapters` table; every
+    # statement is prefixed with them. Empty for one database per book.
+    _scope_cols: tuple[str, ...] = ()
+
     def __init__(self, base_dir: str | Path, filename: str) -> None:
         """
         Initialize storage for a specific book.
@@ -46,6 +87,20 @@ def __init__(self, base_dir: str | Path, filename: str) -> None:
         self._conn: sqlite3.Connection | None = None
         # Cache: chapter id -> need_refetch flag
         self._refetch_flags: dict[str, bool] = {}
+        # Cache: chapter id -> content hash
+        self._hashes: dict[str, str] = {}
+        # Highest updated_seq assigned so far
+        self._seq = 0
+        self._scope_args: tuple[str, ...] = ()
+
+        cols = self._scope_cols
+        self._scope_where = "".join(f"{col} = ? AND " for col in cols)
+        scope_filter = " AND ".join(f"{col} = ?" for col in cols)
+        self._seq_where = f" WHERE {scope_filter}" if cols else ""
+        self._upsert_sql = _UPSERT_SQL.format(
+            scope_cols="".join(f"{col}, " for col in cols),
+            scope_marks="?, " * len(cols),
+        )
 
     def connect(self) -> None:
         """
@@ -54,13 +109,7 @@ def connect(self) -> None:
         if self._conn:
             return
 
-        self._conn = sqlite3.connect(self._db_path)
-        self._conn.row_factory = sqlite3.Row
-        # self._conn.execute("PRAGMA foreign_keys = ON;")
-        # self._conn.execute("PRAGMA journal_mode = WAL;")
-        # self._conn.execute("PRAGMA synchronous = NORMAL;")
-        self._conn.executescript(_CREATE_TABLE_SQL)
-        self._conn.commit()
+        self._conn = self._open_connection()
         self._load_existing_keys()
 
     def exists(self, chap_id: str) -> bool:
@@ -98,32 +147,50 @@ def dirty_ids(self) -> set[str]:
         """
         return {cid for cid, need in self._refetch_flags.items() if need is True}
 
+    @property
+    def last_seq(self) -> int:
+        """
+        The highest update sequence number written to this store so far.
+
+        Callers can remember it and later pass it to `changed_since`.
+        """
+        return self._seq
+
+    def changed_since(self, seq: int) -> list[str]:
+        """
+        Chapter IDs whose content was written after the given sequence number.
+
+        :param seq: A value previously obtained from `last_seq`.
+        :return: Chapter IDs ordered by update sequence (oldest first).
+        """
+        cur = self.conn.execute(
+            "SELECT id FROM chapters "
+            f"WHERE {self._scope_where}updated_seq > ? ORDER BY updated_seq",
+            (*self._scope_args, seq),
+        )
+        return [row["id"] for row in cur.fetchall()]
+
+    def hashes(self, chap_ids: Iterable[str] | None = None) -> dict[str, str]:
+        """
+        Return the content hashes of stored chapters.
+
+        :param chap_ids: Chapter identifiers to look up; all chapters if None.
+        :return: A dict mapping chap_id to content hash (unknown ids omitted).
+        """
+        if chap_ids is None:
+            return dict(self._hashes)
+        return {cid: self._hashes[cid] for cid in chap_ids if cid in self._hashes}
+
     def upsert_chapter(self, data: ChapterDict, need_refetch: bool = False) -> None:
         """
         Insert or update a single chapter.
 
+        Writing a chapter whose content hash and flag are unchanged is a no-op.
+
         :param data: ChapterDict containing `id`, `title`, `content`, `extra`.
         :param need_refetch: Whether this chapter should be marked to refetch.
         """
-        chap_id = data["id"]
-        title = data["title"]
-        content = data["content"]
-        extra_json = json.dumps(data["extra"], ensure_ascii=False)
-
-        self.conn.execute(
-            """
-            INSERT INTO chapters (id, title, content, need_refetch, extra)
-            VALUES (?, ?, ?, ?, ?)
-            ON CONFLICT(id) DO UPDATE SET
-                title=excluded.title,
-                content=excluded.content,
-                need_refetch=excluded.need_refetch,
-                extra=excluded.extra
-            """,
-            (chap_id, title, content, int(need_refetch), extra_json),
-        )
-        self.conn.commit()
-        self._refetch_flags[chap_id] = need_refetch
+        self.upsert_chapters([data], need_refetch=need_refetch)
 
     def upsert_chapters(
         self, data: list[ChapterDict], need_refetch: bool = False
@@ -131,33 +198,58 @@ def upsert_chapters(
         """
         Insert or update multiple chapters in a single transaction.
 
+        Chapters whose content hash is unchanged are not rewritten; only their
+        `need_refetch` flag is updated when it differs.
+
         :param data: List of ChapterDicts.
         :param need_refetch: Whether these chapters should be marked to refetch.
         """
         if not data:
             return
 
+        scope = self._scope_args
         records = []
+        flag_updates = []
         for chapter in data:
             chap_id = chapter["id"]
-            title = chapter["title"]
-            content = chapter["content"]
             extra_json = json.dumps(chapter["extra"], ensure_ascii=False)
-            records.append((chap_id, title, content, int(need_refetch), extra_json))
+            digest = self._compute_hash(
+                chapter["title"], chapter["content"], extra_json
+            )
+
+            if self._hashes.get(chap_id) == digest:
+                if self._refetch_flags.get(chap_id) != need_refetch:
+                    flag_updates.append((int(need_refetch), *scope, chap_id))
+                    self._refetch_flags[chap_id] = need_refetch
+                continue
+
+            self._seq += 1
+            records.append(
+                (
+                    *scope,
+                    chap_id,
+                    chapter["title"],
+                    chapter["content"],
+                    int(need_refetch),
+                    extra_json,
+                    digest,
+                    self._seq,
+                )
+            )
             self._refetch_flags[chap_id] = need_refetch
+            self._hashes[chap_id] = digest
 
-        self.conn.executemany(
-            """
-            INSERT INTO chapters (id, title, content, need_refetch, extra)
-            VALUES (?, ?, ?, ?, ?)
-            ON CONFLICT(id) DO UPDATE SET
-                title=excluded.title,
-                content=excluded.content,
-                need_refetch=excluded.need_refetch,
-                extra=excluded.extra
-            """,
-            records,
-        )
+        if not records and not flag_updates:
+            return
+
+        if records:
+            self.conn.executemany(self._upsert_sql, records)
+            self._store_seq()
+        if flag_updates:
+            self.conn.executemany(
+                f"UPDATE chapters SET need_refetch = ? WHERE {self._scope_where}id = ?",
+                flag_updates,
+            )
         self.conn.commit()
 
     def get_chapter(self, chap_id: str) -> ChapterDict | None:
@@ -168,8 +260,9 @@ def get_chapter(self, chap_id: str) -> ChapterDict | None:
         :return: A ChapterDict if found, else None.
         """
         cur = self.conn.execute(
-            "SELECT id, title, content, extra FROM chapters WHERE id = ?",
-            (chap_id,),
+            "SELECT id, title, content, extra FROM chapters "
+            f"WHERE {self._scope_where}id = ?",
+            (*self._scope_args, chap_id),
         )
         row = cur.fetchone()
         if not row:
@@ -196,9 +289,9 @@ def get_chapters(self, chap_ids: list[str]) -> dict[str, ChapterDict | None]:
         query = f"""
             SELECT id, title, content, extra
               FROM chapters
-             WHERE id IN ({placeholders})
+             WHERE {self._scope_where}id IN ({placeholders})
         """
-        rows = self.conn.execute(query, tuple(chap_ids)).fetchall()
+        rows = self.conn.execute(query, (*self._scope_args, *chap_ids)).fetchall()
 
         result: dict[str, ChapterDict | None] = dict.fromkeys(chap_ids)
         for row in rows:
@@ -218,12 +311,13 @@ def delete_chapter(self, chap_id: str) -> bool:
         :return: True if a row was deleted, False otherwise.
         """
         cur = self.conn.execute(
-            "DELETE FROM chapters WHERE id = ?",
-            (chap_id,),
+            f"DELETE FROM chapters WHERE {self._scope_where}id = ?",
+            (*self._scope_args, chap_id),
         )
         self.conn.commit()
 
         self._refetch_flags.pop(chap_id, None)
+        self._hashes.pop(chap_id, None)
 
         return (cur.rowcount or 0) > 0
 
@@ -240,12 +334,13 @@ def delete_chapters(self, chap_ids: list[str]) -> int:
         unique_ids = set(chap_ids)
 
         placeholders = ",".join("?" for _ in unique_ids)
-        query = f"DELETE FROM chapters WHERE id IN ({placeholders})"
-        cur = self.conn.execute(query, tuple(unique_ids))
+        query = f"DELETE FROM chapters WHERE {self._scope_where}id IN ({placeholders})"
+        cur = self.conn.execute(query, (*self._scope_args, *unique_ids))
         self.conn.commit()
 
         for cid in unique_ids:
             self._refetch_flags.pop(cid, None)
+            self._hashes.pop(cid, None)
 
         return cur.rowcount or 0
 
@@ -263,11 +358,11 @@ def close(self) -> None:
         if self._conn is None:
             return
 
-        with contextlib.suppress(Exception):
-            self._conn.close()
-
+        self._close_connection(self._conn)
         self._conn = None
         self._refetch_flags.clear()
+        self._hashes.clear()
+        self._seq = 0
 
     @property
     def conn(self) -> sqlite3.Connection:
@@ -282,14 +377,110 @@ def conn(self) -> sqlite3.Connection:
             )
         return self._conn
 
+    def _open_connection(self) -> sqlite3.Connection:
+        """
+        Open the SQLite file and make sure the schema is up to date.
+        """
+        conn = sqlite3.connect(self._db_path)
+        conn.row_factory = sqlite3.Row
+        # conn.execute("PRAGMA foreign_keys = ON;")
+        # conn.execute("PRAGMA journal_mode = WAL;")
+        # conn.execute("PRAGMA synchronous = NORMAL;")
+        self._init_schema(conn)
+        conn.commit()
+        return conn
+
+    def _close_connection(self, conn: sqlite3.Connection) -> None:
+        """
+        Release a connection obtained from `_open_connection`.
+        """
+        with contextlib.suppress(Exception):
+            conn.close()
+
+    def _init_schema(self, conn: sqlite3.Connection) -> None:
+        """
+        Create tables and indexes, migrating databases from older versions.
+        """
+        conn.executescript(_CREATE_TABLE_SQL)
+        self._migrate_schema(conn)
+        conn.executescript(_CREATE_INDEX_SQL)
+        conn.executescript(_CREATE_SEQ_SQL)
+
+    @classmethod
+    def _migrate_schema(cls, conn: sqlite3.Connection) -> None:
+        """
+        Add columns missing from databases created by older versions and
+        backfill content hashes for their existing rows.
+        """
+        cur = conn.execute("PRAGMA table_info(chapters)")
+        columns = {row["name"] for row in cur.fetchall()}
+        missing = [col for col in _MIGRATE_COLUMNS if col not in columns]
+        if not missing:
+            return
+
+        for col in missing:
+            conn.execute(
+                f"ALTER TABLE chapters ADD COLUMN {col} {_MIGRATE_COLUMNS[col]}"
+            )
+
+        rows = conn.execute("SELECT id, title, content, extra FROM chapters").fetchall()
+        conn.executemany(
+            "UPDATE chapters SET content_hash = ? WHERE id = ?",
+            [
+                (
+                    cls._compute_hash(row["title"], row["content"], row["extra"]),
+                    row["id"],
+                )
+                for row in rows
+            ],
+        )
+
     def _load_existing_keys(self) -> None:
         """
-        Populate the in-memory cache from the database.
+        Populate the in-memory caches from the database.
         """
-        cur = self.conn.execute("SELECT id, need_refetch FROM chapters")
-        self._refetch_flags = {
-            row["id"]: bool(row["need_refetch"]) for row in cur.fetchall()
+        query = "SELECT id, need_refetch, content_hash, updated_seq FROM chapters"
+        if self._scope_cols:
+            query += " WHERE " + " AND ".join(f"{c} = ?" for c in self._scope_cols)
+        rows = self.conn.execute(query, self._scope_args).fetchall()
+        self._refetch_flags = {row["id"]: bool(row["need_refetch"]) for row in rows}
+        self._hashes = {
+            row["id"]: row["content_hash"] for row in rows if row["content_hash"]
         }
+        stored = self.conn.execute(
+            f"SELECT last_seq FROM chapter_seq{self._seq_where}", self._scope_args
+        ).fetchone()
+        seqs = [row["updated_seq"] for row in rows]
+        if stored:
+            seqs.append(stored["last_seq"])
+        self._seq = max(seqs, default=0)
+
+    def _store_seq(self) -> None:
+        """
+        Persist the sequence high-water mark (in the caller's transaction).
+        """
+        cur = self.conn.execute(
+            f"UPDATE chapter_seq SET last_seq = ?{self._seq_where}",
+            (self._seq, *self._scope_args),
+        )
+        if not cur.rowcount:
+            cols = "".join(f"{col}, " for col in self._scope_cols)
+            marks = "?, " * len(self._scope_cols)
+            self.conn.execute(
+                f"INSERT INTO chapter_seq ({cols}last_seq) VALUES ({marks}?)",
+                (*self._scope_args, self._seq),
+            )
+
+    @staticmethod
+    def _compute_hash(title: str, content: str, extra_json: str | None) -> str:
+        """
+        Compute the content hash of a chapter row.
+        """
+        h = hashlib.blake2b(digest_size=16)
+        for part in (title, content, extra_json or ""):
+            h.update(part.encode("utf-8"))
+            h.update(b"\x00")
+        return h.hexdigest()
 
     @staticmethod
     def _load_dict(data: str) -> dict[str, Any]:
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+novel_downloader.infra.persistence.correction_cache
+---------------------------------------------------
+
+Persistent store of corrected sentences.
+
+Each entry is keyed by `(engine, model, sentence hash)` and shared across
+books, so a sentence is only run through a given correction model once.
+"""
+
+from __future__ import annotations
+
+__all__ = ["CorrectionCache"]
+
+import hashlib
+import sqlite3
+import types
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+from typing import Self
+
+# Stay well below SQLite's bound-parameter limit
+_LOOKUP_CHUNK = 500
+
+_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS corrections (
+  engine       TEXT    NOT NULL,
+  model        TEXT    NOT NULL,
+  text_hash    TEXT    NOT NULL,
+  corrected    TEXT    NOT NULL,
+  updated_at   INTEGER NOT NULL DEFAULT (strftime('%s', 'now')),
+  PRIMARY KEY (engine, model, text_hash)
+) WITHOUT ROWID;
+"""
+
+
+class CorrectionCache:
+    """
+    SQLite-backed cache of sentence corrections.
+    """
+
+    def __init__(self, db_path: str | Path) -> None:
+        """
+        :param db_path: Path to the SQLite file (created on connect).
+        """
+        self._db_path = Path(db_path)
+        self._conn: sqlite3.Connection | None = None
+
+    def connect(self) -> None:
+        """
+        Open the database, creating it if necessary.
+        """
+        if self._conn:
+            return
+        self._db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Several processor worker processes may write concurrently
+        self._conn = sqlite3.connect(self._db_path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode = WAL;")
+        self._conn.execute("PRAGMA synchronous = NORMAL;")
+        self._conn.executescript(_SCHEMA_SQL)
+        self._conn.commit()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """
+        Return the active SQLite connection.
+
+        :raises RuntimeError: If the connection is not established.
+        """
+        if self._conn is None:
+            raise RuntimeError(
+                "Database connection is not established. Call connect() first."
+            )
+        return self._conn
+
+    @staticmethod
+    def text_hash(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def get_many(
+        self,
+        engine: str,
+        model: str,
+        sentences: Iterable[str],
+    ) -> dict[str, str]:
+        """
+        Look up cached corrections.
+
+        :return: Mapping of each found sentence to its corrected form.
+        """
+        by_hash = {self.text_hash(s): s for s in sentences}
+        hashes = list(by_hash)
+        found: dict[str, str] = {}
+        for i in range(0, len(hashes), _LOOKUP_CHUNK):
+            chunk = hashes[i : i + _LOOKUP_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self.conn.execute(
+                "SELECT text_hash, corrected FROM corrections "
+                f"WHERE engine = ? AND model = ? AND text_hash IN ({placeholders})",
+                (engine, model, *chunk),
+            )
+            for text_hash, corrected in rows:
+                found[by_hash[text_hash]] = corrected
+        return found
+
+    def put_many(self, engine: str, model: str, pairs: Mapping[str, str]) -> None:
+        """
+        Store corrections, replacing older entries for the same sentence.
+        """
+        if not pairs:
+            return
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO corrections "
+            "(engine, model, text_hash, corrected) VALUES (?, ?, ?, ?)",
+            [
+                (engine, model, self.text_hash(sentence), corrected)
+                for sentence, corrected in pairs.items()
+            ],
+        )
+        self.conn.commit()
+
+    def close(self) -> None:
+        if self._conn:
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self) -> Self:
+        self.connect()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        tb: types.TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"<CorrectionCache path='{self._db_path}'>"
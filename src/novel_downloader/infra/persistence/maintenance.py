@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+novel_downloader.infra.persistence.maintenance
+----------------------------------------------
+
+Housekeeping for stored book data: SQLite integrity checks, statistics
+refresh and compaction, and garbage collection of media files that are
+no longer referenced by any chapter or book metadata.
+"""
+
+from __future__ import annotations
+
+__all__ = [
+    "DatabaseReport",
+    "MediaReport",
+    "delete_orphan_media",
+    "find_databases",
+    "maintain_database",
+    "referenced_media",
+    "scan_orphan_media",
+]
+
+import contextlib
+import json
+import logging
+import sqlite3
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from novel_downloader.libs.filesystem import font_filename, image_filename
+
+from .media_index import MEDIA_INDEX_FILENAME, MediaIndex
+from .search_index import SEARCH_INDEX_FILENAME
+from .site_storage import SITE_DB_FILENAME
+
+logger = logging.getLogger(__name__)
+
+# The media index and its WAL files live among the media they describe
+_MEDIA_INDEX_FILES = frozenset(
+    MEDIA_INDEX_FILENAME + suffix for suffix in ("", "-wal", "-shm", "-journal")
+)
+
+
+@dataclass(slots=True)
+class DatabaseReport:
+    path: Path
+    integrity: str = "ok"
+    size_before: int = 0
+    size_after: int = 0
+    reclaimable: int = 0
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.integrity == "ok"
+
+    @property
+    def reclaimed(self) -> int:
+        return max(0, self.size_before - self.size_after)
+
+
+@dataclass(slots=True)
+class MediaReport:
+    book_dir: Path
+    orphans: list[Path] = field(default_factory=list)
+    orphan_bytes: int = 0
+    error: str | None = None
+
+
+def find_databases(raw_data_dir: Path, site: str | None = None) -> list[Path]:
+    """
+    List the SQLite files kept under the raw data directory.
+
+    Covers per-book stage databases and media indexes, site-level
+    databases and, when no site is given, the shared search index.
+
+    :param raw_data_dir: The `raw_data` base directory.
+    :param site: Restrict to one site key.
+    """
+    if not raw_data_dir.is_dir():
+        return []
+
+    site_dirs = (
+        [raw_data_dir / site]
+        if site
+        else sorted(p for p in raw_data_dir.iterdir() if p.is_dir())
+    )
+
+    paths: list[Path] = []
+    for site_dir in site_dirs:
+        if not site_dir.is_dir():
+            continue
+        site_db = site_dir / SITE_DB_FILENAME
+        if site_db.is_file():
+            paths.append(site_db)
+        for book_dir in sorted(p for p in site_dir.iterdir() if p.is_dir()):
+            paths.extend(sorted(book_dir.glob("chapter.*.sqlite")))
+            media_index = book_dir / "media" / MEDIA_INDEX_FILENAME
+            if media_index.is_file():
+                paths.append(media_index)
+
+    index_db = raw_data_dir / SEARCH_INDEX_FILENAME
+    if site is None and index_db.is_file():
+        paths.append(index_db)
+    return paths
+
+
+def maintain_database(
+    path: Path,
+    *,
+    check: bool = True,
+    analyze: bool = True,
+    vacuum: bool = True,
+) -> DatabaseReport:
+    """
+    Check and compact a single SQLite database.
+
+    Databases that fail the integrity check are reported but not
+    vacuumed, so a damaged file is never rewritten.
+
+    :param path: SQLite file path.
+    :param check: Run `PRAGMA integrity_check`.
+    :param analyze: Refresh query planner statistics.
+    :param vacuum: Rebuild the file to return free pages to the filesystem.
+    :return: A report with sizes before and after.
+    """
+    report = DatabaseReport(path=path)
+    try:
+        conn = sqlite3.connect(path)
+    except sqlite3.Error as e:
+        report.error = str(e)
+        return report
+
+    try:
+        # Fold the WAL back into the main file so sizes are comparable
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        report.size_before = _db_size(path)
+
+        page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        free_pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        report.reclaimable = page_size * free_pages
+
+        if check:
+            rows = conn.execute("PRAGMA integrity_check").fetchall()
+            report.integrity = "; ".join(str(r[0]) for r in rows) or "ok"
+        if analyze and report.integrity == "ok":
+            conn.execute("ANALYZE")
+            conn.commit()
+        if vacuum and report.integrity == "ok":
+            conn.execute("VACUUM")
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    except sqlite3.Error as e:
+        report.error = str(e)
+        logger.warning("Maintenance failed for %s: %s", path, e)
+    finally:
+        conn.close()
+
+    report.size_after = _db_size(path)
+    return report
+
+
+def referenced_media(book_dir: Path, site_db: Path | None = None) -> set[str]:
+    """
+    Collect the media filenames a book still refers to.
+
+    References come from the `resources` of every stored chapter (all
+    stages) and from the cover / volume cover URLs in every `book_info`.
+
+    :param book_dir: Book directory, i.e. `raw_data/<site>/<book_id>`.
+    :param site_db: Site-level database holding this book, if any.
+    :return: Filenames relative to the book's `media` directory.
+    """
+    names: set[str] = set()
+
+    for info_file in book_dir.glob("book_info.*.json"):
+        try:
+            info = json.loads(info_file.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError) as e:
+            logger.debug("Skipping unreadable %s: %s", info_file, e)
+            continue
+        if not isinstance(info, dict):
+            continue
+        if cover := info.get("cover_url"):
+            names.add(image_filename(cover, name="cover"))
+        for vol in info.get("volumes") or []:
+            if isinstance(vol, dict) and (vol_cover := vol.get("volume_cover")):
+                names.add(image_filename(vol_cover))
+
+    for db_file in book_dir.glob("chapter.*.sqlite"):
+        names |= _resource_names(db_file, "SELECT extra FROM chapters", ())
+    if site_db is not None and site_db.is_file():
+        names |= _resource_names(
+            site_db,
+            "SELECT extra FROM chapters WHERE book_id = ?",
+            (book_dir.name,),
+        )
+
+    return names
+
+
+def scan_orphan_media(book_dir: Path, site_db: Path | None = None) -> MediaReport:
+    """
+    Find files in a book's `media` directory that nothing references.
+
+    :param book_dir: Book directory, i.e. `raw_data/<site>/<book_id>`.
+    :param site_db: Site-level database holding this book, if any.
+    """
+    report = MediaReport(book_dir=book_dir)
+    media_dir = book_dir / "media"
+    if not media_dir.is_dir():
+        return report
+
+    try:
+        keep = referenced_media(book_dir, site_db)
+    except sqlite3.Error as e:
+        # Never delete anything when references cannot be fully read
+        report.error = str(e)
+        return report
+
+    for path in sorted(media_dir.iterdir()):
+        if path.name in _MEDIA_INDEX_FILES:
+            continue
+        if path.is_file() and path.name not in keep:
+            report.orphans.append(path)
+            report.orphan_bytes += path.stat().st_size
+    return report
+
+
+def delete_orphan_media(report: MediaReport) -> int:
+    """
+    Delete the orphans found by `scan_orphan_media` and drop them from the
+    book's media index.
+
+    :return: Number of files removed.
+    """
+    removed = 0
+    for path in report.orphans:
+        with contextlib.suppress(FileNotFoundError):
+            path.unlink()
+            removed += 1
+
+    media_dir = report.book_dir / "media"
+    if report.orphans and (media_dir / MEDIA_INDEX_FILENAME).is_file():
+        try:
+            with MediaIndex(media_dir) as index:
+                index.prune()
+        except sqlite3.Error as e:
+            logger.warning("Could not prune media index %s: %s", media_dir, e)
+    return removed
+
+
+def _resource_names(db_file: Path, query: str, params: tuple[str, ...]) -> set[str]:
+    names: set[str] = set()
+    conn = sqlite3.connect(f"file:{db_file}?mode=ro", uri=True)
+    try:
+        for (extra_str,) in conn.execute(query, params):
+            if not extra_str:
+                continue
+            try:
+                extra = json.loads(extra_str)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(extra, dict):
+                names.update(_media_names(extra.get("resources") or []))
+    finally:
+        conn.close()
+    return names
+
+
+def _media_names(resources: Iterable[Any]) -> set[str]:
+    names: set[str] = set()
+    for res in resources:
+        if not isinstance(res, dict) or not (url := res.get("url")):
+            continue
+        r_type = res.get("type")
+        if r_type == "image":
+            names.add(image_filename(url))
+        elif r_type == "font":
+            names.add(font_filename(url))
+    return names
+
+
+def _db_size(path: Path) -> int:
+    total = 0
+    for suffix in ("", "-wal", "-shm"):
+        p = path.with_name(path.name + suffix)
+        if p.is_file():
+            total += p.stat().st_size
+    return total
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+novel_downloader.infra.persistence.media_index
+----------------------------------------------
+
+Per-book index of downloaded media files.
+
+Every file in a book's `media` directory is described once, when it is
+saved: content hash, detected format, size and, for images, pixel size.
+Exporters read the whole index up front and only stat each file they
+embed, so they never hash a file the index already describes.
+"""
+
+from __future__ import annotations
+
+__all__ = [
+    "MEDIA_INDEX_FILENAME",
+    "MediaCatalog",
+    "MediaIndex",
+    "MediaInfo",
+    "MediaKind",
+    "describe_media",
+    "record_media",
+]
+
+import logging
+import sqlite3
+import types
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Literal, Self
+
+from novel_downloader.libs.crypto.hash_utils import hash_bytes
+from novel_downloader.libs.media.font import detect_font_format
+from novel_downloader.libs.media.image import detect_image_format, image_size
+
+logger = logging.getLogger(__name__)
+
+MEDIA_INDEX_FILENAME = "manifest.sqlite"
+
+MediaKind = Literal["image", "font"]
+
+_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS media (
+  filename    TEXT    PRIMARY KEY,
+  kind        TEXT    NOT NULL,
+  sha256      TEXT    NOT NULL,
+  format      TEXT    NOT NULL DEFAULT '',
+  size        INTEGER NOT NULL,
+  width       INTEGER,
+  height      INTEGER,
+  updated_at  INTEGER NOT NULL DEFAULT (strftime('%s', 'now'))
+) WITHOUT ROWID;
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class MediaInfo:
+    """
+    What is known about one media file.
+
+    :param digest: SHA-256 of the file content (lowercase hex).
+    :param format: Detected format such as 'jpeg' or 'woff2'; '' if unknown.
+    :param width: Pixel width of an image, if it could be read.
+    :param height: Pixel height of an image, if it could be read.
+    """
+
+    filename: str
+    kind: str
+    digest: str
+    format: str
+    size: int
+    width: int | None = None
+    height: int | None = None
+
+
+def describe_media(filename: str, data: bytes, kind: MediaKind) -> MediaInfo:
+    """
+    Hash and inspect the content of a media file.
+    """
+    if kind == "font":
+        return MediaInfo(
+            filename, kind, hash_bytes(data), detect_font_format(data) or "", len(data)
+        )
+    dims = image_size(data)
+    return MediaInfo(
+        filename,
+        kind,
+        hash_bytes(data),
+        detect_image_format(data) or "",
+        len(data),
+        dims[0] if dims else None,
+        dims[1] if dims else None,
+    )
+
+
+class MediaIndex:
+    """
+    SQLite-backed index stored next to the media files it describes.
+    """
+
+    def __init__(self, media_dir: str | Path) -> None:
+        """
+        :param media_dir: A book's media directory.
+        """
+        self._db_path = Path(media_dir) / MEDIA_INDEX_FILENAME
+        self._conn: sqlite3.Connection | None = None
+
+    def connect(self) -> None:
+        """
+        Open the database, creating it if necessary.
+        """
+        if self._conn:
+            return
+        self._db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self._db_path, timeout=30)
+        self._conn.execute("PRAGMA journal_mode = WAL;")
+        self._conn.execute("PRAGMA synchronous = NORMAL;")
+        self._conn.executescript(_SCHEMA_SQL)
+        self._conn.commit()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """
+        Return the active SQLite connection.
+
+        :raises RuntimeError: If the connection is not established.
+        """
+        if self._conn is None:
+            raise RuntimeError(
+                "Database connection is not established. Call connect() first."
+            )
+        return self._conn
+
+    def load(self) -> dict[str, MediaInfo]:
+        """
+        Return every entry, keyed by filename.
+        """
+        rows = self.conn.execute(
+            "SELECT filename, kind, sha256, format, size, width, height FROM media"
+        )
+        return {row[0]: MediaInfo(*row) for row in rows}
+
+    def put_many(self, infos: Iterable[MediaInfo]) -> None:
+        """
+        Store entries, replacing older ones for the same filename.
+        """
+        rows = [
+            (i.filename, i.kind, i.digest, i.format, i.size, i.width, i.height)
+            for i in infos
+        ]
+        if not rows:
+            return
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO media "
+            "(filename, kind, sha256, format, size, width, height) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        self.conn.commit()
+
+    def delete_many(self, filenames: Iterable[str]) -> None:
+        """
+        Remove the entries of the given files.
+        """
+        rows = [(name,) for name in filenames]
+        if not rows:
+            return
+        self.conn.executemany("DELETE FROM media WHERE filename = ?", rows)
+        self.conn.commit()
+
+    def prune(self) -> int:
+        """
+        Remove the entries of files that no longer exist.
+
+        :return: Number of entries removed.
+        """
+        media_dir = self._db_path.parent
+        gone = [
+            name
+            for (name,) in self.conn.execute("SELECT filename FROM media")
+            if not (media_dir / name).is_file()
+        ]
+        self.delete_many(gone)
+        return len(gone)
+
+    def close(self) -> None:
+        if self._conn:
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self) -> Self:
+        self.connect()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        tb: types.TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+def record_media(files: Iterable[tuple[Path, bytes, MediaKind]]) -> None:
+    """
+    Index media files that were just saved, one transaction per directory.
+
+    Failures are logged and ignored; an unindexed file is described by the
+    next export that needs it.
+
+    :param files: `(path, content, kind)` of each saved file.
+    """
+    by_dir: defaultdict[Path, list[MediaInfo]] = defaultdict(list)
+    for path, data, kind in files:
+        by_dir[path.parent].append(describe_media(path.name, data, kind))
+    for media_dir, infos in by_dir.items():
+        try:
+            with MediaIndex(media_dir) as index:
+                index.put_many(infos)
+        except sqlite3.Error as e:
+            logger.debug("Could not index media in %s: %s", media_dir, e)
+
+
+class MediaCatalog:
+    """
+    Read-mostly view of a media index for the duration of one export.
+
+    Each file is checked on its first lookup: entries of deleted files are
+    dropped, and files missing from the index (e.g. downloaded by an older
+    version) or replaced since are described again. `flush()` writes both
+    kinds of change back.
+    """
+
+    def __init__(self, media_dir: Path) -> None:
+        self.media_dir = media_dir
+        self._entries: dict[str, MediaInfo] = {}
+        self._checked: dict[str, MediaInfo | None] = {}
+        self._pending: list[MediaInfo] = []
+        self._stale: list[str] = []
+        if (media_dir / MEDIA_INDEX_FILENAME).is_file():
+            try:
+                with MediaIndex(media_dir) as index:
+                    self._entries = index.load()
+            except sqlite3.Error as e:
+                logger.debug("Ignoring unreadable media index %s: %s", media_dir, e)
+
+    def path(self, filename: str) -> Path:
+        return self.media_dir / filename
+
+    def lookup(self, filename: str, kind: MediaKind = "image") -> MediaInfo | None:
+        """
+        Return the entry for a file in the media directory.
+
+        :return: The entry, or None if the file does not exist.
+        """
+        if filename in self._checked:
+            return self._checked[filename]
+        info = self._entries.get(filename)
+        path = self.path(filename)
+        try:
+            size = path.stat().st_size
+            if info is None or info.size != size:
+                info = describe_media(filename, path.read_bytes(), kind)
+                self._pending.append(info)
+        except OSError:
+            if info is not None:
+                self._stale.append(filename)
+            info = None
+        self._checked[filename] = info
+        return info
+
+    def flush(self) -> None:
+        """
+        Save the entries described and dropped since the catalog was loaded.
+        """
+        if not self._pending and not self._stale:
+            return
+        try:
+            with MediaIndex(self.media_dir) as index:
+                index.put_many(self._pending)
+                index.delete_many(self._stale)
+        except sqlite3.Error as e:
+            logger.debug("Could not update media index %s: %s", self.media_dir, e)
+        self._pending.clear()
+        self._stale.clear()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        tb: types.TracebackType | None,
+    ) -> None:
+        self.flush()
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+novel_downloader.infra.persistence.search_index
+-----------------------------------------------
+
+Local full-text index over stored chapters.
+
+Chapters of every indexed book are kept in one SQLite FTS5 table using
+the `trigram` tokenizer, which matches arbitrary substrings and so works
+for CJK text without word segmentation. The index is synchronized from
+a `ChapterStorage` (or a layered stage view) by content hash, so only
+chapters that changed since the last sync are rewritten.
+"""
+
+from __future__ import annotations
+
+__all__ = ["ChapterSearchIndex", "SEARCH_INDEX_FILENAME"]
+
+import sqlite3
+import types
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Protocol, Self
+
+from novel_downloader.schemas import ChapterDict, LocalSearchHit
+
+SEARCH_INDEX_FILENAME = "search_index.sqlite"
+
+# The trigram tokenizer cannot serve queries shorter than three characters
+_MIN_MATCH_LEN = 3
+
+_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS docs (
+  docid        INTEGER PRIMARY KEY,
+  site         TEXT    NOT NULL,
+  book_id      TEXT    NOT NULL,
+  chapter_id   TEXT    NOT NULL,
+  content_hash TEXT    NOT NULL,
+  UNIQUE (site, book_id, chapter_id)
+);
+
+CREATE TABLE IF NOT EXISTS books (
+  site         TEXT    NOT NULL,
+  book_id      TEXT    NOT NULL,
+  book_name    TEXT    NOT NULL DEFAULT '',
+  stage        TEXT    NOT NULL DEFAULT 'raw',
+  PRIMARY KEY (site, book_id)
+);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS chapter_fts USING fts5(
+  title, content, tokenize = 'trigram'
+);
+"""
+
+
+class _IndexSource(Protocol):
+    """
+    Read interface shared by `ChapterStorage` and `LayeredChapterStorage`.
+    """
+
+    def hashes(self, chap_ids: Iterable[str] | None = None) -> dict[str, str]: ...
+
+    def get_chapters(self, chap_ids: list[str]) -> dict[str, ChapterDict | None]: ...
+
+
+class ChapterSearchIndex:
+    """
+    Full-text search index over chapters of many books.
+
+    Each indexed document is one chapter, identified by
+    `(site, book_id, chapter_id)`.
+    """
+
+    def __init__(self, db_path: str | Path, batch_size: int = 200) -> None:
+        """
+        :param db_path: Path to the index SQLite file.
+        :param batch_size: Number of chapters read per batch during a sync.
+        """
+        self._db_path = Path(db_path)
+        self._batch_size = max(1, batch_size)
+        self._conn: sqlite3.Connection | None = None
+
+    def connect(self) -> None:
+        """
+        Open the index, creating it if necessary.
+        """
+        if self._conn:
+            return
+        self._db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self._db_path)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode = WAL;")
+        self._conn.execute("PRAGMA synchronous = NORMAL;")
+        self._conn.executescript(_SCHEMA_SQL)
+        self._conn.commit()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """
+        Return the active SQLite connection.
+
+        :raises RuntimeError: If the connection is not established.
+        """
+        if self._conn is None:
+            raise RuntimeError(
+                "Database connection is not established. Call connect() first."
+            )
+        return self._conn
+
+    def sync_book(
+        self,
+        site: str,
+        book_id: str,
+        source: _IndexSource,
+        *,
+        book_name: str = "",
+        stage: str = "raw",
+    ) -> int:
+        """
+        Bring the indexed chapters of a book in line with its storage.
+
+        Chapters whose content hash is unchanged are skipped; chapters no
+        longer present in `source` are removed from the index.
+
+        :param site: Site key.
+        :param book_id: Book identifier.
+        :param source: An opened chapter storage or layered stage view.
+        :param book_name: Book title shown in search results.
+        :param stage: Stage the chapters were read from.
+        :return: Number of chapters added, updated, or removed.
+        """
+        conn = self.conn
+        current = source.hashes()
+        known = {
+            row["chapter_id"]: (row["docid"], row["content_hash"])
+            for row in conn.execute(
+                "SELECT docid, chapter_id, content_hash FROM docs "
+                "WHERE site = ? AND book_id = ?",
+                (site, book_id),
+            )
+        }
+
+        removed = [known[cid][0] for cid in known.keys() - current.keys()]
+        changed = [
+            cid for cid, h in current.items() if cid not in known or known[cid][1] != h
+        ]
+
+        if removed:
+            self._delete_docs(removed)
+
+        for i in range(0, len(changed), self._batch_size):
+            batch = changed[i : i + self._batch_size]
+            for cid, chap in source.get_chapters(batch).items():
+                if chap is None:
+                    continue
+                if cid in known:
+                    docid = known[cid][0]
+                    conn.execute(
+                        "UPDATE docs SET content_hash = ? WHERE docid = ?",
+                        (current[cid], docid),
+                    )
+                    conn.execute("DELETE FROM chapter_fts WHERE rowid = ?", (docid,))
+                else:
+                    cur = conn.execute(
+                        "INSERT INTO docs (site, book_id, chapter_id, content_hash) "
+                        "VALUES (?, ?, ?, ?)",
+                        (site, book_id, cid, current[cid]),
+                    )
+                    docid = cur.lastrowid
+                conn.execute(
+                    "INSERT INTO chapter_fts (rowid, title, content) VALUES (?, ?, ?)",
+                    (docid, chap["title"], chap["content"]),
+                )
+
+        conn.execute(
+            "INSERT OR REPLACE INTO books (site, book_id, book_name, stage) "
+            "VALUES (?, ?, ?, ?)",
+            (site, book_id, book_name, stage),
+        )
+        conn.commit()
+        return len(changed) + len(removed)
+
+    def remove_book(self, site: str, book_id: str) -> int:
+        """
+        Drop every indexed chapter of a book.
+
+        :return: Number of chapters removed.
+        """
+        conn = self.conn
+        docids = [
+            row["docid"]
+            for row in conn.execute(
+                "SELECT docid FROM docs WHERE site = ? AND book_id = ?",
+                (site, book_id),
+            )
+        ]
+        self._delete_docs(docids)
+        conn.execute(
+            "DELETE FROM books WHERE site = ? AND book_id = ?", (site, book_id)
+        )
+        conn.commit()
+        return len(docids)
+
+    def indexed_books(self) -> list[tuple[str, str]]:
+        """
+        Return the `(site, book_id)` pairs present in the index.
+        """
+        rows = self.conn.execute(
+            "SELECT site, book_id FROM books ORDER BY site, book_id"
+        ).fetchall()
+        return [(row["site"], row["book_id"]) for row in rows]
+
+    def search(
+        self,
+        query: str,
+        *,
+        sites: Iterable[str] | None = None,
+        book_id: str | None = None,
+        limit: int = 20,
+        context: int = 16,
+    ) -> list[LocalSearchHit]:
+        """
+        Search indexed chapter titles and contents for a substring.
+
+        Queries of three or more characters are answered by the FTS index
+        and ranked by relevance; shorter queries fall back to a scan.
+
+        :param query: Text to look for; matched literally.
+        :param sites: Restrict results to these site keys.
+        :param book_id: Restrict results to a single book.
+        :param limit: Maximum number of hits.
+        :param context: Approximate snippet length, in characters.
+        :return: Hits ordered by relevance (or by index order for scans).
+        """
+        query = query.strip()
+        if not query or limit <= 0:
+            return []
+
+        filters: list[str] = []
+        args: list[str | int] = []
+        site_list = list(sites or [])
+        if site_list:
+            filters.append(f"d.site IN ({','.join('?' for _ in site_list)})")
+            args.extend(site_list)
+        if book_id:
+            filters.append("d.book_id = ?")
+            args.append(book_id)
+        extra_where = "".join(f" AND {f}" for f in filters)
+
+        select = (
+            "SELECT d.site, d.book_id, d.chapter_id, b.book_name, f.title, "
+            "{snippet} AS snippet "
+            "FROM chapter_fts AS f "
+            "JOIN docs AS d ON d.docid = f.rowid "
+            "LEFT JOIN books AS b ON b.site = d.site AND b.book_id = d.book_id "
+        )
+
+        if len(query) >= _MIN_MATCH_LEN:
+            phrase = '"' + query.replace('"', '""') + '"'
+            # Each trigram token covers one character of the snippet
+            tokens = min(64, max(1, context))
+            sql = (
+                select.format(
+                    snippet=f"snippet(chapter_fts, 1, '[', ']', '...', {tokens})"
+                )
+                + f"WHERE chapter_fts MATCH ?{extra_where} ORDER BY rank LIMIT ?"
+            )
+            rows = self.conn.execute(sql, (phrase, *args, limit)).fetchall()
+        else:
+            sql = (
+                select.format(snippet="f.content")
+                + "WHERE (instr(f.title, ?) > 0 OR instr(f.content, ?) > 0)"
+                + f"{extra_where} ORDER BY f.rowid LIMIT ?"
+            )
+            rows = self.conn.execute(sql, (query, query, *args, limit)).fetchall()
+
+        hits: list[LocalSearchHit] = []
+        for row in rows:
+            snippet = row["snippet"] or ""
+            if len(query) < _MIN_MATCH_LEN:
+                snippet = self._make_snippet(snippet, query, context)
+            hits.append(
+                LocalSearchHit(
+                    site=row["site"],
+                    book_id=row["book_id"],
+                    book_name=row["book_name"] or "",
+                    chapter_id=row["chapter_id"],
+                    title=row["title"],
+                    snippet=snippet,
+                )
+            )
+        return hits
+
+    def close(self) -> None:
+        """
+        Close the index connection.
+        """
+        if self._conn is None:
+            return
+        self._conn.close()
+        self._conn = None
+
+    def _delete_docs(self, docids: list[int]) -> None:
+        for i in range(0, len(docids), 500):
+            batch = docids[i : i + 500]
+            placeholders = ",".join("?" for _ in batch)
+            self.conn.execute(
+                f"DELETE FROM chapter_fts WHERE rowid IN ({placeholders})", batch
+            )
+            self.conn.execute(
+                f"DELETE FROM docs WHERE docid IN ({placeholders})", batch
+            )
+
+    @staticmethod
+    def _make_snippet(text: str, query: str, context: int) -> str:
+        """
+        Cut a window around the first occurrence of `query` in `text`,
+        marking the match the same way the FTS snippet does.
+        """
+        pos = text.find(query)
+        if pos < 0:
+            return text[:context] + ("..." if len(text) > context else "")
+        half = max(0, (context - len(query)) // 2)
+        start = max(0, pos - half)
+        end = min(len(text), pos + len(query) + half)
+        return (
+            ("..." if start > 0 else "")
+            + text[start:pos]
+            + f"[{query}]"
+            + text[pos + len(query) : end]
+            + ("..." if end < len(text) else "")
+        )
+
+    def __enter__(self) -> Self:
+        self.connect()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        tb: types.TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"<ChapterSearchIndex path='{self._db_path}'>"
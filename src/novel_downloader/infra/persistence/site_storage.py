@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""
+novel_downloader.infra.persistence.site_storage
+-----------------------------------------------
+
+Site-level consolidated chapter storage.
+
+All books of a site (and all their stages) live in a single SQLite file,
+partitioned by `(book_id, stage)`. Connections are shared through a
+process-wide pool so repeated opens of the same database are cheap.
+"""
+
+from __future__ import annotations
+
+__all__ = [
+    "ConnectionPool",
+    "SiteChapterStorage",
+    "SiteStageStorage",
+    "migrate_book_storage",
+    "SITE_DB_FILENAME",
+]
+
+import contextlib
+import logging
+import sqlite3
+import threading
+from collections.abc import Callable
+from pathlib import Path
+
+from .chapter_storage import ChapterStorage
+from .stage_storage import StageStorage
+
+logger = logging.getLogger(__name__)
+
+SITE_DB_FILENAME = "chapters.sqlite"
+
+_SITE_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS chapters (
+  book_id      TEXT    NOT NULL,
+  stage        TEXT    NOT NULL,
+  id           TEXT    NOT NULL,
+  title        TEXT    NOT NULL,
+  content      TEXT    NOT NULL,
+  need_refetch BOOLEAN NOT NULL DEFAULT 0,
+  extra        TEXT,
+  content_hash TEXT,
+  updated_seq  INTEGER NOT NULL DEFAULT 0,
+  PRIMARY KEY (book_id, stage, id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_chapters_updated_seq
+  ON chapters(book_id, stage, updated_seq);
+
+CREATE TABLE IF NOT EXISTS chapter_seq (
+  book_id      TEXT    NOT NULL,
+  stage        TEXT    NOT NULL,
+  last_seq     INTEGER NOT NULL,
+  PRIMARY KEY (book_id, stage)
+);
+
+CREATE TABLE IF NOT EXISTS processed (
+  book_id      TEXT    NOT NULL,
+  stage        TEXT    NOT NULL,
+  id           TEXT    NOT NULL,
+  input_hash   TEXT    NOT NULL,
+  config_hash  TEXT    NOT NULL DEFAULT '',
+  chapter_key  TEXT    NOT NULL DEFAULT '',
+  PRIMARY KEY (book_id, stage, id)
+);
+"""
+
+
+class ConnectionPool:
+    """
+    A small pool of SQLite connections keyed by database path.
+
+    Connections are checked out exclusively and returned on release; up to
+    `max_idle` idle connections are kept open per database. The schema
+    initializer runs once per database for the lifetime of the pool.
+    """
+
+    def __init__(self, max_idle: int = 4) -> None:
+        self._max_idle = max_idle
+        self._idle: dict[Path, list[sqlite3.Connection]] = {}
+        self._initialized: set[Path] = set()
+        self._lock = threading.Lock()
+
+    def acquire(
+        self,
+        path: Path,
+        init: Callable[[sqlite3.Connection], None] | None = None,
+    ) -> sqlite3.Connection:
+        """
+        Check out a connection to the given database.
+
+        :param path: SQLite file path.
+        :param init: Optional schema initializer, run on first use.
+        """
+        key = path.resolve()
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop()
+
+        conn = sqlite3.connect(key, check_same_thread=False, cached_statements=256)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode = WAL;")
+        conn.execute("PRAGMA synchronous = NORMAL;")
+
+        with self._lock:
+            need_init = key not in self._initialized
+            self._initialized.add(key)
+        if need_init and init is not None:
+            init(conn)
+            conn.commit()
+        return conn
+
+    def release(self, path: Path, conn: sqlite3.Connection) -> None:
+        """
+        Return a connection to the pool, closing it if the pool is full.
+
+        :param path: SQLite file path the connection belongs to.
+        :param conn: Connection obtained from `acquire`.
+        """
+        key = path.resolve()
+        if conn.in_transaction:
+            conn.rollback()
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self._max_idle:
+                idle.append(conn)
+                return
+        with contextlib.suppress(Exception):
+            conn.close()
+
+    def close_all(self, path: Path | None = None) -> None:
+        """
+        Close idle connections, for one database or for all of them.
+
+        :param path: Restrict to this database; all databases if None.
+        """
+        with self._lock:
+            if path is None:
+                conns = [c for idle in self._idle.values() for c in idle]
+                self._idle.clear()
+                self._initialized.clear()
+            else:
+                key = path.resolve()
+                conns = self._idle.pop(key, [])
+                self._initialized.discard(key)
+        for conn in conns:
+            with contextlib.suppress(Exception):
+                conn.close()
+
+
+default_pool = ConnectionPool()
+
+
+class SiteChapterStorage(ChapterStorage):
+    """
+    Chapter storage backed by one partition of a site-level database.
+    """
+
+    _scope_cols = ("book_id", "stage")
+
+    def __init__(
+        self,
+        db_path: str | Path,
+        book_id: str,
+        stage: str = "raw",
+        *,
+        pool: ConnectionPool | None = None,
+    ) -> None:
+        """
+        :param db_path: Path to the site-level SQLite file.
+        :param book_id: Book identifier (partition key).
+        :param stage: Pipeline stage name (partition key).
+        :param pool: Connection pool; the process-wide pool if None.
+        """
+        db_path = Path(db_path)
+        super().__init__(db_path.parent, db_path.name)
+        self._book_id = book_id
+        self._stage = stage
+        self._scope_args = (book_id, stage)
+        self._pool = pool or default_pool
+
+    @classmethod
+    def has_partition(
+        cls,
+        db_path: str | Path,
+        book_id: str,
+        stage: str,
+        *,
+        pool: ConnectionPool | None = None,
+    ) -> bool:
+        """
+        Return True if the site database holds any data for `(book_id, stage)`.
+        """
+        db_path = Path(db_path)
+        if not db_path.is_file():
+            return False
+
+        pool = pool or default_pool
+        conn = pool.acquire(db_path, cls._init_site_schema)
+        try:
+            for table in ("chapters", "processed"):
+                row = conn.execute(
+                    f"SELECT 1 FROM {table} WHERE book_id = ? AND stage = ? LIMIT 1",
+                    (book_id, stage),
+                ).fetchone()
+                if row:
+                    return True
+            return False
+        finally:
+            pool.release(db_path, conn)
+
+    @classmethod
+    def drop_book(
+        cls,
+        db_path: str | Path,
+        book_id: str,
+        *,
+        pool: ConnectionPool | None = None,
+    ) -> int:
+        """
+        Delete every partition (all stages) of a book from the site database.
+
+        :return: Number of chapter rows deleted.
+        """
+        db_path = Path(db_path)
+        if not db_path.is_file():
+            return 0
+
+        pool = pool or default_pool
+        conn = pool.acquire(db_path, cls._init_site_schema)
+        try:
+            cur = conn.execute("DELETE FROM chapters WHERE book_id = ?", (book_id,))
+            conn.execute("DELETE FROM processed WHERE book_id = ?", (book_id,))
+            conn.commit()
+            conn.execute("PRAGMA incremental_vacuum")
+            return cur.rowcount or 0
+        finally:
+            pool.release(db_path, conn)
+
+    def vacuum(self) -> None:
+        """
+        Return free pages of the shared file to the filesystem.
+
+        A full VACUUM rewrites every book of the site, so only an incremental
+        vacuum is performed here.
+        """
+        self.conn.execute("PRAGMA incremental_vacuum")
+        self.conn.commit()
+
+    def _open_connection(self) -> sqlite3.Connection:
+        self._db_path.parent.mkdir(parents=True, exist_ok=True)
+        return self._pool.acquire(self._db_path, self._init_site_schema)
+
+    def _close_connection(self, conn: sqlite3.Connection) -> None:
+        self._pool.release(self._db_path, conn)
+
+    def _init_schema(self, conn: sqlite3.Connection) -> None:
+        self._init_site_schema(conn)
+
+    @staticmethod
+    def _init_site_schema(conn: sqlite3.Connection) -> None:
+        # auto_vacuum only takes effect before the first table is created
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL;")
+        conn.executescript(_SITE_SCHEMA_SQL)
+        StageStorage._migrate_processed(conn)
+
+    def __repr__(self) -> str:
+        return (
+            f"<{type(self).__name__} path='{self._db_path}' "
+            f"book_id='{self._book_id}' stage='{self._stage}'>"
+        )
+
+
+class SiteStageStorage(SiteChapterStorage, StageStorage):
+    """
+    Delta stage storage backed by one partition of a site-level database.
+    """
+
+
+def migrate_book_storage(
+    site_dir: str | Path,
+    *,
+    remove: bool = False,
+    pool: ConnectionPool | None = None,
+) -> int:
+    """
+    Move per-book `chapter.<stage>.sqlite` files into the site-level database.
+
+    Existing rows in the site database are replaced by the per-book data.
+
+    :param site_dir: Site directory, i.e. `raw_data/<site>`.
+    :param remove: Delete the per-book files after a successful copy.
+    :param pool: Connection pool; the process-wide pool if None.
+    :return: Number of per-book files migrated.
+    """
+    site_dir = Path(site_dir)
+    db_path = site_dir / SITE_DB_FILENAME
+    pool = pool or default_pool
+    migrated = 0
+
+    for book_dir in sorted(p for p in site_dir.iterdir() if p.is_dir()):
+        for db_file in sorted(book_dir.glob("chapter.*.sqlite")):
+            stage = db_file.name[len("chapter.") : -len(".sqlite")]
+            book_id = book_dir.name
+
+            # Bring legacy files up to the current schema first
+            legacy_cls = ChapterStorage if stage == "raw" else StageStorage
+            with legacy_cls(book_dir, db_file.name):
+                pass
+
+            conn = pool.acquire(db_path, SiteChapterStorage._init_site_schema)
+            try:
+                conn.execute("ATTACH DATABASE ? AS src", (str(db_file),))
+                try:
+                    conn.execute(
+                        """
+                        INSERT OR REPLACE INTO chapters (
+                          book_id, stage, id, title, content, need_refetch,
+                          extra, content_hash, updated_seq
+                        )
+                        SELECT ?, ?, id, title, content, need_refetch,
+                               extra, content_hash, updated_seq
+                          FROM src.chapters
+                        """,
+                        (book_id, stage),
+                    )
+                    conn.execute(
+                        """
+                        INSERT INTO chapter_seq (book_id, stage, last_seq)
+                        SELECT ?, ?, last_seq FROM src.chapter_seq WHERE true
+                        ON CONFLICT(book_id, stage) DO UPDATE
+                          SET last_seq = MAX(last_seq, excluded.last_seq)
+                        """,
+                        (book_id, stage),
+                    )
+                    if stage != "raw":
+                        conn.execute(
+                            """
+                            INSERT OR REPLACE INTO processed
+                              (book_id, stage, id, input_hash,
+                               config_hash, chapter_key)
+                            SELECT ?, ?, id, input_hash,
+                                   config_hash, chapter_key
+                              FROM src.processed
+                            """,
+                            (book_id, stage),
+                        )
+                    conn.commit()
+                finally:
+                    conn.execute("DETACH DATABASE src")
+            except sqlite3.Error as e:
+                logger.warning("Failed to migrate %s: %s", db_file, e)
+                continue
+            finally:
+                pool.release(db_path, conn)
+
+            migrated += 1
+            if remove:
+                for suffix in ("", "-wal", "-shm", "-journal"):
+                    with contextlib.suppress(FileNotFoundError):
+                        (db_file.parent / f"{db_file.name}{suffix}").unlink()
+
+    return migrated
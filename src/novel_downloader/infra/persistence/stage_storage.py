@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+"""
+novel_downloader.infra.persistence.stage_storage
+------------------------------------------------
+
+Delta (copy-on-write) storage for processing stages.
+
+A stage database only stores chapters whose output differs from the
+stage input; reads fall through the stack of upstream stage databases
+via `LayeredChapterStorage`.
+"""
+
+from __future__ import annotations
+
+__all__ = ["StageStorage", "LayeredChapterStorage"]
+
+import json
+import sqlite3
+import types
+from collections.abc import Iterable, Mapping, Sequence
+from pathlib import Path
+from typing import Self
+
+from novel_downloader.schemas import ChapterDict
+
+from .chapter_storage import ChapterStorage
+
+_CREATE_PROCESSED_SQL = """
+CREATE TABLE IF NOT EXISTS processed (
+  id           TEXT    NOT NULL PRIMARY KEY,
+  input_hash   TEXT    NOT NULL,
+  config_hash  TEXT    NOT NULL DEFAULT '',
+  chapter_key  TEXT    NOT NULL DEFAULT ''
+);
+"""
+
+# Columns added to `processed` after its first release: name -> definition
+_MIGRATE_PROCESSED_COLUMNS: dict[str, str] = {
+    "config_hash": "TEXT NOT NULL DEFAULT ''",
+    "chapter_key": "TEXT NOT NULL DEFAULT ''",
+}
+
+
+class StageStorage(ChapterStorage):
+    """
+    Chapter storage for a processing stage that keeps only changed chapters.
+
+    Every processed chapter is recorded in the `processed` table together
+    with the hash of the input it was derived from and the configuration
+    it was processed with, so chapters passed through unchanged are still
+    known to be up to date.
+    """
+
+    def __init__(self, base_dir: str | Path, filename: str) -> None:
+        super().__init__(base_dir, filename)
+        # Cache: chapter id -> input content hash
+        self._processed: dict[str, str] = {}
+        # Cache: chapter id -> (config hash, processor chapter key)
+        self._config_keys: dict[str, tuple[str, str]] = {}
+
+    def _init_schema(self, conn: sqlite3.Connection) -> None:
+        super()._init_schema(conn)
+        conn.executescript(_CREATE_PROCESSED_SQL)
+        self._migrate_processed(conn)
+
+    @staticmethod
+    def _migrate_processed(conn: sqlite3.Connection) -> None:
+        """
+        Add `processed` columns missing from databases of older versions.
+        """
+        cur = conn.execute("PRAGMA table_info(processed)")
+        columns = {row[1] for row in cur.fetchall()}
+        for col, definition in _MIGRATE_PROCESSED_COLUMNS.items():
+            if col not in columns:
+                conn.execute(f"ALTER TABLE processed ADD COLUMN {col} {definition}")
+        conn.commit()
+
+    def _load_existing_keys(self) -> None:
+        super()._load_existing_keys()
+        query = "SELECT id, input_hash, config_hash, chapter_key FROM processed"
+        if self._scope_cols:
+            query += " WHERE " + " AND ".join(f"{c} = ?" for c in self._scope_cols)
+        rows = self.conn.execute(query, self._scope_args).fetchall()
+        self._processed = {row["id"]: row["input_hash"] for row in rows}
+        self._config_keys = {
+            row["id"]: (row["config_hash"], row["chapter_key"]) for row in rows
+        }
+
+    def processed_ids(self) -> set[str]:
+        """
+        Chapter IDs this stage has produced output for.
+
+        Includes chapters passed through unchanged as well as stages written
+        by older versions, which stored a full copy of every chapter.
+        """
+        return set(self._processed) | self.existing_ids()
+
+    def input_hashes(self, chap_ids: Iterable[str] | None = None) -> dict[str, str]:
+        """
+        Return the input hashes recorded when chapters were processed.
+
+        :param chap_ids: Chapter identifiers to look up; all chapters if None.
+        :return: A dict mapping chap_id to input hash (unknown ids omitted).
+        """
+        if chap_ids is None:
+            return dict(self._processed)
+        return {cid: self._processed[cid] for cid in chap_ids if cid in self._processed}
+
+    def config_keys(
+        self, chap_ids: Iterable[str] | None = None
+    ) -> dict[str, tuple[str, str]]:
+        """
+        Return the `(config_hash, chapter_key)` recorded for processed chapters.
+
+        Both are empty strings for chapters recorded by older versions.
+
+        :param chap_ids: Chapter identifiers to look up; all chapters if None.
+        """
+        if chap_ids is None:
+            return dict(self._config_keys)
+        return {
+            cid: self._config_keys[cid] for cid in chap_ids if cid in self._config_keys
+        }
+
+    def upsert_delta(
+        self,
+        data: list[ChapterDict],
+        input_hashes: Mapping[str, str],
+        need_refetch: bool = False,
+        *,
+        config_hash: str = "",
+        chapter_keys: Mapping[str, str] | None = None,
+    ) -> None:
+        """
+        Store processed chapters, keeping only those that differ from input.
+
+        Chapters identical to their input are not stored, and any row left
+        over from an earlier run that changed them is removed.
+
+        :param data: Processed chapters.
+        :param input_hashes: Content hashes of the stage inputs, keyed by id.
+        :param need_refetch: Whether these chapters should be marked to refetch.
+        :param config_hash: Hash of the configuration the chapters were
+                            processed with.
+        :param chapter_keys: Optional per-chapter keys from the processor.
+        """
+        if not data:
+            return
+
+        changed: list[ChapterDict] = []
+        unchanged: list[str] = []
+        for chapter in data:
+            chap_id = chapter["id"]
+            if self.chapter_hash(chapter) == input_hashes.get(chap_id, ""):
+                unchanged.append(chap_id)
+            else:
+                changed.append(chapter)
+
+        self.upsert_chapters(changed, need_refetch=need_refetch)
+
+        stale = [cid for cid in unchanged if cid in self._refetch_flags]
+        if stale:
+            self.delete_chapters(stale)
+
+        self.mark_processed(
+            [chapter["id"] for chapter in data],
+            input_hashes,
+            config_hash=config_hash,
+            chapter_keys=chapter_keys,
+        )
+
+    def mark_processed(
+        self,
+        chap_ids: Iterable[str],
+        input_hashes: Mapping[str, str],
+        *,
+        config_hash: str = "",
+        chapter_keys: Mapping[str, str] | None = None,
+    ) -> None:
+        """
+        Record chapters as processed from the given inputs and configuration
+        without touching their stored output.
+
+        :param chap_ids: Chapter identifiers.
+        :param input_hashes: Content hashes of the stage inputs, keyed by id.
+        :param config_hash: Hash of the configuration in effect.
+        :param chapter_keys: Optional per-chapter keys from the processor.
+        """
+        keys = chapter_keys or {}
+        records: list[tuple[str, ...]] = []
+        for chap_id in chap_ids:
+            src_hash = input_hashes.get(chap_id, "")
+            cfg_key = (config_hash, keys.get(chap_id, ""))
+            if (
+                self._processed.get(chap_id) == src_hash
+                and self._config_keys.get(chap_id) == cfg_key
+            ):
+                continue
+            records.append((*self._scope_args, chap_id, src_hash, *cfg_key))
+            self._processed[chap_id] = src_hash
+            self._config_keys[chap_id] = cfg_key
+
+        if records:
+            cols = "".join(f"{col}, " for col in self._scope_cols)
+            marks = "?, " * len(self._scope_cols)
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO processed "
+                f"({cols}id, input_hash, config_hash, chapter_key) "
+                f"VALUES ({marks}?, ?, ?, ?)",
+                records,
+            )
+            self.conn.commit()
+
+    def forget(self, chap_ids: Iterable[str]) -> None:
+        """
+        Drop both stored output and processed records for the given chapters.
+
+        :param chap_ids: Chapter identifiers.
+        """
+        ids = list(set(chap_ids))
+        if not ids:
+            return
+        self.delete_chapters(ids)
+        placeholders = ",".join("?" for _ in ids)
+        self.conn.execute(
+            f"DELETE FROM processed WHERE {self._scope_where}id IN ({placeholders})",
+            (*self._scope_args, *ids),
+        )
+        self.conn.commit()
+        for cid in ids:
+            self._processed.pop(cid, None)
+            self._config_keys.pop(cid, None)
+
+    def close(self) -> None:
+        """
+        Close the database connection and clear in-memory caches.
+        """
+        super().close()
+        self._processed.clear()
+        self._config_keys.clear()
+
+    @classmethod
+    def chapter_hash(cls, data: ChapterDict) -> str:
+        """
+        Compute the content hash a chapter would be stored with.
+        """
+        extra_json = json.dumps(data["extra"], ensure_ascii=False)
+        return cls._compute_hash(data["title"], data["content"], extra_json)
+
+    def __repr__(self) -> str:
+        return f"<StageStorage path='{self._db_path}'>"
+
+
+class LayeredChapterStorage:
+    """
+    Read-only view over a stack of stage storages.
+
+    Layers are given bottom-up (e.g. raw, cleaner, zh_convert); a chapter
+    is read from the top-most layer that stores it, so the view works for
+    both delta and full-copy stages.
+    """
+
+    def __init__(self, layers: Sequence[ChapterStorage]) -> None:
+        """
+        :param layers: Chapter storages, ordered from bottom to top.
+        """
+        # Top-most layer first
+        self._layers = list(reversed(layers))
+
+    @classmethod
+    def from_files(cls, base_dir: str | Path, filenames: list[str]) -> Self:
+        """
+        Build a view over per-book SQLite files, skipping missing ones.
+
+        :param base_dir: Directory containing the SQLite files.
+        :param filenames: SQLite filenames, ordered from bottom to top.
+        """
+        base = Path(base_dir)
+        return cls(
+            [
+                ChapterStorage(base, name)
+                for name in filenames
+                if (base / name).is_file()
+            ]
+        )
+
+    @property
+    def layers(self) -> list[ChapterStorage]:
+        """
+        The storages backing this view, ordered bottom-up.
+        """
+        return list(reversed(self._layers))
+
+    def connect(self) -> None:
+        """
+        Open every layer.
+        """
+        for layer in self._layers:
+            layer.connect()
+
+    def exists(self, chap_id: str) -> bool:
+        """
+        Return True if any layer stores the chapter.
+
+        :param chap_id: Chapter identifier.
+        """
+        return any(layer.exists(chap_id) for layer in self._layers)
+
+    def need_refetch(self, chap_id: str) -> bool:
+        """
+        Return the refetch flag from the top-most layer storing the chapter;
+        unknown ids default to True.
+
+        :param chap_id: Chapter identifier.
+        """
+        for layer in self._layers:
+            if layer.exists(chap_id):
+                return layer.need_refetch(chap_id)
+        return True
+
+    def existing_ids(self) -> set[str]:
+        """
+        All chapter IDs visible through the view.
+        """
+        ids: set[str] = set()
+        for layer in self._layers:
+            ids |= layer.existing_ids()
+        return ids
+
+    def clean_ids(self) -> set[str]:
+        """
+        Visible chapter IDs that DO NOT need refetch.
+        """
+        return {cid for cid in self.existing_ids() if not self.need_refetch(cid)}
+
+    def dirty_ids(self) -> set[str]:
+        """
+        Visible chapter IDs that DO need refetch.
+        """
+        return {cid for cid in self.existing_ids() if self.need_refetch(cid)}
+
+    def hashes(self, chap_ids: Iterable[str] | None = None) -> dict[str, str]:
+        """
+        Return the content hashes of the visible chapters.
+
+        :param chap_ids: Chapter identifiers to look up; all chapters if None.
+        """
+        result: dict[str, str] = {}
+        for layer in reversed(self._layers):
+            result.update(layer.hashes(chap_ids))
+        return result
+
+    def get_chapter(self, chap_id: str) -> ChapterDict | None:
+        """
+        Retrieve a single chapter from the top-most layer storing it.
+
+        :param chap_id: Chapter identifier.
+        """
+        for layer in self._layers:
+            if layer.exists(chap_id):
+                return layer.get_chapter(chap_id)
+        return None
+
+    def get_chapters(self, chap_ids: list[str]) -> dict[str, ChapterDict | None]:
+        """
+        Retrieve multiple chapters, resolving each through the layers.
+
+        :param chap_ids: List of chapter identifiers.
+        :return: A dict mapping chap_id to ChapterDict (or None if not found).
+        """
+        result: dict[str, ChapterDict | None] = dict.fromkeys(chap_ids)
+        pending = set(chap_ids)
+        for layer in self._layers:
+            if not pending:
+                break
+            hits = [cid for cid in pending if layer.exists(cid)]
+            if not hits:
+                continue
+            for cid, chap in layer.get_chapters(hits).items():
+                if chap is not None:
+                    result[cid] = chap
+                    pending.discard(cid)
+        return result
+
+    def close(self) -> None:
+        """
+        Close every layer.
+        """
+        for layer in self._layers:
+            layer.close()
+
+    def __enter__(self) -> Self:
+        self.connect()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        tb: types.TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"<LayeredChapterStorage layers={self.layers!r}>"
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+novel_downloader.infra.persistence.translation_memory
+-----------------------------------------------------
+
+Persistent store of machine translations.
+
+Each entry is keyed by `(engine, source, target, text hash)`, so repeated
+strings (chapter titles, volume names, re-runs after a config change) are
+translated once per engine and language pair.
+"""
+
+from __future__ import annotations
+
+__all__ = ["TranslationMemory"]
+
+import hashlib
+import sqlite3
+import types
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+from typing import Self
+
+# Stay well below SQLite's bound-parameter limit
+_LOOKUP_CHUNK = 500
+
+_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS translations (
+  engine       TEXT    NOT NULL,
+  source       TEXT    NOT NULL,
+  target       TEXT    NOT NULL,
+  text_hash    TEXT    NOT NULL,
+  translation  TEXT    NOT NULL,
+  updated_at   INTEGER NOT NULL DEFAULT (strftime('%s', 'now')),
+  PRIMARY KEY (engine, source, target, text_hash)
+) WITHOUT ROWID;
+"""
+
+
+class TranslationMemory:
+    """
+    SQLite-backed translation memory shared by all translator processors.
+    """
+
+    def __init__(self, db_path: str | Path) -> None:
+        """
+        :param db_path: Path to the SQLite file (created on connect).
+        """
+        self._db_path = Path(db_path)
+        self._conn: sqlite3.Connection | None = None
+
+    def connect(self) -> None:
+        """
+        Open the database, creating it if necessary.
+        """
+        if self._conn:
+            return
+        self._db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Several processor worker processes may write concurrently
+        self._conn = sqlite3.connect(self._db_path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode = WAL;")
+        self._conn.execute("PRAGMA synchronous = NORMAL;")
+        self._conn.executescript(_SCHEMA_SQL)
+        self._conn.commit()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """
+        Return the active SQLite connection.
+
+        :raises RuntimeError: If the connection is not established.
+        """
+        if self._conn is None:
+            raise RuntimeError(
+                "Database connection is not established. Call connect() first."
+            )
+        return self._conn
+
+    @staticmethod
+    def text_hash(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def get_many(
+        self,
+        engine: str,
+        source: str,
+        target: str,
+        texts: Iterable[str],
+    ) -> dict[str, str]:
+        """
+        Look up stored translations.
+
+        :return: Mapping of each found text to its translation.
+        """
+        by_hash = {self.text_hash(text): text for text in texts}
+        hashes = list(by_hash)
+        found: dict[str, str] = {}
+        for i in range(0, len(hashes), _LOOKUP_CHUNK):
+            chunk = hashes[i : i + _LOOKUP_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self.conn.execute(
+                "SELECT text_hash, translation FROM translations "
+                "WHERE engine = ? AND source = ? AND target = ? "
+                f"AND text_hash IN ({placeholders})",
+                (engine, source, target, *chunk),
+            )
+            for text_hash, translation in rows:
+                found[by_hash[text_hash]] = translation
+        return found
+
+    def put_many(
+        self,
+        engine: str,
+        source: str,
+        target: str,
+        pairs: Mapping[str, str],
+    ) -> None:
+        """
+        Store translations, replacing older entries for the same text.
+        """
+        if not pairs:
+            return
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO translations "
+            "(engine, source, target, text_hash, translation) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [
+                (engine, source, target, self.text_hash(text), translation)
+                for text, translation in pairs.items()
+            ],
+        )
+        self.conn.commit()
+
+    def close(self) -> None:
+        if self._conn:
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self) -> Self:
+        self.connect()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        tb: types.TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"<TranslationMemory path='{self._db_path}'>"
@@ -16,6 +16,9 @@
 builder.chapters.append(Chapter(id="ch1", title="Chapter 1", content="<p>xxx</p>"))
 builder.export("output/my_novel.epub")
 ```
+
+Pass `stream_to="output/my_novel.epub"` to write chapters and media into the
+archive as they are added; `builder.export()` then completes the file.
 """
 
 __all__ = [
@@ -28,6 +28,18 @@
     "webp": "image/webp",
 }
 
+# Media that deflate cannot shrink; stored in the archive as is
+PRECOMPRESSED_MEDIA_TYPES: frozenset[str] = frozenset(
+    {
+        "image/jpeg",
+        "image/png",
+        "image/gif",
+        "image/webp",
+        "font/woff",
+        "font/woff2",
+    }
+)
+
 FONT_FORMAT_MAP: dict[str, str] = {
     "ttf": "truetype",
     "otf": "opentype",
@@ -12,18 +12,36 @@
 Provides:
   * methods to add chapters, volumes, images, and fonts
   * a clean `export()` entry point that writes the final EPUB archive
+
+In streaming mode (`stream_to`), chapter XHTML and media are written to the
+archive as they are added and only the manifest, spine and TOC entries are
+kept in memory; nav.xhtml, toc.ncx and content.opf are written on export.
+
+With a `manifest_path`, members whose content is unchanged since the export
+recorded there are copied from that archive instead of compressed again.
+
+With an `image_transcoder`, images are downscaled / re-encoded as they are
+added; streaming carries on while the transcodes run.
+
+With a `font_subsetter`, fonts are held back until export and then cut down
+to the characters of the chapters that reference them.
 """
 
 from __future__ import annotations
 
-import zipfile
+import contextlib
+import html
+import os
+import zlib
+from concurrent.futures import Future
 from pathlib import Path
-from zipfile import ZIP_DEFLATED, ZIP_STORED
 
 from novel_downloader.infra.paths import EPUB_CSS_STYLE_PATH
 from novel_downloader.libs.crypto.hash_utils import hash_bytes, hash_file
 from novel_downloader.libs.media.font import detect_font_format
 from novel_downloader.libs.media.image import detect_image_format
+from novel_downloader.libs.media.subset import FontSubsetter
+from novel_downloader.libs.media.transcode import ImageTranscoder
 
 from .constants import (
     CONTAINER_TEMPLATE,
@@ -33,9 +51,11 @@
     FONT_MEDIA_TYPES,
     IMAGE_DIR,
     IMAGE_MEDIA_TYPES,
+    PRECOMPRESSED_MEDIA_TYPES,
     ROOT_PATH,
     TEXT_DIR,
 )
+from .incremental import ExportManifest, PreviousArchive
 from .models import (
     EpubChapter,
     EpubCover,
@@ -52,6 +72,7 @@
     NCXDocument,
     OpfDocument,
 )
+from .zip_writer import ZipWriter
 
 
 class EpubBuilder:
@@ -66,17 +87,65 @@ def __init__(
         word_count: str = "0",
         uid: str = "",
         language: str = "zh-Hans",
+        *,
+        stream_to: str | Path | None = None,
+        compress_level: int = zlib.Z_DEFAULT_COMPRESSION,
+        compress_workers: int = 1,
+        manifest_path: str | Path | None = None,
+        image_transcoder: ImageTranscoder | None = None,
+        font_subsetter: FontSubsetter | None = None,
     ) -> None:
-        # builder state
+        """
+        :param stream_to: Write the archive while building instead of keeping
+            resources in memory; the final EPUB path. Content goes to
+            `<name>.part` until `export()` completes it.
+        :param compress_level: Deflate level of text members, 0 to 9.
+        :param compress_workers: Threads deflating members in parallel.
+        :param manifest_path: Export manifest to reuse unchanged members from
+            and to update on export.
+        :param image_transcoder: Downscales / re-encodes added images; the
+            caller owns it and closes it after `export()`.
+        :param font_subsetter: Subsets fonts to the characters they render;
+            the caller owns it and closes it after `export()`.
+        """
+        self._compress_level = compress_level
+        self._transcoder = image_transcoder
+        self._subsetter = font_subsetter
+        self._compress_workers = max(1, compress_workers)
+
+        # incremental export: content hashes of written members
+        self._manifest_path = Path(manifest_path) if manifest_path else None
+        self._hashes: dict[str, str] = {}
+        self._previous: PreviousArchive | None = None
+        self.reused_members = 0
+        if self._manifest_path is not None:
+            old = ExportManifest.load(self._manifest_path)
+            if old is not None and old.level == compress_level:
+                self._previous = PreviousArchive.open(old)
+
+        # builder state; resources stay empty when streaming
         self.items: list[EpubXhtmlFile] = []
         self.images: list[EpubImage] = []
         self.fonts: list[EpubFont] = []
 
+        self._stream_path: Path | None = None
+        self._zip: ZipWriter | None = None
+        if stream_to is not None:
+            self._open_stream(Path(stream_to))
+
+        # TOC entries of the volume opened by `start_volume`
+        self._vol_toc: tuple[str, str, str] | None = None
+        self._vol_entries: list[tuple[str, str, str]] = []
+
         self._img_map: dict[str, str] = {}
         self._img_idx = 0
 
         self._font_map: dict[str, EpubFont] = {}
         self._font_idx = 0
+        # fonts to subset on export: id -> (font, source digest, characters)
+        self._subset_fonts: dict[str, tuple[EpubFont, str, set[str]]] = {}
+        # images still transcoding: (result, manifest id, expected media type)
+        self._transcoding: list[tuple[Future[bytes], str, str]] = []
 
         self._vol_idx = 0
 
@@ -121,7 +190,7 @@ def __init__(
             serial_status=serial_status,
             word_count=word_count,
         )
-        self.items.append(intro)
+        self._add_item(intro)
         self.opf.add_manifest_item(
             intro.id,
             f"{TEXT_DIR}/{intro.filename}",
@@ -131,19 +200,24 @@ def __init__(
         self.nav.add_chapter(intro.id, intro.title, f"{TEXT_DIR}/{intro.filename}")
         self.ncx.add_chapter(intro.id, intro.title, f"{TEXT_DIR}/{intro.filename}")
 
-    def add_image(self, image_path: Path) -> str:
+    def add_image(self, image_path: Path, *, digest: str | None = None) -> str:
         """
         Add an image resource (deduped by hash) and register it.
+
+        :param digest: SHA-256 of the file if already known; the file is
+            then only read when its content is new to the book.
         """
-        if not (image_path.exists() and image_path.is_file()):
+        h = digest or self._file_digest(image_path)
+        if not h:
             return ""
-        h = hash_file(image_path)
         if h in self._img_map:
             return self._img_map[h]
 
-        data = image_path.read_bytes()
-        # Try detecting from magic bytes
-        fmt = detect_image_format(data)
+        try:
+            data = image_path.read_bytes()
+        except OSError:
+            return ""
+        payload, key, fmt = self._prepare_image(data, h)
         ext = fmt.lower() if fmt else image_path.suffix.lower().lstrip(".")
 
         mtype = IMAGE_MEDIA_TYPES.get(ext)
@@ -153,8 +227,11 @@ def add_image(self, image_path: Path) -> str:
         res_id = f"img_{self._img_idx}"
         filename = f"{res_id}.{ext}"
 
-        img = EpubImage(id=res_id, data=data, media_type=mtype, filename=filename)
-        self.images.append(img)
+        img = EpubImage(
+            id=res_id, data=payload, media_type=mtype, filename=filename, digest=key
+        )
+        self._track_transcode(img)
+        self._add_image(img)
         self.opf.add_manifest_item(
             img.id,
             f"{IMAGE_DIR}/{img.filename}",
@@ -176,7 +253,7 @@ def add_image_bytes(self, data: bytes, mime_type: str = "") -> str:
         if h in self._img_map:
             return self._img_map[h]
 
-        ext = detect_image_format(data)
+        payload, key, ext = self._prepare_image(data, h)
         mtype = IMAGE_MEDIA_TYPES.get(ext) if ext else None
 
         # Fallback to provided mime_type
@@ -194,11 +271,13 @@ def add_image_bytes(self, data: bytes, mime_type: str = "") -> str:
 
         img = EpubImage(
             id=res_id,
-            data=data,
+            data=payload,
             media_type=mtype,
             filename=filename,
+            digest=key,
         )
-        self.images.append(img)
+        self._track_transcode(img)
+        self._add_image(img)
         self.opf.add_manifest_item(
             img.id,
             f"{IMAGE_DIR}/{img.filename}",
@@ -213,6 +292,7 @@ def add_font(
         self,
         font_path: Path,
         *,
+        digest: str | None = None,
         family: str | None = None,
         selectors: tuple[str, ...] = (),
     ) -> EpubFont | None:
@@ -220,20 +300,28 @@ def add_font(
         Add a font from a file (deduped by hash) and register it in the manifest.
 
         :param font_path: Path to the font file.
+        :param digest: SHA-256 of the file if already known.
         :param family: CSS font-family name. If None, a unique name is generated.
         :param selectors: CSS selectors this font should apply to in chapters.
         :return: EpubFont instance, or None if invalid/unsupported.
         """
-        if not (font_path.exists() and font_path.is_file()):
+        h = digest or self._file_digest(font_path)
+        if not h:
             return None
-
-        h = hash_file(font_path)
         if h in self._font_map:
             return self._font_map[h]
 
-        data = font_path.read_bytes()
+        try:
+            data = font_path.read_bytes()
+        except OSError:
+            return None
         fmt = detect_font_format(data)
-        ext = fmt.lower() if fmt else font_path.suffix.lower().lstrip(".") or "bin"
+        target = self._subsetter.output_format(data, h) if self._subsetter else ""
+        ext = (
+            target
+            or (fmt.lower() if fmt else font_path.suffix.lower().lstrip("."))
+            or "bin"
+        )
 
         media_type = FONT_MEDIA_TYPES.get(ext)
         if not media_type:
@@ -253,7 +341,10 @@ def add_font(
             family=family_name,
             selectors=selectors,
         )
-        self.fonts.append(font)
+        if target:
+            self._subset_fonts[font.id] = (font, h, set())
+        else:
+            self._add_font(font)
         self.opf.add_manifest_item(
             font.id,
             f"{FONT_DIR}/{font.filename}",
@@ -286,7 +377,8 @@ def add_font_bytes(
             return self._font_map[h]
 
         fmt = detect_font_format(data)
-        ext = fmt.lower() if fmt else "bin"
+        target = self._subsetter.output_format(data, h) if self._subsetter else ""
+        ext = target or (fmt.lower() if fmt else "bin")
 
         media_type = FONT_MEDIA_TYPES.get(ext)
         if not media_type:
@@ -306,7 +398,10 @@ def add_font_bytes(
             family=family_name,
             selectors=selectors,
         )
-        self.fonts.append(font)
+        if target:
+            self._subset_fonts[font.id] = (font, h, set())
+        else:
+            self._add_font(font)
         self.opf.add_manifest_item(
             font.id,
             f"{FONT_DIR}/{font.filename}",
@@ -317,18 +412,45 @@ def add_font_bytes(
         return font
 
     def add_chapter(self, chap: EpubChapter) -> None:
-        self.items.append(chap)
+        """
+        Add a chapter; inside `start_volume` / `end_volume` it is nested
+        under that volume in the TOC.
+        """
+        self._add_item(chap)
         self.opf.add_manifest_item(
             chap.id,
             f"{TEXT_DIR}/{chap.filename}",
             chap.media_type,
         )
         self.opf.add_spine_item(chap.id)
-        self.nav.add_chapter(chap.id, chap.title, f"{TEXT_DIR}/{chap.filename}")
-        self.ncx.add_chapter(chap.id, chap.title, f"{TEXT_DIR}/{chap.filename}")
+        for font in chap.fonts:
+            if pending := self._subset_fonts.get(font.id):
+                chars = pending[2]
+                chars.update(chap.title)
+                chars.update(html.unescape(chap.content))
+                chars.update(html.unescape(chap.extra_content))
+        entry = (chap.id, chap.title, f"{TEXT_DIR}/{chap.filename}")
+        if self._vol_toc is not None:
+            self._vol_entries.append(entry)
+            return
+        self.nav.add_chapter(*entry)
+        self.ncx.add_chapter(*entry)
 
     def add_volume(self, volume: EpubVolume) -> None:
         """Add a volume cover, intro, and all its chapters to the EPUB."""
+        self.start_volume(volume)
+        for chap in volume.chapters:
+            self.add_chapter(chap)
+        self.end_volume()
+
+    def start_volume(self, volume: EpubVolume) -> None:
+        """
+        Add a volume cover and intro; chapters added until `end_volume`
+        belong to this volume (`volume.chapters` is ignored).
+        """
+        if self._vol_toc is not None:
+            self.end_volume()
+
         vol_id = f"vol_{self._vol_idx}"
         self._vol_idx += 1
 
@@ -350,7 +472,7 @@ def add_volume(self, volume: EpubVolume) -> None:
                 full_title=volume.title,
             )
 
-        self.items.append(vol_cover)
+        self._add_item(vol_cover)
         self.opf.add_manifest_item(
             vol_cover.id,
             f"{TEXT_DIR}/{vol_cover.filename}",
@@ -373,7 +495,7 @@ def add_volume(self, volume: EpubVolume) -> None:
                     title=volume.title,
                     description=volume.intro,
                 )
-            self.items.append(vol_intro)
+            self._add_item(vol_intro)
             self.opf.add_manifest_item(
                 vol_intro.id,
                 f"{TEXT_DIR}/{vol_intro.filename}",
@@ -381,47 +503,178 @@ def add_volume(self, volume: EpubVolume) -> None:
             )
             self.opf.add_spine_item(vol_intro.id)
 
-        # nested chapters
-        entries: list[tuple[str, str, str]] = []
-        for chap in volume.chapters:
-            self.items.append(chap)
-            self.opf.add_manifest_item(
-                chap.id,
-                f"{TEXT_DIR}/{chap.filename}",
-                chap.media_type,
-            )
-            self.opf.add_spine_item(chap.id)
-            entries.append((chap.id, chap.title, f"{TEXT_DIR}/{chap.filename}"))
-
-        # TOC updates
-        self.ncx.add_volume(
-            id=vol_cover.id,
-            label=volume.title,
-            src=f"{TEXT_DIR}/{vol_cover.filename}",
-            chapters=entries,
-        )
-        self.nav.add_volume(
-            id=vol_cover.id,
-            label=volume.title,
-            src=f"{TEXT_DIR}/{vol_cover.filename}",
-            chapters=entries,
+        self._vol_toc = (
+            vol_cover.id,
+            volume.title,
+            f"{TEXT_DIR}/{vol_cover.filename}",
         )
+        self._vol_entries = []
+
+    def end_volume(self) -> None:
+        """Close the volume opened by `start_volume` and add its TOC entries."""
+        if self._vol_toc is None:
+            return
+        vol_id, label, src = self._vol_toc
+        self.ncx.add_volume(id=vol_id, label=label, src=src, chapters=self._vol_entries)
+        self.nav.add_volume(id=vol_id, label=label, src=src, chapters=self._vol_entries)
+        self._vol_toc = None
+        self._vol_entries = []
 
-    def export(self, output_path: str | Path) -> Path:
+    def export(self, output_path: str | Path | None = None) -> Path:
         """
         Build and export the current book as an EPUB file.
 
-        :param output_path: Path to save the final .epub file.
+        :param output_path: Path to save the final .epub file; defaults to
+            `stream_to` when streaming.
         """
+        self.end_volume()
+        if self._zip is not None and self._stream_path is not None:
+            return self._finish_stream(Path(output_path or self._stream_path))
+        if output_path is None:
+            raise ValueError("output_path is required when not streaming")
         return self._build_epub(output_path=Path(output_path))
 
+    def close(self) -> None:
+        """
+        Discard an unfinished streamed archive; a no-op after `export()`.
+        """
+        self._close_previous()
+        if self._zip is None or self._stream_path is None:
+            return
+        self._zip.abort()
+        self._zip = None
+        with contextlib.suppress(OSError):
+            self._part_file(self._stream_path).unlink()
+
+    def _prepare_image(
+        self, data: bytes, digest: str
+    ) -> tuple[bytes | Future[bytes], str | None, str | None]:
+        """
+        Run an image through the transcoder, if any.
+
+        :return: The data to embed (or its future), the content key of a
+            transcoded image, and the output format.
+        """
+        if self._transcoder is not None:
+            prepared = self._transcoder.prepare(data, digest)
+            if prepared is not None:
+                fmt = prepared.fmt
+                if isinstance(prepared.data, bytes):
+                    # a failed transcode keeps the source format
+                    fmt = detect_image_format(prepared.data) or fmt
+                return prepared.data, prepared.key, fmt
+        # Try detecting from magic bytes
+        return data, None, detect_image_format(data)
+
+    def _track_transcode(self, img: EpubImage) -> None:
+        if isinstance(img.data, Future):
+            self._transcoding.append((img.data, img.id, img.media_type))
+            self._relabel_images(wait=False)
+
+    def _relabel_images(self, *, wait: bool) -> None:
+        """
+        Fix the media type of transcoded images that kept their source
+        format; their names are already referenced by chapters.
+
+        :param wait: Wait for running transcodes instead of skipping them.
+        """
+        running: list[tuple[Future[bytes], str, str]] = []
+        for future, img_id, media_type in self._transcoding:
+            if not wait and not future.done():
+                running.append((future, img_id, media_type))
+                continue
+            try:
+                data = future.result()
+            except Exception:
+                continue  # reported when the member is written
+            actual = IMAGE_MEDIA_TYPES.get(detect_image_format(data) or "")
+            if actual and actual != media_type:
+                self.opf.set_media_type(img_id, actual)
+        self._transcoding = running
+
+    @staticmethod
+    def _file_digest(path: Path) -> str:
+        """
+        Hash a file; returns '' if it is not a readable regular file.
+        """
+        try:
+            return hash_file(path) if path.is_file() else ""
+        except OSError:
+            return ""
+
+    @staticmethod
+    def _part_file(path: Path) -> Path:
+        return path.with_name(path.name + ".part")
+
+    def _new_writer(self, path: Path) -> ZipWriter:
+        return ZipWriter(
+            path, level=self._compress_level, workers=self._compress_workers
+        )
+
+    def _open_stream(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._stream_path = path
+        self._zip = self._new_writer(self._part_file(path))
+        self._write_header(self._zip)
+        self._write_style(self._zip)
+
+    def _finish_stream(self, output_path: Path) -> Path:
+        zf, stream_path = self._zip, self._stream_path
+        if zf is None or stream_path is None:
+            raise RuntimeError("EPUB stream is not open")
+        self._write_subset_fonts(zf)
+        self._relabel_images(wait=True)
+        self._write_documents(zf)
+        zf.close()
+        self._zip = None
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        self._close_previous()
+        os.replace(self._part_file(stream_path), output_path)
+        self._save_manifest(zf, output_path)
+        return output_path
+
+    def _close_previous(self) -> None:
+        if self._previous is not None:
+            self._previous.close()
+            self._previous = None
+
+    def _save_manifest(self, epub: ZipWriter, output_path: Path) -> None:
+        if self._manifest_path is None:
+            return
+        crcs = epub.crcs
+        manifest = ExportManifest(
+            archive=str(output_path.resolve()),
+            level=self._compress_level,
+            members={name: (h, crcs[name]) for name, h in self._hashes.items()},
+        )
+        manifest.save(self._manifest_path)
+
+    def _add_item(self, item: EpubXhtmlFile) -> None:
+        if self._zip is None:
+            self.items.append(item)
+            return
+        self._write_item(self._zip, item)
+
+    def _add_image(self, img: EpubImage) -> None:
+        if self._zip is None:
+            self.images.append(img)
+            return
+        self._write_image(self._zip, img)
+
+    def _add_font(self, font: EpubFont) -> None:
+        if self._zip is None:
+            self.fonts.append(font)
+            return
+        self._write_font(self._zip, font)
+        # chapters only need the face metadata of deduped fonts
+        font.data = b""
+
     def _init_cover(self, cover_path: Path | None) -> None:
         if not cover_path or not cover_path.is_file():
             return
 
         data = cover_path.read_bytes()
-        # Try detecting from magic bytes
-        fmt = detect_image_format(data)
+        payload, key, fmt = self._prepare_image(data, hash_bytes(data))
         ext = fmt.lower() if fmt else cover_path.suffix.lower().lstrip(".")
 
         mtype = IMAGE_MEDIA_TYPES.get(ext)
@@ -430,11 +683,13 @@ def _init_cover(self, cover_path: Path | None) -> None:
 
         cover_img = EpubImage(
             id="cover-img",
-            data=data,
+            data=payload,
             media_type=mtype,
             filename=f"cover.{ext}",
+            digest=key,
         )
-        self.images.append(cover_img)
+        self._track_transcode(cover_img)
+        self._add_image(cover_img)
         self.opf.add_manifest_item(
             cover_img.id,
             f"{IMAGE_DIR}/{cover_img.filename}",
@@ -443,7 +698,7 @@ def _init_cover(self, cover_path: Path | None) -> None:
         )
 
         cover_item = EpubCover(ext=ext)
-        self.items.append(cover_item)
+        self._add_item(cover_item)
         self.opf.add_manifest_item(
             cover_item.id,
             f"{TEXT_DIR}/{cover_item.filename}",
@@ -467,56 +722,132 @@ def _build_epub(self, output_path: Path) -> Path:
         """
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        with zipfile.ZipFile(output_path, "w") as epub:
-            # must be first and uncompressed
-            epub.writestr(
-                "mimetype",
-                "application/epub+zip",
-                compress_type=ZIP_STORED,
-            )
+        # written aside, as the previous export may be at the same path
+        part_path = self._part_file(output_path)
+        try:
+            with self._new_writer(part_path) as epub:
+                self._write_header(epub)
+                # subset fonts and transcoded images may change media types
+                self._write_subset_fonts(epub)
+                self._relabel_images(wait=True)
+                self._write_documents(epub)
+                self._write_style(epub)
+
+                for item in self.items:
+                    self._write_item(epub, item)
+                for img in self.images:
+                    self._write_image(epub, img)
+                for font in self.fonts:
+                    self._write_font(epub, font)
+        except BaseException:
+            self._close_previous()
+            with contextlib.suppress(OSError):
+                part_path.unlink()
+            raise
+
+        self._close_previous()
+        os.replace(part_path, output_path)
+        self._save_manifest(epub, output_path)
+        return output_path
 
-            # container.xml
-            epub.writestr(
-                "META-INF/container.xml",
-                CONTAINER_TEMPLATE,
-                compress_type=ZIP_DEFLATED,
-            )
+    def _write_header(self, epub: ZipWriter) -> None:
+        """
+        Write the mimetype and container.xml entries.
+        """
+        # must be first and uncompressed
+        self._write(epub, "mimetype", "application/epub+zip", compress=False)
+        self._write(epub, "META-INF/container.xml", CONTAINER_TEMPLATE)
 
-            # core documents
-            epub.writestr(
-                f"{ROOT_PATH}/nav.xhtml",
-                self.nav.to_xhtml(),
-                compress_type=ZIP_DEFLATED,
-            )
-            epub.writestr(
-                f"{ROOT_PATH}/toc.ncx",
-                self.ncx.to_xml(),
-                compress_type=ZIP_DEFLATED,
-            )
-            epub.writestr(
-                f"{ROOT_PATH}/content.opf",
-                self.opf.to_xml(),
-                compress_type=ZIP_DEFLATED,
-            )
+    def _write_style(self, epub: ZipWriter) -> None:
+        style_text = EPUB_CSS_STYLE_PATH.read_text("utf-8")
+        self._write(epub, f"{ROOT_PATH}/{CSS_DIR}/style.css", style_text)
 
-            # stylesheets
-            style_text = EPUB_CSS_STYLE_PATH.read_text("utf-8")
-            path = f"{ROOT_PATH}/{CSS_DIR}/style.css"
-            epub.writestr(path, style_text, compress_type=ZIP_DEFLATED)
+    def _write_documents(self, epub: ZipWriter) -> None:
+        """
+        Write nav.xhtml, toc.ncx and content.opf.
+        """
+        self._write(epub, f"{ROOT_PATH}/nav.xhtml", self.nav.to_xhtml())
+        self._write(epub, f"{ROOT_PATH}/toc.ncx", self.ncx.to_xml())
+        self._write(epub, f"{ROOT_PATH}/content.opf", self.opf.to_xml())
+
+    def _write_item(self, epub: ZipWriter, item: EpubXhtmlFile) -> None:
+        self._write(epub, f"{ROOT_PATH}/{TEXT_DIR}/{item.filename}", item.to_xhtml())
+
+    def _write_image(self, epub: ZipWriter, img: EpubImage) -> None:
+        # already-compressed formats are stored rather than deflated again
+        self._write(
+            epub,
+            f"{ROOT_PATH}/{IMAGE_DIR}/{img.filename}",
+            img.data,
+            compress=img.media_type not in PRECOMPRESSED_MEDIA_TYPES,
+            digest=img.digest,
+        )
 
-            # items
-            for item in self.items:
-                path = f"{ROOT_PATH}/{TEXT_DIR}/{item.filename}"
-                epub.writestr(path, item.to_xhtml(), compress_type=ZIP_DEFLATED)
+    def _write_font(self, epub: ZipWriter, font: EpubFont) -> None:
+        self._write(
+            epub,
+            f"{ROOT_PATH}/{FONT_DIR}/{font.filename}",
+            font.data,
+            compress=font.media_type not in PRECOMPRESSED_MEDIA_TYPES,
+        )
 
-            # images
-            for img in self.images:
-                path = f"{ROOT_PATH}/{IMAGE_DIR}/{img.filename}"
-                epub.writestr(path, img.data, compress_type=ZIP_DEFLATED)
+    def _write_subset_fonts(self, epub: ZipWriter) -> None:
+        """
+        Subset the held-back fonts to the characters they render and write them.
+        """
+        if self._subsetter is None:
+            return
+        subsetter = self._subsetter
+        jobs = [
+            (font, *subsetter.subset(font.data, digest, "".join(chars)))
+            for font, digest, chars in self._subset_fonts.values()
+        ]
+        for font, result, key in jobs:
+            font.data = b""
+            data = result.result() if isinstance(result, Future) else result
+            # last resort: the whole-font conversion failed too
+            actual = FONT_MEDIA_TYPES.get(detect_font_format(data) or "")
+            if actual and actual != font.media_type:
+                font.media_type = actual
+                self.opf.set_media_type(font.id, actual)
+            self._write(
+                epub,
+                f"{ROOT_PATH}/{FONT_DIR}/{font.filename}",
+                data,
+                compress=font.media_type not in PRECOMPRESSED_MEDIA_TYPES,
+                digest=key,
+            )
+        self._subset_fonts.clear()
 
-            # fonts
-            for font in self.fonts:
-                path = f"{ROOT_PATH}/{FONT_DIR}/{font.filename}"
-                epub.writestr(path, font.data, compress_type=ZIP_DEFLATED)
+    def _write(
+        self,
+        epub: ZipWriter,
+        name: str,
+        data: str | bytes | Future[bytes],
+        *,
+        compress: bool = True,
+        digest: str | None = None,
+    ) -> None:
+        """
+        Add a member, copying it from the previous export if unchanged.
 
-        return output_path
+        :param digest: Content key to record instead of the hash of `data`.
+        """
+        if self._manifest_path is None:
+            epub.write(name, data, compress=compress)
+            return
+
+        if digest is None:
+            if isinstance(data, Future):
+                data = data.result()
+            elif isinstance(data, str):
+                data = data.encode("utf-8")
+            digest = hash_bytes(data)
+        self._hashes[name] = digest
+        if self._previous is not None:
+            member = self._previous.get(name, digest)
+            if member is not None:
+                epub.write_member(member)
+                self.reused_members += 1
+                return
+        epub.write(name, data, compress=compress)
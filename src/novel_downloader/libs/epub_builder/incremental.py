@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+novel_downloader.libs.epub_builder.incremental
+----------------------------------------------
+
+Reuse of unchanged members from a previous export.
+
+An export manifest records, for every member of the archive, the hash of
+its uncompressed content and its CRC-32. On the next build, a member whose
+content hash is unchanged is copied from the previous archive as stored,
+so only new or changed members are compressed again.
+"""
+
+from __future__ import annotations
+
+__all__ = ["ExportManifest", "PreviousArchive"]
+
+import json
+import struct
+import zipfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import BinaryIO
+
+from novel_downloader.libs.filesystem import write_file
+
+from .zip_writer import ZipMember
+
+_MANIFEST_VERSION = 1
+_LOCAL_HEADER = struct.Struct("<IHHHHHIIIHH")
+
+
+@dataclass(slots=True)
+class ExportManifest:
+    """
+    Member hashes of an exported archive.
+
+    :param archive: Path of the archive the manifest describes.
+    :param level: Deflate level the archive was written with.
+    :param members: Member name -> (content hash, CRC-32).
+    """
+
+    archive: str
+    level: int
+    members: dict[str, tuple[str, int]] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: Path) -> ExportManifest | None:
+        """
+        Read a manifest; returns None if it is missing or unreadable.
+        """
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            if data.get("version") != _MANIFEST_VERSION:
+                return None
+            members = {
+                name: (str(digest), int(crc))
+                for name, (digest, crc) in data["members"].items()
+            }
+            return cls(str(data["archive"]), int(data["level"]), members)
+        except (OSError, ValueError, TypeError, KeyError):
+            return None
+
+    def save(self, path: Path) -> None:
+        payload = {
+            "version": _MANIFEST_VERSION,
+            "archive": self.archive,
+            "level": self.level,
+            "members": self.members,
+        }
+        write_file(json.dumps(payload, ensure_ascii=False), path)
+
+
+class PreviousArchive:
+    """
+    Raw access to the members of the archive a manifest describes.
+    """
+
+    def __init__(self, manifest: ExportManifest, fp: BinaryIO) -> None:
+        self._manifest = manifest
+        self._fp = fp
+        with zipfile.ZipFile(fp) as zf:
+            self._infos = {info.filename: info for info in zf.infolist()}
+
+    @classmethod
+    def open(cls, manifest: ExportManifest) -> PreviousArchive | None:
+        """
+        Open the manifest's archive; returns None if it is gone or invalid.
+        """
+        try:
+            fp = open(manifest.archive, "rb")  # noqa: SIM115
+        except OSError:
+            return None
+        try:
+            return cls(manifest, fp)
+        except (OSError, zipfile.BadZipFile):
+            fp.close()
+            return None
+
+    def get(self, name: str, digest: str) -> ZipMember | None:
+        """
+        Return the stored member `name` if its content hash is `digest`.
+        """
+        entry = self._manifest.members.get(name)
+        info = self._infos.get(name)
+        # the CRC check catches an archive rewritten since the manifest
+        if entry is None or info is None or entry != (digest, info.CRC):
+            return None
+        if info.compress_type not in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED):
+            return None
+
+        fp = self._fp
+        fp.seek(info.header_offset)
+        header = fp.read(_LOCAL_HEADER.size)
+        if len(header) != _LOCAL_HEADER.size:
+            return None
+        fields = _LOCAL_HEADER.unpack(header)
+        if fields[0] != 0x04034B50:
+            return None
+        fp.seek(fields[9] + fields[10], 1)
+        payload = fp.read(info.compress_size)
+        if len(payload) != info.compress_size:
+            return None
+        return ZipMember(name, info.compress_type, info.CRC, info.file_size, payload)
+
+    def close(self) -> None:
+        self._fp.close()
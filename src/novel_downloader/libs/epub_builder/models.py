@@ -8,6 +8,8 @@
 
 from __future__ import annotations
 
+import re
+from concurrent.futures import Future
 from dataclasses import dataclass, field
 from pathlib import Path
 
@@ -56,7 +58,9 @@ class EpubResource:
 
 @dataclass(slots=True)
 class EpubImage(EpubResource):
-    data: bytes
+    data: bytes | Future[bytes]
+    # identifies transcoded content for incremental exports
+    digest: str | None = None
 
 
 @dataclass(slots=True)
@@ -495,6 +499,18 @@ def add_manifest_item(
         if media_type == "application/x-dtbncx+xml":
             self._toc_item_id = id
 
+    def set_media_type(self, id: str, media_type: str) -> None:
+        """
+        Change the media type of a manifest item added earlier.
+        """
+        prefix = f'<item id="{id}" '
+        for i, line in enumerate(self.manifest_lines):
+            if line.startswith(prefix):
+                self.manifest_lines[i] = re.sub(
+                    r'media-type="[^"]*"', f'media-type="{media_type}"', line
+                )
+                return
+
     def add_spine_item(
         self,
         idref: str,
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+novel_downloader.libs.epub_builder.zip_writer
+---------------------------------------------
+
+Minimal ZIP writer with parallel deflate.
+
+Members are deflated in a thread pool (zlib releases the GIL) and written
+in the order they were added, so the archive does not depend on which
+compression finishes first. Members can also be added already compressed,
+e.g. copied raw from a previous archive, or as a future of their data.
+"""
+
+from __future__ import annotations
+
+__all__ = ["ZipMember", "ZipWriter", "deflate_member"]
+
+import struct
+import time
+import types
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Self
+from zipfile import ZIP_DEFLATED, ZIP_STORED
+
+# Sizes, offsets and counts from here on need ZIP64 records
+_ZIP64_LIMIT = 0xFFFFFFFF
+_ZIP64_COUNT_LIMIT = 0xFFFF
+# Field values telling readers to look in the ZIP64 records instead
+_ZIP64_MARKER = 0xFFFFFFFF
+_ZIP64_COUNT_MARKER = 0xFFFF
+
+_LOCAL_HEADER = struct.Struct("<IHHHHHIIIHH")
+_CENTRAL_HEADER = struct.Struct("<IHHHHHHIIIHHHHHII")
+_END_RECORD = struct.Struct("<IHHHHIIH")
+_END_RECORD64 = struct.Struct("<IQHHIIQQQQ")
+_END_LOCATOR64 = struct.Struct("<IIQI")
+
+_UTF8_FLAG = 0x800
+
+
+@dataclass(slots=True)
+class ZipMember:
+    """
+    A member as stored in the archive.
+
+    :param payload: Member data after compression (`method`).
+    :param crc: CRC-32 of the uncompressed data.
+    :param size: Uncompressed size.
+    """
+
+    name: str
+    method: int
+    crc: int
+    size: int
+    payload: bytes
+
+
+def deflate_member(name: str, data: bytes, level: int) -> ZipMember:
+    """
+    Compress `data` with raw deflate; data that does not shrink is stored.
+    """
+    crc = zlib.crc32(data)
+    if level == 0:
+        return ZipMember(name, ZIP_STORED, crc, len(data), data)
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    payload = compressor.compress(data) + compressor.flush()
+    if len(payload) >= len(data):
+        return ZipMember(name, ZIP_STORED, crc, len(data), data)
+    return ZipMember(name, ZIP_DEFLATED, crc, len(data), payload)
+
+
+class ZipWriter:
+    """
+    Write a ZIP archive member by member.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        level: int = zlib.Z_DEFAULT_COMPRESSION,
+        workers: int = 1,
+        date_time: tuple[int, int, int, int, int, int] | None = None,
+    ) -> None:
+        """
+        :param path: Archive path (created or truncated).
+        :param level: Deflate level, 0 (store) to 9.
+        :param workers: Compression threads; 1 compresses inline.
+        :param date_time: Timestamp of all members; defaults to now.
+        """
+        self._fp = open(path, "wb")  # noqa: SIM115
+        self._offset = 0
+        self._level = level
+        self._pool = ThreadPoolExecutor(workers) if workers > 1 else None
+        # bounds the number of compressed members held in memory
+        self._max_pending = max(1, workers) * 4
+        self._pending: deque[Future[ZipMember] | ZipMember] = deque()
+        # name, flags, method, crc, size, compressed size, header offset
+        self._central: list[tuple[bytes, int, int, int, int, int, int]] = []
+
+        y, mo, d, h, mi, s = date_time or time.localtime()[:6]
+        self._dos_time = (h << 11) | (mi << 5) | (s // 2)
+        self._dos_date = ((max(y, 1980) - 1980) << 9) | (mo << 5) | d
+
+    def write(
+        self,
+        name: str,
+        data: bytes | str | Future[bytes],
+        *,
+        compress: bool = True,
+    ) -> None:
+        """
+        Add a member; `str` data is encoded as UTF-8.
+
+        :param data: Member data, or a future of it; later members are
+            still written in order once it resolves.
+        :param compress: False to store the data as is (e.g. JPEG images).
+        """
+        if isinstance(data, Future):
+            self._enqueue(self._deferred(name, data, compress))
+            return
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        if not compress or self._level == 0:
+            self._enqueue(
+                ZipMember(name, ZIP_STORED, zlib.crc32(data), len(data), data)
+            )
+        elif self._pool is not None:
+            self._enqueue(self._pool.submit(deflate_member, name, data, self._level))
+        else:
+            self._enqueue(deflate_member(name, data, self._level))
+
+    def write_member(self, member: ZipMember) -> None:
+        """
+        Add a member whose payload is already compressed.
+        """
+        self._enqueue(member)
+
+    @property
+    def crcs(self) -> dict[str, int]:
+        """
+        CRC-32 of each member written so far (all of them after `close()`).
+        """
+        return {name.decode("utf-8"): crc for name, _, _, crc, *_ in self._central}
+
+    def close(self) -> None:
+        """
+        Write the pending members and the central directory.
+        """
+        if self._fp.closed:
+            return
+        try:
+            while self._pending:
+                item = self._pending.popleft()
+                self._write_member(item.result() if isinstance(item, Future) else item)
+            self._write_central_directory()
+        finally:
+            self._shutdown()
+
+    def abort(self) -> None:
+        """
+        Stop writing; the file is left incomplete.
+        """
+        for item in self._pending:
+            if isinstance(item, Future):
+                item.cancel()
+        self._pending.clear()
+        self._shutdown()
+
+    def _deferred(
+        self, name: str, data: Future[bytes], compress: bool
+    ) -> Future[ZipMember]:
+        level = self._level if compress else 0
+        member: Future[ZipMember] = Future()
+
+        def _done(fut: Future[bytes]) -> None:
+            if not member.set_running_or_notify_cancel():
+                return  # aborted
+            try:
+                member.set_result(deflate_member(name, fut.result(), level))
+            except BaseException as e:
+                member.set_exception(e)
+
+        data.add_done_callback(_done)
+        return member
+
+    def _shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+        self._fp.close()
+
+    def _enqueue(self, item: Future[ZipMember] | ZipMember) -> None:
+        pending = self._pending
+        pending.append(item)
+        # write finished members in order; wait for the oldest when full
+        while pending:
+            head = pending[0]
+            if isinstance(head, Future):
+                if not head.done() and len(pending) <= self._max_pending:
+                    break
+                head = head.result()
+            pending.popleft()
+            self._write_member(head)
+
+    def _write_member(self, member: ZipMember) -> None:
+        name = member.name.encode("utf-8")
+        flags = 0 if member.name.isascii() else _UTF8_FLAG
+        csize = len(member.payload)
+        zip64 = member.size >= _ZIP64_LIMIT or csize >= _ZIP64_LIMIT
+
+        extra = struct.pack("<HHQQ", 1, 16, member.size, csize) if zip64 else b""
+        header = _LOCAL_HEADER.pack(
+            0x04034B50,
+            45 if zip64 else 20,
+            flags,
+            member.method,
+            self._dos_time,
+            self._dos_date,
+            member.crc,
+            _ZIP64_MARKER if zip64 else csize,
+            _ZIP64_MARKER if zip64 else member.size,
+            len(name),
+            len(extra),
+        )
+        self._fp.write(header + name + extra)
+        self._fp.write(member.payload)
+
+        self._central.append(
+            (name, flags, member.method, member.crc, member.size, csize, self._offset)
+        )
+        self._offset += len(header) + len(name) + len(extra) + csize
+
+    def _write_central_directory(self) -> None:
+        cd_offset = self._offset
+        for name, flags, method, crc, size, csize, offset in self._central:
+            fields: list[int] = []
+            if size >= _ZIP64_LIMIT:
+                fields.append(size)
+                size = _ZIP64_MARKER
+            if csize >= _ZIP64_LIMIT:
+                fields.append(csize)
+                csize = _ZIP64_MARKER
+            if offset >= _ZIP64_LIMIT:
+                fields.append(offset)
+                offset = _ZIP64_MARKER
+            extra = (
+                struct.pack(f"<HH{len(fields)}Q", 1, 8 * len(fields), *fields)
+                if fields
+                else b""
+            )
+            version = 45 if fields else 20
+            record = _CENTRAL_HEADER.pack(
+                0x02014B50,
+                version,
+                version,
+                flags,
+                method,
+                self._dos_time,
+                self._dos_date,
+                crc,
+                csize,
+                size,
+                len(name),
+                len(extra),
+                0,
+                0,
+                0,
+                0,
+                offset,
+            )
+            self._fp.write(record + name + extra)
+            self._offset += len(record) + len(name) + len(extra)
+
+        count = len(self._central)
+        cd_size = self._offset - cd_offset
+        if (
+            count >= _ZIP64_COUNT_LIMIT
+            or cd_offset >= _ZIP64_LIMIT
+            or cd_size >= _ZIP64_LIMIT
+        ):
+            end64_offset = self._offset
+            self._fp.write(
+                _END_RECORD64.pack(
+                    0x06064B50, 44, 45, 45, 0, 0, count, count, cd_size, cd_offset
+                )
+            )
+            self._fp.write(_END_LOCATOR64.pack(0x07064B50, 0, end64_offset, 1))
+            count = min(count, _ZIP64_COUNT_MARKER)
+            cd_size = min(cd_size, _ZIP64_MARKER)
+            cd_offset = min(cd_offset, _ZIP64_MARKER)
+
+        self._fp.write(
+            _END_RECORD.pack(0x06054B50, 0, 0, count, count, cd_size, cd_offset, 0)
+        )
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        tb: types.TracebackType | None,
+    ) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
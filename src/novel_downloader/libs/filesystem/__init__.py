@@ -7,6 +7,8 @@
 """
 
 __all__ = [
+    "COMPRESSION_SUFFIXES",
+    "AtomicTextWriter",
     "format_filename",
     "font_filename",
     "image_filename",
@@ -14,6 +16,6 @@
     "write_file",
 ]
 
-from .file import write_file
+from .file import COMPRESSION_SUFFIXES, AtomicTextWriter, write_file
 from .filename import font_filename, format_filename, image_filename
 from .sanitize import sanitize_filename
@@ -6,14 +6,21 @@
 File I/O utilities for reading and writing data.
 """
 
-__all__ = ["write_file"]
+__all__ = ["COMPRESSION_SUFFIXES", "AtomicTextWriter", "write_file"]
 
+import contextlib
+import gzip
+import io
 import tempfile
+import types
 from pathlib import Path
-from typing import Literal
+from typing import IO, Literal, Self, cast
 
 from .sanitize import sanitize_filename
 
+#: Supported on-the-fly compressions -> file name suffix
+COMPRESSION_SUFFIXES: dict[str, str] = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+
 
 def write_file(
     content: str | bytes,
@@ -56,3 +63,113 @@ def write_file(
         if tmp_path and tmp_path.exists():
             tmp_path.unlink(missing_ok=True)
         raise
+
+
+class AtomicTextWriter:
+    """
+    Stream text into a temporary file that replaces `filepath` on commit.
+
+    Output can be compressed on the fly with gzip or zstd (the latter needs
+    Python 3.14+ or the `zstandard` package).
+    """
+
+    def __init__(
+        self,
+        filepath: Path,
+        *,
+        compression: str = "none",
+        encoding: str = "utf-8",
+    ) -> None:
+        """
+        :param filepath: Destination path (sanitized like `write_file`).
+        :param compression: One of `COMPRESSION_SUFFIXES`.
+        :raises ValueError: If the compression is unknown.
+        :raises ImportError: If zstd is requested but unavailable.
+        """
+        if compression not in COMPRESSION_SUFFIXES:
+            raise ValueError(f"Unsupported compression: {compression!r}")
+
+        self.path = filepath.with_name(sanitize_filename(filepath.name))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._raw = tempfile.NamedTemporaryFile(  # noqa: SIM115
+            mode="wb", delete=False, dir=self.path.parent
+        )
+        self._tmp_path = Path(self._raw.name)
+        try:
+            self._stream = _open_compressed(self._raw, compression)
+            self._text = io.TextIOWrapper(
+                self._stream, encoding=encoding, newline="\n", write_through=False
+            )
+        except BaseException:
+            self.discard()
+            raise
+        self._done = False
+
+    def write(self, text: str) -> None:
+        self._text.write(text)
+
+    def commit(self) -> Path:
+        """
+        Flush everything and move the file into place.
+        """
+        self._text.close()
+        if self._stream is not self._raw:
+            self._stream.close()
+        self._raw.close()
+        self._tmp_path.replace(self.path)
+        self._done = True
+        return self.path
+
+    def discard(self) -> None:
+        """
+        Drop the temporary file; a no-op after `commit()`.
+        """
+        if getattr(self, "_done", False):
+            return
+        self._done = True
+        for fp in (getattr(self, "_text", None), getattr(self, "_stream", None)):
+            if fp is not None:
+                with contextlib.suppress(Exception):
+                    fp.close()
+        self._raw.close()
+        self._tmp_path.unlink(missing_ok=True)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        tb: types.TracebackType | None,
+    ) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.discard()
+
+
+def _open_compressed(raw: IO[bytes], compression: str) -> IO[bytes]:
+    """
+    Wrap `raw` in a compressing writer; closing it leaves `raw` open.
+    """
+    if compression == "gzip":
+        return cast(IO[bytes], gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6))
+    if compression == "zstd":
+        try:
+            from compression import zstd
+
+            return cast(IO[bytes], zstd.ZstdFile(raw, mode="wb"))
+        except ImportError:
+            pass
+        try:
+            import zstandard
+        except ImportError as e:
+            raise ImportError(
+                "zstd output requires Python 3.14+ or the 'zstandard' package:\n"
+                "    pip install zstandard"
+            ) from e
+        writer = zstandard.ZstdCompressor().stream_writer(raw, closefd=False)
+        return cast(IO[bytes], writer)
+    return raw
@@ -8,6 +8,7 @@
 from pathlib import Path
 
 import numpy as np
+from fontTools import subset
 from fontTools.ttLib import TTFont
 from numpy.typing import NDArray
 from PIL import Image, ImageDraw, ImageFont
@@ -171,3 +172,53 @@ def extract_font_charset_bytes(font_bytes: bytes) -> set[str]:
             except ValueError:
                 continue
     return charset
+
+
+def font_is_readable(font_bytes: bytes) -> bool:
+    """
+    Check that fontTools can decompile every table of a font.
+
+    :param font_bytes: Raw TTF/OTF/WOFF/WOFF2 font data as bytes.
+    """
+    try:
+        with TTFont(io.BytesIO(font_bytes), lazy=False) as font_ttf:
+            font_ttf.ensureDecompiled()
+    except Exception:
+        return False
+    return True
+
+
+def subset_font(
+    font_bytes: bytes, text: str | None, *, flavor: str | None = None
+) -> bytes:
+    """
+    Keep only the glyphs a font needs to render `text`.
+
+    Layout features, names and hinting are kept; characters the font does
+    not cover are ignored.
+
+    :param font_bytes: Raw TTF/OTF/WOFF/WOFF2 font data as bytes.
+    :param text: Characters to keep; None keeps every glyph and only
+        changes the container.
+    :param flavor: Output container, 'woff' or 'woff2'; None keeps the
+        container of the source font.
+    :return: The resulting font as bytes.
+    """
+    with TTFont(io.BytesIO(font_bytes), recalcTimestamp=False) as font_ttf:
+        if text is not None:
+            options = subset.Options()
+            options.layout_features = ["*"]
+            options.name_IDs = ["*"]
+            options.name_languages = ["*"]
+            options.notdef_outline = True
+            options.glyph_names = True
+            options.ignore_missing_glyphs = True
+            options.ignore_missing_unicodes = True
+
+            subsetter = subset.Subsetter(options)
+            subsetter.populate(text=text)
+            subsetter.subset(font_ttf)
+        font_ttf.flavor = flavor or font_ttf.flavor
+        buf = io.BytesIO()
+        font_ttf.save(buf)
+    return buf.getvalue()
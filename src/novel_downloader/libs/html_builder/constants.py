@@ -10,6 +10,9 @@
 MEDIA_DIR = "media"
 FONT_DIR = "fonts"
 
+# content hashes of the exported files, kept in the export directory
+MANIFEST_FILENAME = "_manifest.json"
+
 IMAGE_MEDIA_EXTS: dict[str, str] = {
     "image/png": "png",
     "image/jpeg": "jpg",
@@ -2,8 +2,18 @@
 """
 novel_downloader.libs.html_builder.core
 ---------------------------------------
+
+Builds a static HTML site (index, chapter pages, media and fonts) for a book.
+
+Exports into an existing folder only rewrite files whose content changed and
+remove files a previous export wrote that the book no longer has.
+
+With a `font_subsetter`, fonts are cut down on export to the characters of
+the chapters that reference them.
 """
 
+import html
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 
 from novel_downloader.infra.paths import (
@@ -12,9 +22,10 @@
     HTML_JS_MAIN_PATH,
 )
 from novel_downloader.libs.crypto.hash_utils import hash_bytes, hash_file
-from novel_downloader.libs.filesystem import sanitize_filename, write_file
+from novel_downloader.libs.filesystem import sanitize_filename
 from novel_downloader.libs.media.font import detect_font_format
 from novel_downloader.libs.media.image import detect_image_format
+from novel_downloader.libs.media.subset import FontSubsetter
 
 from .constants import (
     CHAPTER_DIR,
@@ -24,6 +35,7 @@
     JS_DIR,
     MEDIA_DIR,
 )
+from .incremental import DirectorySync
 from .models import HtmlChapter, HtmlFont, HtmlImage, HtmlVolume, IndexDocument
 
 
@@ -38,7 +50,18 @@ def __init__(
         serial_status: str = "",
         word_count: str = "0",
         language: str = "zh-Hans",
+        *,
+        workers: int = 1,
+        font_subsetter: FontSubsetter | None = None,
     ) -> None:
+        """
+        :param workers: Threads rendering and writing chapter files on export.
+        :param font_subsetter: Subsets fonts to the characters they render;
+            the caller owns it and closes it after `export()`.
+        """
+        self._workers = max(1, workers)
+        self._subsetter = font_subsetter
+
         # metadata
         self.title = title
         self.lang = language
@@ -69,22 +92,30 @@ def __init__(
         self.fonts: list[HtmlFont] = []
         self._font_map: dict[str, HtmlFont] = {}
         self._font_idx = 0
+        # fonts to subset on export: filename -> (source digest, characters)
+        self._subset_fonts: dict[str, tuple[str, set[str]]] = {}
 
         self._vol_idx = 0
 
         self._chapters: list[HtmlChapter] = []  # flattened reading order
 
-    def add_image(self, image_path: Path) -> str:
+    def add_image(self, image_path: Path, *, digest: str | None = None) -> str:
         """
         Add an image resource (deduped by hash) and register it.
+
+        :param digest: SHA-256 of the file if already known; the file is
+            then only read when its content is new to the book.
         """
-        if not (image_path.exists() and image_path.is_file()):
+        h = digest or self._file_digest(image_path)
+        if not h:
             return ""
-        h = hash_file(image_path)
         if h in self._img_map:
             return self._img_map[h]
 
-        data = image_path.read_bytes()
+        try:
+            data = image_path.read_bytes()
+        except OSError:
+            return ""
         # Try detecting from magic bytes
         fmt = detect_image_format(data)
         ext = fmt.lower() if fmt else image_path.suffix.lower().lstrip(".") or "bin"
@@ -123,6 +154,7 @@ def add_font(
         self,
         font_path: Path,
         *,
+        digest: str | None = None,
         family: str | None = None,
         selectors: tuple[str, ...] = (),
     ) -> HtmlFont | None:
@@ -130,20 +162,28 @@ def add_font(
         Add a font from a file (deduped by hash) and return a HtmlFont.
 
         :param font_path: Path to the font file.
+        :param digest: SHA-256 of the file if already known.
         :param family: CSS font-family name to use.
         :param selectors: CSS selectors this font should apply to.
         :return: HtmlFont instance, or None if the path is invalid.
         """
-        if not (font_path.exists() and font_path.is_file()):
+        h = digest or self._file_digest(font_path)
+        if not h:
             return None
-
-        h = hash_file(font_path)
         if h in self._font_map:
             return self._font_map[h]
 
-        data = font_path.read_bytes()
+        try:
+            data = font_path.read_bytes()
+        except OSError:
+            return None
         fmt = detect_font_format(data)
-        ext = fmt.lower() if fmt else font_path.suffix.lower().lstrip(".") or "bin"
+        target = self._subsetter.output_format(data, h) if self._subsetter else ""
+        ext = (
+            target
+            or (fmt.lower() if fmt else font_path.suffix.lower().lstrip("."))
+            or "bin"
+        )
 
         family_name = family or f"FontFamily_{self._font_idx}"
         filename = f"font_{self._font_idx}.{ext}"
@@ -155,6 +195,8 @@ def add_font(
             selectors=selectors,
         )
         self.fonts.append(font)
+        if target:
+            self._subset_fonts[filename] = (h, set())
         self._font_map[h] = font
         self._font_idx += 1
         return font
@@ -182,7 +224,8 @@ def add_font_bytes(
             return self._font_map[h]
 
         fmt = detect_font_format(data)
-        ext = fmt.lower() if fmt else "bin"
+        target = self._subsetter.output_format(data, h) if self._subsetter else ""
+        ext = target or (fmt.lower() if fmt else "bin")
 
         family_name = family or f"FontFamily_{self._font_idx}"
         filename = f"font_{self._font_idx}.{ext}"
@@ -194,6 +237,8 @@ def add_font_bytes(
             selectors=selectors,
         )
         self.fonts.append(font)
+        if target:
+            self._subset_fonts[filename] = (h, set())
         self._font_map[h] = font
         self._font_idx += 1
         return font
@@ -204,6 +249,7 @@ def add_chapter(self, chap: HtmlChapter) -> None:
         """
         self._chapters.append(chap)
         self._index.add_chapter(chap)
+        self._track_glyphs(chap)
 
     def add_volume(self, volume: HtmlVolume) -> None:
         """Add a volume and all its chapters to the HTML."""
@@ -212,6 +258,7 @@ def add_volume(self, volume: HtmlVolume) -> None:
 
         for chap in volume.chapters:
             self._chapters.append(chap)
+            self._track_glyphs(chap)
 
     def export(
         self,
@@ -230,79 +277,104 @@ def export(
             folder=folder,
         )
 
-    def _prepare_output_dir(self, html_dir: Path) -> None:
-        css_dir = html_dir / CSS_DIR
-        css_dir.mkdir(parents=True, exist_ok=True)
-        index_css = HTML_CSS_INDEX_PATH.read_bytes()
-        write_file(index_css, css_dir / "index.css")
-        chapter_css = HTML_CSS_CHAPTER_PATH.read_bytes()
-        write_file(chapter_css, css_dir / "chapter.css")
-        js_dir = html_dir / JS_DIR
-        js_dir.mkdir(parents=True, exist_ok=True)
-        main_js = HTML_JS_MAIN_PATH.read_bytes()
-        write_file(main_js, js_dir / "main.js")
-
-    def _write_media(self, html_dir: Path) -> None:
+    @staticmethod
+    def _file_digest(path: Path) -> str:
         """
-        Write all referenced images and the cover image (if any) into /media.
+        Hash a file; returns '' if it is not a readable regular file.
         """
-        media_dir = html_dir / MEDIA_DIR
-        # Write chapter images
-        if self.images:
-            media_dir.mkdir(parents=True, exist_ok=True)
-            for img in self.images:
-                write_file(img.data, media_dir / img.filename)
-
-        # Write cover image as media/cover.xxx
-        if self.cover and self._cover_filename:
-            media_dir.mkdir(parents=True, exist_ok=True)
-            write_file(self.cover, media_dir / self._cover_filename)
+        try:
+            return hash_file(path) if path.is_file() else ""
+        except OSError:
+            return ""
 
-    def _write_fonts(self, html_dir: Path) -> None:
+    def _track_glyphs(self, chap: HtmlChapter) -> None:
+        """
+        Record the characters a chapter renders with each font to subset.
         """
-        Write all referenced fonts into /fonts.
+        for font in chap.fonts:
+            if pending := self._subset_fonts.get(font.filename):
+                chars = pending[1]
+                chars.update(chap.title)
+                chars.update(html.unescape(chap.content))
+                chars.update(html.unescape(chap.extra_content))
+
+    def _asset_files(self) -> list[tuple[str, bytes]]:
+        return [
+            (f"{CSS_DIR}/index.css", HTML_CSS_INDEX_PATH.read_bytes()),
+            (f"{CSS_DIR}/chapter.css", HTML_CSS_CHAPTER_PATH.read_bytes()),
+            (f"{JS_DIR}/main.js", HTML_JS_MAIN_PATH.read_bytes()),
+        ]
+
+    def _media_files(self) -> list[tuple[str, bytes]]:
         """
-        if not self.fonts:
-            return
+        All referenced images and the cover image (if any), under /media.
+        """
+        files = [(f"{MEDIA_DIR}/{img.filename}", img.data) for img in self.images]
+        if self.cover and self._cover_filename:
+            files.append((f"{MEDIA_DIR}/{self._cover_filename}", self.cover))
+        return files
 
-        font_dir = html_dir / FONT_DIR
-        font_dir.mkdir(parents=True, exist_ok=True)
+    def _font_files(self) -> list[tuple[str, bytes]]:
+        """
+        All referenced fonts, under /fonts.
+        """
+        subsetter = self._subsetter
+        if subsetter is None:
+            return [(f"{FONT_DIR}/{font.filename}", font.data) for font in self.fonts]
 
+        # start every subset before waiting on any of them
+        pending: list[tuple[str, bytes | Future[bytes]]] = []
         for font in self.fonts:
-            write_file(font.data, font_dir / font.filename)
-
-    def _build_index(self, html_dir: Path) -> None:
-        index_path = html_dir / "index.html"
-
-        write_file(self._index.to_html(), index_path)
-
-    def _build_chapters(self, html_dir: Path) -> None:
-        chap_dir = html_dir / CHAPTER_DIR
-        chap_dir.mkdir(parents=True, exist_ok=True)
-
-        if not self._chapters:
-            return
-
-        n = len(self._chapters)
-        for idx, chap in enumerate(self._chapters):
-            prev_link = self._chapters[idx - 1].filename if idx > 0 else ""
-            next_link = self._chapters[idx + 1].filename if idx < n - 1 else ""
-
-            chap_html = chap.to_html(
-                lang=self.lang,
-                prev_link=prev_link,
-                next_link=next_link,
-            )
-            write_file(chap_html, chap_dir / chap.filename)
+            data: bytes | Future[bytes] = font.data
+            if entry := self._subset_fonts.get(font.filename):
+                digest, chars = entry
+                data, _ = subsetter.subset(font.data, digest, "".join(chars))
+            pending.append((f"{FONT_DIR}/{font.filename}", data))
+        return [
+            (rel, data.result() if isinstance(data, Future) else data)
+            for rel, data in pending
+        ]
+
+    def _render_chapter(self, idx: int) -> str:
+        chapters = self._chapters
+        prev_link = chapters[idx - 1].filename if idx > 0 else ""
+        next_link = chapters[idx + 1].filename if idx < len(chapters) - 1 else ""
+        return chapters[idx].to_html(
+            lang=self.lang,
+            prev_link=prev_link,
+            next_link=next_link,
+        )
 
     def _build_html(self, output_path: Path, folder: str | None) -> Path:
         folder_name = (
             sanitize_filename(folder) if folder else sanitize_filename(self.title)
         )
         html_dir = output_path / folder_name
-        self._prepare_output_dir(html_dir)
-        self._write_media(html_dir)
-        self._write_fonts(html_dir)
-        self._build_index(html_dir)
-        self._build_chapters(html_dir)
+        (html_dir / CHAPTER_DIR).mkdir(parents=True, exist_ok=True)
+
+        sync = DirectorySync(html_dir)
+        files = [*self._asset_files(), *self._media_files(), *self._font_files()]
+        files.append(("index.html", self._index.to_html().encode("utf-8")))
+
+        def _write_chapter(idx: int) -> bool:
+            rel = f"{CHAPTER_DIR}/{self._chapters[idx].filename}"
+            return sync.put(rel, self._render_chapter(idx))
+
+        # a repeated file name keeps its last chapter, as when written in order
+        last = {chap.filename: i for i, chap in enumerate(self._chapters)}
+        chapter_ids = sorted(last.values())
+
+        if self._workers > 1:
+            with ThreadPoolExecutor(self._workers) as pool:
+                futures = [pool.submit(sync.put, rel, data) for rel, data in files]
+                futures.extend(pool.submit(_write_chapter, i) for i in chapter_ids)
+                for future in futures:
+                    future.result()
+        else:
+            for rel, data in files:
+                sync.put(rel, data)
+            for i in chapter_ids:
+                _write_chapter(i)
+
+        sync.finish()
         return html_dir
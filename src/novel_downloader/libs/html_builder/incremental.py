@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+novel_downloader.libs.html_builder.incremental
+----------------------------------------------
+
+Keeps an export directory in sync with the files of the latest export.
+
+A manifest in the directory maps every file written by the builder to the
+hash of its content, so a re-export only rewrites files that changed and
+removes the ones the book no longer has.
+"""
+
+from __future__ import annotations
+
+__all__ = ["DirectorySync"]
+
+import contextlib
+import json
+import threading
+from pathlib import Path
+
+from novel_downloader.libs.crypto.hash_utils import hash_bytes
+from novel_downloader.libs.filesystem import write_file
+
+from .constants import MANIFEST_FILENAME
+
+
+class DirectorySync:
+    """
+    Write files below `root`, skipping those unchanged since the last sync.
+
+    `put` may be called from several threads.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self._previous = self._load(root / MANIFEST_FILENAME)
+        self._current: dict[str, str] = {}
+        self._lock = threading.Lock()
+        self.written = 0
+        self.skipped = 0
+
+    @staticmethod
+    def _load(path: Path) -> dict[str, str]:
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict):
+            return {}
+        return {str(k): str(v) for k, v in data.items()}
+
+    def put(self, relpath: str, data: str | bytes) -> bool:
+        """
+        Write `data` to `root/relpath` unless the file already holds it.
+
+        :param relpath: POSIX path relative to the root.
+        :return: True if the file was written.
+        """
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        digest = hash_bytes(data)
+        path = self.root / relpath
+        unchanged = self._previous.get(relpath) == digest and path.is_file()
+        with self._lock:
+            self._current[relpath] = digest
+            if unchanged:
+                self.skipped += 1
+            else:
+                self.written += 1
+        if unchanged:
+            return False
+        write_file(data, path)
+        return True
+
+    def finish(self) -> list[str]:
+        """
+        Delete files left over from the previous sync and save the manifest.
+
+        :return: Relative paths of the deleted files.
+        """
+        root = self.root.resolve()
+        removed: list[str] = []
+        for relpath in self._previous.keys() - self._current.keys():
+            path = (self.root / relpath).resolve()
+            # never follow a manifest entry out of the export directory
+            if not path.is_relative_to(root) or path == root:
+                continue
+            with contextlib.suppress(OSError):
+                path.unlink()
+                removed.append(relpath)
+
+        write_file(
+            json.dumps(self._current, ensure_ascii=False, sort_keys=True),
+            self.root / MANIFEST_FILENAME,
+        )
+        return removed
@@ -269,6 +269,52 @@ def concat_image_slices_vertical(
     return buf.getvalue()
 
 
+def transcode_image(
+    data: bytes,
+    *,
+    format: str = "JPEG",
+    quality: int = 85,
+    max_width: int = 0,
+    max_height: int = 0,
+) -> bytes:
+    """
+    Downscale an image to fit a bounding box and re-encode it.
+
+    The aspect ratio is kept and images are never enlarged. JPEG output is
+    flattened onto white; WebP and PNG keep transparency.
+
+    :param data: Source image bytes.
+    :param format: Output format ("JPEG", "WEBP" or "PNG").
+    :param quality: Encoder quality for lossy formats (1-100).
+    :param max_width: Maximum width in pixels; 0 for no limit.
+    :param max_height: Maximum height in pixels; 0 for no limit.
+    :return: Encoded image bytes.
+    :raises PIL.UnidentifiedImageError, OSError: If input bytes cannot be decoded.
+    """
+    format = format.upper()
+    with Image.open(io.BytesIO(data)) as src:
+        width, height = src.size
+        box = (max_width or width, max_height or height)
+        # lets the JPEG decoder scale down by DCT, much cheaper than resizing
+        src.draft(src.mode, box)
+        img = src.copy()
+
+    img.thumbnail(box, Image.Resampling.LANCZOS)
+    if format == "JPEG":
+        img = Image.fromarray(_pil_to_rgb_array(img, white_bg=True))
+    elif img.mode not in ("RGB", "RGBA"):
+        img = img.convert("RGBA" if "A" in img.getbands() or img.mode == "P" else "RGB")
+
+    buf = io.BytesIO()
+    if format == "JPEG":
+        img.save(buf, format=format, quality=quality, optimize=True, progressive=True)
+    elif format == "WEBP":
+        img.save(buf, format=format, quality=quality, method=4)
+    else:
+        img.save(buf, format=format, optimize=True)
+    return buf.getvalue()
+
+
 def _pil_to_rgb_array(img: Image.Image, white_bg: bool) -> NDArray[np.uint8]:
     """Convert PIL image to RGB numpy array, optionally flattening alpha."""
     if img.mode == "P":
@@ -4,6 +4,11 @@
 ---------------------------------
 """
 
+import struct
+
+# JPEG start-of-frame markers (baseline, progressive, lossless, ...)
+_JPEG_SOF = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
 
 def detect_image_format(data: bytes) -> str | None:
     """
@@ -71,3 +76,69 @@ def detect_image_format(data: bytes) -> str | None:
     #     return "rgb"
 
     return None
+
+
+def image_size(data: bytes) -> tuple[int, int] | None:
+    """
+    Read the pixel dimensions from an image header without decoding it.
+
+    Supports PNG, GIF, JPEG, WebP and BMP.
+
+    :param data: Raw image bytes.
+    :return: `(width, height)`, or None if unknown or unreadable.
+    """
+    try:
+        return _image_size(data)
+    except struct.error:
+        return None
+
+
+def _image_size(data: bytes) -> tuple[int, int] | None:
+    if data.startswith(b"\x89PNG\r\n\x1a\n") and data[12:16] == b"IHDR":
+        w, h = struct.unpack(">II", data[16:24])
+        return w, h
+
+    if data.startswith((b"GIF87a", b"GIF89a")):
+        w, h = struct.unpack("<HH", data[6:10])
+        return w, h
+
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        chunk = data[12:16]
+        if chunk == b"VP8 ":
+            w, h = struct.unpack("<HH", data[26:30])
+            return w & 0x3FFF, h & 0x3FFF
+        if chunk == b"VP8L":
+            bits = int.from_bytes(data[21:25], "little")
+            return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+        if chunk == b"VP8X":
+            w = int.from_bytes(data[24:27], "little") + 1
+            h = int.from_bytes(data[27:30], "little") + 1
+            return w, h
+        return None
+
+    if data.startswith(b"BM"):
+        w, h = struct.unpack("<ii", data[18:26])
+        return w, abs(h)
+
+    if data.startswith(b"\xff\xd8"):
+        pos = 2
+        n = len(data)
+        while pos + 4 <= n:
+            if data[pos] != 0xFF:
+                return None
+            marker = data[pos + 1]
+            # fill bytes and standalone markers carry no length
+            if marker == 0xFF:
+                pos += 1
+                continue
+            if marker in (0x01, *range(0xD0, 0xD8)):
+                pos += 2
+                continue
+            (length,) = struct.unpack(">H", data[pos + 2 : pos + 4])
+            if marker in _JPEG_SOF:
+                h, w = struct.unpack(">HH", data[pos + 5 : pos + 9])
+                return w, h
+            pos += 2 + length
+        return None
+
+    return None
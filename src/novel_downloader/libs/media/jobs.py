@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+novel_downloader.libs.media.jobs
+--------------------------------
+
+Base for export-time media conversions (image transcoding, font subsetting).
+
+Conversions run inline or in spawned worker processes. Successful results
+are cached on disk under a key derived from the source content hash, so a
+repeated export only reads them back. A failed conversion yields the source
+bytes unchanged; callers detect the format of the result before labelling it.
+"""
+
+from __future__ import annotations
+
+__all__ = ["MediaJobPool"]
+
+import contextlib
+import logging
+import multiprocessing
+import types
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Self
+
+from novel_downloader.libs.filesystem import write_file
+
+logger = logging.getLogger(__name__)
+
+
+def _run_job(
+    fn: Callable[..., bytes],
+    data: bytes,
+    args: tuple[Any, ...],
+    cache_path: Path,
+) -> bytes:
+    try:
+        out = fn(data, *args)
+    except Exception as e:
+        logger.warning("%s failed, keeping the source: %s", fn.__name__, e)
+        return data
+
+    with contextlib.suppress(OSError):
+        write_file(out, cache_path)
+    return out
+
+
+class MediaJobPool:
+    """
+    Run media conversions in a process pool, with a result cache.
+    """
+
+    def __init__(self, cache_dir: Path, *, workers: int = 1) -> None:
+        """
+        :param cache_dir: Directory holding converted results.
+        :param workers: Worker processes; 1 converts inline.
+        """
+        self._cache_dir = cache_dir
+        # spawned, not forked: the exporter already runs compression threads
+        self._pool = (
+            ProcessPoolExecutor(
+                workers, mp_context=multiprocessing.get_context("spawn")
+            )
+            if workers > 1
+            else None
+        )
+        self.cached = 0
+
+    def _cache_path(self, digest: str, key: str) -> Path:
+        return self._cache_dir / digest[:2] / key
+
+    def _cached(self, digest: str, key: str) -> bytes | None:
+        """
+        Return the cached result for `key`, if any.
+        """
+        try:
+            data = self._cache_path(digest, key).read_bytes()
+        except OSError:
+            return None
+        self.cached += 1
+        return data
+
+    def _submit(
+        self,
+        fn: Callable[..., bytes],
+        data: bytes,
+        *args: Any,
+        digest: str,
+        key: str,
+    ) -> bytes | Future[bytes]:
+        """
+        Convert `data` with `fn(data, *args)` and cache the result.
+
+        :param fn: Module-level function (picklable), raising on failure.
+        :return: The result, or its future when running in workers.
+        """
+        job = (fn, data, args, self._cache_path(digest, key))
+        if self._pool is None:
+            return _run_job(*job)
+        return self._pool.submit(_run_job, *job)
+
+    def close(self) -> None:
+        """
+        Wait for running jobs and stop the worker processes.
+        """
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        tb: types.TracebackType | None,
+    ) -> None:
+        self.close()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+novel_downloader.libs.media.subset
+----------------------------------
+
+Export-time font subsetting.
+
+Embedded fonts are cut down to the characters of the chapters that use
+them and / or converted to WOFF2 through `MediaJobPool`; results are cached
+under the source content hash and a hash of the kept characters.
+"""
+
+from __future__ import annotations
+
+__all__ = ["FONT_FORMATS", "FontSubsetter"]
+
+import contextlib
+import logging
+from concurrent.futures import Future
+from pathlib import Path
+
+from novel_downloader.libs.crypto.hash_utils import hash_bytes
+from novel_downloader.libs.filesystem import write_file
+
+from .font import detect_font_format
+from .jobs import MediaJobPool
+
+logger = logging.getLogger(__name__)
+
+# part of every cache key; bump with the options of `font_utils.subset_font`
+_CACHE_VERSION = 1
+
+FONT_FORMATS = ("original", "woff2")
+
+# containers fontTools can read and write
+_SUBSETTABLE = frozenset({"ttf", "otf", "woff", "woff2"})
+
+
+def _subset(data: bytes, text: str | None, flavor: str | None) -> bytes:
+    from novel_downloader.libs.font_utils import subset_font
+
+    try:
+        return subset_font(data, text, flavor=flavor)
+    except Exception as e:
+        # the output name already promises `flavor`
+        if text is None or flavor is None:
+            raise
+        logger.warning("Font subsetting failed, converting the whole font: %s", e)
+    return subset_font(data, None, flavor=flavor)
+
+
+class FontSubsetter(MediaJobPool):
+    """
+    Subset fonts in a process pool, with a result cache.
+
+    Builders name fonts after `output_format`, which only promises another
+    container for fonts that fontTools can read. If subsetting still fails,
+    the whole font is converted instead.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        *,
+        subset: bool = True,
+        format: str = "original",
+        workers: int = 1,
+    ) -> None:
+        """
+        :param cache_dir: Directory holding subset fonts.
+        :param subset: Drop the glyphs of characters that are not used;
+            False only converts the container.
+        :param format: Output format: 'woff2', or 'original' to keep the
+            source container.
+        :param workers: Worker processes; 1 subsets inline.
+        :raises ValueError: If the output format is unknown.
+        :raises ImportError: If fontTools or brotli is not installed.
+        """
+        if format not in FONT_FORMATS:
+            raise ValueError(f"Unknown font format: {format}")
+        try:
+            from novel_downloader.libs import font_utils  # noqa: F401
+
+            if format == "woff2":
+                import brotli  # noqa: F401
+        except ImportError as e:
+            raise ImportError(
+                "Font subsetting requires fontTools and brotli. Install with:\n"
+                "  pip install novel-downloader[image-utils]"
+            ) from e
+
+        super().__init__(cache_dir, workers=workers)
+        self._subset = subset
+        self._flavor = None if format == "original" else format
+        self.subsetted = 0
+
+    def target_format(self, fmt: str | None) -> str:
+        """
+        Return the format a font is subset to, or '' to keep it as is.
+
+        :param fmt: Detected source format, e.g. 'ttf'.
+        """
+        if fmt not in _SUBSETTABLE:
+            return ""
+        return self._flavor or fmt
+
+    def output_format(self, data: bytes, digest: str) -> str:
+        """
+        Return the format a font will be embedded in, or '' to keep it as is.
+
+        Fonts that would change container are checked once (the result is
+        cached), so a broken font is never named after a format it cannot
+        be converted to.
+
+        :param data: Source font bytes.
+        :param digest: SHA-256 of `data`.
+        """
+        fmt = detect_font_format(data)
+        target = self.target_format(fmt)
+        if target and target != fmt and not self._readable(data, digest):
+            logger.warning(
+                "Font %s cannot be converted to %s, embedding it as is",
+                digest[:12],
+                target,
+            )
+            return ""
+        return target
+
+    def _readable(self, data: bytes, digest: str) -> bool:
+        from novel_downloader.libs.font_utils import font_is_readable
+
+        marker = self._cache_path(digest, f"{digest}_v{_CACHE_VERSION}.ok")
+        if marker.is_file():
+            return True
+        if not font_is_readable(data):
+            return False
+        with contextlib.suppress(OSError):
+            write_file(b"", marker)
+        return True
+
+    def subset(
+        self, data: bytes, digest: str, text: str
+    ) -> tuple[bytes | Future[bytes], str]:
+        """
+        Start subsetting a font, or return its cached result.
+
+        :param data: Source font bytes, in a format `target_format` accepts.
+        :param digest: SHA-256 of `data`.
+        :param text: Characters the font has to render.
+        :return: The subset font (or its future) and a key identifying its
+            content, stable across exports.
+        """
+        chars: str | None = None
+        glyphs = "all"
+        if self._subset:
+            chars = "".join(sorted(set(text)))
+            glyphs = hash_bytes(chars.encode("utf-8", "surrogatepass"))[:16]
+        ext = self._flavor or "orig"
+        key = f"{digest}_v{_CACHE_VERSION}_{glyphs}.{ext}"
+        cached = self._cached(digest, key)
+        if cached is not None:
+            return cached, key
+
+        self.subsetted += 1
+        result = self._submit(
+            _subset, data, chars, self._flavor, digest=digest, key=key
+        )
+        return result, key
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+novel_downloader.libs.media.transcode
+-------------------------------------
+
+Export-time image downscaling and re-encoding.
+
+Images are decoded and encoded through `MediaJobPool`; results are cached
+under the source content hash and the transcode parameters.
+"""
+
+from __future__ import annotations
+
+__all__ = ["OUTPUT_FORMATS", "ImageTranscoder", "PreparedImage", "TranscodeParams"]
+
+from concurrent.futures import Future
+from dataclasses import dataclass
+from pathlib import Path
+
+from .image import detect_image_format, image_size
+from .jobs import MediaJobPool
+
+# part of every cache key; bump when the encoder settings change
+_CACHE_VERSION = 1
+
+OUTPUT_FORMATS = ("original", "jpeg", "webp")
+
+# formats Pillow can decode and that are worth re-encoding
+_TRANSCODABLE = frozenset({"jpeg", "png", "webp", "bmp"})
+_PIL_FORMATS = {"jpeg": "JPEG", "png": "PNG", "webp": "WEBP", "bmp": "PNG"}
+
+
+@dataclass(frozen=True, slots=True)
+class TranscodeParams:
+    """
+    :param format: Output format: 'jpeg', 'webp', or 'original' to keep the
+        source format and only downscale.
+    :param max_width: Maximum width in pixels; 0 for no limit.
+    :param max_height: Maximum height in pixels; 0 for no limit.
+    :param quality: Encoder quality for lossy formats (1-100).
+    """
+
+    format: str = "original"
+    max_width: int = 0
+    max_height: int = 0
+    quality: int = 85
+
+    @property
+    def enabled(self) -> bool:
+        return self.format != "original" or self.max_width > 0 or self.max_height > 0
+
+    @property
+    def tag(self) -> str:
+        return f"v{_CACHE_VERSION}_{self.max_width}x{self.max_height}_q{self.quality}"
+
+
+@dataclass(slots=True)
+class PreparedImage:
+    """
+    An image ready to embed.
+
+    :param fmt: Format of the output data, e.g. 'jpeg'.
+    :param data: Output bytes, or a future of them while transcoding.
+    :param key: Identifies the output content; stable across exports.
+    """
+
+    fmt: str
+    data: bytes | Future[bytes]
+    key: str
+
+
+def _transcode(
+    data: bytes,
+    source_fmt: str,
+    target_fmt: str,
+    params: TranscodeParams,
+) -> bytes:
+    from novel_downloader.libs.image_utils import transcode_image
+
+    out = transcode_image(
+        data,
+        format=_PIL_FORMATS[target_fmt],
+        quality=params.quality,
+        max_width=params.max_width,
+        max_height=params.max_height,
+    )
+    if target_fmt == source_fmt and len(out) >= len(data):
+        return data
+    return out
+
+
+class ImageTranscoder(MediaJobPool):
+    """
+    Downscale and re-encode images in a process pool, with a result cache.
+
+    An image that fails to transcode is kept as is, so the format of the
+    result may differ from `PreparedImage.fmt`.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        params: TranscodeParams,
+        *,
+        workers: int = 1,
+    ) -> None:
+        """
+        :param cache_dir: Directory holding transcoded images.
+        :param params: Output format, bounds and quality.
+        :param workers: Worker processes; 1 transcodes inline.
+        :raises ValueError: If the output format is unknown.
+        :raises ImportError: If Pillow or numpy is not installed.
+        """
+        if params.format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown image format: {params.format}")
+        try:
+            from novel_downloader.libs import image_utils  # noqa: F401
+        except ImportError as e:
+            raise ImportError(
+                "Image optimization requires Pillow and numpy. Install with:\n"
+                "  pip install novel-downloader[image-utils]"
+            ) from e
+
+        super().__init__(cache_dir, workers=workers)
+        self._params = params
+        self.transcoded = 0
+
+    def target_format(self, fmt: str | None, size: tuple[int, int] | None) -> str:
+        """
+        Return the format an image is transcoded to, or '' to keep it as is.
+
+        :param fmt: Detected source format.
+        :param size: Source `(width, height)`.
+        """
+        if fmt not in _TRANSCODABLE or size is None:
+            return ""
+        params = self._params
+        target = fmt if params.format == "original" else params.format
+        if target == "bmp":
+            target = "png"
+        width, height = size
+        too_big = (params.max_width and width > params.max_width) or (
+            params.max_height and height > params.max_height
+        )
+        # re-encoding in the same format only loses quality
+        if target == fmt and not too_big:
+            return ""
+        return target
+
+    def prepare(self, data: bytes, digest: str) -> PreparedImage | None:
+        """
+        Start transcoding an image, or return its cached result.
+
+        :param data: Source image bytes.
+        :param digest: SHA-256 of `data`.
+        :return: The transcoded image, or None if it is kept as is.
+        """
+        fmt = detect_image_format(data)
+        target = self.target_format(fmt, image_size(data))
+        if not target or fmt is None:
+            return None
+
+        key = f"{digest}_{self._params.tag}.{target}"
+        cached = self._cached(digest, key)
+        if cached is not None:
+            return PreparedImage(target, cached, key)
+
+        self.transcoded += 1
+        result = self._submit(
+            _transcode, data, fmt, target, self._params, digest=digest, key=key
+        )
+        return PreparedImage(target, result, key)
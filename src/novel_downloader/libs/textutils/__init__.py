@@ -6,6 +6,17 @@
 Text processing helpers such as number handling, text cleaning, and truncation.
 """
 
-__all__ = ["truncate_half_lines"]
+__all__ = [
+    "LITERAL_BACKEND",
+    "LiteralReplacer",
+    "OPENCC_CHAINS",
+    "is_literal_pattern",
+    "pack_texts",
+    "truncate_half_lines",
+    "ZhConverter",
+]
 
+from .batching import pack_texts
+from .literal_replace import LITERAL_BACKEND, LiteralReplacer, is_literal_pattern
 from .truncate import truncate_half_lines
+from .zhconv import OPENCC_CHAINS, ZhConverter
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+novel_downloader.libs.textutils.batching
+----------------------------------------
+
+Group texts into size-limited batches for batched requests or inference.
+"""
+
+__all__ = ["pack_texts"]
+
+from collections.abc import Sequence
+
+
+def pack_texts(
+    texts: Sequence[str],
+    max_chars: int,
+    max_items: int | None = None,
+) -> list[list[int]]:
+    """
+    Group texts, in order, into batches bounded by total length and count.
+
+    A text longer than `max_chars` is put in a batch of its own.
+
+    :param texts: Texts to group.
+    :param max_chars: Maximum total characters per batch.
+    :param max_items: Maximum number of texts per batch; unlimited if None.
+    :return: Batches as lists of indices into `texts`.
+    """
+    batches: list[list[int]] = []
+    current: list[int] = []
+    size = 0
+    for idx, text in enumerate(texts):
+        full = (max_items is not None and len(current) >= max_items) or (
+            current and size + len(text) > max_chars
+        )
+        if full:
+            batches.append(current)
+            current, size = [], 0
+        current.append(idx)
+        size += len(text)
+    if current:
+        batches.append(current)
+    return batches
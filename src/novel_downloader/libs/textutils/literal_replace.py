@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+novel_downloader.libs.textutils.literal_replace
+-----------------------------------------------
+
+Multi-pattern literal replacement with leftmost-longest matching.
+
+Uses an Aho-Corasick automaton from `pyahocorasick` when it is installed;
+otherwise the literals are compiled into a single trie-shaped regex, which
+avoids backtracking over thousands of plain alternatives.
+"""
+
+from __future__ import annotations
+
+__all__ = ["LITERAL_BACKEND", "LiteralReplacer", "is_literal_pattern"]
+
+import re
+from bisect import bisect_left
+from collections.abc import Callable, Mapping
+from typing import Any
+
+try:
+    import ahocorasick
+except ImportError:  # optional dependency
+    ahocorasick = None
+
+#: Matching engine used for newly built replacers
+LITERAL_BACKEND = "ahocorasick" if ahocorasick is not None else "regex"
+_REGEX_META = frozenset(".^$*+?{}[]\\|()")
+
+
+def is_literal_pattern(pattern: str) -> bool:
+    """
+    Return True if a regex pattern only matches its own text.
+    """
+    return bool(pattern) and not any(ch in _REGEX_META for ch in pattern)
+
+
+class LiteralReplacer:
+    """
+    Replace many literal strings in one left-to-right pass.
+
+    At each position the longest key wins; replaced text is not rescanned.
+    Instances are picklable so compiled matchers can be cached on disk.
+    """
+
+    def __init__(self, mapping: Mapping[str, str]) -> None:
+        """
+        :param mapping: Literal key -> replacement (empty keys are ignored).
+        """
+        self._mapping = {k: v for k, v in mapping.items() if k}
+        self._automaton: Any = None
+        self._rx: re.Pattern[str] | None = None
+        if not self._mapping:
+            return
+
+        if ahocorasick is not None:
+            automaton = ahocorasick.Automaton()
+            for key, repl in self._mapping.items():
+                automaton.add_word(key, (key, repl))
+            automaton.make_automaton()
+            self._automaton = automaton
+        else:
+            self._rx = re.compile(_trie_pattern(self._mapping))
+
+    @property
+    def backend(self) -> str:
+        return "ahocorasick" if self._automaton is not None else "regex"
+
+    def __bool__(self) -> bool:
+        return bool(self._mapping)
+
+    def __len__(self) -> int:
+        return len(self._mapping)
+
+    def sub(self, text: str) -> str:
+        """
+        Replace every (leftmost-longest) occurrence of the keys in `text`.
+        """
+        if not self._mapping or not text:
+            return text
+
+        if self._rx is not None:
+            mapping = self._mapping
+            return self._rx.sub(lambda m: mapping[m.group(0)], text)
+
+        longest = self._longest(text)
+        if not longest:
+            return text
+
+        parts: list[str] = []
+        pos = 0
+        for start in sorted(longest):
+            if start < pos:
+                continue
+            key, repl = longest[start]
+            parts.append(text[pos:start])
+            parts.append(repl)
+            pos = start + len(key)
+        parts.append(text[pos:])
+        return "".join(parts)
+
+    def scanner(self, text: str) -> Callable[[int], tuple[int, int, str] | None]:
+        """
+        Return a function finding the leftmost-longest match in `text` at
+        or after a position, as `(start, end, replacement)`, or None.
+        """
+        if not self._mapping or not text:
+            return lambda pos: None
+
+        mapping = self._mapping
+        if self._rx is not None:
+            rx = self._rx
+
+            def _search(pos: int) -> tuple[int, int, str] | None:
+                m = rx.search(text, pos)
+                if m is None:
+                    return None
+                return m.start(), m.end(), mapping[m.group(0)]
+
+            return _search
+
+        longest = self._longest(text)
+        starts = sorted(longest)
+
+        def _next(pos: int) -> tuple[int, int, str] | None:
+            i = bisect_left(starts, pos)
+            if i == len(starts):
+                return None
+            start = starts[i]
+            key, repl = longest[start]
+            return start, start + len(key), repl
+
+        return _next
+
+    def _longest(self, text: str) -> dict[int, tuple[str, str]]:
+        # `iter_long` can skip a shorter match after a failed longer one,
+        # so pick the longest key per start position from all matches
+        longest: dict[int, tuple[str, str]] = {}
+        for end, item in self._automaton.iter(text):
+            start = end - len(item[0]) + 1
+            best = longest.get(start)
+            if best is None or len(item[0]) > len(best[0]):
+                longest[start] = item
+        return longest
+
+    def occurring(self, text: str) -> set[str]:
+        """
+        Return every key that occurs anywhere in `text` (overlaps included).
+        """
+        if not self._mapping or not text:
+            return set()
+        if self._automaton is not None:
+            return {key for _, (key, _) in self._automaton.iter(text)}
+        return {key for key in self._mapping if key in text}
+
+    @property
+    def mapping(self) -> dict[str, str]:
+        """
+        The literal key -> replacement mapping (do not modify).
+        """
+        return self._mapping
+
+    def __getstate__(self) -> dict[str, Any]:
+        # compiled regexes pickle as their source, so only the trie pattern
+        # is kept; it saves rebuilding the trie on load
+        return {
+            "mapping": self._mapping,
+            "automaton": self._automaton,
+            "pattern": self._rx.pattern if self._rx is not None else None,
+        }
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self._mapping = state["mapping"]
+        self._automaton = state["automaton"]
+        pattern = state.get("pattern")
+        self._rx = re.compile(pattern) if pattern is not None else None
+
+
+def _trie_pattern(keys: Mapping[str, str]) -> str:
+    """
+    Build a regex matching any of `keys`, preferring the longest match.
+
+    Keys are merged into a character trie, so the engine follows a single
+    branch per position instead of trying each key in turn.
+    """
+    root: dict[str, Any] = {}
+    for key in keys:
+        node = root
+        for ch in key:
+            node = node.setdefault(ch, {})
+        node[""] = True
+    return _node_pattern(root)
+
+
+def _node_pattern(node: dict[str, Any]) -> str:
+    alts: list[str] = []
+    for ch in sorted(k for k in node if k):
+        child = node[ch]
+        run = re.escape(ch)
+        # collapse single-child chains to keep the pattern (and recursion) flat
+        while len(child) == 1 and "" not in child:
+            (nxt,) = child
+            run += re.escape(nxt)
+            child = child[nxt]
+        rest = _node_pattern(child) if any(k for k in child) else ""
+        alts.append(run + rest)
+
+    if not alts:
+        return ""
+    body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+    if "" in node:
+        # greedy optional: try the longer continuation first
+        return "(?:" + body + ")?"
+    return body
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+novel_downloader.libs.textutils.zhconv
+--------------------------------------
+
+Simplified/Traditional Chinese conversion using OpenCC dictionaries.
+
+Each conversion stage maps single characters with `str.translate` and
+phrases by forward maximum matching, the OpenCC segmentation rule: at each
+position the longest phrase wins and the text it covers is not rescanned.
+Positions where a phrase may start are found by a C-level scan over the
+set of two-character phrase prefixes, so Python code only runs there.
+"""
+
+from __future__ import annotations
+
+__all__ = ["OPENCC_CHAINS", "ZhConverter", "read_opencc_dict"]
+
+import re
+from collections.abc import Iterable, Mapping
+from itertools import compress, count
+from pathlib import Path
+
+# every overlapping pair of characters
+_BIGRAM_RX = re.compile(r"(?=(..))", re.DOTALL)
+
+# direction -> stages; each stage merges a group of dictionary files,
+# earlier files taking precedence (as in OpenCC's config/*.json)
+OPENCC_CHAINS: dict[str, tuple[tuple[str, ...], ...]] = {
+    "hk2s": (
+        ("HKVariantsRevPhrases.txt", "HKVariantsRev.txt"),
+        ("TSPhrases.txt", "TSCharacters.txt"),
+    ),
+    "hk2t": (("HKVariantsRevPhrases.txt", "HKVariantsRev.txt"),),
+    "jp2t": (
+        ("JPShinjitaiPhrases.txt", "JPShinjitaiCharacters.txt", "JPVariantsRev.txt"),
+    ),
+    "s2hk": (("STPhrases.txt", "STCharacters.txt"), ("HKVariants.txt",)),
+    "s2t": (("STPhrases.txt", "STCharacters.txt"),),
+    "s2tw": (("STPhrases.txt", "STCharacters.txt"), ("TWVariants.txt",)),
+    "s2twp": (
+        ("STPhrases.txt", "STCharacters.txt"),
+        ("TWPhrases.txt",),
+        ("TWVariants.txt",),
+    ),
+    "t2hk": (("HKVariants.txt",),),
+    "t2jp": (("JPVariants.txt",),),
+    "t2s": (("TSPhrases.txt", "TSCharacters.txt"),),
+    "t2tw": (("TWVariants.txt",),),
+    "tw2s": (
+        ("TWVariantsRevPhrases.txt", "TWVariantsRev.txt"),
+        ("TSPhrases.txt", "TSCharacters.txt"),
+    ),
+    "tw2sp": (
+        ("TWPhrasesRev.txt", "TWVariantsRevPhrases.txt", "TWVariantsRev.txt"),
+        ("TSPhrases.txt", "TSCharacters.txt"),
+    ),
+    "tw2t": (("TWVariantsRevPhrases.txt", "TWVariantsRev.txt"),),
+}
+
+
+def read_opencc_dict(path: Path) -> dict[str, str]:
+    """
+    Read an OpenCC text dictionary (`key<TAB>value [alternatives...]`).
+
+    Only the first candidate of each entry is kept.
+    """
+    mapping: dict[str, str] = {}
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            key, sep, values = line.rstrip("\r\n").partition("\t")
+            if key and sep and (value := values.split(" ", 1)[0]):
+                mapping[key] = value
+    return mapping
+
+
+class _Stage:
+    """
+    One conversion step: a character table plus a phrase dictionary.
+    """
+
+    __slots__ = ("chars", "table", "aligned", "phrases", "prefix_len")
+
+    def __init__(self, mapping: Mapping[str, str]) -> None:
+        self.chars = {k: v for k, v in mapping.items() if len(k) == 1}
+        self.phrases = {k: v for k, v in mapping.items() if len(k) > 1}
+
+        # two-character prefix -> longest phrase starting with it
+        prefix_len: dict[str, int] = {}
+        for key in self.phrases:
+            prefix = key[:2]
+            prefix_len[prefix] = max(prefix_len.get(prefix, 0), len(key))
+        self.prefix_len = prefix_len
+        self._init_table()
+
+    def _init_table(self) -> None:
+        chars = self.chars
+        # indexed by code point; lookups past the end leave the char as is
+        size = max(map(ord, chars), default=-1) + 1
+        table: list[int | str] = list(range(size))
+        for key, value in chars.items():
+            table[ord(key)] = value
+        self.table = table
+        # one-to-one character mappings keep positions aligned
+        self.aligned = all(len(value) == 1 for value in chars.values())
+
+    def __getstate__(self) -> tuple[dict[str, str], dict[str, str], dict[str, int]]:
+        # the code point table is large but cheap to rebuild
+        return self.chars, self.phrases, self.prefix_len
+
+    def __setstate__(
+        self, state: tuple[dict[str, str], dict[str, str], dict[str, int]]
+    ) -> None:
+        self.chars, self.phrases, self.prefix_len = state
+        self._init_table()
+
+    def convert(self, text: str) -> str:
+        table = self.table
+        if not self.phrases or len(text) < 2:
+            return text.translate(table)
+
+        phrases = self.phrases
+        prefix_len = self.prefix_len
+        bigrams = _BIGRAM_RX.findall(text)
+        # when aligned, gaps are sliced from one translate over the text
+        converted = text.translate(table) if self.aligned else None
+
+        parts: list[str] = []
+        last = 0
+        n = len(text)
+        for i in compress(count(), map(prefix_len.__contains__, bigrams)):
+            if i < last:
+                continue
+            bigram = bigrams[i]
+            for size in range(min(prefix_len[bigram], n - i), 2, -1):
+                repl = phrases.get(text[i : i + size])
+                if repl is not None:
+                    break
+            else:
+                size = 2
+                repl = phrases.get(bigram)
+                if repl is None:
+                    continue
+            parts.append(
+                converted[last:i]
+                if converted is not None
+                else text[last:i].translate(table)
+            )
+            parts.append(repl)
+            last = i + size
+
+        if converted is None:
+            converted = text[last:].translate(table)
+        elif parts:
+            converted = converted[last:]
+        parts.append(converted)
+        return "".join(parts)
+
+
+class ZhConverter:
+    """
+    Convert text through a chain of OpenCC dictionary stages.
+
+    Instances are picklable so a compiled chain can be cached on disk.
+    """
+
+    def __init__(self, stages: Iterable[Mapping[str, str]]) -> None:
+        """
+        :param stages: One merged mapping per stage, applied in order.
+        """
+        self._stages = [_Stage(mapping) for mapping in stages]
+
+    @classmethod
+    def from_opencc(cls, direction: str, dict_dir: Path) -> ZhConverter:
+        """
+        Build the converter for an OpenCC conversion (e.g. `t2s`).
+
+        :param direction: A key of `OPENCC_CHAINS`.
+        :param dict_dir: Directory holding the OpenCC `.txt` dictionaries.
+        :raises ValueError: If the direction is unknown.
+        """
+        chain = OPENCC_CHAINS.get(direction)
+        if chain is None:
+            raise ValueError(f"Unknown conversion direction: {direction}")
+
+        stages: list[dict[str, str]] = []
+        for group in chain:
+            merged: dict[str, str] = {}
+            for filename in reversed(group):
+                merged.update(read_opencc_dict(dict_dir / filename))
+            stages.append(merged)
+        return cls(stages)
+
+    def convert(self, text: str) -> str:
+        for stage in self._stages:
+            text = stage.convert(text)
+        return text
@@ -13,6 +13,17 @@
 from pathlib import Path
 from typing import Any, Self, cast
 
+from novel_downloader.infra.persistence.chapter_storage import ChapterStorage
+from novel_downloader.infra.persistence.search_index import SEARCH_INDEX_FILENAME
+from novel_downloader.infra.persistence.site_storage import (
+    SITE_DB_FILENAME,
+    SiteChapterStorage,
+    SiteStageStorage,
+)
+from novel_downloader.infra.persistence.stage_storage import (
+    LayeredChapterStorage,
+    StageStorage,
+)
 from novel_downloader.libs.filesystem import image_filename
 from novel_downloader.plugins.protocols import FetcherProtocol, ParserProtocol
 from novel_downloader.plugins.protocols.ui import (
@@ -66,9 +77,16 @@ def __init__(
         self._backoff_factor = cfg.backoff_factor
         self._workers = max(1, cfg.workers)
         self._storage_batch_size = max(1, cfg.storage_batch_size)
+        self._storage_layout = cfg.storage_layout
+        self._search_index = cfg.search_index
+        self._process_workers = max(1, cfg.process_workers)
+        self._fuse_processors = cfg.fuse_processors
+        self._stream_processing = cfg.stream_processing
 
         self._fetcher_cfg = cfg.fetcher_cfg
         self._parser_cfg = cfg.parser_cfg
+        # kept to rebuild the client in worker processes
+        self._config = cfg
 
         self._fetcher: FetcherProtocol | None = None
         self._parser: ParserProtocol | None = None
@@ -77,6 +95,7 @@ def __init__(
         self._cache_dir = Path(cfg.cache_dir) / site
         self._output_dir = Path(cfg.output_dir)
         self._debug_dir = Path.cwd() / "debug" / site
+        self._search_index_path = Path(cfg.raw_data_dir) / SEARCH_INDEX_FILENAME
 
     async def init(self, fetcher_cfg: FetcherConfig, parser_cfg: ParserConfig) -> None:
         if self._fetcher or self._parser:
@@ -130,6 +149,7 @@ async def download_book(
         book: BookConfig,
         *,
         ui: DownloadUI | None = None,
+        processors: list[ProcessorConfig] | None = None,
         **kwargs: Any,
     ) -> None:
         """
@@ -137,6 +157,8 @@ async def download_book(
 
         :param book: BookConfig with at least ``book_id``.
         :param ui: Optional DownloadUI to report progress or messages.
+        :param processors: Processor chain to run on chapters as they are
+            stored, when `stream_processing` is enabled.
         """
         ...
 
@@ -546,9 +568,12 @@ def _detect_latest_stage(self, book_id: str) -> str:
         """
         Return the chosen stage name for export (e.g., 'raw', 'cleaner', 'corrector').
 
+        Stage databases only hold chapters changed by that stage, so the
+        returned stage should be read through `_open_stage_storage`.
+
         Strategy:
-          * If pipeline.json exists, walk pipeline in reverse and pick the last stage
-            whose recorded sqlite file exists.
+          * If pipeline.json exists, walk pipeline in reverse and pick the last
+            materialized stage whose recorded sqlite file exists.
           * Fallback: any executed record with an existing sqlite file.
           * Else: 'raw'.
         """
@@ -556,9 +581,77 @@ def _detect_latest_stage(self, book_id: str) -> str:
         meta = self._load_pipeline_meta(book_id)
 
         for stg in reversed(meta["pipeline"]):
-            db_file = base / f"chapter.{stg}.sqlite"
+            rec = meta["executed"].get(stg)
+            if isinstance(rec, dict) and not rec.get("materialized", True):
+                continue
             info_file = base / f"book_info.{stg}.json"
-            if db_file.is_file() and info_file.is_file():
+            if info_file.is_file() and self._has_stage_data(book_id, stg):
                 return stg
 
         return "raw"
+
+    def _chapter_storage(self, book_id: str, stage: str = "raw") -> ChapterStorage:
+        """
+        Return the (unopened) chapter storage of a book stage, honoring
+        the configured storage layout.
+        """
+        if self._storage_layout == "site":
+            return SiteChapterStorage(self._site_db_path, book_id, stage)
+        return ChapterStorage(self._book_dir(book_id), f"chapter.{stage}.sqlite")
+
+    def _stage_storage(self, book_id: str, stage: str) -> StageStorage:
+        """
+        Return the (unopened) delta storage a processing stage writes to.
+        """
+        if self._storage_layout == "site":
+            return SiteStageStorage(self._site_db_path, book_id, stage)
+        return StageStorage(self._book_dir(book_id), f"chapter.{stage}.sqlite")
+
+    def _has_stage_data(self, book_id: str, stage: str) -> bool:
+        """
+        Return True if chapter data has been stored for the book stage.
+        """
+        if self._storage_layout == "site":
+            return SiteChapterStorage.has_partition(self._site_db_path, book_id, stage)
+        return (self._book_dir(book_id) / f"chapter.{stage}.sqlite").is_file()
+
+    @property
+    def _site_db_path(self) -> Path:
+        return self._raw_data_dir / SITE_DB_FILENAME
+
+    def _stage_layers(self, book_id: str, stage: str) -> list[str]:
+        """
+        Return the stages backing `stage`, ordered bottom-up.
+
+        The chain is taken from the stage's recorded dependencies in
+        pipeline.json; unknown stages fall back to `raw` + the stage itself.
+        Stages that ran fused (not materialized) have no storage of their
+        own and are skipped.
+        """
+        if stage == "raw":
+            return ["raw"]
+
+        meta = self._load_pipeline_meta(book_id)
+        executed = meta["executed"]
+        rec = executed.get(stage)
+        deps = rec.get("depends_on", []) if isinstance(rec, dict) else []
+        stored = [
+            dep
+            for dep in deps
+            if not isinstance(executed.get(dep), dict)
+            or executed[dep].get("materialized", True)
+        ]
+        return ["raw", *stored, stage]
+
+    def _open_stage_storage(self, book_id: str, stage: str) -> LayeredChapterStorage:
+        """
+        Return a read-only view resolving chapters of `stage` through
+        its upstream stage databases.
+        """
+        return LayeredChapterStorage(
+            [
+                self._chapter_storage(book_id, stg)
+                for stg in self._stage_layers(book_id, stage)
+                if self._has_stage_data(book_id, stg)
+            ]
+        )
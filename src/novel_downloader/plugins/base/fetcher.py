@@ -15,6 +15,7 @@
 from typing import Any, Literal, Self
 
 from novel_downloader.infra.http_defaults import DEFAULT_USER_HEADERS, IMAGE_HEADERS
+from novel_downloader.infra.persistence.media_index import MediaKind, record_media
 from novel_downloader.infra.sessions import create_session
 from novel_downloader.libs.filesystem import font_filename, image_filename, write_file
 from novel_downloader.libs.time_utils import async_jitter_sleep
@@ -65,6 +66,8 @@ def __init__(
         self._rate_limiter: TokenBucketRateLimiter | None = (
             TokenBucketRateLimiter(config.max_rps) if config.max_rps > 0 else None
         )
+        # saved media not yet in the media index: (path, content, kind)
+        self._unindexed: list[tuple[Path, bytes, MediaKind]] = []
 
     async def init(
         self,
@@ -235,7 +238,12 @@ async def fetch_image(
         :return: Path of saved image, or None if failed/skipped.
         """
         img_dir.mkdir(parents=True, exist_ok=True)
-        return await self._fetch_one_image(url, img_dir, name=name, on_exist=on_exist)
+        try:
+            return await self._fetch_one_image(
+                url, img_dir, name=name, on_exist=on_exist
+            )
+        finally:
+            await self._index_media()
 
     async def fetch_images(
         self,
@@ -267,6 +275,7 @@ async def fetch_images(
                 self._fetch_one_image(url, img_dir, on_exist=on_exist) for url in batch
             ]
             results = await asyncio.gather(*tasks, return_exceptions=True)
+            await self._index_media()
             for r in results:
                 if isinstance(r, Exception):
                     logger.warning("Image download error: %s", r)
@@ -292,6 +301,7 @@ async def fetch_fonts(
                 self._fetch_one_font(url, font_dir, on_exist=on_exist) for url in batch
             ]
             results = await asyncio.gather(*tasks, return_exceptions=True)
+            await self._index_media()
             for r in results:
                 if isinstance(r, Exception):
                     logger.warning("Font download error: %s", r)
@@ -413,6 +423,7 @@ async def _fetch_one_image(
             return None
 
         write_file(content=content, filepath=save_path, on_exist="overwrite")
+        self._unindexed.append((save_path, content, "image"))
         logger.debug("Saved image: %s <- %s", save_path, url)
         return save_path
 
@@ -436,9 +447,22 @@ async def _fetch_one_font(
             return None
 
         write_file(content=content, filepath=save_path, on_exist="overwrite")
+        self._unindexed.append((save_path, content, "font"))
         logger.debug("Saved font: %s <- %s", save_path, url)
         return save_path
 
+    async def _index_media(self) -> None:
+        """
+        Add the media saved since the last call to the media index.
+
+        Hashing and the SQLite writes run in a worker thread, one
+        transaction per directory.
+        """
+        if not self._unindexed:
+            return
+        files, self._unindexed = self._unindexed, []
+        await asyncio.to_thread(record_media, files)
+
     def _resolve_base_url(self, locale_style: str) -> str:
         key = locale_style.strip().lower()
         return self.BASE_URL_MAP.get(key, self.DEFAULT_BASE_URL)
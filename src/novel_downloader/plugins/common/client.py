@@ -12,11 +12,14 @@
 from novel_downloader.plugins.mixins import (
     CleanupMixin,
     DownloadMixin,
+    ExportBookMixin,
     ExportEpubMixin,
     ExportHtmlMixin,
     ExportTxtMixin,
     ProcessMixin,
+    SearchIndexMixin,
 )
+from novel_downloader.plugins.mixins.export_book import BookWriterFactory
 from novel_downloader.plugins.protocols import ExportUI, LoginUI
 from novel_downloader.schemas import BookConfig, ExporterConfig
 
@@ -49,10 +52,12 @@ def __call__(
 class CommonClient(
     CleanupMixin,
     DownloadMixin,
+    ExportBookMixin,
     ExportEpubMixin,
     ExportHtmlMixin,
     ExportTxtMixin,
     ProcessMixin,
+    SearchIndexMixin,
     BaseClient,
 ):
     """
@@ -98,6 +103,10 @@ def export_book(
         """
         Persist the assembled book to disk.
 
+        In ``book`` split mode, formats with a book writer
+        (``_xp_<fmt>_book_writer``) are exported together in a single pass
+        over the chapters; other formats use ``_export_<split_mode>_<fmt>``.
+
         :param book: The book configuration to export.
         :param cfg: Optional ExporterConfig defining export parameters.
         :param formats: Optional list of format strings (e.g., ['epub', 'txt']).
@@ -108,7 +117,38 @@ def export_book(
         formats = formats or ["epub"]
         results: dict[str, list[Path]] = {}
 
+        # formats with a book writer share one read of the book
+        writers: dict[str, BookWriterFactory] = {}
+        if cfg.split_mode == "book":
+            for fmt in formats:
+                factory = getattr(self, f"_xp_{fmt.lower()}_book_writer", None)
+                if callable(factory):
+                    writers[fmt] = factory
+
+        if writers:
+            if ui:
+                for fmt in writers:
+                    ui.on_start(book, fmt)
+            try:
+                outcomes = self._export_book_formats(book, cfg, writers, stage=stage)
+            except Exception as e:
+                outcomes = dict.fromkeys(writers, e)
+
+            for fmt, outcome in outcomes.items():
+                if isinstance(outcome, Exception):
+                    results[fmt] = []
+                    logger.warning(f"Error exporting {fmt}: {outcome}")
+                    if ui:
+                        ui.on_error(book, fmt, outcome)
+                    continue
+                results[fmt] = outcome
+                if ui:
+                    for path in outcome:
+                        ui.on_success(book, fmt, path)
+
         for fmt in formats:
+            if fmt in writers:
+                continue
             method_name = f"_export_{cfg.split_mode}_{fmt.lower()}"
             export_func: _ExportBookFunc | None = getattr(self, method_name, None)
 
@@ -135,7 +175,7 @@ def export_book(
                 if ui:
                     ui.on_error(book, fmt, e)
 
-        return results
+        return {fmt: results[fmt] for fmt in formats}
 
     def export_chapter(
         self,
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+novel_downloader.plugins.export_pool
+------------------------------------
+
+Runs book exports side by side in worker processes.
+
+Workers rebuild the client from its class and configuration and record
+the progress callbacks of each export; the callbacks are replayed on the
+caller's `ExportUI` once the book is done.
+"""
+
+__all__ = ["ExportPool"]
+
+import logging
+import multiprocessing
+import pickle
+import threading
+import types
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from dataclasses import replace
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Self, cast
+
+from novel_downloader.libs.filesystem import sanitize_filename
+from novel_downloader.schemas import BookConfig, ClientConfig, ExporterConfig
+
+from .protocols import ClientProtocol, ExportUI
+
+if TYPE_CHECKING:
+    from .protocols import _ClientContext
+
+logger = logging.getLogger(__name__)
+
+ExportResult = dict[str, list[Path]]
+_Event = tuple[str, tuple[Any, ...]]
+
+
+class _RecordingExportUI:
+    """
+    Collects `ExportUI` callbacks in a worker process.
+    """
+
+    def __init__(self) -> None:
+        self.events: list[_Event] = []
+
+    def on_start(self, book: BookConfig, fmt: str | None = None) -> None:
+        self.events.append(("on_start", (book, fmt)))
+
+    def on_success(self, book: BookConfig, fmt: str, path: Path) -> None:
+        self.events.append(("on_success", (book, fmt, path)))
+
+    def on_error(self, book: BookConfig, fmt: str | None, error: Exception) -> None:
+        # the event travels back to the parent process
+        try:
+            pickle.dumps(error)
+        except Exception:
+            error = RuntimeError(str(error))
+        self.events.append(("on_error", (book, fmt, error)))
+
+    def on_unsupported(self, book: BookConfig, fmt: str) -> None:
+        self.events.append(("on_unsupported", (book, fmt)))
+
+
+def _export_in_worker(
+    spec: tuple[type, str, ClientConfig],
+    book: BookConfig,
+    cfg: ExporterConfig,
+    formats: list[str] | None,
+    stage: str | None,
+) -> tuple[ExportResult, list[_Event]]:
+    cls, site, client_cfg = spec
+    client: ClientProtocol = cls(site, client_cfg)
+    recorder = _RecordingExportUI()
+    results = client.export_book(book, cfg, formats=formats, stage=stage, ui=recorder)
+    return results, recorder.events
+
+
+class ExportPool:
+    """
+    Export books concurrently, at most `workers` at a time.
+
+    With a single worker, books are exported one after another in a
+    background thread and report progress as it happens. Books sharing a
+    title would write the same files, so they wait for one another.
+    """
+
+    def __init__(self, workers: int = 1) -> None:
+        """
+        :param workers: Books exported at once, each in its own process.
+        """
+        self._pool: Executor
+        # the last export queued per book title
+        self._tails: dict[str, Future[ExportResult]] = {}
+        self._tails_lock = threading.Lock()
+        if workers > 1:
+            # spawned, not forked: callers may already run threads
+            self._pool = ProcessPoolExecutor(
+                workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        else:
+            self._pool = ThreadPoolExecutor(1)
+
+    def submit(
+        self,
+        client: ClientProtocol,
+        book: BookConfig,
+        cfg: ExporterConfig | None = None,
+        *,
+        formats: list[str] | None = None,
+        stage: str | None = None,
+        ui: ExportUI | None = None,
+    ) -> Future[ExportResult]:
+        """
+        Queue a book export; see `ClientProtocol.export_book`.
+
+        :param ui: Receives the callbacks of this book.
+        :return: A future of the mapping from format name to created paths.
+        """
+        cfg = cfg or ExporterConfig()
+        if isinstance(self._pool, ThreadPoolExecutor):
+            return self._pool.submit(
+                client.export_book, book, cfg, formats=formats, stage=stage, ui=ui
+            )
+
+        ctx = cast("_ClientContext", client)
+        spec = (type(client), ctx._site, ctx._config)
+        # books already run side by side; nested pools would oversubscribe
+        job_cfg = replace(cfg, export_workers=1, image_workers=1, font_workers=1)
+        outer: Future[ExportResult] = Future()
+
+        def _fail(e: Exception) -> None:
+            logger.warning("Error exporting book %s: %s", book.book_id, e)
+            if ui:
+                ui.on_error(book, None, e)
+            outer.set_exception(e)
+
+        def _done(f: Future[tuple[ExportResult, list[_Event]]]) -> None:
+            if not outer.set_running_or_notify_cancel():
+                return
+            try:
+                results, events = f.result()
+            except Exception as e:
+                _fail(e)
+                return
+            if ui:
+                for name, args in events:
+                    getattr(ui, name)(*args)
+            outer.set_result(results)
+
+        def _start(_: object = None) -> None:
+            if outer.cancelled():
+                return
+            try:
+                job = self._pool.submit(
+                    _export_in_worker, spec, book, job_cfg, formats, stage
+                )
+            except Exception as e:
+                if outer.set_running_or_notify_cancel():
+                    _fail(e)
+                return
+            job.add_done_callback(_done)
+
+        # two writers on one `.part` file corrupt it
+        key = self._output_key(ctx, book, stage)
+        with self._tails_lock:
+            prev = self._tails.get(key)
+            self._tails[key] = outer
+
+        def _forget(_: object) -> None:
+            with self._tails_lock:
+                if self._tails.get(key) is outer:
+                    del self._tails[key]
+
+        outer.add_done_callback(_forget)
+        if prev is None:
+            _start()
+        else:
+            prev.add_done_callback(_start)
+        return outer
+
+    def close(self) -> None:
+        """
+        Wait for queued exports and stop the workers.
+        """
+        # books waiting on a namesake are submitted once it finishes
+        with self._tails_lock:
+            tails = list(self._tails.values())
+        wait(tails)
+        self._pool.shutdown(wait=True)
+
+    @staticmethod
+    def _output_key(ctx: "_ClientContext", book: BookConfig, stage: str | None) -> str:
+        """
+        Title the output files of a book are named after.
+
+        Falls back to the book id when the book information cannot be read.
+        """
+        try:
+            stage = stage or ctx._detect_latest_stage(book.book_id)
+            name = ctx._load_book_info(book.book_id, stage=stage)["book_name"]
+        except Exception:
+            return f"id:{book.book_id}"
+        return f"name:{sanitize_filename(name)}"
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        tb: types.TracebackType | None,
+    ) -> None:
+        self.close()
@@ -7,15 +7,19 @@
 __all__ = [
     "CleanupMixin",
     "DownloadMixin",
+    "ExportBookMixin",
     "ExportEpubMixin",
     "ExportHtmlMixin",
     "ExportTxtMixin",
     "ProcessMixin",
+    "SearchIndexMixin",
 ]
 
 from .cleanup import CleanupMixin
 from .download import DownloadMixin
+from .export_book import ExportBookMixin
 from .export_epub import ExportEpubMixin
 from .export_html import ExportHtmlMixin
 from .export_txt import ExportTxtMixin
 from .process import ProcessMixin
+from .search_index import SearchIndexMixin
@@ -8,7 +8,8 @@
 import shutil
 from typing import TYPE_CHECKING, Any
 
-from novel_downloader.infra.persistence.chapter_storage import ChapterStorage
+from novel_downloader.infra.persistence.search_index import ChapterSearchIndex
+from novel_downloader.infra.persistence.site_storage import SiteChapterStorage
 from novel_downloader.schemas import BookConfig
 
 logger = logging.getLogger(__name__)
@@ -39,6 +40,11 @@ def cleanup_book(
         :param stage: Which stage/version of raw data to remove.
         """
         if remove_all:
+            if self._storage_layout == "site":
+                SiteChapterStorage.drop_book(self._site_db_path, book.book_id)
+            if self._search_index_path.is_file():
+                with ChapterSearchIndex(self._search_index_path) as index:
+                    index.remove_book(self._site, book.book_id)
             book_dir = self._raw_data_dir / book.book_id
             if book_dir.exists():
                 logger.info(
@@ -104,20 +110,25 @@ def cleanup_chapters(
         """
         Delete populated chapter entries (in SQLite) for a given range.
         """
-        raw_base = self._raw_data_dir / book_id
-
         # Load chapter listing from metadata
         book_info = self._load_book_info(book_id, stage=stage)
         vols = book_info["volumes"]
         cids = self._extract_chapter_ids(vols, start_id, end_id, ignore_ids)
 
-        db_path = raw_base / f"chapter.{stage}.sqlite"
-        if not db_path.exists():
+        if not self._has_stage_data(book_id, stage):
             logger.debug("No chapter DB for book %s (stage=%s)", book_id, stage)
             return
 
         # Delete rows from SQLite
-        with ChapterStorage(raw_base, filename=f"chapter.{stage}.sqlite") as storage:
+        if stage != "raw":
+            # Also drop processed records so the stage reprocesses them
+            with self._stage_storage(book_id, stage) as stg:
+                stg.forget(cids)
+                stg.vacuum()
+            logger.info("Reset %d chapters of stage '%s'", len(cids), stage)
+            return
+
+        with self._chapter_storage(book_id, stage) as storage:
             deleted = storage.delete_chapters(cids)
             if deleted > 0:
                 storage.vacuum()
@@ -11,13 +11,19 @@
 
 from novel_downloader.infra.persistence.chapter_storage import ChapterStorage
 from novel_downloader.libs.time_utils import async_jitter_sleep
-from novel_downloader.schemas import BookConfig, BookInfoDict, ChapterDict
+from novel_downloader.schemas import (
+    BookConfig,
+    BookInfoDict,
+    ChapterDict,
+    ProcessorConfig,
+)
 
 ONE_DAY = 86400  # seconds
 logger = logging.getLogger(__name__)
 
 
 if TYPE_CHECKING:
+    from novel_downloader.plugins.mixins.process import StreamSegment
     from novel_downloader.plugins.protocols import (
         DownloadUI,
         _ClientContext,
@@ -56,6 +62,24 @@ def _dl_check_empty(self, raw_pages: list[str]) -> bool: ...
 
         def _dl_check_refetch(self, chap: ChapterDict) -> bool: ...
 
+        async def _dl_stream_segments(
+            self,
+            book_id: str,
+            processors: list[ProcessorConfig] | None,
+        ) -> list[StreamSegment]: ...
+
+        def _pc_stream_segments(
+            self,
+            processors: list[ProcessorConfig],
+        ) -> list[StreamSegment]: ...
+
+        def _pc_process_chapters(
+            self,
+            book_id: str,
+            segments: list[StreamSegment],
+            chap_ids: list[str],
+        ) -> None: ...
+
 
 @final
 class StopToken:
@@ -78,13 +102,19 @@ async def download_book(
         book: BookConfig,
         *,
         ui: "DownloadUI | None" = None,
+        processors: list[ProcessorConfig] | None = None,
         **kwargs: Any,
     ) -> None:
         """
         Download all chapters and metadata for a single book.
 
+        With `stream_processing` enabled, stored chapters are run through
+        `processors` while the download continues; the `process_book` call
+        afterwards then only handles book info and leftover chapters.
+
         :param book: :class:`BookConfig` with at least ``book_id`` defined.
         :param ui: Optional :class:`DownloadUI` for progress reporting.
+        :param processors: Processor chain to stream chapters through.
         """
         book_id = book.book_id
         start_id = book.start_id
@@ -99,98 +129,136 @@ async def download_book(
 
         # ---- metadata ---
         book_info = await self.get_book_info(book_id=book_id)
-        with ChapterStorage(raw_base, filename="chapter.raw.sqlite") as storage:
+        with self._chapter_storage(book_id) as storage:
             book_info = await self._dl_fix_chapter_ids(
                 book_id,
                 book_info,
                 storage,
             )
 
-        await self._dl_cache_info_images(book_id, book_info)
+            await self._dl_cache_info_images(book_id, book_info)
 
-        vols = book_info["volumes"]
-        plan = self._extract_chapter_ids(vols, start_id, end_id, ignore_set)
-        if not plan:
-            logger.info(
-                "Nothing to do after filtering (site=%s, book=%s)", self._site, book_id
-            )
-            return
+            vols = book_info["volumes"]
+            plan = self._extract_chapter_ids(vols, start_id, end_id, ignore_set)
+            if not plan:
+                logger.info(
+                    "Nothing to do after filtering (site=%s, book=%s)",
+                    self._site,
+                    book_id,
+                )
+                return
 
-        total = len(plan)
-        done = 0
+            total = len(plan)
+            done = 0
 
-        async def bump(n: int = 1) -> None:
-            nonlocal done
-            done += n
-            if ui:
-                await ui.on_progress(done, total)
+            async def bump(n: int = 1) -> None:
+                nonlocal done
+                done += n
+                if ui:
+                    await ui.on_progress(done, total)
 
-        # ---- queues & batching ---
-        save_q: asyncio.Queue[ChapterDict | StopToken] = asyncio.Queue(maxsize=10)
-        batches: dict[bool, list[ChapterDict]] = {False: [], True: []}
-        sem = asyncio.Semaphore(self.workers)
+            segments = await self._dl_stream_segments(book_id, processors)
 
-        def _batch(need_refetch: bool) -> list[ChapterDict]:
-            return batches[need_refetch]
+            # ---- queues & batching ---
+            save_q: asyncio.Queue[ChapterDict | StopToken] = asyncio.Queue(maxsize=10)
+            process_q: asyncio.Queue[list[str] | StopToken] = asyncio.Queue()
+            batches: dict[bool, list[ChapterDict]] = {False: [], True: []}
+            sem = asyncio.Semaphore(self.workers)
 
-        async def flush_batch(need_refetch: bool) -> None:
-            batch = _batch(need_refetch)
-            if not batch:
-                return
-            try:
-                # need_refetch=True for encrypted, False for plain
-                storage.upsert_chapters(batch, need_refetch=need_refetch)
-            except Exception as e:
-                logger.error(
-                    "Storage batch upsert failed (site=%s, book=%s, size=%d, need_refetch=%s): %s",  # noqa: E501
-                    self._site,
-                    book_id,
-                    len(batch),
-                    need_refetch,
-                    e,
-                )
-            else:
-                await bump(len(batch))
-            finally:
-                batch.clear()
-
-        async def flush_all() -> None:
-            await flush_batch(False)
-            await flush_batch(True)
-
-        # ---- workers ---
-        async def storage_worker() -> None:
-            while True:
-                item = await save_q.get()
-                if isinstance(item, StopToken):
-                    break
-
-                need = self._dl_check_refetch(item)
-                bucket = _batch(need)
-                bucket.append(item)
-                if len(bucket) >= self._storage_batch_size:
-                    await flush_batch(need)
-            await flush_all()
-
-        async def producer(cid: str) -> None:
-            async with sem:
-                if self._cache_chapter and not storage.need_refetch(cid):
-                    await bump(1)
+            def _batch(need_refetch: bool) -> list[ChapterDict]:
+                return batches[need_refetch]
+
+            async def flush_batch(need_refetch: bool) -> None:
+                batch = _batch(need_refetch)
+                if not batch:
                     return
+                try:
+                    # need_refetch=True for encrypted, False for plain
+                    storage.upsert_chapters(batch, need_refetch=need_refetch)
+                except Exception as e:
+                    logger.error(
+                        "Storage batch upsert failed (site=%s, book=%s, size=%d, need_refetch=%s): %s",  # noqa: E501
+                        self._site,
+                        book_id,
+                        len(batch),
+                        need_refetch,
+                        e,
+                    )
+                else:
+                    await bump(len(batch))
+                    if segments and not need_refetch:
+                        process_q.put_nowait([chap["id"] for chap in batch])
+                finally:
+                    batch.clear()
+
+            async def flush_all() -> None:
+                await flush_batch(False)
+                await flush_batch(True)
+
+            # ---- workers ---
+            async def storage_worker() -> None:
+                while True:
+                    item = await save_q.get()
+                    if isinstance(item, StopToken):
+                        break
+
+                    need = self._dl_check_refetch(item)
+                    bucket = _batch(need)
+                    bucket.append(item)
+                    if len(bucket) >= self._storage_batch_size:
+                        await flush_batch(need)
+                await flush_all()
+
+            async def process_worker() -> None:
+                stopped = False
+                while not stopped:
+                    # take everything stored meanwhile as one batch
+                    items = [await process_q.get()]
+                    while not process_q.empty():
+                        items.append(process_q.get_nowait())
+
+                    chap_ids: list[str] = []
+                    for item in items:
+                        if isinstance(item, StopToken):
+                            stopped = True
+                        else:
+                            chap_ids.extend(item)
+                    if not chap_ids:
+                        continue
 
-                chap = await self.get_chapter(book_id, cid)
-                if chap is not None:
-                    await save_q.put(chap)
+                    try:
+                        await asyncio.to_thread(
+                            self._pc_process_chapters, book_id, segments, chap_ids
+                        )
+                    except Exception as e:
+                        # the remaining chapters are left to process_book
+                        logger.warning(
+                            "Stream processing failed (site=%s, book=%s): %s",
+                            self._site,
+                            book_id,
+                            e,
+                        )
+                        return
 
-                await async_jitter_sleep(
-                    base=self._request_interval,
-                    mul_spread=1.1,
-                    max_sleep=self._request_interval + 2,
-                )
+            async def producer(cid: str) -> None:
+                async with sem:
+                    if self._cache_chapter and not storage.need_refetch(cid):
+                        await bump(1)
+                        return
 
-        # ---- run tasks ---
-        with ChapterStorage(raw_base, filename="chapter.raw.sqlite") as storage:
+                    chap = await self.get_chapter(book_id, cid)
+                    if chap is not None:
+                        await save_q.put(chap)
+
+                    await async_jitter_sleep(
+                        base=self._request_interval,
+                        mul_spread=1.1,
+                        max_sleep=self._request_interval + 2,
+                    )
+
+            # ---- run tasks ---
             storage_task = asyncio.create_task(storage_worker())
+            process_task = asyncio.create_task(process_worker()) if segments else None
 
             try:
                 tasks = [asyncio.create_task(producer(cid)) for cid in plan]
@@ -199,6 +267,9 @@ async def producer(cid: str) -> None:
                 # signal storage to finish and wait for flush
                 await save_q.put(STOP)
                 await storage_task
+                if process_task:
+                    process_q.put_nowait(STOP)
+                    await process_task
             except asyncio.CancelledError:
                 logger.info("Download cancelled, stopping storage worker...")
                 await save_q.put(STOP)
@@ -210,13 +281,22 @@ async def producer(cid: str) -> None:
                     storage_task.cancel()
                     await asyncio.gather(storage_task, return_exceptions=True)
 
+                if process_task:
+                    process_q.put_nowait(STOP)
+                    try:
+                        await asyncio.wait_for(process_task, timeout=10)
+                    except TimeoutError:
+                        logger.warning("Process worker did not exit, cancelling.")
+
                 raise
             finally:
-                if not storage_task.done():
-                    storage_task.cancel()
-                    await asyncio.gather(storage_task, return_exceptions=True)
+                for task in (storage_task, process_task):
+                    if task and not task.done():
+                        task.cancel()
+                        await asyncio.gather(task, return_exceptions=True)
 
         # ---- done ---
+        self._si_auto_index(book_id)
         if ui:
             await ui.on_complete(book)
 
@@ -253,7 +333,7 @@ async def download_chapter(
             return
 
         # ---- save directly ----
-        with ChapterStorage(raw_base, filename="chapter.raw.sqlite") as storage:
+        with self._chapter_storage(book_id) as storage:
             need_refetch = self._dl_check_refetch(chap)
             try:
                 storage.upsert_chapters([chap], need_refetch=need_refetch)
@@ -310,7 +390,7 @@ async def cache_media(
             )
             return
 
-        with ChapterStorage(raw_base, filename="chapter.raw.sqlite") as storage:
+        with self._chapter_storage(book_id) as storage:
             chapters = storage.get_chapters(plan)
             for chap in chapters.values():
                 if chap is None:
@@ -519,6 +599,31 @@ async def _dl_fix_chapter_ids(
         self._save_book_info(book_id, book_info)
         return book_info
 
+    async def _dl_stream_segments(
+        self: "DownloadClientContext",
+        book_id: str,
+        processors: list[ProcessorConfig] | None,
+    ) -> list["StreamSegment"]:
+        """
+        Prepare the processor chain for streaming, if enabled.
+
+        Processors are built in a worker thread, since some load models or
+        compile large dictionaries. On failure the download runs without
+        streaming and `process_book` handles everything afterwards.
+        """
+        if not (self._stream_processing and processors):
+            return []
+        try:
+            return await asyncio.to_thread(self._pc_stream_segments, processors)
+        except Exception as e:
+            logger.warning(
+                "Stream processing disabled (site=%s, book=%s): %s",
+                self._site,
+                book_id,
+                e,
+            )
+            return []
+
     async def _dl_cache_info_images(
         self: "DownloadClientContext",
         book_id: str,
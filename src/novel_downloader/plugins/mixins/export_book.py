@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+novel_downloader.plugins.mixins.export_book
+-------------------------------------------
+
+Single-pass book export shared by the format mixins.
+
+The book info is loaded and filtered once, each volume's chapters are read
+from storage in one batch, and every chapter is handed to the writer of
+each requested format.
+"""
+
+import contextlib
+import logging
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from operator import methodcaller
+from pathlib import Path
+from typing import TYPE_CHECKING, Protocol
+
+from novel_downloader.infra.persistence.media_index import MediaCatalog
+from novel_downloader.libs.media.subset import FontSubsetter
+from novel_downloader.schemas import (
+    BookConfig,
+    BookInfoDict,
+    ChapterDict,
+    ExporterConfig,
+    VolumeInfoDict,
+)
+
+logger = logging.getLogger(__name__)
+
+
+if TYPE_CHECKING:
+    from novel_downloader.plugins.protocols import _ClientContext
+
+
+@dataclass(slots=True)
+class ExportSource:
+    """
+    The book being exported, as loaded by the export driver.
+    """
+
+    book_id: str
+    stage: str
+    book_info: BookInfoDict
+    media: MediaCatalog
+
+
+class BookWriter(Protocol):
+    """
+    One output format, fed the filtered book in reading order.
+    """
+
+    def start_volume(
+        self, v_idx: int, vol_title: str, volume: VolumeInfoDict
+    ) -> None: ...
+
+    def add_chapter(
+        self, cid: str, chap_title: str | None, chap: ChapterDict | None
+    ) -> None:
+        """
+        :param chap: The stored chapter, or None if it is missing.
+        """
+        ...
+
+    def end_volume(self) -> None: ...
+
+    def finish(self) -> list[Path]:
+        """
+        Write the output and return the created paths.
+        """
+        ...
+
+    def close(self) -> None:
+        """
+        Release resources; discards the output if `finish` was not reached.
+        """
+        ...
+
+
+BookWriterFactory = Callable[[ExportSource, ExporterConfig], BookWriter]
+
+
+class ExportBookMixin:
+    """
+    Drives book exports for one or more formats.
+    """
+
+    def _export_book_formats(
+        self: "_ClientContext",
+        book: BookConfig,
+        cfg: ExporterConfig,
+        factories: Mapping[str, BookWriterFactory],
+        *,
+        stage: str | None = None,
+    ) -> dict[str, list[Path] | Exception]:
+        """
+        Export a book to every format in `factories` in one pass.
+
+        A writer that raises is dropped and its exception is returned in
+        place of its paths; the other formats carry on.
+
+        :param factories: Format name -> writer factory.
+        :return: Format name -> created paths or the error it failed with.
+        """
+        book_id = book.book_id
+
+        # --- Load book data ---
+        raw_base = self._raw_data_dir / book_id
+        if not raw_base.is_dir():
+            return dict.fromkeys(factories, [])
+
+        stage = stage or self._detect_latest_stage(book_id)
+        book_info = self._load_book_info(book_id, stage=stage)
+
+        # --- Filter volumes & chapters ---
+        orig_vols = book_info.get("volumes", [])
+        vols = self._filter_volumes(
+            orig_vols, book.start_id, book.end_id, book.ignore_ids
+        )
+        if not vols:
+            logger.info(
+                "Nothing to do after filtering (site=%s, book=%s)", self._site, book_id
+            )
+            return dict.fromkeys(factories, [])
+
+        src = ExportSource(book_id, stage, book_info, MediaCatalog(raw_base / "media"))
+        results: dict[str, list[Path] | Exception] = {}
+        writers: dict[str, BookWriter] = {}
+
+        def _feed(call: Callable[[BookWriter], object]) -> None:
+            for fmt, writer in list(writers.items()):
+                try:
+                    call(writer)
+                except Exception as e:
+                    results[fmt] = e
+                    del writers[fmt]
+                    with contextlib.suppress(Exception):
+                        writer.close()
+
+        try:
+            for fmt, factory in factories.items():
+                try:
+                    writers[fmt] = factory(src, cfg)
+                except Exception as e:
+                    results[fmt] = e
+
+            with self._open_stage_storage(book_id, stage) as storage:
+                for v_idx, vol in enumerate(vols, start=1):
+                    if not writers:
+                        break
+                    vol_title = vol.get("volume_name") or f"卷 {v_idx}"
+                    _feed(methodcaller("start_volume", v_idx, vol_title, vol))
+
+                    # Collect chapter ids then batch fetch
+                    chapters = [
+                        c for c in vol.get("chapters", []) if c.get("chapterId")
+                    ]
+                    cids = [c["chapterId"] for c in chapters]
+                    chap_map = storage.get_chapters(cids) if cids else {}
+                    for ch_info in chapters:
+                        cid = ch_info["chapterId"]
+                        _feed(
+                            methodcaller(
+                                "add_chapter",
+                                cid,
+                                ch_info.get("title"),
+                                chap_map.get(cid),
+                            )
+                        )
+
+                    _feed(methodcaller("end_volume"))
+
+            for fmt, writer in writers.items():
+                try:
+                    results[fmt] = writer.finish()
+                except Exception as e:
+                    results[fmt] = e
+        finally:
+            for writer in writers.values():
+                with contextlib.suppress(Exception):
+                    writer.close()
+            src.media.flush()
+
+        return {fmt: results.get(fmt, []) for fmt in factories}
+
+    def _export_font_subsetter(
+        self: "_ClientContext", cfg: ExporterConfig
+    ) -> FontSubsetter | None:
+        """
+        Return a subsetter for the configured font options, or None if
+        fonts are embedded as downloaded.
+        """
+        if not cfg.font_subset and cfg.font_format == "original":
+            return None
+        return FontSubsetter(
+            self._cache_dir / "font_subsets",
+            subset=cfg.font_subset,
+            format=cfg.font_format,
+            workers=cfg.font_workers,
+        )
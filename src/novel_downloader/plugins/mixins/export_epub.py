@@ -5,12 +5,17 @@
 """
 
 import base64
+import contextlib
 import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
 from html import escape
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Protocol
 
-from novel_downloader.infra.persistence.chapter_storage import ChapterStorage
+from novel_downloader.infra.persistence.media_index import MediaCatalog
+from novel_downloader.infra.persistence.stage_storage import LayeredChapterStorage
 from novel_downloader.libs.epub_builder import EpubBuilder, EpubChapter, EpubVolume
 from novel_downloader.libs.filesystem import (
     font_filename,
@@ -18,13 +23,20 @@
     image_filename,
     sanitize_filename,
 )
+from novel_downloader.libs.media.subset import FontSubsetter
+from novel_downloader.libs.media.transcode import ImageTranscoder, TranscodeParams
 from novel_downloader.schemas import (
     BookConfig,
+    BookInfoDict,
     ChapterDict,
+    ClientConfig,
     ExporterConfig,
     MediaResource,
+    VolumeInfoDict,
 )
 
+from .export_book import BookWriter, ExportSource
+
 logger = logging.getLogger(__name__)
 
 
@@ -43,7 +55,7 @@ def _xp_epub_chapter(
             cid: str,
             chap_title: str | None,
             chap: ChapterDict,
-            media_dir: Path,
+            media: MediaCatalog,
             include_picture: bool = True,
         ) -> EpubChapter: ...
 
@@ -56,6 +68,47 @@ def _xp_epub_missing_chapter(
 
         def _xp_epub_extras(self, extras: dict[str, Any]) -> str: ...
 
+        def _epub_manifest_path(self, book_id: str, part: str) -> Path: ...
+
+        def _epub_export_volumes_parallel(
+            self,
+            book_id: str,
+            stage: str,
+            book_info: BookInfoDict,
+            volumes: list[tuple[int, VolumeInfoDict]],
+            cfg: ExporterConfig,
+        ) -> list[Path]: ...
+
+        def _epub_volume_path(
+            self,
+            book_info: BookInfoDict,
+            v_idx: int,
+            vol: VolumeInfoDict,
+            cfg: ExporterConfig,
+        ) -> Path: ...
+
+        def _epub_write_volume(
+            self,
+            book_id: str,
+            book_info: BookInfoDict,
+            v_idx: int,
+            vol: VolumeInfoDict,
+            cfg: ExporterConfig,
+            *,
+            storage: LayeredChapterStorage,
+            media: MediaCatalog,
+            transcoder: ImageTranscoder | None = None,
+            subsetter: FontSubsetter | None = None,
+        ) -> Path: ...
+
+        def _epub_image_transcoder(
+            self, cfg: ExporterConfig
+        ) -> ImageTranscoder | None: ...
+
+        def _xp_epub_book_writer(
+            self, src: ExportSource, cfg: ExporterConfig
+        ) -> BookWriter: ...
+
         def _xp_epub_chap_post(
             self, html_parts: list[str], chap: ChapterDict
         ) -> list[str]: ...
@@ -76,6 +129,8 @@ def _export_volume_epub(
     ) -> list[Path]:
         """
         Export each volume of a novel as a separate EPUB file.
+
+        With `export_workers > 1` the volumes are built in worker processes.
         """
         book_id = book.book_id
         start_id = book.start_id
@@ -87,8 +142,6 @@ def _export_volume_epub(
         if not raw_base.is_dir():
             return []
 
-        media_dir = raw_base / "media"
-
         stage = stage or self._detect_latest_stage(book_id)
         book_info = self._load_book_info(book_id, stage=stage)
 
@@ -101,231 +154,279 @@ def _export_volume_epub(
             )
             return []
 
-        # --- Prepare header (book metadata) ---
-        name = book_info["book_name"]
-        author = book_info.get("author") or ""
-        book_summary = book_info.get("summary", "")
-
-        # --- Generate intro + cover ---
-        cover_path = self._resolve_image_path(media_dir, book_info.get("cover_url"))
+        volumes = [
+            (v_idx, vol)
+            for v_idx, vol in enumerate(vols, start=1)
+            if any(c.get("chapterId") for c in vol.get("chapters", []))
+        ]
+        if min(cfg.export_workers, len(volumes)) > 1:
+            return self._epub_export_volumes_parallel(
+                book_id, stage, book_info, volumes, cfg
+            )
 
         # --- Compile columes ---
         outputs: list[Path] = []
-        with ChapterStorage(raw_base, filename=f"chapter.{stage}.sqlite") as storage:
-            for v_idx, vol in enumerate(vols, start=1):
-                vol_title = vol.get("volume_name") or f"卷 {v_idx}"
-
-                vol_cover = self._resolve_image_path(media_dir, vol.get("volume_cover"))
-                vol_cover = vol_cover or cover_path
-
-                builder = EpubBuilder(
-                    title=f"{name} - {vol_title}",
-                    author=author,
-                    description=vol.get("volume_intro") or book_summary,
-                    cover_path=vol_cover,
-                    subject=book_info.get("tags", []),
-                    serial_status=book_info.get("serial_status", ""),
-                    word_count=vol.get("word_count", ""),
-                    uid=f"{self._site}_{book_id}_v{v_idx}",
-                )
-
-                # Collect chapter ids then batch fetch
-                cids = [
-                    c["chapterId"]
-                    for c in vol.get("chapters", [])
-                    if c.get("chapterId")
-                ]
-                if not cids:
-                    continue
-                chap_map = storage.get_chapters(cids)
-
-                # Append each chapter
-                seen_cids: set[str] = set()
-                for ch_info in vol.get("chapters", []):
-                    cid = ch_info.get("chapterId")
-                    ch_title = ch_info.get("title")
-                    if not cid or cid in seen_cids:
-                        continue
-
-                    ch = chap_map.get(cid)
-                    if not ch:
-                        if cfg.render_missing_chapter:
-                            chapter_obj = self._xp_epub_missing_chapter(
-                                cid=cid,
-                                chap_title=ch_title,
-                            )
-                            builder.add_chapter(chapter_obj)
-                            seen_cids.add(cid)
-                        continue
-
-                    chapter_obj = self._xp_epub_chapter(
-                        book=builder,
-                        cid=cid,
-                        chap_title=ch_title,
-                        chap=ch,
-                        media_dir=media_dir,
-                        include_picture=cfg.include_picture,
-                    )
-                    builder.add_chapter(chapter_obj)
-                    seen_cids.add(cid)
-
-                out_name = format_filename(
-                    cfg.filename_template,
-                    title=vol_title,
-                    author=author,
-                    append_timestamp=cfg.append_timestamp,
-                    ext="epub",
-                )
-                out_path = self._output_dir / sanitize_filename(out_name)
-
+        media = MediaCatalog(raw_base / "media")
+        transcoder = self._epub_image_transcoder(cfg)
+        subsetter = self._export_font_subsetter(cfg)
+        with (
+            media,
+            transcoder or contextlib.nullcontext(),
+            subsetter or contextlib.nullcontext(),
+            self._open_stage_storage(book_id, stage) as storage,
+        ):
+            for v_idx, vol in volumes:
                 try:
-                    outputs.append(builder.export(out_path))
-                    logger.info(
-                        "Exported EPUB (site=%s, book=%s): %s",
-                        self._site,
+                    out_path = self._epub_write_volume(
                         book_id,
-                        out_path,
+                        book_info,
+                        v_idx,
+                        vol,
+                        cfg,
+                        storage=storage,
+                        media=media,
+                        transcoder=transcoder,
+                        subsetter=subsetter,
                     )
                 except Exception as e:
                     logger.error(
-                        "Failed to write EPUB (site=%s, book=%s) to %s: %s",
+                        "Failed to write EPUB (site=%s, book=%s) for volume %s: %s",
                         self._site,
                         book_id,
-                        out_path,
+                        vol.get("volume_name") or f"卷 {v_idx}",
                         e,
                     )
+                    continue
+                logger.info(
+                    "Exported EPUB (site=%s, book=%s): %s",
+                    self._site,
+                    book_id,
+                    out_path,
+                )
+                outputs.append(out_path)
         return outputs
 
-    def _export_book_epub(
+    def _epub_export_volumes_parallel(
         self: "ExportEpubClientContext",
-        book: BookConfig,
+        book_id: str,
+        stage: str,
+        book_info: BookInfoDict,
+        volumes: list[tuple[int, VolumeInfoDict]],
         cfg: ExporterConfig,
-        *,
-        stage: str | None = None,
-        **kwargs: Any,
     ) -> list[Path]:
         """
-        Export a single novel (identified by `book_id`) to an EPUB file.
-        """
-        book_id = book.book_id
-        start_id = book.start_id
-        end_id = book.end_id
-        ignore_set = book.ignore_ids
-
-        # --- Load book data ---
-        raw_base = self._raw_data_dir / book_id
-        if not raw_base.is_dir():
-            return []
+        Build volume EPUBs in a process pool; outputs keep the volume order.
 
-        media_dir = raw_base / "media"
+        Each worker rebuilds the client from its class and configuration,
+        so site overrides of the `_xp_epub_*` hooks apply there too.
 
-        stage = stage or self._detect_latest_stage(book_id)
-        book_info = self._load_book_info(book_id, stage=stage)
+        Volumes that map to the same file are written one after another,
+        in volume order, as the sequential export would.
+        """
+        workers = min(cfg.export_workers, len(volumes))
+        logger.debug(
+            "Exporting %d volume EPUBs with %d workers (site=%s, book=%s)",
+            len(volumes),
+            workers,
+            self._site,
+            book_id,
+        )
+        # volumes already run side by side; nested pools would oversubscribe
+        job_cfg = replace(cfg, export_workers=1, image_workers=1, font_workers=1)
+        spec = (type(self), self._site, self._config)
+
+        # two writers on one `.epub.part` corrupt it: the n-th volume of each
+        # output path goes into round n. Timestamps may differ between
+        # workers, so paths are compared without them.
+        rounds: list[list[tuple[int, VolumeInfoDict]]] = []
+        seen: dict[Path, int] = {}
+        bare_cfg = replace(cfg, append_timestamp=False)
+        for v_idx, vol in volumes:
+            path = self._epub_volume_path(book_info, v_idx, vol, bare_cfg)
+            n = seen.get(path, 0)
+            seen[path] = n + 1
+            if n == len(rounds):
+                rounds.append([])
+            rounds[n].append((v_idx, vol))
+
+        written: dict[int, Path] = {}
+        with ProcessPoolExecutor(
+            workers, mp_context=multiprocessing.get_context("spawn")
+        ) as pool:
+            for batch in rounds:
+                futures = [
+                    pool.submit(
+                        _export_volume_in_worker,
+                        spec,
+                        book_id,
+                        stage,
+                        book_info,
+                        v_idx,
+                        vol,
+                        job_cfg,
+                    )
+                    for v_idx, vol in batch
+                ]
+                for (v_idx, vol), future in zip(batch, futures, strict=True):
+                    try:
+                        out_path = future.result()
+                    except Exception as e:
+                        logger.error(
+                            "Failed to write EPUB (site=%s, book=%s) for volume %s: %s",
+                            self._site,
+                            book_id,
+                            vol.get("volume_name") or f"卷 {v_idx}",
+                            e,
+                        )
+                        continue
+                    logger.info(
+                        "Exported EPUB (site=%s, book=%s): %s",
+                        self._site,
+                        book_id,
+                        out_path,
+                    )
+                    written[v_idx] = out_path
+        return [written[v_idx] for v_idx, _ in volumes if v_idx in written]
 
-        # --- Filter volumes & chapters ---
-        orig_vols = book_info.get("volumes", [])
-        vols = self._filter_volumes(orig_vols, start_id, end_id, ignore_set)
-        if not vols:
-            logger.info(
-                "Nothing to do after filtering (site=%s, book=%s)", self._site, book_id
-            )
-            return []
+    def _epub_volume_path(
+        self: "ExportEpubClientContext",
+        book_info: BookInfoDict,
+        v_idx: int,
+        vol: VolumeInfoDict,
+        cfg: ExporterConfig,
+    ) -> Path:
+        """
+        Path of the standalone EPUB written for one volume.
+        """
+        out_name = format_filename(
+            cfg.filename_template,
+            title=vol.get("volume_name") or f"卷 {v_idx}",
+            author=book_info.get("author") or "",
+            append_timestamp=cfg.append_timestamp,
+            ext="epub",
+        )
+        return self._output_dir / sanitize_filename(out_name)
 
+    def _epub_write_volume(
+        self: "ExportEpubClientContext",
+        book_id: str,
+        book_info: BookInfoDict,
+        v_idx: int,
+        vol: VolumeInfoDict,
+        cfg: ExporterConfig,
+        *,
+        storage: LayeredChapterStorage,
+        media: MediaCatalog,
+        transcoder: ImageTranscoder | None = None,
+        subsetter: FontSubsetter | None = None,
+    ) -> Path:
+        """
+        Write one volume as a standalone EPUB and return its path.
+        """
         # --- Prepare header (book metadata) ---
         name = book_info["book_name"]
         author = book_info.get("author") or ""
+        book_summary = book_info.get("summary", "")
+        vol_title = vol.get("volume_name") or f"卷 {v_idx}"
 
         # --- Generate intro + cover ---
         cover_path = self._resolve_image_path(
-            media_dir, book_info.get("cover_url"), name="cover"
-        )
-
-        # --- Initialize EPUB ---
-        builder = EpubBuilder(
-            title=name,
-            author=author,
-            description=book_info.get("summary", ""),
-            cover_path=cover_path,
-            subject=book_info.get("tags", []),
-            serial_status=book_info.get("serial_status", ""),
-            word_count=book_info.get("word_count", ""),
-            uid=f"{self._site}_{book_id}",
+            media.media_dir, book_info.get("cover_url")
         )
+        vol_cover = self._resolve_image_path(media.media_dir, vol.get("volume_cover"))
+        vol_cover = vol_cover or cover_path
+
+        # Collect chapter ids then batch fetch
+        cids = [c["chapterId"] for c in vol.get("chapters", []) if c.get("chapterId")]
+        chap_map = storage.get_chapters(cids)
+
+        out_path = self._epub_volume_path(book_info, v_idx, vol, cfg)
+
+        builder: EpubBuilder | None = None
+        try:
+            builder = EpubBuilder(
+                title=f"{name} - {vol_title}",
+                author=author,
+                description=vol.get("volume_intro") or book_summary,
+                cover_path=vol_cover,
+                subject=book_info.get("tags", []),
+                serial_status=book_info.get("serial_status", ""),
+                word_count=vol.get("word_count", ""),
+                uid=f"{self._site}_{book_id}_v{v_idx}",
+                stream_to=out_path,
+                compress_level=cfg.compress_level,
+                compress_workers=cfg.compress_workers,
+                manifest_path=(
+                    self._epub_manifest_path(book_id, f"v{v_idx}")
+                    if cfg.incremental
+                    else None
+                ),
+                image_transcoder=transcoder,
+                font_subsetter=subsetter,
+            )
 
-        # --- Compile columes ---
-        seen_cids: set[str] = set()
-        with ChapterStorage(raw_base, filename=f"chapter.{stage}.sqlite") as storage:
-            for v_idx, vol in enumerate(vols, start=1):
-                vol_title = vol.get("volume_name") or f"卷 {v_idx}"
-
-                vol_cover = self._resolve_image_path(media_dir, vol.get("volume_cover"))
-
-                curr_vol = EpubVolume(
-                    id=f"vol_{v_idx}",
-                    title=vol_title,
-                    intro=vol.get("volume_intro", ""),
-                    cover_path=vol_cover,
-                )
-
-                # Collect chapter ids then batch fetch
-                cids = [
-                    c["chapterId"]
-                    for c in vol.get("chapters", [])
-                    if c.get("chapterId")
-                ]
-                if not cids:
-                    builder.add_volume(curr_vol)
+            # Append each chapter
+            seen_cids: set[str] = set()
+            for ch_info in vol.get("chapters", []):
+                cid = ch_info.get("chapterId")
+                ch_title = ch_info.get("title")
+                if not cid or cid in seen_cids:
                     continue
-                chap_map = storage.get_chapters(cids)
 
-                # Append each chapter
-                for ch_info in vol.get("chapters", []):
-                    cid = ch_info.get("chapterId")
-                    ch_title = ch_info.get("title")
-                    if not cid or cid in seen_cids:
-                        continue
-
-                    ch = chap_map.get(cid)
-                    if not ch:
-                        if cfg.render_missing_chapter:
-                            chapter_obj = self._xp_epub_missing_chapter(
-                                cid=cid,
-                                chap_title=ch_title,
-                            )
-                            curr_vol.chapters.append(chapter_obj)
-                            seen_cids.add(cid)
-                        continue
-
-                    chapter_obj = self._xp_epub_chapter(
-                        book=builder,
-                        cid=cid,
-                        chap_title=ch_title,
-                        chap=ch,
-                        media_dir=media_dir,
-                        include_picture=cfg.include_picture,
-                    )
+                ch = chap_map.get(cid)
+                if not ch:
+                    if cfg.render_missing_chapter:
+                        chapter_obj = self._xp_epub_missing_chapter(
+                            cid=cid,
+                            chap_title=ch_title,
+                        )
+                        builder.add_chapter(chapter_obj)
+                        seen_cids.add(cid)
+                    continue
 
-                    curr_vol.chapters.append(chapter_obj)
-                    seen_cids.add(cid)
+                chapter_obj = self._xp_epub_chapter(
+                    book=builder,
+                    cid=cid,
+                    chap_title=ch_title,
+                    chap=ch,
+                    media=media,
+                    include_picture=cfg.include_picture,
+                )
+                builder.add_chapter(chapter_obj)
+                seen_cids.add(cid)
 
-                if curr_vol.chapters:
-                    builder.add_volume(curr_vol)
+            return builder.export()
+        finally:
+            if builder is not None:
+                builder.close()
 
-        # --- Finalize EPUB ---
-        out_name = format_filename(
-            cfg.filename_template,
-            title=name,
-            author=author,
-            append_timestamp=cfg.append_timestamp,
-            ext="epub",
-        )
-        out_path = self._output_dir / sanitize_filename(out_name)
-
-        builder.export(out_path)
-        logger.info(
-            "Exported EPUB (site=%s, book=%s): %s", self._site, book_id, out_path
-        )
-        return [out_path]
+    def _export_book_epub(
+        self: "ExportEpubClientContext",
+        book: BookConfig,
+        cfg: ExporterConfig,
+        *,
+        stage: str | None = None,
+        **kwargs: Any,
+    ) -> list[Path]:
+        """
+        Export a single novel (identified by `book_id`) to an EPUB file.
+        """
+        result = self._export_book_formats(
+            book, cfg, {"epub": self._xp_epub_book_writer}, stage=stage
+        )["epub"]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def _xp_epub_book_writer(
+        self: "ExportEpubClientContext",
+        src: ExportSource,
+        cfg: ExporterConfig,
+    ) -> BookWriter:
+        """
+        Return the EPUB writer used by the book export driver.
+        """
+        return _EpubBookWriter(self, src, cfg)
 
     def _export_chapter_epub(
         self: "ExportEpubClientContext",
@@ -341,23 +442,23 @@ def _export_chapter_epub(
         if not raw_base.is_dir():
             return None
 
-        media_dir = raw_base / "media"
+        media = MediaCatalog(raw_base / "media")
 
         # --- detect stage ---
         stage = stage or self._detect_latest_stage(book_id)
 
         # --- load chapter ---
-        dbfile = raw_base / f"chapter.{stage}.sqlite"
-        if not dbfile.exists():
+        if not self._has_stage_data(book_id, stage):
             return None
 
-        with ChapterStorage(raw_base, filename=f"chapter.{stage}.sqlite") as storage:
+        with self._open_stage_storage(book_id, stage) as storage:
             chap = storage.get_chapter(chapter_id)
 
         if chap is None:
             return None
 
         chap_title = (chap.get("title") or f"chapter_{chapter_id}").strip()
+        subsetter = self._export_font_subsetter(cfg)
 
         builder = EpubBuilder(
             title=chap_title,
@@ -368,17 +469,20 @@ def _export_chapter_epub(
             serial_status="",
             word_count="0",
             uid=f"{self._site}_{book_id}_{chapter_id}",
+            compress_level=cfg.compress_level,
+            font_subsetter=subsetter,
         )
 
         # --- build chapter XHTML ---
-        chapter_obj = self._xp_epub_chapter(
-            book=builder,
-            cid=chapter_id,
-            chap_title=chap_title,
-            chap=chap,
-            media_dir=media_dir,
-            include_picture=cfg.include_picture,
-        )
+        with media:
+            chapter_obj = self._xp_epub_chapter(
+                book=builder,
+                cid=chapter_id,
+                chap_title=chap_title,
+                chap=chap,
+                media=media,
+                include_picture=cfg.include_picture,
+            )
 
         builder.add_chapter(chapter_obj)
 
@@ -394,7 +498,8 @@ def _export_chapter_epub(
         out_path = self._output_dir / sanitize_filename(out_name)
 
         # --- export epub ---
-        builder.export(out_path)
+        with subsetter or contextlib.nullcontext():
+            builder.export(out_path)
 
         logger.info(
             "Exported EPUB chapter (site=%s, book=%s, chapter=%s): %s",
@@ -405,6 +510,33 @@ def _export_chapter_epub(
         )
         return out_path
 
+    def _epub_manifest_path(
+        self: "ExportEpubClientContext", book_id: str, part: str
+    ) -> Path:
+        """
+        Return where the incremental export manifest of a book part is kept.
+        """
+        return self._book_dir(book_id) / f"epub_manifest.{part}.json"
+
+    def _epub_image_transcoder(
+        self: "ExportEpubClientContext", cfg: ExporterConfig
+    ) -> ImageTranscoder | None:
+        """
+        Return a transcoder for the configured image options, or None if
+        images are embedded as downloaded.
+        """
+        params = TranscodeParams(
+            format=cfg.image_format,
+            max_width=cfg.image_max_width,
+            max_height=cfg.image_max_height,
+            quality=cfg.image_quality,
+        )
+        if not params.enabled:
+            return None
+        return ImageTranscoder(
+            self._cache_dir / "images", params, workers=cfg.image_workers
+        )
+
     def _xp_epub_chapter(
         self: "ExportEpubClientContext",
         *,
@@ -412,7 +544,7 @@ def _xp_epub_chapter(
         cid: str,
         chap_title: str | None,
         chap: ChapterDict,
-        media_dir: Path,
+        media: MediaCatalog,
         include_picture: bool = True,
     ) -> EpubChapter:
         """
@@ -433,9 +565,11 @@ def _append_image(res: MediaResource) -> None:
             fname: str | None = None
             try:
                 if url := res.get("url"):
-                    local = media_dir / image_filename(url)
-                    if local and local.is_file():
-                        fname = book.add_image(local)
+                    info = media.lookup(image_filename(url))
+                    if info is not None:
+                        fname = book.add_image(
+                            media.path(info.filename), digest=info.digest
+                        )
 
                 elif b64 := res.get("base64"):
                     mime = res.get("mime", "image/png")
@@ -448,7 +582,7 @@ def _append_image(res: MediaResource) -> None:
                     html_parts.append(self._IMAGE_WRAPPER.format(img=tag))
 
             except Exception as e:
-                logger.debug("EPUB image add failed: %s", e)
+                logger.warning("EPUB image add failed: %s", e)
 
         for r in resources:
             typ = r.get("type")
@@ -456,8 +590,12 @@ def _append_image(res: MediaResource) -> None:
             if typ == "font":
                 try:
                     if url := r.get("url"):
-                        local = media_dir / font_filename(url)
-                        if local.is_file() and (f := book.add_font(local)):
+                        info = media.lookup(font_filename(url), "font")
+                        if info is not None and (
+                            f := book.add_font(
+                                media.path(info.filename), digest=info.digest
+                            )
+                        ):
                             added_fonts.append(f)
 
                     elif b64 := r.get("base64"):
@@ -466,7 +604,7 @@ def _append_image(res: MediaResource) -> None:
                             added_fonts.append(f)
 
                 except Exception as e:
-                    logger.debug("EPUB font add failed: %s", e)
+                    logger.warning("EPUB font add failed: %s", e)
 
             elif typ == "image" and include_picture:
                 idx = r.get("paragraph_index", max_i)
@@ -532,3 +670,190 @@ def _xp_epub_extras(self, extras: dict[str, Any]) -> str:
     def _xp_epub_chap_post(self, html_parts: list[str], chap: ChapterDict) -> list[str]:
         """Allows subclasses to inject HTML or modify structure."""
         return html_parts
+
+
+def _export_volume_in_worker(
+    spec: tuple[type, str, ClientConfig],
+    book_id: str,
+    stage: str,
+    book_info: BookInfoDict,
+    v_idx: int,
+    vol: VolumeInfoDict,
+    cfg: ExporterConfig,
+) -> Path:
+    """
+    Build one volume EPUB in a worker process.
+
+    The client class is passed rather than looked up by name so that
+    clients from local plugins resolve under every start method.
+    """
+    cls, site, client_cfg = spec
+    client: ExportEpubClientContext = cls(site, client_cfg)
+    media = MediaCatalog(client._raw_data_dir / book_id / "media")
+    transcoder = client._epub_image_transcoder(cfg)
+    subsetter = client._export_font_subsetter(cfg)
+    with (
+        media,
+        transcoder or contextlib.nullcontext(),
+        subsetter or contextlib.nullcontext(),
+        client._open_stage_storage(book_id, stage) as storage,
+    ):
+        return client._epub_write_volume(
+            book_id,
+            book_info,
+            v_idx,
+            vol,
+            cfg,
+            storage=storage,
+            media=media,
+            transcoder=transcoder,
+            subsetter=subsetter,
+        )
+
+
+class _EpubBookWriter:
+    """
+    Streams the book into a single EPUB file.
+    """
+
+    def __init__(
+        self,
+        client: "ExportEpubClientContext",
+        src: ExportSource,
+        cfg: ExporterConfig,
+    ) -> None:
+        self._client = client
+        self._src = src
+        self._cfg = cfg
+
+        # --- Prepare header (book metadata) ---
+        book_info = src.book_info
+        name = book_info["book_name"]
+        author = book_info.get("author") or ""
+
+        # --- Generate intro + cover ---
+        cover_path = client._resolve_image_path(
+            src.media.media_dir, book_info.get("cover_url"), name="cover"
+        )
+
+        # --- Initialize EPUB ---
+        out_name = format_filename(
+            cfg.filename_template,
+            title=name,
+            author=author,
+            append_timestamp=cfg.append_timestamp,
+            ext="epub",
+        )
+        self._out_path = client._output_dir / sanitize_filename(out_name)
+
+        # chapters and media are written to the archive as they are added
+        self._transcoder = client._epub_image_transcoder(cfg)
+        self._subsetter: FontSubsetter | None = None
+        try:
+            self._subsetter = client._export_font_subsetter(cfg)
+            self._builder = EpubBuilder(
+                title=name,
+                author=author,
+                description=book_info.get("summary", ""),
+                cover_path=cover_path,
+                subject=book_info.get("tags", []),
+                serial_status=book_info.get("serial_status", ""),
+                word_count=book_info.get("word_count", ""),
+                uid=f"{client._site}_{src.book_id}",
+                stream_to=self._out_path,
+                compress_level=cfg.compress_level,
+                compress_workers=cfg.compress_workers,
+                manifest_path=(
+                    client._epub_manifest_path(src.book_id, "book")
+                    if cfg.incremental
+                    else None
+                ),
+                image_transcoder=self._transcoder,
+                font_subsetter=self._subsetter,
+            )
+        except BaseException:
+            self._close_workers()
+            raise
+        self._seen_cids: set[str] = set()
+        self._vol: EpubVolume | None = None
+        self._vol_started = False
+        self._vol_has_ids = False
+
+    def start_volume(self, v_idx: int, vol_title: str, volume: VolumeInfoDict) -> None:
+        self._vol = EpubVolume(
+            id=f"vol_{v_idx}",
+            title=vol_title,
+            intro=volume.get("volume_intro", ""),
+            cover_path=self._client._resolve_image_path(
+                self._src.media.media_dir, volume.get("volume_cover")
+            ),
+        )
+        self._vol_started = False
+        self._vol_has_ids = False
+
+    def add_chapter(
+        self, cid: str, chap_title: str | None, chap: ChapterDict | None
+    ) -> None:
+        self._vol_has_ids = True
+        if cid in self._seen_cids:
+            return
+
+        if chap is not None:
+            chapter_obj = self._client._xp_epub_chapter(
+                book=self._builder,
+                cid=cid,
+                chap_title=chap_title,
+                chap=chap,
+                media=self._src.media,
+                include_picture=self._cfg.include_picture,
+            )
+        elif self._cfg.render_missing_chapter:
+            chapter_obj = self._client._xp_epub_missing_chapter(
+                cid=cid, chap_title=chap_title
+            )
+        else:
+            return
+
+        # the volume is opened by its first chapter, so volumes whose
+        # chapters are all skipped are left out
+        if not self._vol_started and self._vol is not None:
+            self._builder.start_volume(self._vol)
+            self._vol_started = True
+        self._builder.add_chapter(chapter_obj)
+        self._seen_cids.add(cid)
+
+    def end_volume(self) -> None:
+        if self._vol is not None and not self._vol_has_ids:
+            # volumes without any chapter ids keep their title page
+            self._builder.add_volume(self._vol)
+        self._builder.end_volume()
+        self._vol = None
+
+    def finish(self) -> list[Path]:
+        # --- Finalize EPUB ---
+        client, builder = self._client, self._builder
+        builder.export()
+        logger.info(
+            "Exported EPUB (site=%s, book=%s): %s",
+            client._site,
+            self._src.book_id,
+            self._out_path,
+        )
+        if builder.reused_members:
+            logger.debug(
+                "Reused %d unchanged EPUB members (site=%s, book=%s)",
+                builder.reused_members,
+                client._site,
+                self._src.book_id,
+            )
+        return [self._out_path]
+
+    def close(self) -> None:
+        self._builder.close()
+        self._close_workers()
+
+    def _close_workers(self) -> None:
+        if self._transcoder is not None:
+            self._transcoder.close()
+        if self._subsetter is not None:
+            self._subsetter.close()
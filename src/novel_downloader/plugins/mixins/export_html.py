@@ -5,12 +5,13 @@
 """
 
 import base64
+import contextlib
 import logging
 from html import escape
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Protocol
 
-from novel_downloader.infra.persistence.chapter_storage import ChapterStorage
+from novel_downloader.infra.persistence.media_index import MediaCatalog
 from novel_downloader.libs.filesystem import (
     font_filename,
     format_filename,
@@ -22,8 +23,11 @@
     ChapterDict,
     ExporterConfig,
     MediaResource,
+    VolumeInfoDict,
 )
 
+from .export_book import BookWriter, ExportSource
+
 logger = logging.getLogger(__name__)
 
 
@@ -40,7 +44,7 @@ def _xp_html_chapter(
             cid: str,
             chap_title: str | None,
             chap: ChapterDict,
-            media_dir: Path | None = None,
+            media: MediaCatalog,
         ) -> HtmlChapter: ...
 
         def _xp_html_missing_chapter(
@@ -56,6 +60,10 @@ def _xp_html_chap_post(
             self, html_parts: list[str], chap: ChapterDict
         ) -> list[str]: ...
 
+        def _xp_html_book_writer(
+            self, src: ExportSource, cfg: ExporterConfig
+        ) -> BookWriter: ...
+
 
 class ExportHtmlMixin:
     """"""
@@ -71,110 +79,22 @@ def _export_book_html(
         """
         Export a novel as HTML files.
         """
-        book_id = book.book_id
-        start_id = book.start_id
-        end_id = book.end_id
-        ignore_set = book.ignore_ids
-
-        # --- Load book data ---
-        raw_base = self._raw_data_dir / book_id
-        if not raw_base.is_dir():
-            return []
-
-        media_dir = raw_base / "media"
-
-        stage = stage or self._detect_latest_stage(book_id)
-        book_info = self._load_book_info(book_id, stage=stage)
-
-        # --- Filter volumes & chapters ---
-        orig_vols = book_info.get("volumes", [])
-        vols = self._filter_volumes(orig_vols, start_id, end_id, ignore_set)
-        if not vols:
-            logger.info(
-                "Nothing to do after filtering (site=%s, book=%s)", self._site, book_id
-            )
-            return []
-
-        # --- Prepare header (book metadata) ---
-        name = book_info["book_name"]
-        author = book_info.get("author") or ""
-        cover_path = self._resolve_image_path(
-            media_dir, book_info.get("cover_url"), name="cover"
-        )
-        cover = cover_path.read_bytes() if cover_path else None
-
-        # --- Initialize EPUB ---
-        builder = HtmlBuilder(
-            title=name,
-            author=author,
-            description=book_info.get("summary", ""),
-            cover=cover,
-            subject=book_info.get("tags", []),
-            serial_status=book_info.get("serial_status", ""),
-            word_count=book_info.get("word_count", ""),
-        )
-
-        # --- Compile columes ---
-        with ChapterStorage(raw_base, filename=f"chapter.{stage}.sqlite") as storage:
-            for v_idx, vol in enumerate(vols, start=1):
-                vol_title = vol.get("volume_name") or f"卷 {v_idx}"
-
-                curr_vol = HtmlVolume(
-                    title=vol_title,
-                    intro=vol.get("volume_intro", ""),
-                )
-
-                # Collect chapter ids then batch fetch
-                cids = [
-                    c["chapterId"]
-                    for c in vol.get("chapters", [])
-                    if c.get("chapterId")
-                ]
-                if not cids:
-                    continue
-                chap_map = storage.get_chapters(cids)
-
-                # Append each chapter
-                for ch_info in vol.get("chapters", []):
-                    cid = ch_info.get("chapterId")
-                    ch_title = ch_info.get("title")
-                    if not cid:
-                        continue
-
-                    ch = chap_map.get(cid)
-                    if not ch:
-                        if cfg.render_missing_chapter:
-                            chapter_obj = self._xp_html_missing_chapter(
-                                cid=cid,
-                                chap_title=ch_title,
-                            )
-                            curr_vol.chapters.append(chapter_obj)
-                        continue
-
-                    chapter_obj = self._xp_html_chapter(
-                        builder=builder,
-                        cid=cid,
-                        chap_title=ch_title,
-                        chap=ch,
-                        media_dir=media_dir,
-                    )
-
-                    curr_vol.chapters.append(chapter_obj)
-
-                if curr_vol.chapters:
-                    builder.add_volume(curr_vol)
-
-        out_name = format_filename(
-            cfg.filename_template,
-            title=name,
-            author=author,
-            append_timestamp=cfg.append_timestamp,
-        )
-        out_path = builder.export(self._output_dir, folder=out_name)
-        logger.info(
-            "Exported HTML (site=%s, book=%s): %s", self._site, book_id, out_path
-        )
-        return [out_path]
+        result = self._export_book_formats(
+            book, cfg, {"html": self._xp_html_book_writer}, stage=stage
+        )["html"]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def _xp_html_book_writer(
+        self: "ExportHtmlClientContext",
+        src: ExportSource,
+        cfg: ExporterConfig,
+    ) -> BookWriter:
+        """
+        Return the HTML writer used by the book export driver.
+        """
+        return _HtmlBookWriter(self, src, cfg)
 
     def _export_chapter_html(
         self: "ExportHtmlClientContext",
@@ -194,11 +114,10 @@ def _export_chapter_html(
         stage = stage or self._detect_latest_stage(book_id)
 
         # --- load chapter ---
-        dbfile = raw_base / f"chapter.{stage}.sqlite"
-        if not dbfile.exists():
+        if not self._has_stage_data(book_id, stage):
             return None
 
-        with ChapterStorage(raw_base, filename=f"chapter.{stage}.sqlite") as storage:
+        with self._open_stage_storage(book_id, stage) as storage:
             chap = storage.get_chapter(chapter_id)
 
         if chap is None:
@@ -206,7 +125,8 @@ def _export_chapter_html(
 
         # ---- basic fields ----
         chap_title = (chap.get("title") or f"chapter_{chapter_id}").strip()
-        media_dir = raw_base / "media"
+        media = MediaCatalog(raw_base / "media")
+        subsetter = self._export_font_subsetter(cfg)
 
         # ---- builder (no metadata known) ----
         builder = HtmlBuilder(
@@ -217,16 +137,18 @@ def _export_chapter_html(
             subject=[],
             serial_status="",
             word_count="0",
+            font_subsetter=subsetter,
         )
 
         # ---- build a chapter ----
-        chapter_obj = self._xp_html_chapter(
-            builder=builder,
-            cid=chapter_id,
-            chap_title=chap_title,
-            chap=chap,
-            media_dir=media_dir,
-        )
+        with media:
+            chapter_obj = self._xp_html_chapter(
+                builder=builder,
+                cid=chapter_id,
+                chap_title=chap_title,
+                chap=chap,
+                media=media,
+            )
 
         builder.add_chapter(chapter_obj)
 
@@ -238,7 +160,8 @@ def _export_chapter_html(
             append_timestamp=cfg.append_timestamp,
         )
 
-        out_path = builder.export(self._output_dir, folder=out_name)
+        with subsetter or contextlib.nullcontext():
+            out_path = builder.export(self._output_dir, folder=out_name)
 
         logger.info(
             "Exported HTML chapter (site=%s, book=%s, chapter=%s): %s",
@@ -257,7 +180,7 @@ def _xp_html_chapter(
         cid: str,
         chap_title: str | None,
         chap: ChapterDict,
-        media_dir: Path,
+        media: MediaCatalog,
     ) -> HtmlChapter:
         """
         Build a Chapter object with HTML content and optionally place images / font.
@@ -279,10 +202,12 @@ def _append_image(res: MediaResource) -> None:
                 if url := res.get("url"):
                     if url.startswith("//"):
                         url = "https:" + url
-                    if url.startswith(("http://", "https://")):
-                        local = media_dir / image_filename(url)
-                        if local and local.is_file():
-                            fname = builder.add_image(local)
+                    if url.startswith(("http://", "https://")) and (
+                        info := media.lookup(image_filename(url))
+                    ):
+                        fname = builder.add_image(
+                            media.path(info.filename), digest=info.digest
+                        )
 
                 elif b64 := res.get("base64"):
                     mime = res.get("mime", "image/png")
@@ -296,7 +221,7 @@ def _append_image(res: MediaResource) -> None:
                     )
 
             except Exception as e:
-                logger.debug("HTML image add failed: %s", e)
+                logger.warning("HTML image add failed: %s", e)
 
         for r in resources:
             typ = r.get("type")
@@ -304,8 +229,12 @@ def _append_image(res: MediaResource) -> None:
             if typ == "font":
                 try:
                     if url := r.get("url"):
-                        local = media_dir / font_filename(url)
-                        if local.is_file() and (f := builder.add_font(local)):
+                        info = media.lookup(font_filename(url), "font")
+                        if info is not None and (
+                            f := builder.add_font(
+                                media.path(info.filename), digest=info.digest
+                            )
+                        ):
                             added_fonts.append(f)
 
                     elif b64 := r.get("base64"):
@@ -314,7 +243,7 @@ def _append_image(res: MediaResource) -> None:
                             added_fonts.append(f)
 
                 except Exception as e:
-                    logger.debug("EPUB font add failed: %s", e)
+                    logger.warning("HTML font add failed: %s", e)
 
             elif typ == "image":
                 idx = r.get("paragraph_index", max_i)
@@ -379,3 +308,93 @@ def _xp_html_extras(self, extras: dict[str, Any]) -> str:
     def _xp_html_chap_post(self, html_parts: list[str], chap: ChapterDict) -> list[str]:
         """Allows subclasses to inject HTML or modify structure."""
         return html_parts
+
+
+class _HtmlBookWriter:
+    """
+    Collects the book into an `HtmlBuilder`, one page per chapter.
+    """
+
+    def __init__(
+        self,
+        client: "ExportHtmlClientContext",
+        src: ExportSource,
+        cfg: ExporterConfig,
+    ) -> None:
+        self._client = client
+        self._src = src
+        self._cfg = cfg
+
+        # --- Prepare header (book metadata) ---
+        book_info = src.book_info
+        self._name = book_info["book_name"]
+        self._author = book_info.get("author") or ""
+        cover_path = client._resolve_image_path(
+            src.media.media_dir, book_info.get("cover_url"), name="cover"
+        )
+        cover = cover_path.read_bytes() if cover_path else None
+
+        self._subsetter = client._export_font_subsetter(cfg)
+        self._builder = HtmlBuilder(
+            title=self._name,
+            author=self._author,
+            description=book_info.get("summary", ""),
+            cover=cover,
+            subject=book_info.get("tags", []),
+            serial_status=book_info.get("serial_status", ""),
+            word_count=book_info.get("word_count", ""),
+            workers=cfg.html_workers,
+            font_subsetter=self._subsetter,
+        )
+        self._vol: HtmlVolume | None = None
+
+    def start_volume(self, v_idx: int, vol_title: str, volume: VolumeInfoDict) -> None:
+        self._vol = HtmlVolume(title=vol_title, intro=volume.get("volume_intro", ""))
+
+    def add_chapter(
+        self, cid: str, chap_title: str | None, chap: ChapterDict | None
+    ) -> None:
+        if self._vol is None:
+            return
+        if chap is not None:
+            chapter_obj = self._client._xp_html_chapter(
+                builder=self._builder,
+                cid=cid,
+                chap_title=chap_title,
+                chap=chap,
+                media=self._src.media,
+            )
+        elif self._cfg.render_missing_chapter:
+            chapter_obj = self._client._xp_html_missing_chapter(
+                cid=cid, chap_title=chap_title
+            )
+        else:
+            return
+        self._vol.chapters.append(chapter_obj)
+
+    def end_volume(self) -> None:
+        if self._vol is not None and self._vol.chapters:
+            self._builder.add_volume(self._vol)
+        self._vol = None
+
+    def finish(self) -> list[Path]:
+        client = self._client
+        out_name = format_filename(
+            self._cfg.filename_template,
+            title=self._name,
+            author=self._author,
+            append_timestamp=self._cfg.append_timestamp,
+        )
+        out_path = self._builder.export(client._output_dir, folder=out_name)
+        logger.info(
+            "Exported HTML (site=%s, book=%s): %s",
+            client._site,
+            self._src.book_id,
+            out_path,
+        )
+        return [out_path]
+
+    def close(self) -> None:
+        self._vol = None
+        if self._subsetter is not None:
+            self._subsetter.close()
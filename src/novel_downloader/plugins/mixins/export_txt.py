@@ -8,8 +8,9 @@
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Protocol
 
-from novel_downloader.infra.persistence.chapter_storage import ChapterStorage
 from novel_downloader.libs.filesystem import (
+    COMPRESSION_SUFFIXES,
+    AtomicTextWriter,
     format_filename,
     sanitize_filename,
     write_file,
@@ -22,6 +23,8 @@
     VolumeInfoDict,
 )
 
+from .export_book import BookWriter, ExportSource
+
 logger = logging.getLogger(__name__)
 
 
@@ -50,6 +53,10 @@ def _xp_txt_missing_chapter(
 
         def _xp_txt_extras(self, extras: dict[str, Any]) -> str: ...
 
+        def _xp_txt_book_writer(
+            self, src: ExportSource, cfg: ExporterConfig
+        ) -> BookWriter: ...
+
 
 class ExportTxtMixin:
     """"""
@@ -65,86 +72,22 @@ def _export_book_txt(
         """
         Export a novel as a single text file by merging all chapter data.
         """
-        book_id = book.book_id
-        start_id = book.start_id
-        end_id = book.end_id
-        ignore_set = book.ignore_ids
-
-        # --- Load book data ---
-        raw_base = self._raw_data_dir / book_id
-        if not raw_base.is_dir():
-            return []
-
-        stage = stage or self._detect_latest_stage(book_id)
-        book_info = self._load_book_info(book_id, stage=stage)
-
-        # --- Filter volumes & chapters ---
-        orig_vols = book_info.get("volumes", [])
-        vols = self._filter_volumes(orig_vols, start_id, end_id, ignore_set)
-        if not vols:
-            logger.info(
-                "Nothing to do after filtering (site=%s, book=%s)", self._site, book_id
-            )
-            return []
-
-        # --- Prepare header (book metadata) ---
-        name = book_info["book_name"]
-        author = book_info.get("author") or ""
-        header_txt = self._xp_txt_header(book_info, name, author)
-
-        # --- Build body by volumes & chapters ---
-        parts: list[str] = [header_txt]
-        with ChapterStorage(raw_base, filename=f"chapter.{stage}.sqlite") as storage:
-            for v_idx, volume in enumerate(vols, start=1):
-                vol_title = volume.get("volume_name") or f"卷 {v_idx}"
-                parts.append(self._xp_txt_volume_heading(vol_title, volume))
-
-                # Collect chapter ids then batch fetch
-                cids = [
-                    c["chapterId"]
-                    for c in volume.get("chapters", [])
-                    if c.get("chapterId")
-                ]
-                if not cids:
-                    continue
-                chap_map = storage.get_chapters(cids)
-                for ch_info in volume.get("chapters", []):
-                    cid = ch_info.get("chapterId")
-                    ch_title = ch_info.get("title")
-                    if not cid:
-                        continue
-
-                    ch = chap_map.get(cid)
-                    if not ch:
-                        if cfg.render_missing_chapter:
-                            parts.append(
-                                self._xp_txt_missing_chapter(
-                                    cid=cid,
-                                    chap_title=ch_title,
-                                )
-                            )
-                        continue
-
-                    parts.append(self._xp_txt_chapter(ch_title, ch))
-
-        final_text = "\n".join(parts)
-
-        # --- Determine output file path ---
-        out_name = format_filename(
-            cfg.filename_template,
-            title=name,
-            author=author,
-            append_timestamp=cfg.append_timestamp,
-            ext="txt",
-        )
-        out_path = self._output_dir / sanitize_filename(out_name)
+        result = self._export_book_formats(
+            book, cfg, {"txt": self._xp_txt_book_writer}, stage=stage
+        )["txt"]
+        if isinstance(result, Exception):
+            raise result
+        return result
 
-        # --- Save final text ---
-        result = write_file(content=final_text, filepath=out_path, on_exist="overwrite")
-        logger.info(
-            "Exported TXT (site=%s, book=%s): %s", self._site, book_id, out_path
-        )
-        return [result]
+    def _xp_txt_book_writer(
+        self: "ExportTxtClientContext",
+        src: ExportSource,
+        cfg: ExporterConfig,
+    ) -> BookWriter:
+        """
+        Return the TXT writer used by the book export driver.
+        """
+        return _TxtBookWriter(self, src, cfg)
 
     def _export_chapter_txt(
         self: "ExportTxtClientContext",
@@ -164,11 +107,10 @@ def _export_chapter_txt(
         stage = stage or self._detect_latest_stage(book_id)
 
         # --- Load chapter ---
-        dbfile = raw_base / f"chapter.{stage}.sqlite"
-        if not dbfile.exists():
+        if not self._has_stage_data(book_id, stage):
             return None
 
-        with ChapterStorage(raw_base, filename=f"chapter.{stage}.sqlite") as storage:
+        with self._open_stage_storage(book_id, stage) as storage:
             chap = storage.get_chapter(chapter_id)
 
         if chap is None:
@@ -287,3 +229,71 @@ def _xp_txt_extras(self, extras: dict[str, Any]) -> str:
         Subclasses may override this method to render extra info.
         """
         return ""
+
+
+class _TxtBookWriter:
+    """
+    Streams the book into a single text file, chapter by chapter.
+    """
+
+    def __init__(
+        self,
+        client: "ExportTxtClientContext",
+        src: ExportSource,
+        cfg: ExporterConfig,
+    ) -> None:
+        self._client = client
+        self._src = src
+
+        # --- Prepare header (book metadata) ---
+        name = src.book_info["book_name"]
+        author = src.book_info.get("author") or ""
+
+        # --- Determine output file path ---
+        out_name = format_filename(
+            cfg.filename_template,
+            title=name,
+            author=author,
+            append_timestamp=cfg.append_timestamp,
+            ext="txt" + COMPRESSION_SUFFIXES.get(cfg.txt_compression, ""),
+        )
+        out_path = client._output_dir / sanitize_filename(out_name)
+
+        self._cfg = cfg
+        self._out = AtomicTextWriter(out_path, compression=cfg.txt_compression)
+        self._out.write(client._xp_txt_header(src.book_info, name, author))
+
+    def start_volume(self, v_idx: int, vol_title: str, volume: VolumeInfoDict) -> None:
+        self._write(self._client._xp_txt_volume_heading(vol_title, volume))
+
+    def add_chapter(
+        self, cid: str, chap_title: str | None, chap: ChapterDict | None
+    ) -> None:
+        if chap is not None:
+            self._write(self._client._xp_txt_chapter(chap_title, chap))
+        elif self._cfg.render_missing_chapter:
+            self._write(
+                self._client._xp_txt_missing_chapter(cid=cid, chap_title=chap_title)
+            )
+
+    def end_volume(self) -> None:
+        pass
+
+    def _write(self, part: str) -> None:
+        # same layout as joining all parts with newlines
+        self._out.write("\n")
+        self._out.write(part)
+
+    def finish(self) -> list[Path]:
+        # --- Save final text ---
+        result = self._out.commit()
+        logger.info(
+            "Exported TXT (site=%s, book=%s): %s",
+            self._client._site,
+            self._src.book_id,
+            result,
+        )
+        return [result]
+
+    def close(self) -> None:
+        self._out.discard()
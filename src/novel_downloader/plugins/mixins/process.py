@@ -6,9 +6,14 @@
 
 import json
 import logging
+import math
+import multiprocessing
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any, Protocol
 
-from novel_downloader.infra.persistence.chapter_storage import ChapterStorage
+from novel_downloader.infra.persistence.stage_storage import LayeredChapterStorage
 from novel_downloader.plugins import registrar
 from novel_downloader.schemas import (
     BookConfig,
@@ -19,10 +24,16 @@
 
 logger = logging.getLogger(__name__)
 PROCESS_BATCH: int = 200
+# Below this many chapters per worker, process start-up costs more than it saves
+PARALLEL_MIN_CHAPTERS: int = 64
 
 
 if TYPE_CHECKING:
-    from novel_downloader.plugins.protocols import ProcessUI, _ClientContext
+    from novel_downloader.plugins.protocols import (
+        ProcessorProtocol,
+        ProcessUI,
+        _ClientContext,
+    )
 
     class ProcessClientContext(_ClientContext, Protocol):
         """"""
@@ -33,14 +44,18 @@ def _pc_prepare_env(
             ui: "ProcessUI | None",
         ) -> tuple[BookInfoDict, list[str], set[str]] | None: ...
 
+        def _pc_plan_segments(
+            self,
+            processors: list[ProcessorConfig],
+        ) -> list[list[ProcessorConfig]]: ...
+
         def _pc_run_stage(
             self,
             book: BookConfig,
             book_info: BookInfoDict,
-            pconf: ProcessorConfig,
+            segment: list[ProcessorConfig],
             chap_ids: list[str],
             chap_set: set[str],
-            prev_output: str,
             completed_stages: list[str],
             ui: "ProcessUI | None",
         ) -> BookInfoDict: ...
@@ -56,15 +71,44 @@ def _pc_record_execution(
             book_id: str,
             pconf: ProcessorConfig,
             completed_stages: list[str],
+            *,
+            materialized: bool = True,
         ) -> None: ...
 
+        def _pc_map_chapters(
+            self,
+            processors: list["ProcessorProtocol"],
+            options: list[dict[str, Any]],
+            chapters: list[ChapterDict],
+        ) -> Iterator[tuple[ChapterDict, str]]: ...
+
+        def _pc_segment_hash(
+            self,
+            segment: list[ProcessorConfig],
+            processors: list["ProcessorProtocol"],
+        ) -> str: ...
+
         def _pc_is_incremental(
             self,
             book_id: str,
             pconf: ProcessorConfig,
             completed_stages: list[str],
+            *,
+            materialized: bool = True,
         ) -> bool: ...
 
+        def _pc_stream_segments(
+            self,
+            processors: list[ProcessorConfig],
+        ) -> list["StreamSegment"]: ...
+
+        def _pc_process_chapters(
+            self,
+            book_id: str,
+            segments: list["StreamSegment"],
+            chap_ids: list[str],
+        ) -> None: ...
+
         @staticmethod
         def _pc_hash_config(options: dict[str, Any]) -> str: ...
 
@@ -72,6 +116,17 @@ def _pc_hash_config(options: dict[str, Any]) -> str: ...
         def _utc_now_iso() -> str: ...
 
 
+@dataclass(slots=True)
+class StreamSegment:
+    """
+    A processing segment prepared once for streaming during download.
+    """
+
+    stage: str
+    processors: list["ProcessorProtocol"]
+    config_hash: str
+
+
 class ProcessMixin:
     """
     Provides the `process_book()` API for clients.
@@ -98,35 +153,39 @@ def process_book(
         book_info, chap_ids, chap_set = prep
 
         stage_name: str = "Unknown"
-        prev_output = "chapter.raw.sqlite"
         completed_stages: list[str] = []
         self._pc_init_pipeline(book.book_id, processors)
 
         try:
-            for pconf in processors:
-                stage_name = pconf.name
+            for segment in self._pc_plan_segments(processors):
+                stage_name = "+".join(p.name for p in segment)
                 if ui:
                     ui.on_stage_start(book, stage_name)
 
                 book_info = self._pc_run_stage(
                     book,
                     book_info,
-                    pconf,
+                    segment,
                     chap_ids,
                     chap_set,
-                    prev_output,
                     completed_stages,
                     ui,
                 )
 
-                self._pc_record_execution(book.book_id, pconf, completed_stages)
-                completed_stages.append(stage_name)
-                prev_output = f"chapter.{stage_name}.sqlite"
+                for pconf in segment:
+                    self._pc_record_execution(
+                        book.book_id,
+                        pconf,
+                        completed_stages,
+                        materialized=pconf is segment[-1],
+                    )
+                    completed_stages.append(pconf.name)
 
                 if ui:
                     ui.on_stage_complete(book, stage_name)
 
             logger.info("All stages completed successfully for book %s", book.book_id)
+            self._si_auto_index(book.book_id)
 
         except Exception as e:
             logger.warning(
@@ -145,12 +204,11 @@ def _pc_prepare_env(
         base_dir = self._raw_data_dir / book_id
 
         # Check raw stage files
-        raw_sqlite = base_dir / "chapter.raw.sqlite"
         raw_info = base_dir / "book_info.raw.json"
 
-        if not raw_sqlite.is_file() or not raw_info.is_file():
+        if not self._has_stage_data(book_id, "raw") or not raw_info.is_file():
             if ui:
-                ui.on_missing(book, "raw", raw_sqlite)
+                ui.on_missing(book, "raw", base_dir / "chapter.raw.sqlite")
             return None
 
         # Load raw book_info
@@ -164,58 +222,143 @@ def _pc_prepare_env(
 
         return (book_info, chap_ids, chap_set)
 
+    def _pc_plan_segments(
+        self: "ProcessClientContext",
+        processors: list[ProcessorConfig],
+    ) -> list[list[ProcessorConfig]]:
+        """
+        Group processors into segments that run as one pass.
+
+        Without fusing every processor is its own segment. With
+        `fuse_processors` enabled, consecutive processors are chained in
+        memory and a segment ends at a checkpoint or the last processor;
+        only the final stage of each segment is written to storage.
+        """
+        if not self._fuse_processors:
+            return [[p] for p in processors]
+
+        segments: list[list[ProcessorConfig]] = []
+        current: list[ProcessorConfig] = []
+        for pconf in processors:
+            current.append(pconf)
+            if pconf.checkpoint:
+                segments.append(current)
+                current = []
+        if current:
+            segments.append(current)
+        return segments
+
     def _pc_run_stage(
         self: "ProcessClientContext",
         book: BookConfig,
         book_info: BookInfoDict,
-        pconf: ProcessorConfig,
+        segment: list[ProcessorConfig],
         chap_ids: list[str],
         chap_set: set[str],
-        prev_output: str,
         completed_stages: list[str],
         ui: "ProcessUI | None",
     ) -> BookInfoDict:
         book_id = book.book_id
-        base_dir = self._raw_data_dir / book_id
-        stage_name = pconf.name
-
-        # Determine input + output paths
-        in_base = prev_output
-        out_base = f"chapter.{stage_name}.sqlite"
-        in_path = base_dir / in_base
+        stage_name = segment[-1].name
 
-        if not in_path.is_file():
-            raise FileNotFoundError(f"Upstream stage output missing: {in_path.name}")
+        # The input is the layered view of raw + every stage materialized
+        # so far; the output only stores chapters this segment changes
+        prev_stage = completed_stages[-1] if completed_stages else "raw"
+        if not self._has_stage_data(book_id, prev_stage):
+            raise FileNotFoundError(f"Upstream stage output missing: {prev_stage}")
 
-        # Build processor
-        processor = registrar.get_processor(stage_name, pconf.options)
+        # Build processors
+        processors = [registrar.get_processor(p.name, p.options) for p in segment]
 
         # Process top-level book info
-        book_info = processor.process_book_info(book_info)
+        for processor in processors:
+            book_info = processor.process_book_info(book_info)
         self._save_book_info(book_id, book_info, stage=stage_name)
 
-        incremental = self._pc_is_incremental(book_id, pconf, completed_stages)
+        # Stage-level check, only used for chapters recorded by older
+        # versions that carry no per-chapter configuration
+        names = [p.name for p in segment]
+        legacy_ok = all(
+            self._pc_is_incremental(
+                book_id,
+                pconf,
+                [*completed_stages, *names[:i]],
+                materialized=pconf is segment[-1],
+            )
+            for i, pconf in enumerate(segment)
+        )
+        overwrite = any(p.overwrite for p in segment)
+        seg_hash = self._pc_segment_hash(segment, processors)
+        keyer = _chapter_keyer(processors)
         total = len(chap_ids)
+        in_stages = [
+            stg
+            for stg in self._stage_layers(book_id, prev_stage)
+            if self._has_stage_data(book_id, stg)
+        ]
 
         with (
-            ChapterStorage(base_dir, in_base) as instore,
-            ChapterStorage(base_dir, out_base) as outstore,
+            LayeredChapterStorage(
+                [self._chapter_storage(book_id, stg) for stg in in_stages]
+            ) as instore,
+            self._stage_storage(book_id, stage_name) as outstore,
         ):
             in_exists = instore.existing_ids()
             missing_input = chap_set - in_exists
-
-            if incremental:
-                logger.info(
-                    "Book %s stage '%s': incremental mode enabled (deps=%s)",
-                    book_id,
-                    stage_name,
-                    ", ".join(completed_stages) or "none",
-                )
-                out_exists = outstore.existing_ids()
+            in_hashes = instore.hashes(chap_set & in_exists)
+
+            # A chapter is reused when its input is unchanged and it was
+            # processed with the same configuration, or the processor's
+            # per-chapter key shows the configuration change cannot affect it
+            reusable: set[str] = set()
+            rekeyed: dict[str, str] = {}
+            if not overwrite:
+                processed = outstore.input_hashes(in_hashes)
+                legacy_ids = outstore.processed_ids() - set(processed)
+                recorded = outstore.config_keys(processed)
                 clean_upstream = instore.clean_ids()
-                reusable = (out_exists & clean_upstream) & chap_set
-            else:
-                reusable = set()
+                to_key: list[str] = []
+                for cid in chap_set & clean_upstream:
+                    if cid in legacy_ids:
+                        # full-copy stages written before processed records
+                        if legacy_ok:
+                            reusable.add(cid)
+                        continue
+                    if processed.get(cid) != in_hashes.get(cid):
+                        continue
+                    cfg_hash, chap_key = recorded.get(cid, ("", ""))
+                    if cfg_hash == seg_hash or (not cfg_hash and legacy_ok):
+                        reusable.add(cid)
+                    elif chap_key and keyer is not None:
+                        to_key.append(cid)
+
+                if to_key and keyer is not None:
+                    for cid, src in instore.get_chapters(to_key).items():
+                        if src is None:
+                            continue
+                        key = keyer(src)
+                        if key and key == recorded[cid][1]:
+                            reusable.add(cid)
+                            rekeyed[cid] = key
+
+                # Remember the current configuration for reused chapters
+                outstore.mark_processed(
+                    [cid for cid in reusable if cid in processed],
+                    in_hashes,
+                    config_hash=seg_hash,
+                    chapter_keys={
+                        cid: rekeyed.get(cid, recorded.get(cid, ("", ""))[1])
+                        for cid in reusable
+                    },
+                )
+                if reusable:
+                    logger.info(
+                        "Book %s stage '%s': reusing %d of %d chapters",
+                        book_id,
+                        stage_name,
+                        len(reusable),
+                        total,
+                    )
 
             to_process = chap_set - reusable - missing_input
             done = len(reusable) + len(missing_input)
@@ -223,35 +366,49 @@ def _pc_run_stage(
             if done and ui:
                 ui.on_stage_progress(book, stage_name, done, total)
 
-            to_process_list = list(to_process)
+            to_process_list = [cid for cid in chap_ids if cid in to_process]
             in_map = instore.get_chapters(to_process_list)
 
-            batch_need: list[ChapterDict] = []
-            batch_ok: list[ChapterDict] = []
-
-            def _flush() -> None:
-                if batch_need:
-                    outstore.upsert_chapters(batch_need, need_refetch=True)
-                    batch_need.clear()
-                if batch_ok:
-                    outstore.upsert_chapters(batch_ok, need_refetch=False)
-                    batch_ok.clear()
-
+            present: list[str] = []
+            sources: list[ChapterDict] = []
             for cid in to_process_list:
-                src = in_map.get(cid)
+                if (src := in_map.get(cid)) is not None:
+                    present.append(cid)
+                    sources.append(src)
+
+            if len(present) < len(to_process_list):
+                done += len(to_process_list) - len(present)
+                if ui:
+                    ui.on_stage_progress(book, stage_name, done, total)
 
-                if src is None:
-                    done += 1
-                    if ui:
-                        ui.on_stage_progress(book, stage_name, done, total)
-                    continue
+            results = self._pc_map_chapters(
+                processors, [p.options for p in segment], sources
+            )
 
-                processed = processor.process_chapter(src)
+            batch_need: list[ChapterDict] = []
+            batch_ok: list[ChapterDict] = []
+            batch_keys: dict[str, str] = {}
 
+            def _flush() -> None:
+                for batch, need_refetch in ((batch_need, True), (batch_ok, False)):
+                    if batch:
+                        outstore.upsert_delta(
+                            batch,
+                            in_hashes,
+                            need_refetch=need_refetch,
+                            config_hash=seg_hash,
+                            chapter_keys=batch_keys,
+                        )
+                        batch.clear()
+                batch_keys.clear()
+
+            for cid, (processed_chap, chap_key) in zip(present, results, strict=True):
                 if instore.need_refetch(cid):
-                    batch_need.append(processed)
+                    batch_need.append(processed_chap)
                 else:
-                    batch_ok.append(processed)
+                    batch_ok.append(processed_chap)
+                if chap_key:
+                    batch_keys[cid] = chap_key
 
                 if (len(batch_need) + len(batch_ok)) >= PROCESS_BATCH:
                     _flush()
@@ -264,11 +421,64 @@ def _flush() -> None:
 
         return book_info
 
+    def _pc_map_chapters(
+        self: "ProcessClientContext",
+        processors: list["ProcessorProtocol"],
+        options: list[dict[str, Any]],
+        chapters: list[ChapterDict],
+    ) -> Iterator[tuple[ChapterDict, str]]:
+        """
+        Run each chapter through the processor chain, yielding results in
+        input order together with the chapter key (see `_chapter_keyer`).
+
+        Chapters are handed to the chain in groups, so processors that
+        implement `process_chapters` can batch work across chapters.
+
+        With `process_workers > 1` and enough chapters, the groups are sharded
+        across a process pool; each worker builds its own processors once.
+        Each worker gets the same number of groups, of at most `PROCESS_BATCH`
+        chapters like the inline path. A segment with a processor that sets
+        `single_process = True` (e.g. one holding a large model that every
+        worker would load again) always runs inline.
+
+        :param processors: Processors built for this segment, in order.
+        :param options: Options each processor was built with.
+        :param chapters: Input chapters.
+        """
+        workers = min(self._process_workers, len(chapters) // PARALLEL_MIN_CHAPTERS)
+        if any(getattr(proc, "single_process", False) for proc in processors):
+            workers = 1
+        if workers <= 1:
+            for start in range(0, len(chapters), PROCESS_BATCH):
+                batch = chapters[start : start + PROCESS_BATCH]
+                yield from _apply_chain(processors, batch)
+            return
+
+        logger.debug("Processing %d chapters with %d workers", len(chapters), workers)
+        # split each worker's share into as few groups as PROCESS_BATCH allows
+        share = math.ceil(len(chapters) / workers)
+        size = math.ceil(share / math.ceil(share / PROCESS_BATCH))
+        batches = [chapters[i : i + size] for i in range(0, len(chapters), size)]
+        specs = [
+            (type(proc), opts) for proc, opts in zip(processors, options, strict=True)
+        ]
+        # spawned, not forked: callers may already run threads
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(specs,),
+        ) as pool:
+            for results in pool.map(_process_in_worker, batches):
+                yield from results
+
     def _pc_is_incremental(
         self: "ProcessClientContext",
         book_id: str,
         pconf: ProcessorConfig,
         completed_stages: list[str],
+        *,
+        materialized: bool = True,
     ) -> bool:
         """
         Determine whether a processor can reuse its previous result.
@@ -276,22 +486,24 @@ def _pc_is_incremental(
         Logic:
           * overwrite = False
           * prior record exists in pipeline meta
-          * file exists
+          * stage was (not) materialized the same way as now
+          * file exists, for materialized stages
           * config hash unchanged
           * dependencies unchanged
         """
         if pconf.overwrite:
             return False
 
-        base = self._book_dir(book_id)
         # Load full metadata
         meta = self._load_pipeline_meta(book_id)
         rec = meta["executed"].get(pconf.name)
         if not rec or not isinstance(rec, dict):
             return False
 
-        filepath = base / f"chapter.{pconf.name}.sqlite"
-        if not filepath.is_file():
+        if rec.get("materialized", True) != materialized:
+            return False
+
+        if materialized and not self._has_stage_data(book_id, pconf.name):
             return False
 
         # Check config hash
@@ -302,6 +514,113 @@ def _pc_is_incremental(
         # Compare dependency chain
         return rec.get("depends_on") == completed_stages
 
+    def _pc_segment_hash(
+        self: "ProcessClientContext",
+        segment: list[ProcessorConfig],
+        processors: list["ProcessorProtocol"],
+    ) -> str:
+        """
+        Return the hash of a segment's effective configuration.
+
+        Besides the options, it covers what processors report through an
+        optional `config_fingerprint()` (e.g. the contents of rule files the
+        options only point to).
+        """
+        parts: list[Any] = []
+        for pconf, proc in zip(segment, processors, strict=True):
+            fingerprint = getattr(proc, "config_fingerprint", None)
+            parts.append(
+                [
+                    pconf.name,
+                    pconf.options,
+                    fingerprint() if callable(fingerprint) else "",
+                ]
+            )
+        return self._pc_hash_config({"segment": parts})
+
+    def _pc_stream_segments(
+        self: "ProcessClientContext",
+        processors: list[ProcessorConfig],
+    ) -> list[StreamSegment]:
+        """
+        Build the segments that can run while the book is still downloading.
+
+        Preparation stops at the first segment with `overwrite`: the final
+        `process_book` rebuilds it and everything downstream anyway.
+        """
+        prepared: list[StreamSegment] = []
+        for segment in self._pc_plan_segments(processors):
+            if any(p.overwrite for p in segment):
+                break
+            built = [registrar.get_processor(p.name, p.options) for p in segment]
+            prepared.append(
+                StreamSegment(
+                    stage=segment[-1].name,
+                    processors=built,
+                    config_hash=self._pc_segment_hash(segment, built),
+                )
+            )
+        return prepared
+
+    def _pc_process_chapters(
+        self: "ProcessClientContext",
+        book_id: str,
+        segments: list[StreamSegment],
+        chap_ids: list[str],
+    ) -> None:
+        """
+        Run freshly stored raw chapters through the prepared segments.
+
+        Output and processed records are written exactly as `_pc_run_stage`
+        writes them, so the `process_book` call after the download reuses
+        these chapters instead of processing them again. Chapters marked
+        for refetch are left to that call.
+
+        :param book_id: Book identifier.
+        :param segments: Segments from `_pc_stream_segments`.
+        :param chap_ids: Chapters just stored in the raw stage.
+        """
+        stored: list[str] = []
+        for seg in segments:
+            in_stages = ["raw", *stored]
+            with (
+                LayeredChapterStorage(
+                    [self._chapter_storage(book_id, stg) for stg in in_stages]
+                ) as instore,
+                self._stage_storage(book_id, seg.stage) as outstore,
+            ):
+                clean = instore.clean_ids()
+                ids = [cid for cid in chap_ids if cid in clean]
+                in_hashes = instore.hashes(ids)
+                processed = outstore.input_hashes(ids)
+                recorded = outstore.config_keys(ids)
+                todo = [
+                    cid
+                    for cid in ids
+                    if processed.get(cid) != in_hashes[cid]
+                    or recorded[cid][0] != seg.config_hash
+                ]
+
+                present: list[str] = []
+                sources: list[ChapterDict] = []
+                for cid, src in instore.get_chapters(todo).items():
+                    if src is not None:
+                        present.append(cid)
+                        sources.append(src)
+
+                results = _apply_chain(seg.processors, sources)
+                outstore.upsert_delta(
+                    [chap for chap, _ in results],
+                    in_hashes,
+                    config_hash=seg.config_hash,
+                    chapter_keys={
+                        cid: key
+                        for cid, (_, key) in zip(present, results, strict=True)
+                        if key
+                    },
+                )
+            stored.append(seg.stage)
+
     @staticmethod
     def _utc_now_iso() -> str:
         from datetime import UTC, datetime
@@ -322,6 +641,8 @@ def _pc_record_execution(
         book_id: str,
         pconf: ProcessorConfig,
         completed_stages: list[str],
+        *,
+        materialized: bool = True,
     ) -> None:
         """
         Update pipeline metadata after a processor successfully completes.
@@ -330,6 +651,7 @@ def _pc_record_execution(
           * processed_at - current UTC timestamp
           * depends_on - list of completed stages for this run
           * config_hash - hash of processor options
+          * materialized - False if the stage ran fused and was not stored
         """
         # Load existing metadata
         meta = self._load_pipeline_meta(book_id)
@@ -340,6 +662,7 @@ def _pc_record_execution(
             "processed_at": self._utc_now_iso(),
             "depends_on": list(completed_stages),
             "config_hash": self._pc_hash_config(pconf.options),
+            "materialized": materialized,
         }
 
         # Persist to pipeline.json
@@ -360,3 +683,61 @@ def _pc_hash_config(options: dict[str, Any]) -> str:
 
         payload = json.dumps(options, sort_keys=True, separators=(",", ":"))
         return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:12]
+
+
+_worker_processors: list["ProcessorProtocol"] = []
+
+
+def _chapter_keyer(
+    processors: list["ProcessorProtocol"],
+) -> "Callable[[ChapterDict], str] | None":
+    """
+    Return the processor's optional `chapter_fingerprint` for single-processor
+    segments.
+
+    The fingerprint identifies the part of the configuration that can
+    affect a given input chapter. Fused segments have no per-chapter key:
+    later processors see intermediate output that is not stored.
+    """
+    if len(processors) != 1:
+        return None
+    keyer = getattr(processors[0], "chapter_fingerprint", None)
+    return keyer if callable(keyer) else None
+
+
+def _apply_chain(
+    processors: list["ProcessorProtocol"], chapters: list[ChapterDict]
+) -> list[tuple[ChapterDict, str]]:
+    keyer = _chapter_keyer(processors)
+    keys = [keyer(chap) if keyer is not None else "" for chap in chapters]
+    for processor in processors:
+        batch_fn = getattr(processor, "process_chapters", None)
+        if callable(batch_fn):
+            out: list[ChapterDict] = batch_fn(chapters)
+            if len(out) != len(chapters):
+                raise ValueError(
+                    f"{type(processor).__name__}.process_chapters returned "
+                    f"{len(out)} chapters for {len(chapters)} inputs"
+                )
+            chapters = out
+        else:
+            chapters = [processor.process_chapter(chap) for chap in chapters]
+    return list(zip(chapters, keys, strict=True))
+
+
+def _init_worker(
+    specs: list[tuple["type[ProcessorProtocol]", dict[str, Any]]],
+) -> None:
+    """
+    Build the segment's processors once per worker process.
+
+    Classes are passed rather than looked up by name so that processors
+    from local plugins resolve under every multiprocessing start method.
+    """
+    _worker_processors[:] = [cls(options) for cls, options in specs]
+
+
+def _process_in_worker(chapters: list[ChapterDict]) -> list[tuple[ChapterDict, str]]:
+    if not _worker_processors:
+        raise RuntimeError("Worker processors are not initialized.")
+    return _apply_chain(_worker_processors, chapters)
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+novel_downloader.plugins.mixins.search_index
+--------------------------------------------
+"""
+
+import logging
+from typing import TYPE_CHECKING, Any
+
+from novel_downloader.infra.persistence.search_index import ChapterSearchIndex
+
+logger = logging.getLogger(__name__)
+
+
+if TYPE_CHECKING:
+    from novel_downloader.plugins.protocols import _ClientContext
+
+
+class SearchIndexMixin:
+    """
+    Provides the `index_book()` API for clients.
+    """
+
+    def index_book(
+        self: "_ClientContext",
+        book_id: str,
+        *,
+        stage: str | None = None,
+        **kwargs: Any,
+    ) -> int:
+        """
+        Synchronize a book's chapters into the local full-text index.
+
+        Only chapters whose content changed since the previous sync are
+        rewritten, so calling this after every download is cheap.
+
+        :param book_id: Book identifier.
+        :param stage: Stage to index; defaults to the latest stage.
+        :return: Number of chapters added, updated, or removed.
+        """
+        stage = stage or self._detect_latest_stage(book_id)
+        if not self._has_stage_data(book_id, stage):
+            logger.info("No %s chapters stored for book %s", stage, book_id)
+            return 0
+
+        try:
+            book_name = self._load_book_info(book_id, stage).get("book_name", "")
+        except (FileNotFoundError, ValueError):
+            book_name = ""
+
+        with (
+            ChapterSearchIndex(self._search_index_path) as index,
+            self._open_stage_storage(book_id, stage) as storage,
+        ):
+            count = index.sync_book(
+                self._site, book_id, storage, book_name=book_name, stage=stage
+            )
+
+        logger.info(
+            "Search index updated for site=%s book=%s stage=%s (%d chapters)",
+            self._site,
+            book_id,
+            stage,
+            count,
+        )
+        return count
+
+    def _si_auto_index(self: "_ClientContext", book_id: str) -> None:
+        """
+        Update the search index after new data is stored, if enabled.
+
+        Indexing failures are logged and never abort the caller.
+        """
+        if not self._search_index:
+            return
+        try:
+            self.index_book(book_id)
+        except Exception as e:
+            logger.warning("Failed to update search index for %s: %s", book_id, e)
@@ -5,19 +5,188 @@
 
 A text cleaner that removes invisible characters, deletes unwanted patterns,
 and applies literal replacements for both book-level metadata and chapters.
+
+Literal rules (replacement keys and removal patterns without regex syntax)
+are matched by a multi-pattern matcher and the remaining removal patterns by
+one combined regex, interleaved in a single pass over the original text.
 """
 
 from __future__ import annotations
 
-import copy
+import hashlib
 import json
 import re
+from collections.abc import Iterator
+from pathlib import Path
 from re import Match, Pattern
 from typing import Any
 
+from novel_downloader.infra.paths import USER_CACHE_DIR
+from novel_downloader.libs.textutils import (
+    LITERAL_BACKEND,
+    LiteralReplacer,
+    is_literal_pattern,
+)
 from novel_downloader.plugins.registry import registrar
+from novel_downloader.plugins.utils.book_info import map_book_info
+from novel_downloader.plugins.utils.pickle_cache import load_or_build
 from novel_downloader.schemas import BookInfoDict, ChapterDict
 
+RULE_CACHE_DIR = USER_CACHE_DIR / "cleaner"
+# Bump when the cached matcher format changes
+_RULE_CACHE_VERSION = 1
+
+
+class _RuleSet:
+    """
+    The rules for one kind of text (titles or content).
+    """
+
+    def __init__(
+        self,
+        literals: LiteralReplacer,
+        regexes: list[str],
+        removes: list[str],
+        repl_map: dict[str, str],
+        flags: int,
+    ) -> None:
+        self.literals = literals
+        self.regexes = regexes
+        self.repl_map = repl_map
+        self.flags = flags
+
+        # position of each rule in the single combined regex all rules used
+        # to form; it decides which rule wins when several match at one spot
+        order: list[tuple[str, str | None]] = [
+            (p, p if is_literal_pattern(p) else None) for p in removes
+        ]
+        order += [(re.escape(k), k) for k in repl_map]
+        order.sort(key=lambda rule: len(rule[0]), reverse=True)
+        self._regex_rank: dict[str, int] = {}
+        self._literal_rank: dict[str, int] = {}
+        for rank, (pattern, key) in enumerate(order):
+            if key is None:
+                self._regex_rank.setdefault(pattern, rank)
+            else:
+                self._literal_rank.setdefault(key, rank)
+        # longer first to avoid prefix collisions
+        self.combined_rx: Pattern[str] | None = (
+            re.compile("|".join(regexes), flags=flags) if regexes else None
+        )
+        self._rx_cache: dict[str, Pattern[str]] = {}
+
+    def __bool__(self) -> bool:
+        return bool(self.literals) or self.combined_rx is not None
+
+    def apply(self, text: str) -> str:
+        if self.combined_rx is None:
+            return self.literals.sub(text)
+        if not self.literals:
+            return self.combined_rx.sub(self._regex_repl, text)
+        return self._apply_mixed(text)
+
+    def _regex_repl(self, match: Match[str]) -> str:
+        return self.repl_map.get(match.group(0), "")
+
+    def _apply_mixed(self, text: str) -> str:
+        """
+        Apply literal and regex rules in a single pass over `text`.
+
+        Both kinds are matched against the original text only, as with one
+        combined regex: the leftmost match wins, and at the same position
+        the rule that comes first in the combined (longest-first) order.
+        Replaced text is never rescanned.
+
+        Empty regex matches are skipped. They remove nothing, and after one
+        `re.sub` still takes a non-empty match at the same position.
+        """
+        assert self.combined_rx is not None
+        finditer = self.combined_rx.finditer
+        next_literal = self.literals.scanner(text)
+        lit = next_literal(0)
+        rx_iter = finditer(text)
+        rx_m = _next_nonempty(rx_iter)
+
+        parts: list[str] = []
+        pos = 0
+        while lit is not None or rx_m is not None:
+            if lit is None:
+                use_regex = True
+            elif rx_m is None:
+                use_regex = False
+            elif rx_m.start() != lit[0]:
+                use_regex = rx_m.start() < lit[0]
+            else:
+                use_regex = self._regex_wins(text, lit[0], text[lit[0] : lit[1]])
+
+            if use_regex:
+                assert rx_m is not None
+                start, end = rx_m.span()
+                parts.append(text[pos:start])
+                parts.append(self._regex_repl(rx_m))
+            else:
+                assert lit is not None
+                start, end, repl = lit
+                parts.append(text[pos:start])
+                parts.append(repl)
+            pos = end
+            if lit is not None and lit[0] < pos:
+                lit = next_literal(pos)
+            if rx_m is not None and rx_m.start() < pos:
+                if not use_regex:
+                    # a literal took over: scan again from where it ended
+                    rx_iter = finditer(text, pos)
+                rx_m = _next_nonempty(rx_iter)
+        parts.append(text[pos:])
+        return "".join(parts)
+
+    def _regex_wins(self, text: str, pos: int, key: str) -> bool:
+        """
+        Whether a regex with a non-empty match at `pos` comes before the
+        literal `key` in the combined rule order.
+        """
+        literal_rank = self._literal_rank[key]
+        for pattern in self.regexes:
+            if self._regex_rank[pattern] > literal_rank:
+                return False
+            for m in self._compiled(pattern).finditer(text, pos):
+                if m.start() > pos:
+                    break
+                if m.end() > pos:
+                    return True
+        return False
+
+    def _compiled(self, pattern: str) -> Pattern[str]:
+        rx = self._rx_cache.get(pattern)
+        if rx is None:
+            rx = self._rx_cache[pattern] = re.compile(pattern, self.flags)
+        return rx
+
+    def matching(self, text: str) -> list[Any]:
+        """
+        The rules that take part in cleaning `text`: literals and regexes
+        occurring in it.
+        """
+        literal_map = self.literals.mapping
+        hits: list[Any] = [
+            [k, literal_map[k]] for k in sorted(self.literals.occurring(text))
+        ]
+        for pattern in self.regexes:
+            if self._compiled(pattern).search(text) is not None:
+                hits.append([pattern, self.repl_map.get(pattern)])
+        return hits
+
+    def describe(self) -> list[Any]:
+        return [
+            sorted(self.literals.mapping.items()),
+            self.regexes,
+            sorted(self.repl_map.items()),
+        ]
+
+
+def _next_nonempty(matches: Iterator[Match[str]]) -> Match[str] | None:
+    return next((m for m in matches if m.end() > m.start()), None)
+
 
 @registrar.register_processor()
 class CleanerProcessor:
@@ -46,61 +215,46 @@ def __init__(self, config: dict[str, Any]) -> None:
         title_remove = list(dict.fromkeys(title_remove_patterns))
         content_remove = list(dict.fromkeys(content_remove_patterns))
 
-        self._title_repl_map: dict[str, str] = title_replacements
-        self._content_repl_map: dict[str, str] = content_replacements
-
-        # build combined regexes (longer first to avoid prefix collisions)
-        self._title_combined_rx: Pattern[str] | None = None
-        if title_remove or self._title_repl_map:
-            parts = title_remove + [re.escape(k) for k in self._title_repl_map]
-            parts.sort(key=len, reverse=True)
-            self._title_combined_rx = re.compile("|".join(parts))
+        # split literal rules from real regexes
+        title_literals, title_regexes = self._split_rules(
+            title_remove, title_replacements
+        )
+        content_literals, content_regexes = self._split_rules(
+            content_remove, content_replacements
+        )
 
-        self._content_combined_rx: Pattern[str] | None = None
-        if content_remove or self._content_repl_map:
-            parts = content_remove + [re.escape(k) for k in self._content_repl_map]
-            parts.sort(key=len, reverse=True)
-            self._content_combined_rx = re.compile("|".join(parts), flags=re.MULTILINE)
+        use_cache = bool(config.get("rule_cache", True))
+        replacers = self._build_literals(
+            {"title": title_literals, "content": content_literals}, use_cache
+        )
+        self._title_rules = _RuleSet(
+            replacers["title"], title_regexes, title_remove, title_replacements, 0
+        )
+        self._content_rules = _RuleSet(
+            replacers["content"],
+            content_regexes,
+            content_remove,
+            content_replacements,
+            re.MULTILINE,
+        )
 
     def process_book_info(self, book_info: BookInfoDict) -> BookInfoDict:
         """
         Apply cleaning rules to book metadata and nested structures.
         """
-        bi = copy.deepcopy(book_info)
-
-        if isinstance(name := bi.get("book_name"), str):
-            bi["book_name"] = self._clean_title(name)
-        if isinstance(author := bi.get("author"), str):
-            bi["author"] = self._clean_title(author)
-
-        if isinstance(summary := bi.get("summary"), str):
-            bi["summary"] = self._clean_content(summary)
-
-        if isinstance(tags := bi.get("tags"), list):
-            bi["tags"] = [
-                self._clean_title(t) if isinstance(t, str) else t for t in tags
-            ]
-
-        if isinstance(volumes := bi.get("volumes"), list):
-            for vol in volumes:
-                if isinstance(vname := vol.get("volume_name"), str):
-                    vol["volume_name"] = self._clean_title(vname)
-
-                if isinstance(intro := vol.get("volume_intro"), str):
-                    vol["volume_intro"] = self._clean_content(intro)
-
-                if isinstance(chapters := vol.get("chapters"), list):
-                    for cinfo in chapters:
-                        if isinstance(ctitle := cinfo.get("title"), str):
-                            cinfo["title"] = self._clean_title(ctitle)
-
-        return bi
+        return map_book_info(
+            book_info,
+            title=self._clean_title,
+            content=self._clean_content,
+            author=self._clean_title,
+            tags=self._clean_title,
+        )
 
     def process_chapter(self, chapter: ChapterDict) -> ChapterDict:
         """
         Apply cleaning rules to a single chapter (title + content).
         """
-        ch = copy.deepcopy(chapter)
+        ch = chapter.copy()
 
         if isinstance(title := ch.get("title"), str):
             ch["title"] = self._clean_title(title)
@@ -109,37 +263,108 @@ def process_chapter(self, chapter: ChapterDict) -> ChapterDict:
 
         return ch
 
+    def config_fingerprint(self) -> str:
+        """
+        Hash of the loaded rules, so edits to the rule files are noticed
+        even though the options only hold their paths.
+        """
+        return self._hash(
+            [
+                self._remove_invisible,
+                self._title_rules.describe(),
+                self._content_rules.describe(),
+            ]
+        )
+
+    def chapter_fingerprint(self, chapter: ChapterDict) -> str:
+        """
+        Hash of the rules that can affect this (unprocessed) chapter.
+
+        All rules are matched against the input only, so a rule that
+        matches nowhere in it never takes part in a match; adding, removing
+        or editing such rules leaves the output unchanged.
+        """
+        parts: list[Any] = [self._remove_invisible]
+        for text, rules in (
+            (chapter.get("title"), self._title_rules),
+            (chapter.get("content"), self._content_rules),
+        ):
+            if not isinstance(text, str) or not rules:
+                parts.append([])
+                continue
+            if self._remove_invisible:
+                text = self._remove_bom_and_invisible(text)
+            parts.append(rules.matching(text))
+        return self._hash(parts)
+
+    @staticmethod
+    def _hash(payload: Any) -> str:
+        data = json.dumps(payload, ensure_ascii=False)
+        return hashlib.sha256(data.encode("utf-8")).hexdigest()[:16]
+
+    @staticmethod
+    def _split_rules(
+        removes: list[str],
+        replacements: dict[str, str],
+    ) -> tuple[dict[str, str], list[str]]:
+        """
+        Split rules into a literal mapping and the remaining regex patterns.
+
+        Replacements win over removals of the same literal, as before.
+        """
+        literals = {p: "" for p in removes if is_literal_pattern(p)}
+        literals.update(replacements)
+        regexes = [p for p in removes if not is_literal_pattern(p)]
+        regexes.sort(key=len, reverse=True)
+        return literals, regexes
+
+    @staticmethod
+    def _build_literals(
+        mappings: dict[str, dict[str, str]],
+        use_cache: bool,
+    ) -> dict[str, LiteralReplacer]:
+        """
+        Build the literal matchers, reusing a compiled copy from the rule
+        cache when the same rules were compiled before.
+        """
+        if not use_cache or not any(mappings.values()):
+            return {name: LiteralReplacer(m) for name, m in mappings.items()}
+
+        key = CleanerProcessor._hash(
+            [
+                _RULE_CACHE_VERSION,
+                LITERAL_BACKEND,
+                {name: sorted(m.items()) for name, m in mappings.items()},
+            ]
+        )
+        return load_or_build(
+            Path(RULE_CACHE_DIR) / f"{key}.pickle",
+            lambda: {name: LiteralReplacer(m) for name, m in mappings.items()},
+            lambda cached: isinstance(cached, dict) and set(cached) == set(mappings),
+        )
+
     @classmethod
     def _remove_bom_and_invisible(cls, text: str) -> str:
         return cls._INVISIBLE_PATTERN.sub("", text)
 
     def _clean_title(self, text: str) -> str:
-        return self._do_clean(text, self._title_combined_rx, self._title_repl_map)
+        return self._do_clean(text, self._title_rules)
 
     def _clean_content(self, text: str) -> str:
-        return self._do_clean(text, self._content_combined_rx, self._content_repl_map)
+        return self._do_clean(text, self._content_rules)
 
-    def _do_clean(
-        self,
-        text: str,
-        combined_rx: Pattern[str] | None,
-        repl_map: dict[str, str],
-    ) -> str:
+    def _do_clean(self, text: str, rules: _RuleSet) -> str:
         if not isinstance(text, str):
             return text  # defensive
 
-        if not self._remove_invisible and not combined_rx:
+        if not self._remove_invisible and not rules:
             return text.strip()
 
         if self._remove_invisible:
             text = self._remove_bom_and_invisible(text)
 
-        if combined_rx:
-
-            def _sub(match: Match[str]) -> str:
-                return repl_map.get(match.group(0), "")
-
-            text = combined_rx.sub(_sub, text)
+        if rules:
+            text = rules.apply(text)
 
         return text.strip()
 
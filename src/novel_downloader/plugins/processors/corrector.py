@@ -5,16 +5,26 @@
 
 Runs Chinese text correction using pycorrector engines (kenlm/MacBERT/T5/etc.)
 on book metadata and chapter content.
+
+Loaded models are kept per process, so later `process_book` calls in the
+same CLI or web session skip the model load; corrected sentences are
+cached on disk and shared across books.
 """
 
 from __future__ import annotations
 
-import copy
+import json
 import logging
+import re
+import sqlite3
+import threading
 from collections.abc import Callable
-from typing import Any
+from typing import Any, Literal
 
+from novel_downloader.infra.paths import USER_CACHE_DIR
+from novel_downloader.infra.persistence.correction_cache import CorrectionCache
 from novel_downloader.plugins.registry import registrar
+from novel_downloader.plugins.utils.book_info import map_book_info
 from novel_downloader.schemas import BookInfoDict, ChapterDict
 
 logger = logging.getLogger(__name__)
@@ -22,6 +32,15 @@
 SingleHandler = Callable[[str], str]
 BatchHandler = Callable[[list[str]], list[str]]
 
+CORRECTION_CACHE_PATH = USER_CACHE_DIR / "correction_cache.sqlite"
+
+# A sentence ends at terminal punctuation plus any closing quotes/brackets
+_SENTENCE_RX = re.compile(r".+?(?:[。！？!?…]+[」』”’）)]*|$)")
+
+# Warm models: (engine, model key) -> batch handler
+_MODELS: dict[tuple[str, str], BatchHandler] = {}
+_MODELS_LOCK = threading.Lock()
+
 
 @registrar.register_processor()
 class CorrectorProcessor:
@@ -29,6 +48,9 @@ class CorrectorProcessor:
     Implements the Processor protocol using pycorrector.
     """
 
+    # Pool workers would each load their own copy of the model
+    single_process = True
+
     def __init__(self, config: dict[str, Any]) -> None:
         self._apply_title = bool(config.get("apply_title", True))
         self._apply_content = bool(config.get("apply_content", True))
@@ -36,66 +58,76 @@ def __init__(self, config: dict[str, Any]) -> None:
         self._apply_tags = bool(config.get("apply_tags", False))
 
         self._skip_if_len_le = config.get("skip_if_len_le")
+        self._batch_size = max(1, int(config.get("batch_size", 64)))
 
         self._engine = (config.get("engine") or "kenlm").lower()
-        self._batch_handler = self._build_batch_handler(self._engine, config)
+        self._model_key = json.dumps(
+            self._engine_kwargs(self._engine, config), sort_keys=True, default=str
+        )
+        self._batch_handler = self._load_batch_handler(
+            config, keep=bool(config.get("keep_model", True))
+        )
+
+        self._use_cache = bool(config.get("correction_cache", True))
+        self._cache: CorrectionCache | None = None
 
     def process_book_info(self, book_info: BookInfoDict) -> BookInfoDict:
         """
         Apply correction to book metadata and nested structures.
         """
-        bi = copy.deepcopy(book_info)
-
-        # Title-like
-        if self._apply_title and isinstance(name := bi.get("book_name"), str):
-            bi["book_name"] = self._correct_text(name)
-        if self._apply_author and isinstance(author := bi.get("author"), str):
-            bi["author"] = self._correct_text(author)
-
-        # Content-like
-        if self._apply_content and isinstance(summary := bi.get("summary"), str):
-            bi["summary"] = self._correct_text(summary)
-
-        # Tags
-        if self._apply_tags and isinstance(tags := bi.get("tags"), list):
-            bi["tags"] = [
-                self._correct_text(t) if isinstance(t, str) else t for t in tags
-            ]
-
-        # Volumes & chapters
-        if isinstance(volumes := bi.get("volumes"), list):
-            for vol in volumes:
-                if self._apply_title and isinstance(
-                    vname := vol.get("volume_name"), str
-                ):
-                    vol["volume_name"] = self._correct_text(vname)
-
-                if self._apply_content and isinstance(
-                    intro := vol.get("volume_intro"), str
-                ):
-                    vol["volume_intro"] = self._correct_text(intro)
-
-                if isinstance(chapters := vol.get("chapters"), list):
-                    for cinfo in chapters:
-                        if self._apply_title and isinstance(
-                            ctitle := cinfo.get("title"), str
-                        ):
-                            cinfo["title"] = self._correct_text(ctitle)
-
-        return bi
+        fn = self._correct_text
+        return map_book_info(
+            book_info,
+            title=fn if self._apply_title else None,
+            content=fn if self._apply_content else None,
+            author=fn if self._apply_author else None,
+            tags=fn if self._apply_tags else None,
+        )
 
     def process_chapter(self, chapter: ChapterDict) -> ChapterDict:
         """
         Apply correction to a single chapter (title + content).
         """
-        ch = copy.deepcopy(chapter)
+        return self.process_chapters([chapter])[0]
+
+    def process_chapters(self, chapters: list[ChapterDict]) -> list[ChapterDict]:
+        """
+        Apply correction to several chapters, batching lines across them
+        so the model sees full batches.
+        """
+        out = [ch.copy() for ch in chapters]
+
+        fields: list[tuple[int, Literal["title", "content"]]] = []
+        texts: list[str] = []
+        for idx, ch in enumerate(out):
+            if self._apply_title and isinstance(title := ch.get("title"), str):
+                fields.append((idx, "title"))
+                texts.append(title)
+            if self._apply_content and isinstance(content := ch.get("content"), str):
+                fields.append((idx, "content"))
+                texts.append(content)
+
+        for (idx, key), fixed in zip(fields, self._correct_texts(texts), strict=True):
+            out[idx][key] = fixed
 
-        if self._apply_title and isinstance(title := ch.get("title"), str):
-            ch["title"] = self._correct_text(title)
-        if self._apply_content and isinstance(content := ch.get("content"), str):
-            ch["content"] = self._correct_text(content)
+        return out
 
-        return ch
+    def _load_batch_handler(self, cfg: dict[str, Any], keep: bool) -> BatchHandler:
+        """
+        Return the batch handler for the configured model, reusing one
+        already loaded in this process when `keep` is set.
+        """
+        if not keep:
+            return self._build_batch_handler(self._engine, cfg)
+
+        key = (self._engine, self._model_key)
+        with _MODELS_LOCK:
+            handler = _MODELS.get(key)
+            if handler is None:
+                handler = _MODELS[key] = self._build_batch_handler(self._engine, cfg)
+            else:
+                logger.debug("Reusing loaded pycorrector model: %s", key)
+        return handler
 
     def _build_batch_handler(self, engine: str, cfg: dict[str, Any]) -> BatchHandler:
         """Create engine-specific batch handler with normalized outputs."""
@@ -206,16 +238,19 @@ def _batch(texts: list[str]) -> list[str]:
 
     def _correct_text(self, text: str) -> str:
         """
-        Correct a single string. Optionally line-by-line to preserve structure.
-        Uses engine-normalized handlers to avoid pycorrector's type unions.
+        Correct a single string line-by-line to preserve structure.
         """
         if not isinstance(text, str):
             return text
+        return self._correct_texts([text])[0]
 
-        lines: list[str] = text.splitlines()
-        if not lines:
-            return text
+    def _correct_texts(self, texts: list[str]) -> list[str]:
+        """
+        Correct several strings line-by-line to preserve structure.
 
+        Lines that need correction are collected across all texts and sent
+        to the engine in batches of `batch_size`.
+        """
         th = self._skip_if_len_le
 
         def _needs(seg: str) -> bool:
@@ -224,26 +259,98 @@ def _needs(seg: str) -> bool:
                 return False
             return not (th is not None and len(s) <= int(th))
 
-        mask = [_needs(seg) for seg in lines]
-        batch = [seg for seg, m in zip(lines, mask, strict=False) if m]
+        split = [text.splitlines() for text in texts]
+        masks = [[_needs(seg) for seg in lines] for lines in split]
+        batch = [
+            seg
+            for lines, mask in zip(split, masks, strict=True)
+            for seg, m in zip(lines, mask, strict=True)
+            if m
+        ]
+        it = iter(self._correct_lines(batch))
+
+        out: list[str] = []
+        for text, lines, mask in zip(texts, split, masks, strict=True):
+            if not lines:
+                out.append(text)
+                continue
+            out_lines = [
+                next(it) if m else seg for seg, m in zip(lines, mask, strict=True)
+            ]
+            out.append("\n".join(out_lines))
+        return out
+
+    def _correct_lines(self, lines: list[str]) -> list[str]:
+        """
+        Correct lines sentence by sentence.
 
-        if not batch:
-            return "\n".join(lines)
+        Each distinct sentence is corrected once; sentences found in the
+        correction cache skip the model entirely.
+        """
+        pieces = [_SENTENCE_RX.findall(line) for line in lines]
+        unique = list(dict.fromkeys(s for ps in pieces for s in ps if s.strip()))
 
-        fixed = self._batch_handler(batch)
+        fixed = self._recall(unique)
+        missing = [s for s in unique if s not in fixed]
+        if missing:
+            new = dict(zip(missing, self._run_model(missing), strict=True))
+            fixed.update(new)
+            self._remember(new)
 
-        if not isinstance(fixed, list) or len(fixed) != sum(mask):
-            logger.warning("Batch handler size mismatch; using per-item fallback.")
-            fixed = []
-            for seg in batch:
-                x = self._batch_handler([seg])
-                fixed.append(x[0] if isinstance(x, list) and x else seg)
+        return ["".join(fixed.get(s, s) for s in ps) for ps in pieces]
 
-        it = iter(fixed)
-        out_lines = [
-            next(it) if m else seg for seg, m in zip(lines, mask, strict=False)
-        ]
-        return "\n".join(out_lines)
+    def _run_model(self, sentences: list[str]) -> list[str]:
+        """
+        Run the engine over sentences in batches, falling back per item
+        when a batch comes back with the wrong size.
+        """
+        out: list[str] = []
+        for start in range(0, len(sentences), self._batch_size):
+            batch = sentences[start : start + self._batch_size]
+            fixed = self._batch_handler(batch)
+
+            if not isinstance(fixed, list) or len(fixed) != len(batch):
+                logger.warning("Batch handler size mismatch; using per-item fallback.")
+                fixed = []
+                for seg in batch:
+                    x = self._batch_handler([seg])
+                    fixed.append(x[0] if isinstance(x, list) and x else seg)
+
+            out.extend(fixed)
+        return out
+
+    def _open_cache(self) -> CorrectionCache | None:
+        if not self._use_cache:
+            return None
+        if self._cache is None:
+            cache = CorrectionCache(CORRECTION_CACHE_PATH)
+            try:
+                cache.connect()
+            except (OSError, sqlite3.Error) as e:
+                logger.warning("Correction cache disabled: %s", e)
+                self._use_cache = False
+                return None
+            self._cache = cache
+        return self._cache
+
+    def _recall(self, sentences: list[str]) -> dict[str, str]:
+        cache = self._open_cache()
+        if cache is None or not sentences:
+            return {}
+        try:
+            return cache.get_many(self._engine, self._model_key, sentences)
+        except sqlite3.Error as e:
+            logger.warning("Correction cache lookup failed: %s", e)
+            return {}
+
+    def _remember(self, pairs: dict[str, str]) -> None:
+        cache = self._open_cache()
+        if cache is None or not pairs:
+            return
+        try:
+            cache.put_many(self._engine, self._model_key, pairs)
+        except sqlite3.Error as e:
+            logger.warning("Correction cache update failed: %s", e)
 
     @staticmethod
     def _engine_kwargs(engine: str, cfg: dict[str, Any]) -> dict[str, Any]:
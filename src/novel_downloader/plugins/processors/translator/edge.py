@@ -5,19 +5,21 @@
 """
 
 import base64
-import copy
 import json
 import logging
-import time
+import threading
 from datetime import datetime
 from typing import Any
 from urllib.parse import urlencode
 
 import requests
 
+from novel_downloader.libs.textutils import pack_texts
 from novel_downloader.plugins.registry import registrar
 from novel_downloader.schemas import BookInfoDict, ChapterDict
 
+from .engine import TranslationEngine, translate_book_info
+
 logger = logging.getLogger(__name__)
 
 
@@ -30,47 +32,51 @@ class EdgeTranslaterProcessor:
     def __init__(self, config: dict[str, Any]) -> None:
         self._source: str = config.get("source") or "auto"
         self._target: str = config.get("target") or "zh-Hans"
-        self._sleep: float = float(config.get("sleep", 1.0))
+        self._batch_chars: int = int(config.get("batch_chars", 10000))
+        self._engine = TranslationEngine(
+            "edge", self._source, self._target, config, default_rate=2.0
+        )
         self._endpoint: str = (
             "https://api-edge.cognitive.microsofttranslator.com/translate"
         )
         self._auth_url: str = "https://edge.microsoft.com/translate/auth"
         self._token_cache: dict[str, Any] | None = None
+        self._token_lock = threading.Lock()
 
     def process_book_info(self, book_info: BookInfoDict) -> BookInfoDict:
         """
         Translate book metadata and nested structures.
         """
-        bi = copy.deepcopy(book_info)
-
-        bi["book_name"] = self._translate(bi.get("book_name", ""))
-        bi["summary"] = self._translate(bi.get("summary", ""))
-        if "summary_brief" in bi:
-            bi["summary_brief"] = self._translate(bi["summary_brief"])
-
-        for vol in bi.get("volumes", []):
-            vol["volume_name"] = self._translate(vol.get("volume_name", ""))
-            if "volume_intro" in vol:
-                vol["volume_intro"] = self._translate(vol["volume_intro"])
-            for ch in vol.get("chapters", []):
-                ch["title"] = self._translate(ch.get("title", ""))
-
-        return bi
+        return translate_book_info(book_info, self._translate_many)
 
     def process_chapter(self, chapter: ChapterDict) -> ChapterDict:
         """
         Translate a single chapter (title + content).
         Each line is treated as one paragraph.
         """
-        ch = copy.deepcopy(chapter)
+        return self.process_chapters([chapter])[0]
+
+    def process_chapters(self, chapters: list[ChapterDict]) -> list[ChapterDict]:
+        """
+        Translate several chapters, packing titles and paragraphs of many
+        chapters into each request.
+        """
+        out = [ch.copy() for ch in chapters]
 
-        ch["title"] = self._translate(ch.get("title", ""))
+        texts: list[str] = []
+        counts: list[int] = []
+        for ch in out:
+            paragraphs = self._split_text(ch.get("content", ""))
+            texts.append(ch.get("title", ""))
+            texts.extend(paragraphs)
+            counts.append(len(paragraphs))
 
-        paragraphs = self._split_text(ch.get("content", ""))
-        translated = [self._translate(p) for p in paragraphs]
-        ch["content"] = "\n".join(translated)
+        it = iter(self._translate_many(texts))
+        for ch, count in zip(out, counts, strict=True):
+            ch["title"] = next(it)
+            ch["content"] = "\n".join(next(it) for _ in range(count))
 
-        return ch
+        return out
 
     @staticmethod
     def _split_text(text: str, max_length: int = 3000) -> list[str]:
@@ -117,21 +123,36 @@ def _get_token(self) -> str:
         """
         Fetch a fresh token from Edge if none cached or expired.
         """
-        if self._token_cache is None or datetime.now() >= self._token_cache["expire"]:
-            logger.debug("Fetching new Microsoft Edge translator token...")
-            r = requests.get(self._auth_url, timeout=10)
-            r.raise_for_status()
-            token = r.text.strip()
-            self._token_cache = self._parse_jwt(token)
-        return self._token_cache["token"]  # type: ignore[no-any-return]
-
-    def _translate(self, text: str) -> str:
+        with self._token_lock:
+            if (
+                self._token_cache is None
+                or datetime.now() >= self._token_cache["expire"]
+            ):
+                logger.debug("Fetching new Microsoft Edge translator token...")
+                r = requests.get(self._auth_url, timeout=10)
+                r.raise_for_status()
+                token = r.text.strip()
+                self._token_cache = self._parse_jwt(token)
+            return self._token_cache["token"]  # type: ignore[no-any-return]
+
+    def _translate_many(self, texts: list[str]) -> list[str]:
         """
-        Translate text using Edge Translator API.
+        Translate texts using Edge Translator API, several per request.
+
+        Blank texts are returned unchanged; a failed request leaves its
+        texts untranslated.
         """
-        if not text.strip():
-            return text
+        return self._engine.translate(
+            [text.strip() or text for text in texts], self._pack, self._request
+        )
 
+    def _pack(self, texts: list[str]) -> list[list[int]]:
+        return pack_texts(texts, self._batch_chars, max_items=100)
+
+    def _request(self, texts: list[str]) -> list[str] | None:
+        """
+        Send one translation request; returns None on failure.
+        """
         params = {
             "to": self._target,
             "api-version": "3.0",
@@ -145,22 +166,20 @@ def _translate(self, text: str) -> str:
             "Content-Type": "application/json",
             "authorization": f"Bearer {self._get_token()}",
         }
-        body = json.dumps([{"text": text.strip()}])
+        body = json.dumps([{"text": text} for text in texts])
 
         try:
             r = requests.post(endpoint, headers=headers, data=body, timeout=20)
             if r.status_code == 200:
                 data = r.json()
-                return data[0]["translations"][0]["text"]  # type: ignore[no-any-return]
+                return [str(item["translations"][0]["text"]) for item in data]
             else:
                 logger.warning(
                     "HTTP %d during Edge translation: %s",
                     r.status_code,
                     r.text[:120],
                 )
-                return text
+                return None
         except Exception as e:
             logger.error("Edge translation failed: %s", e)
-            return text
-        finally:
-            time.sleep(self._sleep)
+            return None
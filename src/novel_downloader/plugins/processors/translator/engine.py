@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+novel_downloader.plugins.processors.translator.engine
+-----------------------------------------------------
+
+Request engine shared by the translator processors.
+
+Texts are deduplicated and looked up in the persistent translation memory
+first; the remaining ones are packed into requests that run concurrently
+in worker threads, bounded by a per-provider concurrency limit and a
+request-rate budget.
+"""
+
+from __future__ import annotations
+
+__all__ = ["TranslationEngine", "translate_book_info"]
+
+import asyncio
+import logging
+import sqlite3
+from collections.abc import Callable, Sequence
+from typing import Any
+
+from novel_downloader.infra.paths import USER_CACHE_DIR
+from novel_downloader.infra.persistence.translation_memory import TranslationMemory
+from novel_downloader.plugins.utils.book_info import map_book_info
+from novel_downloader.plugins.utils.rate_limiter import TokenBucketRateLimiter
+from novel_downloader.schemas import BookInfoDict
+
+logger = logging.getLogger(__name__)
+
+TRANSLATION_MEMORY_PATH = USER_CACHE_DIR / "translation_memory.sqlite"
+
+# Sends one request; None (or a None entry) marks a failed translation
+RequestFn = Callable[[list[str]], Sequence[str | None] | None]
+PackFn = Callable[[list[str]], list[list[int]]]
+
+
+class TranslationEngine:
+    """
+    Translate texts through a provider's request function.
+
+    Failed texts are returned untranslated and are not remembered, so the
+    next run retries them.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        source: str,
+        target: str,
+        config: dict[str, Any],
+        *,
+        default_rate: float,
+    ) -> None:
+        """
+        :param name: Provider key, part of the translation memory key.
+        :param source: Source language code.
+        :param target: Target language code.
+        :param config: Processor options (`concurrency`, `rate`, `sleep`,
+            `translation_memory`).
+        :param default_rate: Requests per second when not configured.
+        """
+        self._name = name
+        self._source = source
+        self._target = target
+        self._concurrency = max(1, int(config.get("concurrency", 4)))
+
+        if "rate" in config:
+            rate = float(config["rate"])
+        elif "sleep" in config:
+            # legacy option: a pause after every sequential request
+            sleep = float(config["sleep"])
+            rate = 1.0 / sleep if sleep > 0 else 0.0
+        else:
+            rate = default_rate
+        self._rate = max(0.0, rate)
+
+        self._use_memory = bool(config.get("translation_memory", True))
+        self._memory: TranslationMemory | None = None
+
+    def translate(
+        self,
+        texts: list[str],
+        pack: PackFn,
+        request: RequestFn,
+    ) -> list[str]:
+        """
+        Translate `texts`; blank texts are returned unchanged.
+
+        :param pack: Groups the texts to translate into requests
+            (returns lists of indices).
+        :param request: Translates one group of texts; called from worker
+            threads.
+        """
+        unique = list(dict.fromkeys(t for t in texts if t.strip()))
+        if not unique:
+            return list(texts)
+
+        done = self._recall(unique)
+        missing = [t for t in unique if t not in done]
+        if missing:
+            batches = [[missing[i] for i in batch] for batch in pack(missing)]
+            asyncio.run(self._run(batches, request, done))
+
+        return [done.get(t, t) for t in texts]
+
+    async def _run(
+        self,
+        batches: list[list[str]],
+        request: RequestFn,
+        done: dict[str, str],
+    ) -> None:
+        sem = asyncio.Semaphore(self._concurrency)
+        limiter = (
+            TokenBucketRateLimiter(
+                self._rate, burst=self._concurrency, jitter_strength=0.1
+            )
+            if self._rate > 0
+            else None
+        )
+
+        async def _one(batch: list[str]) -> None:
+            async with sem:
+                if limiter is not None:
+                    await limiter.wait()
+                try:
+                    result = await asyncio.to_thread(request, batch)
+                except Exception as e:
+                    logger.warning("%s translation request failed: %s", self._name, e)
+                    return
+
+            if result is None or len(result) != len(batch):
+                return
+            pairs = {
+                text: trans
+                for text, trans in zip(batch, result, strict=True)
+                if trans is not None
+            }
+            done.update(pairs)
+            # remember as results arrive, so an interrupted run keeps them
+            self._remember(pairs)
+
+        await asyncio.gather(*(_one(batch) for batch in batches))
+
+    def _open_memory(self) -> TranslationMemory | None:
+        if not self._use_memory:
+            return None
+        if self._memory is None:
+            memory = TranslationMemory(TRANSLATION_MEMORY_PATH)
+            try:
+                memory.connect()
+            except (OSError, sqlite3.Error) as e:
+                logger.warning("Translation memory disabled: %s", e)
+                self._use_memory = False
+                return None
+            self._memory = memory
+        return self._memory
+
+    def _recall(self, texts: list[str]) -> dict[str, str]:
+        memory = self._open_memory()
+        if memory is None:
+            return {}
+        try:
+            return memory.get_many(self._name, self._source, self._target, texts)
+        except sqlite3.Error as e:
+            logger.warning("Translation memory lookup failed: %s", e)
+            return {}
+
+    def _remember(self, pairs: dict[str, str]) -> None:
+        memory = self._open_memory()
+        if memory is None or not pairs:
+            return
+        try:
+            memory.put_many(self._name, self._source, self._target, pairs)
+        except sqlite3.Error as e:
+            logger.warning("Translation memory update failed: %s", e)
+
+
+def translate_book_info(
+    book_info: BookInfoDict,
+    translate_many: Callable[[list[str]], list[str]],
+) -> BookInfoDict:
+    """
+    Translate the titles and descriptions of `book_info` in one batch.
+
+    :param translate_many: Translates a list of texts, preserving order.
+    """
+    texts: list[str] = []
+
+    def _collect(text: str) -> str:
+        texts.append(text)
+        return text
+
+    map_book_info(book_info, title=_collect, content=_collect)
+    if isinstance(brief := book_info.get("summary_brief"), str):
+        texts.append(brief)
+
+    table = dict(zip(texts, translate_many(texts), strict=True))
+
+    def _lookup(text: str) -> str:
+        return table.get(text, text)
+
+    bi = map_book_info(book_info, title=_lookup, content=_lookup)
+    if isinstance(brief, str):
+        bi["summary_brief"] = _lookup(brief)
+    return bi
@@ -6,17 +6,18 @@
 
 from __future__ import annotations
 
-import copy
 import logging
-import time
 from typing import Any
 
 import requests
 
 from novel_downloader.infra.http_defaults import DEFAULT_USER_AGENT
+from novel_downloader.libs.textutils import pack_texts
 from novel_downloader.plugins.registry import registrar
 from novel_downloader.schemas import BookInfoDict, ChapterDict
 
+from .engine import TranslationEngine, translate_book_info
+
 logger = logging.getLogger(__name__)
 
 
@@ -29,7 +30,10 @@ class GoogleTranslaterProcessor:
     def __init__(self, config: dict[str, Any]) -> None:
         self._source: str = config.get("source") or "auto"
         self._target: str = config.get("target") or "zh-CN"
-        self._sleep: float = float(config.get("sleep", 2.0))
+        self._batch_chars: int = int(config.get("batch_chars", 4500))
+        self._engine = TranslationEngine(
+            "google", self._source, self._target, config, default_rate=1.0
+        )
         self._endpoint = "https://translate.googleapis.com/translate_a/single"
         self._headers = {
             "Accept": "*/*",
@@ -42,36 +46,64 @@ def process_book_info(self, book_info: BookInfoDict) -> BookInfoDict:
         """
         Apply translate to book metadata and nested structures.
         """
-        bi = copy.deepcopy(book_info)
-        bi["book_name"] = self._translate(bi.get("book_name", ""))
-        bi["summary"] = self._translate(bi.get("summary", ""))
-
-        if "summary_brief" in bi:
-            bi["summary_brief"] = self._translate(bi["summary_brief"])
-
-        for vol in bi.get("volumes", []):
-            vol["volume_name"] = self._translate(vol.get("volume_name", ""))
-            if "volume_intro" in vol:
-                vol["volume_intro"] = self._translate(vol["volume_intro"])
-            for ch in vol.get("chapters", []):
-                ch["title"] = self._translate(ch.get("title", ""))
-
-        return bi
+        return translate_book_info(book_info, self._translate_many)
 
     def process_chapter(self, chapter: ChapterDict) -> ChapterDict:
         """
         Apply cleaning rules to a single chapter (title + content).
         """
-        ch = copy.deepcopy(chapter)
-        ch["title"] = self._translate(ch.get("title", ""))
-        ch["content"] = self._translate(ch.get("content", ""))
-        return ch
+        return self.process_chapters([chapter])[0]
+
+    def process_chapters(self, chapters: list[ChapterDict]) -> list[ChapterDict]:
+        """
+        Translate several chapters, packing short texts of many chapters
+        into each request.
+        """
+        out = [ch.copy() for ch in chapters]
+        texts: list[str] = []
+        for ch in out:
+            texts += [ch.get("title", ""), ch.get("content", "")]
+
+        it = iter(self._translate_many(texts))
+        for ch in out:
+            ch["title"] = next(it)
+            ch["content"] = next(it)
+        return out
+
+    def _translate_many(self, texts: list[str]) -> list[str]:
+        return self._engine.translate(texts, self._pack, self._request)
+
+    def _pack(self, texts: list[str]) -> list[list[int]]:
+        return pack_texts(texts, self._batch_chars)
+
+    def _request(self, texts: list[str]) -> list[str | None]:
+        """
+        Translate texts, joining several into one newline-separated request.
 
-    def _translate(self, text: str) -> str:
-        """Send text to the unofficial Google Translate endpoint."""
-        if not text.strip():
-            return text
+        The joined translation is split back by line count; when the
+        endpoint merges or splits lines, the texts are sent one by one.
+        """
+        if len(texts) > 1:
+            joined = "\n".join(texts)
+            trans = self._translate(joined)
+            if trans is not None:
+                lines = trans.split("\n")
+                if len(lines) == joined.count("\n") + 1:
+                    out: list[str | None] = []
+                    pos = 0
+                    for text in texts:
+                        n = text.count("\n") + 1
+                        out.append("\n".join(lines[pos : pos + n]))
+                        pos += n
+                    return out
+        return [self._translate(text) for text in texts]
+
+    def _translate(self, text: str) -> str | None:
+        """
+        Send text to the unofficial Google Translate endpoint.
 
+        :return: The translation, or None if the request failed.
+        """
         data = {
             "client": "gtx",
             "sl": self._source,
@@ -80,7 +112,6 @@ def _translate(self, text: str) -> str:
             "dj": "1",
             "q": text,
         }
-        trans: str = text
 
         try:
             r = requests.post(
@@ -88,17 +119,12 @@ def _translate(self, text: str) -> str:
             )
             if r.status_code == 200:
                 resp = r.json()
-                trans = "".join(s["trans"] for s in resp["sentences"])
-            else:
-                logger.warning(
-                    "HTTP %d while translating text: %s",
-                    r.status_code,
-                    r.text,
-                )
+                return "".join(s["trans"] for s in resp["sentences"])
+            logger.warning(
+                "HTTP %d while translating text: %s",
+                r.status_code,
+                r.text,
+            )
         except Exception as e:
             logger.warning("Translation request failed: %s", e)
-
-        # Respectful delay between requests
-        time.sleep(self._sleep)
-
-        return trans
+        return None
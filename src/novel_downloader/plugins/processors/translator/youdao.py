@@ -5,10 +5,10 @@
 """
 
 import base64
-import copy
 import hashlib
 import json
 import logging
+import threading
 import time
 from typing import Any
 
@@ -17,9 +17,12 @@
 from Crypto.Util.Padding import unpad
 
 from novel_downloader.infra.http_defaults import DEFAULT_USER_AGENT
+from novel_downloader.libs.textutils import pack_texts
 from novel_downloader.plugins.registry import registrar
 from novel_downloader.schemas import BookInfoDict, ChapterDict
 
+from .engine import TranslationEngine, translate_book_info
+
 logger = logging.getLogger(__name__)
 
 
@@ -32,43 +35,46 @@ class YoudaoTranslaterProcessor:
     def __init__(self, config: dict[str, Any]) -> None:
         self._source: str = config.get("source") or "auto"
         self._target: str = config.get("target") or "zh-CHS"
-        self._sleep: float = float(config.get("sleep", 1.0))
+        self._batch_chars: int = int(config.get("batch_chars", 3000))
+        self._engine = TranslationEngine(
+            "youdao", self._source, self._target, config, default_rate=1.0
+        )
         self._client = _YoudaoWebFanyi()
 
     def process_book_info(self, book_info: BookInfoDict) -> BookInfoDict:
         """
         Translate book metadata and nested structures.
         """
-        bi = copy.deepcopy(book_info)
-
-        bi["book_name"] = self._translate(bi.get("book_name", ""))
-        bi["summary"] = self._translate(bi.get("summary", ""))
-        if "summary_brief" in bi:
-            bi["summary_brief"] = self._translate(bi["summary_brief"])
-
-        for vol in bi.get("volumes", []):
-            vol["volume_name"] = self._translate(vol.get("volume_name", ""))
-            if "volume_intro" in vol:
-                vol["volume_intro"] = self._translate(vol["volume_intro"])
-            for ch in vol.get("chapters", []):
-                ch["title"] = self._translate(ch.get("title", ""))
-
-        return bi
+        return translate_book_info(book_info, self._translate_many)
 
     def process_chapter(self, chapter: ChapterDict) -> ChapterDict:
         """
         Translate a single chapter (title + content).
         Each line is treated as one paragraph.
         """
-        ch = copy.deepcopy(chapter)
+        return self.process_chapters([chapter])[0]
 
-        ch["title"] = self._translate(ch.get("title", ""))
+    def process_chapters(self, chapters: list[ChapterDict]) -> list[ChapterDict]:
+        """
+        Translate several chapters, packing titles and paragraphs of many
+        chapters into each request.
+        """
+        out = [ch.copy() for ch in chapters]
+
+        texts: list[str] = []
+        counts: list[int] = []
+        for ch in out:
+            paragraphs = self._split_text(ch.get("content", ""))
+            texts.append(ch.get("title", ""))
+            texts.extend(paragraphs)
+            counts.append(len(paragraphs))
 
-        paragraphs = self._split_text(ch.get("content", ""))
-        translated = [self._translate(p) for p in paragraphs]
-        ch["content"] = "\n".join(translated)
+        it = iter(self._translate_many(texts))
+        for ch, count in zip(out, counts, strict=True):
+            ch["title"] = next(it)
+            ch["content"] = "\n".join(next(it) for _ in range(count))
 
-        return ch
+        return out
 
     @staticmethod
     def _split_text(text: str, max_length: int = 3000) -> list[str]:
@@ -96,22 +102,48 @@ def _split_text(text: str, max_length: int = 3000) -> list[str]:
 
         return chunks
 
-    def _translate(self, text: str) -> str:
+    def _translate_many(self, texts: list[str]) -> list[str]:
+        return self._engine.translate(texts, self._pack, self._request)
+
+    def _pack(self, texts: list[str]) -> list[list[int]]:
+        return pack_texts(texts, self._batch_chars)
+
+    def _request(self, texts: list[str]) -> list[str | None]:
+        """
+        Translate texts, joining several into one newline-separated request.
+
+        Youdao returns one row per input line, so the rows are split back
+        by line count; on a mismatch the texts are sent one by one.
+        """
+        if len(texts) > 1:
+            joined = "\n".join(texts)
+            try:
+                rows = self._client.translate_rows(joined, self._source, self._target)
+            except Exception as e:
+                logger.warning("Youdao batch translate failed: %s", e)
+                rows = []
+
+            if len(rows) == joined.count("\n") + 1:
+                out: list[str | None] = []
+                pos = 0
+                for text in texts:
+                    n = text.count("\n") + 1
+                    out.append("".join(rows[pos : pos + n]))
+                    pos += n
+                return out
+        return [self._translate(text) for text in texts]
+
+    def _translate(self, text: str) -> str | None:
         """
         Translate text using Youdao Translator API.
+
+        :return: The translation, or None if the request failed.
         """
-        if not text:
-            return ""
         try:
-            out = self._client.translate(text, self._source, self._target)
-            if self._sleep > 0:
-                time.sleep(self._sleep)
-            return out
+            return self._client.translate(text, self._source, self._target)
         except Exception as e:
-            logger.warning(
-                "Youdao translate failed; returning original text. Error: %s", e
-            )
-            return text
+            logger.warning("Youdao translate failed: %s", e)
+            return None
 
 
 class _YoudaoWebFanyi:
@@ -143,6 +175,8 @@ def __init__(self, session: requests.Session | None = None) -> None:
         self._aes_key_bytes: bytes = b""
         self._aes_iv_bytes: bytes = b""
         self._key_fetched_at: float = 0.0
+        # requests run concurrently; fetch keys once at a time
+        self._key_lock = threading.Lock()
 
     @staticmethod
     def _md5_hex(s: str) -> str:
@@ -161,6 +195,10 @@ def _sign_for_translate(self, mystic_time_ms: int, secret_key: str) -> str:
         return self._md5_hex(s)
 
     def _ensure_keys(self, force: bool = False) -> None:
+        with self._key_lock:
+            self._fetch_keys(force)
+
+    def _fetch_keys(self, force: bool) -> None:
         if (
             not force
             and self._secret_key
@@ -237,6 +275,16 @@ def _norm_lang(code: str) -> str:
     def translate(self, text: str, src: str = "auto", tgt: str = "zh-CHS") -> str:
         if not text:
             return ""
+        return "".join(self.translate_rows(text, src, tgt))
+
+    def translate_rows(
+        self, text: str, src: str = "auto", tgt: str = "zh-CHS"
+    ) -> list[str]:
+        """
+        Translate text and return one translated row per input paragraph.
+        """
+        if not text:
+            return []
 
         self._ensure_keys()
 
@@ -289,9 +337,7 @@ def translate(self, text: str, src: str = "auto", tgt: str = "zh-CHS") -> str:
             if js.get("code") != 0:
                 raise RuntimeError(f"Youdao returned error: {js}")
 
-        out_parts: list[str] = []
-        for row in js.get("translateResult", []):
-            for seg in row:
-                tgt_text = seg.get("tgt", "")
-                out_parts.append(tgt_text)
-        return "".join(out_parts)
+        return [
+            "".join(seg.get("tgt", "") for seg in row)
+            for row in js.get("translateResult", [])
+        ]
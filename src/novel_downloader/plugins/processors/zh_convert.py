@@ -3,18 +3,35 @@
 novel_downloader.plugins.processors.zh_convert
 ----------------------------------------------
 
-Converts Chinese text between 简体 <-> 繁体 using pycorrector utilities.
+Converts Chinese text between 简体 <-> 繁体 using OpenCC dictionaries.
+
+By default the `opencc` package converts the text. `engine = "builtin"`
+compiles the dictionaries into lookup tables once and caches them on disk;
+directions it has no dictionaries for still go through `opencc`.
 """
 
 from __future__ import annotations
 
-import copy
+import hashlib
+import importlib.util
+import logging
 from collections.abc import Callable
+from pathlib import Path
 from typing import Any
 
+from novel_downloader.infra.paths import USER_CACHE_DIR
+from novel_downloader.libs.textutils import OPENCC_CHAINS, ZhConverter
 from novel_downloader.plugins.registry import registrar
+from novel_downloader.plugins.utils.book_info import map_book_info
+from novel_downloader.plugins.utils.pickle_cache import load_or_build
 from novel_downloader.schemas import BookInfoDict, ChapterDict
 
+logger = logging.getLogger(__name__)
+
+TABLE_CACHE_DIR = USER_CACHE_DIR / "zh_convert"
+# Bump when the cached converter format changes
+_TABLE_CACHE_VERSION = 1
+
 
 @registrar.register_processor()
 class ZhConvertProcessor:
@@ -29,51 +46,31 @@ def __init__(self, config: dict[str, Any]) -> None:
         self._apply_tags = bool(config.get("apply_tags", False))
 
         direction = (config.get("direction") or "t2s").lower()
-        self._convert = self._build_converter(direction)
+        engine = (config.get("engine") or "opencc").lower()
+        if engine not in ("builtin", "opencc"):
+            raise ValueError(f"Unknown zh_convert engine: {engine}")
+
+        builtin = None
+        if engine == "builtin":
+            builtin = self._build_builtin(
+                direction,
+                config.get("dict_dir"),
+                use_cache=bool(config.get("table_cache", True)),
+            )
+        self._convert = builtin or self._build_converter(direction)
 
     def process_book_info(self, book_info: BookInfoDict) -> BookInfoDict:
-        bi = copy.deepcopy(book_info)
-
-        # Title-like
-        if self._apply_title and isinstance(name := bi.get("book_name"), str):
-            bi["book_name"] = self._convert_text(name)
-        if self._apply_author and isinstance(author := bi.get("author"), str):
-            bi["author"] = self._convert_text(author)
-
-        # Content-like
-        if self._apply_content and isinstance(summary := bi.get("summary"), str):
-            bi["summary"] = self._convert_text(summary)
-
-        # Tags
-        if self._apply_tags and isinstance(tags := bi.get("tags"), list):
-            bi["tags"] = [
-                self._convert_text(t) if isinstance(t, str) else t for t in tags
-            ]
-
-        # Volumes & chapters
-        if isinstance(volumes := bi.get("volumes"), list):
-            for vol in volumes:
-                if self._apply_title and isinstance(
-                    vname := vol.get("volume_name"), str
-                ):
-                    vol["volume_name"] = self._convert_text(vname)
-
-                if self._apply_content and isinstance(
-                    intro := vol.get("volume_intro"), str
-                ):
-                    vol["volume_intro"] = self._convert_text(intro)
-
-                if isinstance(chapters := vol.get("chapters"), list):
-                    for cinfo in chapters:
-                        if self._apply_title and isinstance(
-                            ctitle := cinfo.get("title"), str
-                        ):
-                            cinfo["title"] = self._convert_text(ctitle)
-
-        return bi
+        fn = self._convert_text
+        return map_book_info(
+            book_info,
+            title=fn if self._apply_title else None,
+            content=fn if self._apply_content else None,
+            author=fn if self._apply_author else None,
+            tags=fn if self._apply_tags else None,
+        )
 
     def process_chapter(self, chapter: ChapterDict) -> ChapterDict:
-        ch = copy.deepcopy(chapter)
+        ch = chapter.copy()
 
         if self._apply_title and isinstance(title := ch.get("title"), str):
             ch["title"] = self._convert_text(title)
@@ -82,9 +79,60 @@ def process_chapter(self, chapter: ChapterDict) -> ChapterDict:
 
         return ch
 
+    def _build_builtin(
+        self,
+        direction: str,
+        dict_dir: str | None,
+        use_cache: bool,
+    ) -> Callable[[str], str] | None:
+        """
+        Build the built-in converter, reusing compiled tables from the
+        cache when the dictionary files are unchanged.
+
+        :return: The converter, or None if the direction or its dictionary
+            files are not available, so the `opencc` package is used.
+        """
+        chain = OPENCC_CHAINS.get(direction)
+        base = Path(dict_dir) if dict_dir else self._opencc_dict_dir()
+        files = sorted({name for group in chain or () for name in group})
+        if (
+            chain is None
+            or base is None
+            or not all((base / name).is_file() for name in files)
+        ):
+            logger.debug(
+                "zh_convert: no built-in tables for %s, using opencc", direction
+            )
+            return None
+        if not use_cache:
+            return ZhConverter.from_opencc(direction, base).convert
+
+        digest = hashlib.sha256(f"{_TABLE_CACHE_VERSION}:{direction}".encode())
+        for name in files:
+            digest.update(name.encode("utf-8"))
+            digest.update((base / name).read_bytes())
+        converter = load_or_build(
+            Path(TABLE_CACHE_DIR) / f"{direction}-{digest.hexdigest()[:16]}.pickle",
+            lambda: ZhConverter.from_opencc(direction, base),
+            lambda cached: isinstance(cached, ZhConverter),
+        )
+        return converter.convert
+
+    @staticmethod
+    def _opencc_dict_dir() -> Path | None:
+        """
+        Locate the dictionaries shipped with the `opencc` package without
+        importing it.
+        """
+        spec = importlib.util.find_spec("opencc")
+        for location in (spec and spec.submodule_search_locations) or []:
+            if (path := Path(location) / "dictionary").is_dir():
+                return path
+        return None
+
     def _build_converter(self, direction: str) -> Callable[[str], str]:
         """
-        Build the pycorrector converter based on direction.
+        Build the OpenCC converter based on direction.
         """
         try:
             from opencc import OpenCC
@@ -13,6 +13,7 @@
     "FetcherProtocol",
     "ParserProtocol",
     "ProcessorProtocol",
+    "BatchProcessorProtocol",
     "DownloadUI",
     "ExportUI",
     "LoginUI",
@@ -22,7 +23,7 @@
 from .client import ClientProtocol, _ClientContext
 from .fetcher import FetcherProtocol
 from .parser import ParserProtocol
-from .processor import ProcessorProtocol
+from .processor import BatchProcessorProtocol, ProcessorProtocol
 from .ui import (
     DownloadUI,
     ExportUI,
@@ -10,13 +10,20 @@
 """
 
 import types
+from collections.abc import Mapping
 from pathlib import Path
-from typing import Any, Protocol, Self
+from typing import TYPE_CHECKING, Any, Protocol, Self
 
+from novel_downloader.infra.persistence.chapter_storage import ChapterStorage
+from novel_downloader.infra.persistence.stage_storage import (
+    LayeredChapterStorage,
+    StageStorage,
+)
 from novel_downloader.schemas import (
     BookConfig,
     BookInfoDict,
     ChapterDict,
+    ClientConfig,
     ExporterConfig,
     FetcherConfig,
     ParserConfig,
@@ -34,6 +41,10 @@
     ProcessUI,
 )
 
+if TYPE_CHECKING:
+    from novel_downloader.libs.media.subset import FontSubsetter
+    from novel_downloader.plugins.mixins.export_book import BookWriterFactory
+
 
 class ClientProtocol(Protocol):
     """
@@ -138,6 +149,7 @@ async def download_book(
         book: BookConfig,
         *,
         ui: DownloadUI | None = None,
+        processors: list[ProcessorConfig] | None = None,
         **kwargs: Any,
     ) -> None:
         """
@@ -145,6 +157,8 @@ async def download_book(
 
         :param book: :class:`BookConfig` with at least ``book_id`` defined.
         :param ui: Optional :class:`DownloadUI` for progress reporting.
+        :param processors: Processor chain to run on chapters as they are
+            stored, when `stream_processing` is enabled.
         """
         ...
 
@@ -330,6 +344,22 @@ def export_chapter(
         """
         ...
 
+    def index_book(
+        self,
+        book_id: str,
+        *,
+        stage: str | None = None,
+        **kwargs: Any,
+    ) -> int:
+        """
+        Synchronize a book's chapters into the local full-text index.
+
+        :param book_id: Identifier of the book to index.
+        :param stage: Optional stage name; defaults to the latest stage.
+        :return: Number of chapters added, updated, or removed.
+        """
+        ...
+
     async def __aenter__(self) -> Self: ...
 
     async def __aexit__(
@@ -349,6 +379,7 @@ class _ClientContext(ClientProtocol, Protocol):
     """
 
     _site: str
+    _config: ClientConfig
 
     _cache_dir: Path
     _raw_data_dir: Path
@@ -364,6 +395,12 @@ class _ClientContext(ClientProtocol, Protocol):
     _fetch_inaccessible: bool
 
     _storage_batch_size: int
+    _storage_layout: str
+    _search_index: bool
+    _process_workers: int
+    _fuse_processors: bool
+    _stream_processing: bool
+    _search_index_path: Path
 
     @property
     def fetcher(self) -> FetcherProtocol:
@@ -392,6 +429,50 @@ def _detect_latest_stage(self, book_id: str) -> str:
         """
         ...
 
+    @property
+    def _site_db_path(self) -> Path:
+        """Path of the site-level chapter database (``storage_layout = "site"``)."""
+        ...
+
+    def _chapter_storage(self, book_id: str, stage: str = "raw") -> ChapterStorage:
+        """Return the chapter storage of a book stage for the storage layout."""
+        ...
+
+    def _stage_storage(self, book_id: str, stage: str) -> StageStorage:
+        """Return the delta storage a processing stage writes to."""
+        ...
+
+    def _has_stage_data(self, book_id: str, stage: str) -> bool:
+        """Return True if chapter data has been stored for the book stage."""
+        ...
+
+    def _stage_layers(self, book_id: str, stage: str) -> list[str]:
+        """Return the stages backing a stage, ordered bottom-up."""
+        ...
+
+    def _open_stage_storage(self, book_id: str, stage: str) -> LayeredChapterStorage:
+        """Return a read-only layered view over the stage's chapter databases."""
+        ...
+
+    def _si_auto_index(self, book_id: str) -> None:
+        """Update the search index after new data is stored, if enabled."""
+        ...
+
+    def _export_book_formats(
+        self,
+        book: BookConfig,
+        cfg: ExporterConfig,
+        factories: Mapping[str, "BookWriterFactory"],
+        *,
+        stage: str | None = None,
+    ) -> dict[str, list[Path] | Exception]:
+        """Export a book to several formats in one pass over its chapters."""
+        ...
+
+    def _export_font_subsetter(self, cfg: ExporterConfig) -> "FontSubsetter | None":
+        """Return the font subsetter for the configured font options, if any."""
+        ...
+
     def _save_book_info(
         self, book_id: str, book_info: BookInfoDict, stage: str = "raw"
     ) -> None:
@@ -18,6 +18,10 @@ class ProcessorProtocol(Protocol):
 
     A processor performs transformations on book metadata or chapter content,
     typically for cleanup, formatting, or metadata augmentation.
+
+    Inputs must not be modified in place. Returning a shallow copy with the
+    changed fields replaced is enough; untouched values (e.g. `extra`) may
+    be shared with the input.
     """
 
     def __init__(self, config: dict[str, Any]) -> None:
@@ -45,3 +49,22 @@ def process_chapter(self, chapter: ChapterDict) -> ChapterDict:
         :return: Modified or original chapter data.
         """
         ...
+
+
+class BatchProcessorProtocol(ProcessorProtocol, Protocol):
+    """
+    Optional extension for processors that work more efficiently on many
+    chapters at once (e.g. batched model inference or packed requests).
+
+    When available, the processing pipeline calls `process_chapters` with
+    groups of chapters instead of calling `process_chapter` for each one.
+    """
+
+    def process_chapters(self, chapters: list[ChapterDict]) -> list[ChapterDict]:
+        """
+        Process and transform several chapters.
+
+        :param chapters: Parsed chapters.
+        :return: Processed chapters, in the same order and of the same length.
+        """
+        ...
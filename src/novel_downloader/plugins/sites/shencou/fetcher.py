@@ -84,5 +84,6 @@ async def _fetch_one_image(
             return None
 
         write_file(content=content, filepath=save_path, on_exist="overwrite")
+        self._unindexed.append((save_path, content, "image"))
         logger.debug("Saved image: %s <- %s", save_path, url)
         return save_path
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+novel_downloader.plugins.utils.book_info
+----------------------------------------
+
+Copy-on-write helpers for processors that rewrite text fields of book
+metadata without deep-copying the whole structure.
+"""
+
+__all__ = ["map_book_info"]
+
+from collections.abc import Callable
+
+from novel_downloader.schemas import BookInfoDict, ChapterInfoDict, VolumeInfoDict
+
+TextFn = Callable[[str], str]
+
+
+def map_book_info(
+    book_info: BookInfoDict,
+    *,
+    title: TextFn | None = None,
+    content: TextFn | None = None,
+    author: TextFn | None = None,
+    tags: TextFn | None = None,
+) -> BookInfoDict:
+    """
+    Return a copy of `book_info` with its text fields transformed.
+
+    Only containers on the path to a changed value are copied; untouched
+    volumes, catalog entries and `extra` are shared with the input, which
+    is never modified.
+
+    :param title: Applied to the book name, volume names and chapter titles.
+    :param content: Applied to the summary and volume intros.
+    :param author: Applied to the author name.
+    :param tags: Applied to each tag.
+    """
+    bi = book_info.copy()
+
+    if title is not None and isinstance(name := bi.get("book_name"), str):
+        bi["book_name"] = title(name)
+    if author is not None and isinstance(author_name := bi.get("author"), str):
+        bi["author"] = author(author_name)
+    if content is not None and isinstance(summary := bi.get("summary"), str):
+        bi["summary"] = content(summary)
+    if tags is not None and isinstance(tag_list := bi.get("tags"), list):
+        bi["tags"] = [tags(t) if isinstance(t, str) else t for t in tag_list]
+
+    if isinstance(volumes := bi.get("volumes"), list) and (title or content):
+        new_volumes: list[VolumeInfoDict] | None = None
+        for idx, vol in enumerate(volumes):
+            new_vol = _map_volume(vol, title, content)
+            if new_vol is not vol:
+                if new_volumes is None:
+                    new_volumes = list(volumes)
+                new_volumes[idx] = new_vol
+        if new_volumes is not None:
+            bi["volumes"] = new_volumes
+
+    return bi
+
+
+def _map_volume(
+    vol: VolumeInfoDict,
+    title: TextFn | None,
+    content: TextFn | None,
+) -> VolumeInfoDict:
+    """
+    Return `vol` itself if nothing changes, else a shallow copy.
+    """
+    new_vol: VolumeInfoDict | None = None
+
+    if title is not None and isinstance(vname := vol.get("volume_name"), str):
+        new_name = title(vname)
+        if new_name != vname:
+            new_vol = vol.copy()
+            new_vol["volume_name"] = new_name
+
+    if content is not None and isinstance(intro := vol.get("volume_intro"), str):
+        new_intro = content(intro)
+        if new_intro != intro:
+            new_vol = new_vol or vol.copy()
+            new_vol["volume_intro"] = new_intro
+
+    if title is not None and isinstance(chapters := vol.get("chapters"), list):
+        new_chapters: list[ChapterInfoDict] | None = None
+        for idx, cinfo in enumerate(chapters):
+            if not isinstance(ctitle := cinfo.get("title"), str):
+                continue
+            new_title = title(ctitle)
+            if new_title != ctitle:
+                if new_chapters is None:
+                    new_chapters = list(chapters)
+                new_chapters[idx] = cinfo.copy()
+                new_chapters[idx]["title"] = new_title
+        if new_chapters is not None:
+            new_vol = new_vol or vol.copy()
+            new_vol["chapters"] = new_chapters
+
+    return new_vol or vol
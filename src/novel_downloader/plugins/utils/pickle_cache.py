@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+novel_downloader.plugins.utils.pickle_cache
+-------------------------------------------
+
+On-disk cache of compiled processor data (matchers, lookup tables).
+"""
+
+__all__ = ["load_or_build"]
+
+import logging
+import pickle
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, TypeVar
+
+from novel_downloader.libs.filesystem import write_file
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def load_or_build(  # noqa: UP047 (Python 3.11)
+    path: Path,
+    build: Callable[[], T],
+    accept: Callable[[Any], bool],
+) -> T:
+    """
+    Return the object pickled at `path`, or build it and store it there.
+
+    Unreadable or rejected entries are rebuilt. The cache is only an
+    optimization, so failing to write it is logged and otherwise ignored.
+
+    :param path: Cache file, named after a hash of everything `build` uses.
+    :param build: Creates the object on a cache miss.
+    :param accept: Checks that a loaded object is usable.
+    """
+    try:
+        with path.open("rb") as f:
+            cached = pickle.load(f)
+        if accept(cached):
+            return cached  # type: ignore[no-any-return]
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.debug("Ignoring unreadable cache %s: %s", path, e)
+
+    obj = build()
+    try:
+        # unique temp file: parallel workers may store the same entry
+        write_file(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL), path)
+    except OSError as e:
+        logger.debug("Failed to write cache %s: %s", path, e)
+    return obj
@@ -22,6 +22,7 @@
     "VolumeInfoDict",
     "LoginField",
     "SearchResult",
+    "LocalSearchHit",
     "ExecutedStageMeta",
     "PipelineMeta",
 ]
@@ -45,4 +46,4 @@
     ProcessorConfig,
 )
 from .process import ExecutedStageMeta, PipelineMeta
-from .search import SearchResult
+from .search import LocalSearchHit, SearchResult
@@ -62,6 +62,20 @@ class ExporterConfig:
     filename_template: str = "{title}_{author}"
     include_picture: bool = True
     split_mode: str = "book"
+    compress_level: int = 6
+    compress_workers: int = 4
+    incremental: bool = False
+    txt_compression: str = "none"  # "none" | "gzip" | "zstd"
+    html_workers: int = 4
+    image_format: str = "original"  # "original" | "jpeg" | "webp"
+    image_max_width: int = 0
+    image_max_height: int = 0
+    image_quality: int = 85
+    image_workers: int = 4
+    font_subset: bool = False
+    font_format: str = "original"  # "original" | "woff2"
+    font_workers: int = 2
+    export_workers: int = 1
 
 
 @dataclass
@@ -78,6 +92,11 @@ class ClientConfig:
     fetch_inaccessible: bool = False
     save_html: bool = False
     storage_batch_size: int = 1
+    storage_layout: str = "book"  # "book" | "site"
+    search_index: bool = False
+    process_workers: int = 1
+    fuse_processors: bool = False
+    stream_processing: bool = False
     fetcher_cfg: FetcherConfig = field(default_factory=FetcherConfig)
     parser_cfg: ParserConfig = field(default_factory=ParserConfig)
 
@@ -86,6 +105,7 @@ class ClientConfig:
 class ProcessorConfig:
     name: str  # "cleaner" | "corrector" | ...
     overwrite: bool = False
+    checkpoint: bool = False
     options: dict[str, Any] = field(default_factory=dict)
 
 
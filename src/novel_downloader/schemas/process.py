@@ -4,13 +4,14 @@
 --------------------------------
 """
 
-from typing import TypedDict
+from typing import NotRequired, TypedDict
 
 
 class ExecutedStageMeta(TypedDict):
     processed_at: str  # ISO 8601 timestamp
     depends_on: list[str]
     config_hash: str
+    materialized: NotRequired[bool]  # False if fused into a later stage
 
 
 class PipelineMeta(TypedDict):
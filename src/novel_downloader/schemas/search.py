@@ -19,3 +19,12 @@ class SearchResult(TypedDict, total=True):
     update_date: str
     word_count: str
     priority: int
+
+
+class LocalSearchHit(TypedDict, total=True):
+    site: str
+    book_id: str
+    book_name: str
+    chapter_id: str
+    title: str
+    snippet: str
@@ -1,5 +1,26 @@
 import asyncio
+import hashlib
 import sys
 
+import pytest
+
 if sys.platform.startswith("win"):
     asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+
+@pytest.fixture(autouse=True)
+def _isolated_user_cache(request, tmp_path_factory, monkeypatch):
+    # Keep processor caches out of the real user cache directory
+    from novel_downloader.plugins.processors import cleaner, corrector, zh_convert
+    from novel_downloader.plugins.processors.translator import engine
+
+    key = hashlib.md5(request.node.nodeid.encode("utf-8")).hexdigest()
+    base = tmp_path_factory.getbasetemp() / "user_cache" / key
+    monkeypatch.setattr(cleaner, "RULE_CACHE_DIR", base / "rule_cache")
+    monkeypatch.setattr(
+        engine, "TRANSLATION_MEMORY_PATH", base / "translation_memory.sqlite"
+    )
+    monkeypatch.setattr(
+        corrector, "CORRECTION_CACHE_PATH", base / "correction_cache.sqlite"
+    )
+    monkeypatch.setattr(zh_convert, "TABLE_CACHE_DIR", base / "zh_convert")
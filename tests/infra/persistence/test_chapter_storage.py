@@ -110,6 +110,68 @@ def test_dirty_and_clean_ids(tmp_storage: ChapterStorage):
     assert tmp_storage.existing_ids() == {clean["id"], dirty["id"]}
 
 
+# ---------------------------------------------------------------------
+# Content hashes / change tracking
+# ---------------------------------------------------------------------
+
+
+def test_hashes_and_changed_since(tmp_storage: ChapterStorage):
+    tmp_storage.upsert_chapters([_make_chapter(1), _make_chapter(2)])
+    hashes = tmp_storage.hashes()
+    assert set(hashes) == {"chap1", "chap2"}
+    assert hashes["chap1"] != hashes["chap2"]
+    assert tmp_storage.hashes(["chap2", "missing"]) == {"chap2": hashes["chap2"]}
+
+    mark = tmp_storage.last_seq
+    assert tmp_storage.changed_since(0) == ["chap1", "chap2"]
+    assert tmp_storage.changed_since(mark) == []
+
+    changed = _make_chapter(2)
+    changed["content"] = "Updated"
+    tmp_storage.upsert_chapter(changed)
+    assert tmp_storage.changed_since(mark) == ["chap2"]
+    assert tmp_storage.hashes(["chap2"])["chap2"] != hashes["chap2"]
+
+
+def test_identical_upsert_is_noop(tmp_storage: ChapterStorage):
+    tmp_storage.upsert_chapter(_make_chapter(1))
+    mark = tmp_storage.last_seq
+    changes = tmp_storage.conn.total_changes
+
+    tmp_storage.upsert_chapter(_make_chapter(1))
+    assert tmp_storage.conn.total_changes == changes
+    assert tmp_storage.last_seq == mark
+
+
+def test_flag_only_update_keeps_seq(tmp_storage: ChapterStorage):
+    tmp_storage.upsert_chapter(_make_chapter(1), need_refetch=True)
+    mark = tmp_storage.last_seq
+
+    tmp_storage.upsert_chapter(_make_chapter(1), need_refetch=False)
+    assert tmp_storage.need_refetch("chap1") is False
+    assert tmp_storage.changed_since(mark) == []
+
+
+def test_migrate_legacy_schema(tmp_path: Path):
+    conn = sqlite3.connect(tmp_path / "old.db")
+    conn.execute(
+        "CREATE TABLE chapters (id TEXT NOT NULL PRIMARY KEY, title TEXT NOT NULL, "
+        "content TEXT NOT NULL, need_refetch BOOLEAN NOT NULL DEFAULT 0, extra TEXT)"
+    )
+    conn.execute(
+        "INSERT INTO chapters VALUES (?, ?, ?, ?, ?)",
+        ("chap1", "Title 1", "Content 1", 0, '{"i": 1}'),
+    )
+    conn.commit()
+    conn.close()
+
+    with ChapterStorage(tmp_path, "old.db") as store:
+        assert "chap1" in store.hashes()
+        before = store.conn.total_changes
+        store.upsert_chapter(_make_chapter(1))
+        assert store.conn.total_changes == before
+
+
 # ---------------------------------------------------------------------
 # Loading from DB
 # ---------------------------------------------------------------------
@@ -122,6 +184,7 @@ def test_load_existing_keys(tmp_path: Path):
     with ChapterStorage(tmp_path, "chap.db") as store2:
         assert store2.exists("chap1")
         assert store2.need_refetch("chap1") is False
+        assert store2.last_seq == 1
 
 
 # ---------------------------------------------------------------------
@@ -145,3 +208,15 @@ def test_load_dict_various_inputs(data, expected):
 def test_repr(tmp_path: Path):
     s = ChapterStorage(tmp_path, "x.db")
     assert str(tmp_path) in repr(s)
+
+
+def test_seq_not_reused_after_delete(tmp_path: Path):
+    with ChapterStorage(tmp_path, "chap.db") as store:
+        store.upsert_chapters([_make_chapter(1), _make_chapter(2)])
+        mark = store.last_seq
+        assert store.delete_chapter("chap2")
+
+    with ChapterStorage(tmp_path, "chap.db") as store:
+        assert store.last_seq == mark
+        store.upsert_chapter(_make_chapter(3))
+        assert store.changed_since(mark) == ["chap3"]
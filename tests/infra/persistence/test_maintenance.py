@@ -0,0 +1,157 @@
+import json
+from pathlib import Path
+
+from novel_downloader.infra.persistence.chapter_storage import ChapterStorage
+from novel_downloader.infra.persistence.maintenance import (
+    delete_orphan_media,
+    find_databases,
+    maintain_database,
+    referenced_media,
+    scan_orphan_media,
+)
+from novel_downloader.infra.persistence.media_index import (
+    MEDIA_INDEX_FILENAME,
+    MediaIndex,
+    describe_media,
+)
+from novel_downloader.infra.persistence.site_storage import (
+    SITE_DB_FILENAME,
+    ConnectionPool,
+    SiteChapterStorage,
+)
+from novel_downloader.libs.filesystem import font_filename, image_filename
+from novel_downloader.schemas import ChapterDict
+
+IMG_URL = "https://example.com/a.jpg"
+FONT_URL = "https://example.com/f.woff2"
+COVER_URL = "https://example.com/cover.png"
+
+
+def _chapter(idx: int, resources: list[dict[str, str]]) -> ChapterDict:
+    return ChapterDict(
+        id=str(idx),
+        title=f"T{idx}",
+        content="x" * 2000,
+        extra={"resources": resources},
+    )
+
+
+def _make_book(book_dir: Path) -> None:
+    book_dir.mkdir(parents=True)
+    (book_dir / "book_info.raw.json").write_text(
+        json.dumps({"cover_url": COVER_URL, "volumes": []}), encoding="utf-8"
+    )
+    media = book_dir / "media"
+    media.mkdir()
+    for name in (
+        image_filename(IMG_URL),
+        font_filename(FONT_URL),
+        image_filename(COVER_URL, name="cover"),
+        "stale.jpg",
+    ):
+        (media / name).write_bytes(b"data")
+
+
+# ---------------------------------------------------------------------
+# Databases
+# ---------------------------------------------------------------------
+
+
+def test_maintain_database_reclaims_space(tmp_path: Path):
+    with ChapterStorage(tmp_path, "chapter.raw.sqlite") as store:
+        store.upsert_chapters([_chapter(i, []) for i in range(200)])
+        store.delete_chapters([str(i) for i in range(200)])
+
+    report = maintain_database(tmp_path / "chapter.raw.sqlite", vacuum=False)
+    assert report.ok
+    assert report.reclaimable > 0
+    assert report.size_after == report.size_before
+
+    report = maintain_database(tmp_path / "chapter.raw.sqlite")
+    assert report.ok
+    assert report.reclaimed > 0
+
+
+def test_maintain_database_reports_corruption(tmp_path: Path):
+    bad = tmp_path / "chapter.raw.sqlite"
+    bad.write_bytes(b"not a database" * 100)
+    report = maintain_database(bad)
+    assert not report.ok
+    assert report.error
+
+
+def test_find_databases(tmp_path: Path):
+    book_dir = tmp_path / "site" / "b1"
+    book_dir.mkdir(parents=True)
+    (book_dir / "chapter.raw.sqlite").touch()
+    (book_dir / "chapter.cleaner.sqlite").touch()
+    (book_dir / "media").mkdir()
+    (book_dir / "media" / MEDIA_INDEX_FILENAME).touch()
+    (tmp_path / "site" / SITE_DB_FILENAME).touch()
+    (tmp_path / "search_index.sqlite").touch()
+
+    found = find_databases(tmp_path)
+    assert [p.name for p in found] == [
+        SITE_DB_FILENAME,
+        "chapter.cleaner.sqlite",
+        "chapter.raw.sqlite",
+        MEDIA_INDEX_FILENAME,
+        "search_index.sqlite",
+    ]
+    assert tmp_path / "search_index.sqlite" not in find_databases(tmp_path, "site")
+
+
+# ---------------------------------------------------------------------
+# Media
+# ---------------------------------------------------------------------
+
+
+def test_orphan_media_per_book_layout(tmp_path: Path):
+    book_dir = tmp_path / "b1"
+    _make_book(book_dir)
+    with ChapterStorage(book_dir, "chapter.raw.sqlite") as store:
+        store.upsert_chapter(_chapter(1, [{"type": "image", "url": IMG_URL}]))
+    with ChapterStorage(book_dir, "chapter.cleaner.sqlite") as store:
+        store.upsert_chapter(_chapter(1, [{"type": "font", "url": FONT_URL}]))
+
+    assert referenced_media(book_dir) == {
+        image_filename(IMG_URL),
+        font_filename(FONT_URL),
+        image_filename(COVER_URL, name="cover"),
+    }
+    report = scan_orphan_media(book_dir)
+    assert [p.name for p in report.orphans] == ["stale.jpg"]
+    assert report.orphan_bytes == 4
+
+
+def test_orphan_media_keeps_media_index(tmp_path: Path):
+    book_dir = tmp_path / "b1"
+    _make_book(book_dir)
+    with MediaIndex(book_dir / "media") as index:
+        index.put_many([describe_media("stale.jpg", b"data", "image")])
+
+    report = scan_orphan_media(book_dir)
+    assert MEDIA_INDEX_FILENAME not in {p.name for p in report.orphans}
+    assert "stale.jpg" in {p.name for p in report.orphans}
+
+    assert delete_orphan_media(report) == len(report.orphans)
+    assert not (book_dir / "media" / "stale.jpg").exists()
+    with MediaIndex(book_dir / "media") as index:
+        assert index.load() == {}
+
+
+def test_orphan_media_site_layout(tmp_path: Path):
+    book_dir = tmp_path / "b1"
+    _make_book(book_dir)
+    site_db = tmp_path / SITE_DB_FILENAME
+    pool = ConnectionPool()
+    with SiteChapterStorage(site_db, "b1", pool=pool) as store:
+        store.upsert_chapter(_chapter(1, [{"type": "image", "url": IMG_URL}]))
+    with SiteChapterStorage(site_db, "b2", pool=pool) as store:
+        store.upsert_chapter(_chapter(1, [{"type": "font", "url": FONT_URL}]))
+    pool.close_all()
+
+    report = scan_orphan_media(book_dir, site_db)
+    assert sorted(p.name for p in report.orphans) == sorted(
+        [font_filename(FONT_URL), "stale.jpg"]
+    )
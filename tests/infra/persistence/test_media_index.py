@@ -0,0 +1,124 @@
+import struct
+import zlib
+from pathlib import Path
+
+from novel_downloader.infra.persistence.media_index import (
+    MEDIA_INDEX_FILENAME,
+    MediaCatalog,
+    MediaIndex,
+    describe_media,
+    record_media,
+)
+from novel_downloader.libs.crypto.hash_utils import hash_bytes
+
+
+def _png(width: int, height: int) -> bytes:
+    ihdr = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    chunk = b"IHDR" + ihdr
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + struct.pack(">I", len(ihdr))
+        + chunk
+        + struct.pack(">I", zlib.crc32(chunk))
+    )
+
+
+def test_describe_image():
+    data = _png(640, 480)
+    info = describe_media("a.png", data, "image")
+    assert info.digest == hash_bytes(data)
+    assert (info.format, info.size) == ("png", len(data))
+    assert (info.width, info.height) == (640, 480)
+
+
+def test_describe_font():
+    data = b"wOF2" + b"\x00" * 60
+    info = describe_media("f.woff2", data, "font")
+    assert info.format == "woff2"
+    assert info.width is None
+
+
+def test_index_roundtrip(tmp_path: Path):
+    infos = [
+        describe_media("a.png", _png(2, 3), "image"),
+        describe_media("b.bin", b"unknown data", "image"),
+    ]
+    with MediaIndex(tmp_path) as index:
+        index.put_many(infos)
+    with MediaIndex(tmp_path) as index:
+        assert index.load() == {i.filename: i for i in infos}
+
+
+def test_record_media(tmp_path: Path):
+    path = tmp_path / "media" / "a.png"
+    path.parent.mkdir()
+    path.write_bytes(_png(5, 7))
+    font = tmp_path / "other" / "f.woff2"
+    record_media(
+        [(path, path.read_bytes(), "image"), (font, b"wOF2" + b"\x00" * 60, "font")]
+    )
+
+    with MediaIndex(path.parent) as index:
+        info = index.load()["a.png"]
+    assert (info.width, info.height) == (5, 7)
+    with MediaIndex(font.parent) as index:
+        assert index.load()["f.woff2"].format == "woff2"
+
+
+def test_catalog_uses_index_without_reading(tmp_path: Path):
+    data = _png(1, 1)
+    record_media([(tmp_path / "a.png", data, "image")])
+    # same size, other content: the entry must come from the index
+    (tmp_path / "a.png").write_bytes(b"\x00" * len(data))
+    info = MediaCatalog(tmp_path).lookup("a.png")
+    assert info is not None
+    assert info.digest == hash_bytes(data)
+
+
+def test_catalog_drops_deleted_and_replaced_files(tmp_path: Path):
+    record_media(
+        [
+            (tmp_path / "gone.png", _png(1, 1), "image"),
+            (tmp_path / "a.png", _png(1, 1), "image"),
+        ]
+    )
+    (tmp_path / "a.png").write_bytes(_png(2, 2) + b"more")
+    with MediaCatalog(tmp_path) as media:
+        assert media.lookup("gone.png") is None
+        info = media.lookup("a.png")
+        assert info is not None and info.width == 2
+
+    with MediaIndex(tmp_path) as index:
+        assert index.load() == {"a.png": info}
+
+
+def test_index_prune(tmp_path: Path):
+    (tmp_path / "a.png").write_bytes(_png(1, 1))
+    with MediaIndex(tmp_path) as index:
+        index.put_many(
+            [
+                describe_media("a.png", _png(1, 1), "image"),
+                describe_media("gone.png", _png(1, 1), "image"),
+            ]
+        )
+        assert index.prune() == 1
+        assert set(index.load()) == {"a.png"}
+
+
+def test_catalog_backfills_unindexed_files(tmp_path: Path):
+    (tmp_path / "a.png").write_bytes(_png(4, 4))
+    with MediaCatalog(tmp_path) as media:
+        info = media.lookup("a.png")
+        assert info is not None
+        assert media.lookup("missing.png") is None
+    assert not (tmp_path / "missing.png").exists()
+
+    with MediaIndex(tmp_path) as index:
+        assert index.load() == {"a.png": info}
+
+
+def test_catalog_without_media_dir(tmp_path: Path):
+    media_dir = tmp_path / "media"
+    with MediaCatalog(media_dir) as media:
+        assert media.lookup("a.png") is None
+    assert not (media_dir / MEDIA_INDEX_FILENAME).exists()
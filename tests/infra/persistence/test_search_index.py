@@ -0,0 +1,112 @@
+from collections.abc import Generator
+from pathlib import Path
+
+import pytest
+
+from novel_downloader.infra.persistence.chapter_storage import ChapterStorage
+from novel_downloader.infra.persistence.search_index import ChapterSearchIndex
+from novel_downloader.infra.persistence.stage_storage import (
+    LayeredChapterStorage,
+    StageStorage,
+)
+from novel_downloader.schemas import ChapterDict
+
+
+@pytest.fixture()
+def index(tmp_path: Path) -> Generator[ChapterSearchIndex]:
+    idx = ChapterSearchIndex(tmp_path / "search_index.sqlite")
+    idx.connect()
+    yield idx
+    idx.close()
+
+
+def _chap(idx: int, content: str) -> ChapterDict:
+    return ChapterDict(id=f"c{idx}", title=f"第{idx}章", content=content, extra={})
+
+
+def _raw(base: Path, chapters: list[ChapterDict]) -> ChapterStorage:
+    base.mkdir(parents=True, exist_ok=True)
+    store = ChapterStorage(base, "chapter.raw.sqlite")
+    store.connect()
+    store.upsert_chapters(chapters)
+    return store
+
+
+# ---------------------------------------------------------------------
+# Sync
+# ---------------------------------------------------------------------
+
+
+def test_sync_is_incremental(tmp_path: Path, index: ChapterSearchIndex):
+    store = _raw(tmp_path, [_chap(1, "他走进了山洞里面"), _chap(2, "天色渐晚")])
+    assert index.sync_book("s", "b1", store, book_name="书") == 2
+    assert index.sync_book("s", "b1", store) == 0
+
+    store.upsert_chapter(_chap(2, "月亮升起来了"))
+    store.delete_chapters(["c1"])
+    assert index.sync_book("s", "b1", store) == 2
+    store.close()
+
+    assert index.search("山洞里") == []
+    hits = index.search("月亮升")
+    assert [h["chapter_id"] for h in hits] == ["c2"]
+
+
+def test_sync_from_layered_view(tmp_path: Path, index: ChapterSearchIndex):
+    raw = _raw(tmp_path, [_chap(1, "原始内容一"), _chap(2, "原始内容二")])
+    hashes = raw.hashes()
+    raw.close()
+    with StageStorage(tmp_path, "chapter.cleaner.sqlite") as stage:
+        stage.upsert_delta([_chap(1, "原始内容一"), _chap(2, "清洗后内容")], hashes)
+
+    layers = ["chapter.raw.sqlite", "chapter.cleaner.sqlite"]
+    with LayeredChapterStorage.from_files(tmp_path, layers) as view:
+        index.sync_book("s", "b1", view, stage="cleaner")
+
+    assert [h["chapter_id"] for h in index.search("清洗后")] == ["c2"]
+    assert [h["chapter_id"] for h in index.search("原始内容")] == ["c1"]
+
+
+# ---------------------------------------------------------------------
+# Search
+# ---------------------------------------------------------------------
+
+
+def test_search_snippet_and_filters(tmp_path: Path, index: ChapterSearchIndex):
+    a = _raw(tmp_path / "a", [_chap(1, "前文" * 20 + "山洞" + "后文" * 20)])
+    b = _raw(tmp_path / "b", [_chap(1, "山洞口")])
+    index.sync_book("s1", "a", a, book_name="甲")
+    index.sync_book("s2", "b", b, book_name="乙")
+    a.close()
+    b.close()
+
+    hits = index.search("山洞", limit=10)
+    assert {(h["site"], h["book_name"]) for h in hits} == {("s1", "甲"), ("s2", "乙")}
+    long_hit = next(h for h in hits if h["book_id"] == "a")
+    assert "[山洞]" in long_hit["snippet"]
+    assert long_hit["snippet"].startswith("...")
+
+    assert [h["book_id"] for h in index.search("山洞口", sites=["s2"])] == ["b"]
+    assert index.search("山洞口", sites=["s1"]) == []
+    assert [h["book_id"] for h in index.search("山洞", book_id="a")] == ["a"]
+    assert "[山洞口]" in index.search("山洞口")[0]["snippet"]
+
+
+def test_search_treats_query_literally(tmp_path: Path, index: ChapterSearchIndex):
+    store = _raw(tmp_path, [_chap(1, 'say "hello" AND OR NOT world')])
+    index.sync_book("s", "b1", store)
+    store.close()
+
+    assert len(index.search('"hello" AND')) == 1
+    assert index.search("   ") == []
+
+
+def test_remove_book(tmp_path: Path, index: ChapterSearchIndex):
+    store = _raw(tmp_path, [_chap(1, "一些内容"), _chap(2, "更多内容")])
+    index.sync_book("s", "b1", store)
+    store.close()
+
+    assert index.indexed_books() == [("s", "b1")]
+    assert index.remove_book("s", "b1") == 2
+    assert index.indexed_books() == []
+    assert index.search("内容") == []
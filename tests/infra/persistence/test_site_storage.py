@@ -0,0 +1,142 @@
+from collections.abc import Generator
+from pathlib import Path
+
+import pytest
+
+from novel_downloader.infra.persistence.chapter_storage import ChapterStorage
+from novel_downloader.infra.persistence.site_storage import (
+    SITE_DB_FILENAME,
+    ConnectionPool,
+    SiteChapterStorage,
+    SiteStageStorage,
+    migrate_book_storage,
+)
+from novel_downloader.infra.persistence.stage_storage import StageStorage
+from novel_downloader.schemas import ChapterDict
+
+
+@pytest.fixture()
+def pool() -> Generator[ConnectionPool]:
+    p = ConnectionPool(max_idle=2)
+    yield p
+    p.close_all()
+
+
+def _make_chapter(idx: int, content: str | None = None) -> ChapterDict:
+    return ChapterDict(
+        id=f"chap{idx}",
+        title=f"Title {idx}",
+        content=content if content is not None else f"Content {idx}",
+        extra={"i": idx},
+    )
+
+
+# ---------------------------------------------------------------------
+# Partitioning
+# ---------------------------------------------------------------------
+
+
+def test_partitions_are_isolated(tmp_path: Path, pool: ConnectionPool):
+    db = tmp_path / SITE_DB_FILENAME
+    with SiteChapterStorage(db, "b1", pool=pool) as s1:
+        s1.upsert_chapters([_make_chapter(1), _make_chapter(2)])
+    with SiteChapterStorage(db, "b2", pool=pool) as s2:
+        s2.upsert_chapter(_make_chapter(1, content="Other book"))
+
+    with SiteChapterStorage(db, "b1", pool=pool) as s1:
+        assert s1.existing_ids() == {"chap1", "chap2"}
+        chap = s1.get_chapter("chap1")
+        assert chap is not None
+        assert chap["content"] == "Content 1"
+        assert s1.changed_since(0) == ["chap1", "chap2"]
+        assert s1.delete_chapters(["chap1"]) == 1
+
+    with SiteChapterStorage(db, "b2", pool=pool) as s2:
+        chaps = s2.get_chapters(["chap1", "chap2"])
+        assert chaps["chap1"] is not None
+        assert chaps["chap1"]["content"] == "Other book"
+        assert chaps["chap2"] is None
+
+    assert SiteChapterStorage.has_partition(db, "b1", "raw", pool=pool)
+    assert not SiteChapterStorage.has_partition(db, "b1", "cleaner", pool=pool)
+
+
+def test_seq_not_reused_after_delete(tmp_path: Path, pool: ConnectionPool):
+    db = tmp_path / SITE_DB_FILENAME
+    with SiteChapterStorage(db, "b1", pool=pool) as store:
+        store.upsert_chapters([_make_chapter(1), _make_chapter(2)])
+        mark = store.last_seq
+        store.delete_chapter("chap2")
+
+    with SiteChapterStorage(db, "b1", pool=pool) as store:
+        store.upsert_chapter(_make_chapter(3))
+        assert store.changed_since(mark) == ["chap3"]
+    with SiteChapterStorage(db, "b2", pool=pool) as other:
+        assert other.last_seq == 0
+
+
+def test_identical_upsert_is_noop(tmp_path: Path, pool: ConnectionPool):
+    db = tmp_path / SITE_DB_FILENAME
+    with SiteChapterStorage(db, "b1", pool=pool) as store:
+        store.upsert_chapter(_make_chapter(1))
+        changes = store.conn.total_changes
+        store.upsert_chapter(_make_chapter(1))
+        assert store.conn.total_changes == changes
+
+
+def test_stage_partition_delta(tmp_path: Path, pool: ConnectionPool):
+    db = tmp_path / SITE_DB_FILENAME
+    with SiteChapterStorage(db, "b1", pool=pool) as raw:
+        raw.upsert_chapters([_make_chapter(1), _make_chapter(2)])
+        hashes = raw.hashes()
+
+    with SiteStageStorage(db, "b1", "cleaner", pool=pool) as stage:
+        stage.upsert_delta([_make_chapter(1), _make_chapter(2, "x")], hashes)
+        assert stage.existing_ids() == {"chap2"}
+        assert stage.processed_ids() == {"chap1", "chap2"}
+
+    assert SiteChapterStorage.has_partition(db, "b1", "cleaner", pool=pool)
+    assert SiteChapterStorage.drop_book(db, "b1", pool=pool) == 3
+    assert not SiteChapterStorage.has_partition(db, "b1", "cleaner", pool=pool)
+
+
+# ---------------------------------------------------------------------
+# Connection pool
+# ---------------------------------------------------------------------
+
+
+def test_pool_reuses_connections(tmp_path: Path, pool: ConnectionPool):
+    db = tmp_path / SITE_DB_FILENAME
+    with SiteChapterStorage(db, "b1", pool=pool) as store:
+        first = store.conn
+    with SiteChapterStorage(db, "b2", pool=pool) as store:
+        assert store.conn is first
+
+
+# ---------------------------------------------------------------------
+# Migration
+# ---------------------------------------------------------------------
+
+
+def test_migrate_book_storage(tmp_path: Path, pool: ConnectionPool):
+    book_dir = tmp_path / "b1"
+    book_dir.mkdir()
+    with ChapterStorage(book_dir, "chapter.raw.sqlite") as raw:
+        raw.upsert_chapters([_make_chapter(1), _make_chapter(2)])
+        hashes = raw.hashes()
+        raw.upsert_chapter(_make_chapter(3))
+        raw.delete_chapter("chap3")
+        mark = raw.last_seq
+    with StageStorage(book_dir, "chapter.cleaner.sqlite") as stage:
+        stage.upsert_delta([_make_chapter(1), _make_chapter(2, "x")], hashes)
+
+    assert migrate_book_storage(tmp_path, remove=True, pool=pool) == 2
+    assert not list(book_dir.glob("chapter.*.sqlite"))
+
+    db = tmp_path / SITE_DB_FILENAME
+    with SiteChapterStorage(db, "b1", pool=pool) as raw:
+        assert raw.hashes() == hashes
+        assert raw.last_seq == mark
+    with SiteStageStorage(db, "b1", "cleaner", pool=pool) as stage:
+        assert stage.existing_ids() == {"chap2"}
+        assert stage.processed_ids() == {"chap1", "chap2"}
@@ -0,0 +1,138 @@
+import sqlite3
+from pathlib import Path
+
+from novel_downloader.infra.persistence.chapter_storage import ChapterStorage
+from novel_downloader.infra.persistence.stage_storage import (
+    LayeredChapterStorage,
+    StageStorage,
+)
+from novel_downloader.schemas import ChapterDict
+
+
+def _make_chapter(idx: int, content: str | None = None) -> ChapterDict:
+    return ChapterDict(
+        id=f"chap{idx}",
+        title=f"Title {idx}",
+        content=content if content is not None else f"Content {idx}",
+        extra={"i": idx},
+    )
+
+
+def _write_raw(base: Path, chapters: list[ChapterDict]) -> dict[str, str]:
+    with ChapterStorage(base, "chapter.raw.sqlite") as raw:
+        raw.upsert_chapters(chapters)
+        return raw.hashes()
+
+
+# ---------------------------------------------------------------------
+# StageStorage
+# ---------------------------------------------------------------------
+
+
+def test_upsert_delta_stores_only_changed(tmp_path: Path):
+    hashes = _write_raw(tmp_path, [_make_chapter(1), _make_chapter(2)])
+
+    with StageStorage(tmp_path, "chapter.cleaner.sqlite") as stage:
+        stage.upsert_delta(
+            [_make_chapter(1), _make_chapter(2, content="Cleaned")], hashes
+        )
+        assert stage.existing_ids() == {"chap2"}
+        assert stage.processed_ids() == {"chap1", "chap2"}
+        assert stage.input_hashes(["chap1"]) == {"chap1": hashes["chap1"]}
+
+
+def test_upsert_delta_removes_stale_rows(tmp_path: Path):
+    hashes = _write_raw(tmp_path, [_make_chapter(1)])
+
+    with StageStorage(tmp_path, "chapter.cleaner.sqlite") as stage:
+        stage.upsert_delta([_make_chapter(1, content="Changed")], hashes)
+        assert stage.existing_ids() == {"chap1"}
+
+        stage.upsert_delta([_make_chapter(1)], hashes)
+        assert stage.existing_ids() == set()
+        assert stage.processed_ids() == {"chap1"}
+
+
+def test_forget_drops_processed_records(tmp_path: Path):
+    hashes = _write_raw(tmp_path, [_make_chapter(1)])
+
+    with StageStorage(tmp_path, "chapter.cleaner.sqlite") as stage:
+        stage.upsert_delta([_make_chapter(1)], hashes)
+        stage.forget(["chap1"])
+        assert stage.processed_ids() == set()
+
+    with StageStorage(tmp_path, "chapter.cleaner.sqlite") as stage:
+        assert stage.processed_ids() == set()
+
+
+def test_config_keys_persist_and_migrate(tmp_path: Path):
+    hashes = _write_raw(tmp_path, [_make_chapter(1), _make_chapter(2)])
+
+    # A stage database from before per-chapter configuration was recorded
+    db = tmp_path / "chapter.cleaner.sqlite"
+    conn = sqlite3.connect(db)
+    conn.execute(
+        "CREATE TABLE processed (id TEXT NOT NULL PRIMARY KEY, input_hash TEXT)"
+    )
+    conn.execute("INSERT INTO processed VALUES ('chap1', ?)", (hashes["chap1"],))
+    conn.commit()
+    conn.close()
+
+    with StageStorage(tmp_path, db.name) as stage:
+        assert stage.config_keys() == {"chap1": ("", "")}
+        stage.upsert_delta(
+            [_make_chapter(2, content="Cleaned")],
+            hashes,
+            config_hash="cfg",
+            chapter_keys={"chap2": "k2"},
+        )
+        stage.mark_processed(["chap1"], hashes, config_hash="cfg")
+
+    with StageStorage(tmp_path, db.name) as stage:
+        assert stage.config_keys() == {"chap1": ("cfg", ""), "chap2": ("cfg", "k2")}
+        assert stage.input_hashes() == hashes
+
+
+# ---------------------------------------------------------------------
+# LayeredChapterStorage
+# ---------------------------------------------------------------------
+
+
+def test_layered_reads_fall_through(tmp_path: Path):
+    hashes = _write_raw(tmp_path, [_make_chapter(1), _make_chapter(2)])
+    with StageStorage(tmp_path, "chapter.cleaner.sqlite") as stage:
+        stage.upsert_delta(
+            [_make_chapter(1), _make_chapter(2, content="Cleaned")], hashes
+        )
+
+    layers = ["chapter.raw.sqlite", "chapter.cleaner.sqlite", "chapter.x.sqlite"]
+    with LayeredChapterStorage.from_files(tmp_path, layers) as view:
+        assert [layer._db_path.name for layer in view.layers] == layers[:2]
+        chaps = view.get_chapters(["chap1", "chap2", "missing"])
+        assert chaps["chap1"] is not None
+        assert chaps["chap1"]["content"] == "Content 1"
+        assert chaps["chap2"] is not None
+        assert chaps["chap2"]["content"] == "Cleaned"
+        assert chaps["missing"] is None
+
+        single = view.get_chapter("chap2")
+        assert single is not None
+        assert single["content"] == "Cleaned"
+        assert view.existing_ids() == {"chap1", "chap2"}
+        assert view.hashes(["chap1"]) == {"chap1": hashes["chap1"]}
+        assert view.hashes(["chap2"])["chap2"] != hashes["chap2"]
+
+
+def test_layered_refetch_flags_from_top_layer(tmp_path: Path):
+    with ChapterStorage(tmp_path, "chapter.raw.sqlite") as raw:
+        raw.upsert_chapter(_make_chapter(1), need_refetch=True)
+        hashes = raw.hashes()
+    with StageStorage(tmp_path, "chapter.cleaner.sqlite") as stage:
+        stage.upsert_delta([_make_chapter(1, content="x")], hashes)
+
+    layers = ["chapter.raw.sqlite", "chapter.cleaner.sqlite"]
+    with LayeredChapterStorage.from_files(tmp_path, layers) as view:
+        assert view.need_refetch("chap1") is False
+        assert view.clean_ids() == {"chap1"}
+        assert view.dirty_ids() == set()
+        assert view.need_refetch("unknown") is True
@@ -0,0 +1,20 @@
+from pathlib import Path
+
+from novel_downloader.infra.persistence.translation_memory import TranslationMemory
+
+
+def test_get_put_round_trip(tmp_path: Path):
+    db = tmp_path / "tm.sqlite"
+    with TranslationMemory(db) as tm:
+        tm.put_many("google", "auto", "en", {"第一章": "Chapter 1", "你好": "Hi"})
+        assert tm.get_many("google", "auto", "en", ["第一章", "未知"]) == {
+            "第一章": "Chapter 1"
+        }
+        # keyed by engine and language pair
+        assert tm.get_many("edge", "auto", "en", ["第一章"]) == {}
+        assert tm.get_many("google", "auto", "ja", ["第一章"]) == {}
+
+    with TranslationMemory(db) as tm:
+        tm.put_many("google", "auto", "en", {"你好": "Hello"})
+        texts = [f"t{i}" for i in range(1200)] + ["你好"]
+        assert tm.get_many("google", "auto", "en", texts) == {"你好": "Hello"}
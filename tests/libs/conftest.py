@@ -0,0 +1,51 @@
+import io
+from collections.abc import Callable
+
+import pytest
+
+
+def _square() -> object:
+    from fontTools.pens.ttGlyphPen import TTGlyphPen
+
+    pen = TTGlyphPen(None)
+    pen.moveTo((0, 0))
+    pen.lineTo((0, 500))
+    pen.lineTo((500, 500))
+    pen.lineTo((500, 0))
+    pen.closePath()
+    return pen.glyph()
+
+
+@pytest.fixture
+def make_font() -> Callable[..., bytes]:
+    """
+    Build a TrueType font covering `chars`; `corrupt` overwrites one of its
+    tables with 0xFF bytes.
+    """
+    pytest.importorskip("fontTools")
+    from fontTools.fontBuilder import FontBuilder
+    from fontTools.ttLib import TTFont
+
+    def _build(chars: str, *, corrupt: str | None = None) -> bytes:
+        names = [".notdef", *(f"uni{ord(c):04X}" for c in chars)]
+        fb = FontBuilder(1000, isTTF=True)
+        fb.setupGlyphOrder(names)
+        fb.setupCharacterMap({ord(c): f"uni{ord(c):04X}" for c in chars})
+        fb.setupGlyf({name: _square() for name in names})
+        fb.setupHorizontalMetrics(dict.fromkeys(names, (600, 0)))
+        fb.setupHorizontalHeader(ascent=800, descent=-200)
+        fb.setupNameTable({"familyName": "Test", "styleName": "Regular"})
+        fb.setupOS2()
+        fb.setupPost()
+        buf = io.BytesIO()
+        fb.save(buf)
+        data = buf.getvalue()
+        if corrupt is None:
+            return data
+
+        with TTFont(io.BytesIO(data)) as font:
+            entry = font.reader.tables[corrupt]
+        end = entry.offset + entry.length
+        return data[: entry.offset] + b"\xff" * entry.length + data[end:]
+
+    return _build
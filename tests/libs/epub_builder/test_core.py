@@ -1,8 +1,14 @@
+import io
+import re
 import zipfile
 from pathlib import Path
 
+import pytest
+
+from novel_downloader.libs.crypto.hash_utils import hash_file
 from novel_downloader.libs.epub_builder.constants import (
     CSS_DIR,
+    IMAGE_DIR,
     ROOT_PATH,
     TEXT_DIR,
 )
@@ -11,6 +17,9 @@
     EpubChapter,
     EpubVolume,
 )
+from novel_downloader.libs.media.font import detect_font_format
+from novel_downloader.libs.media.subset import FontSubsetter
+from novel_downloader.libs.media.transcode import ImageTranscoder, TranscodeParams
 
 
 # ---------------------------------------------------------
@@ -97,6 +106,19 @@ def test_add_image_file(tmp_path):
     assert any("img_0" in line for line in b.opf.manifest_lines)
 
 
+def test_add_image_with_known_digest(tmp_path):
+    img = make_temp_image(tmp_path)
+    digest = hash_file(img)
+
+    b = EpubBuilder("T")
+    fn = b.add_image(img, digest=digest)
+    img.unlink()
+    # a known digest is not read again
+    assert b.add_image(img, digest=digest) == fn
+    assert b.add_image(tmp_path / "gone.png", digest="0" * 64) == ""
+    assert len(b.images) == 1
+
+
 # ---------------------------------------------------------
 # Test: Add image bytes
 # ---------------------------------------------------------
@@ -230,3 +252,245 @@ def test_export_mimetype_stored(tmp_path):
         info = z.getinfo("mimetype")
         # Compression must be ZIP_STORED (0)
         assert info.compress_type == zipfile.ZIP_STORED
+
+
+# ---------------------------------------------------------
+# Test: Streaming mode writes the same archive
+# ---------------------------------------------------------
+def _build(tmp_path: Path, stream_to: Path | None = None) -> EpubBuilder:
+    cover = make_temp_image(tmp_path, "cover.png")
+    vol_img = make_temp_image(tmp_path, "vol.png", b"\x89PNG\r\n\x1a\nvol")
+    font = make_temp_font(tmp_path)
+
+    b = EpubBuilder(
+        "Book", author="A", description="D", cover_path=cover, stream_to=stream_to
+    )
+    fonts = [f] if (f := b.add_font(font)) else []
+    b.add_image_bytes(b"\x89PNG\r\n\x1a\ninline")
+    b.add_chapter(EpubChapter(id="c0", filename="c0.xhtml", title="Prologue"))
+    b.add_volume(
+        EpubVolume(
+            id="v1",
+            title="Vol 1",
+            intro="Intro",
+            cover_path=vol_img,
+            chapters=[
+                EpubChapter(id="c1", filename="c1.xhtml", title="Ch1", fonts=fonts),
+                EpubChapter(id="c2", filename="c2.xhtml", title="Ch2"),
+            ],
+        )
+    )
+    b.start_volume(EpubVolume(id="v2", title="Vol 2"))
+    b.add_font(font)
+    b.add_chapter(EpubChapter(id="c3", filename="c3.xhtml", title="Ch3", fonts=fonts))
+    return b
+
+
+def _entries(path: Path) -> dict[str, bytes]:
+    with zipfile.ZipFile(path) as z:
+        assert z.namelist()[0] == "mimetype"
+        entries = {name: z.read(name) for name in z.namelist()}
+    opf = f"{ROOT_PATH}/content.opf"
+    entries[opf] = re.sub(
+        rb"<meta property=\"dcterms:modified\">[^<]*", b"", entries[opf]
+    )
+    return entries
+
+
+def test_streaming_matches_buffered(tmp_path):
+    buffered = _build(tmp_path).export(tmp_path / "buffered.epub")
+
+    out = tmp_path / "out" / "streamed.epub"
+    builder = _build(tmp_path, stream_to=out)
+    assert not builder.items and not builder.images and not builder.fonts
+    assert (tmp_path / "out" / "streamed.epub.part").is_file()
+
+    assert builder.export() == out
+    assert not (tmp_path / "out" / "streamed.epub.part").exists()
+    assert _entries(out) == _entries(buffered)
+
+    # stream order: content as added, package documents last
+    with zipfile.ZipFile(out) as z:
+        assert z.namelist()[-1] == f"{ROOT_PATH}/content.opf"
+        assert z.getinfo("mimetype").compress_type == zipfile.ZIP_STORED
+
+
+def test_streaming_close_discards(tmp_path):
+    out = tmp_path / "aborted.epub"
+    builder = EpubBuilder("Book", stream_to=out)
+    builder.add_chapter(EpubChapter(id="c1", filename="c1.xhtml", title="Ch1"))
+    builder.close()
+
+    assert not out.exists()
+    assert not (tmp_path / "aborted.epub.part").exists()
+
+
+# ---------------------------------------------------------
+# Test: Compressed media is stored, text is deflated
+# ---------------------------------------------------------
+def test_export_stores_precompressed_media(tmp_path):
+    b = EpubBuilder("Book", compress_workers=2)
+    b.add_image_bytes(b"\x89PNG\r\n\x1a\n" + b"\x00" * 4096)
+    b.add_chapter(
+        EpubChapter(id="c1", filename="c1.xhtml", title="Ch1", content="<p>x</p>" * 500)
+    )
+    out = b.export(tmp_path / "media.epub")
+
+    with zipfile.ZipFile(out) as z:
+        assert z.testzip() is None
+        (png,) = [n for n in z.namelist() if n.endswith(".png")]
+        assert z.getinfo(png).compress_type == zipfile.ZIP_STORED
+        chapter = z.getinfo(f"{ROOT_PATH}/{TEXT_DIR}/c1.xhtml")
+        assert chapter.compress_type == zipfile.ZIP_DEFLATED
+
+
+# ---------------------------------------------------------
+# Test: Image transcoding while streaming
+# ---------------------------------------------------------
+def test_streamed_images_are_transcoded(tmp_path):
+    pil_image = pytest.importorskip("PIL.Image")
+    buf = io.BytesIO()
+    pil_image.new("RGB", (1200, 900), (10, 120, 200)).save(buf, "PNG")
+    img = make_temp_image(tmp_path, data=buf.getvalue())
+    params = TranscodeParams(format="jpeg", max_width=600)
+
+    out = tmp_path / "t.epub"
+    manifest = tmp_path / "manifest.json"
+    for _ in range(2):
+        with ImageTranscoder(tmp_path / "cache", params, workers=2) as transcoder:
+            b = EpubBuilder(
+                "T",
+                stream_to=out,
+                manifest_path=manifest,
+                image_transcoder=transcoder,
+            )
+            assert b.add_image(img) == "img_0.jpeg"
+            b.export()
+
+    # the second run reads the cache and reuses the member
+    assert transcoder.cached == 1
+    assert b.reused_members > 0
+    with zipfile.ZipFile(out) as z:
+        data = z.read(f"{ROOT_PATH}/{IMAGE_DIR}/img_0.jpeg")
+        assert "image/jpeg" in z.read(f"{ROOT_PATH}/content.opf").decode()
+    with pil_image.open(io.BytesIO(data)) as im:
+        assert (im.format, im.size) == ("JPEG", (600, 450))
+
+
+@pytest.mark.parametrize(("stream", "workers"), [(False, 1), (True, 1), (True, 2)])
+def test_failed_transcode_is_labelled_as_source(tmp_path, stream, workers):
+    pil_image = pytest.importorskip("PIL.Image")
+    buf = io.BytesIO()
+    pil_image.new("RGB", (400, 300), (10, 120, 200)).save(buf, "PNG")
+    # the header is readable, decoding the pixels is not
+    img = make_temp_image(tmp_path, data=buf.getvalue()[:64])
+
+    out = tmp_path / "t.epub"
+    params = TranscodeParams(format="jpeg")
+    with ImageTranscoder(tmp_path / "cache", params, workers=workers) as transcoder:
+        b = EpubBuilder(
+            "T", stream_to=out if stream else None, image_transcoder=transcoder
+        )
+        # a failure in a worker is only known after chapters use the name
+        name = "img_0.jpeg" if workers > 1 else "img_0.png"
+        assert b.add_image(img) == name
+        b.export(out)
+
+    with zipfile.ZipFile(out) as z:
+        assert z.read(f"{ROOT_PATH}/{IMAGE_DIR}/{name}") == img.read_bytes()
+        opf = z.read(f"{ROOT_PATH}/content.opf").decode()
+    assert f'href="{IMAGE_DIR}/{name}" media-type="image/png"' in opf
+
+
+class _RecordingSubsetter:
+    def __init__(self):
+        self.calls = []
+
+    def output_format(self, data, digest):
+        return "woff2" if detect_font_format(data) == "ttf" else ""
+
+    def subset(self, data, digest, text):
+        self.calls.append(set(text))
+        return b"wOF2" + "".join(sorted(text)).encode(), f"{digest}_subset"
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_fonts_are_subset_on_export(tmp_path, stream):
+    subsetter = _RecordingSubsetter()
+    out = tmp_path / "t.epub"
+    b = EpubBuilder("T", stream_to=out if stream else None, font_subsetter=subsetter)
+    font = b.add_font(make_temp_font(tmp_path))
+    assert font is not None
+    assert (font.filename, font.media_type) == ("font_0.woff2", "font/woff2")
+
+    b.add_chapter(
+        EpubChapter(
+            id="c1", filename="c1.xhtml", title="甲", content="<p>乙</p>", fonts=[font]
+        )
+    )
+    b.add_chapter(
+        EpubChapter(id="c2", filename="c2.xhtml", title="丙", content="<p>丁</p>")
+    )
+    assert subsetter.calls == []
+    b.export(out)
+
+    assert subsetter.calls == [set("甲<p>乙</")]
+    with zipfile.ZipFile(out) as z:
+        data = z.read(f"{ROOT_PATH}/Fonts/font_0.woff2")
+    assert data == b"wOF2" + "".join(sorted(set("甲<p>乙</"))).encode()
+
+
+class _FailingSubsetter(_RecordingSubsetter):
+    def subset(self, data, digest, text):
+        return data, f"{digest}_orig"
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_broken_fonts_are_named_after_their_output(tmp_path, make_font, stream):
+    pytest.importorskip("brotli")
+    broken = make_font("甲乙", corrupt="glyf")
+    unsubsettable = make_font("甲乙", corrupt="hmtx")
+
+    out = tmp_path / "t.epub"
+    subsetter = FontSubsetter(tmp_path / "cache", format="woff2")
+    b = EpubBuilder("T", stream_to=out if stream else None, font_subsetter=subsetter)
+    fonts = [b.add_font_bytes(broken), b.add_font_bytes(unsubsettable)]
+    assert [(f.filename, f.format) for f in fonts if f] == [
+        ("font_0.ttf", "truetype"),
+        ("font_1.woff2", "woff2"),
+    ]
+    b.add_chapter(
+        EpubChapter(
+            id="c1", filename="c1.xhtml", title="甲", content="<p>乙</p>", fonts=fonts
+        )
+    )
+    b.export(out)
+
+    with zipfile.ZipFile(out) as z:
+        assert z.read(f"{ROOT_PATH}/Fonts/font_0.ttf") == broken
+        data = z.read(f"{ROOT_PATH}/Fonts/font_1.woff2")
+        opf = z.read(f"{ROOT_PATH}/content.opf").decode()
+        chapter = z.read(f"{ROOT_PATH}/{TEXT_DIR}/c1.xhtml").decode()
+    assert detect_font_format(data) == "woff2"
+    assert 'href="Fonts/font_0.ttf" media-type="font/ttf"' in opf
+    assert 'href="Fonts/font_1.woff2" media-type="font/woff2"' in opf
+    assert 'font_0.ttf") format("truetype")' in chapter
+    assert 'font_1.woff2") format("woff2")' in chapter
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_failed_subset_is_labelled_as_source(tmp_path, stream):
+    out = tmp_path / "t.epub"
+    b = EpubBuilder(
+        "T", stream_to=out if stream else None, font_subsetter=_FailingSubsetter()
+    )
+    font = b.add_font(make_temp_font(tmp_path))
+    assert font is not None and font.filename == "font_0.woff2"
+    b.export(out)
+
+    assert font.media_type == "font/ttf"
+    with zipfile.ZipFile(out) as z:
+        data = z.read(f"{ROOT_PATH}/Fonts/font_0.woff2")
+        opf = z.read(f"{ROOT_PATH}/content.opf").decode()
+    assert data == b"\x00\x01\x00\x00FAKEFONTDATA"
+    assert 'href="Fonts/font_0.woff2" media-type="font/ttf"' in opf
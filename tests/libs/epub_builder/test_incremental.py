@@ -0,0 +1,89 @@
+import json
+import zipfile
+from pathlib import Path
+
+from novel_downloader.libs.epub_builder.constants import ROOT_PATH, TEXT_DIR
+from novel_downloader.libs.epub_builder.core import EpubBuilder
+from novel_downloader.libs.epub_builder.models import EpubChapter
+
+
+def _export(
+    out: Path,
+    manifest: Path | None,
+    chapters: dict[str, str],
+    *,
+    stream: bool = False,
+    level: int = 6,
+) -> EpubBuilder:
+    b = EpubBuilder(
+        "Book",
+        uid="book-1",
+        manifest_path=manifest,
+        compress_level=level,
+        stream_to=out if stream else None,
+    )
+    for cid, text in chapters.items():
+        b.add_chapter(
+            EpubChapter(
+                id=f"c_{cid}", filename=f"c{cid}.xhtml", title=cid, content=text
+            )
+        )
+    b.export(None if stream else out)
+    return b
+
+
+def _read(path: Path, cid: str) -> bytes:
+    with zipfile.ZipFile(path) as z:
+        assert z.testzip() is None
+        return z.read(f"{ROOT_PATH}/{TEXT_DIR}/c{cid}.xhtml")
+
+
+CHAPTERS = {str(i): f"<p>chapter {i}</p>" * 200 for i in range(1, 4)}
+
+
+def test_reuses_unchanged_members(tmp_path):
+    manifest = tmp_path / "manifest.json"
+    first = _export(tmp_path / "a.epub", manifest, CHAPTERS)
+    assert first.reused_members == 0
+
+    data = json.loads(manifest.read_text("utf-8"))
+    assert data["archive"] == str((tmp_path / "a.epub").resolve())
+    assert f"{ROOT_PATH}/{TEXT_DIR}/c1.xhtml" in data["members"]
+
+    updated = {**CHAPTERS, "2": "<p>revised</p>", "4": "<p>new</p>"}
+    second = _export(tmp_path / "b.epub", manifest, updated)
+    # mimetype, container.xml, style.css, intro, c1 and c3
+    assert second.reused_members == 6
+
+    plain = tmp_path / "plain.epub"
+    _export(plain, None, updated)
+    for cid in updated:
+        assert _read(tmp_path / "b.epub", cid) == _read(plain, cid)
+    data = json.loads(manifest.read_text("utf-8"))
+    assert data["archive"] == str((tmp_path / "b.epub").resolve())
+
+
+def test_stream_over_previous_archive(tmp_path):
+    out = tmp_path / "book.epub"
+    manifest = tmp_path / "manifest.json"
+    _export(out, manifest, CHAPTERS, stream=True)
+
+    again = _export(out, manifest, {**CHAPTERS, "4": "<p>new</p>"}, stream=True)
+    assert again.reused_members == 7
+    assert b"chapter 3" in _read(out, "3")
+    assert b"new" in _read(out, "4")
+
+
+def test_no_reuse_when_level_or_archive_changes(tmp_path):
+    manifest = tmp_path / "manifest.json"
+    _export(tmp_path / "a.epub", manifest, CHAPTERS)
+    assert _export(tmp_path / "b.epub", manifest, CHAPTERS, level=1).reused_members == 0
+
+    # rewritten behind the manifest's back: CRCs no longer match
+    _export(tmp_path / "c.epub", manifest, CHAPTERS)
+    _export(tmp_path / "c.epub", None, dict.fromkeys(CHAPTERS, "<p>x</p>"))
+    _export(tmp_path / "d.epub", manifest, CHAPTERS)
+    assert _read(tmp_path / "d.epub", "1") == _read(tmp_path / "a.epub", "1")
+
+    (tmp_path / "d.epub").unlink()
+    assert _export(tmp_path / "e.epub", manifest, CHAPTERS).reused_members == 0
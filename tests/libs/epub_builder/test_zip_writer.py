@@ -0,0 +1,88 @@
+import random
+import zipfile
+from concurrent.futures import Future
+from pathlib import Path
+
+import pytest
+
+from novel_downloader.libs.epub_builder import zip_writer
+from novel_downloader.libs.epub_builder.zip_writer import ZipWriter, deflate_member
+
+DATE = (2024, 5, 6, 7, 8, 10)
+TEXT = "<p>第一章 正文</p>\n" * 500
+
+
+def _write(path: Path, workers: int = 1, level: int = 6) -> Path:
+    with ZipWriter(path, workers=workers, level=level, date_time=DATE) as zw:
+        zw.write("mimetype", "application/epub+zip", compress=False)
+        for i in range(20):
+            zw.write(f"OEBPS/Text/c{i}.xhtml", TEXT + str(i))
+        zw.write("OEBPS/Images/noise.bin", random.Random(0).randbytes(4096))
+        zw.write("OEBPS/Text/章节.xhtml", TEXT)
+        zw.write_member(deflate_member("OEBPS/raw.txt", b"copied " * 100, 9))
+    return path
+
+
+def test_roundtrip(tmp_path: Path):
+    out = _write(tmp_path / "a.zip")
+
+    with zipfile.ZipFile(out) as z:
+        assert z.testzip() is None
+        names = z.namelist()
+        assert names[0] == "mimetype"
+        assert z.getinfo("mimetype").compress_type == zipfile.ZIP_STORED
+        assert z.read("OEBPS/Text/c3.xhtml") == (TEXT + "3").encode()
+        assert z.getinfo("OEBPS/Text/c3.xhtml").compress_type == zipfile.ZIP_DEFLATED
+        assert z.read("OEBPS/Text/章节.xhtml") == TEXT.encode()
+        assert z.read("OEBPS/raw.txt") == b"copied " * 100
+        assert z.getinfo("OEBPS/Text/c3.xhtml").date_time == DATE
+        # random data does not shrink and is stored
+        assert z.getinfo("OEBPS/Images/noise.bin").compress_type == zipfile.ZIP_STORED
+
+
+def test_parallel_output_is_ordered(tmp_path: Path):
+    serial = _write(tmp_path / "serial.zip").read_bytes()
+    parallel = _write(tmp_path / "parallel.zip", workers=4).read_bytes()
+    assert serial == parallel
+
+
+def test_level_zero_stores(tmp_path: Path):
+    out = _write(tmp_path / "stored.zip", level=0)
+    with zipfile.ZipFile(out) as z:
+        assert z.testzip() is None
+        info = z.getinfo("OEBPS/Text/c1.xhtml")
+        assert info.compress_type == zipfile.ZIP_STORED
+
+
+def test_zip64_records(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(zip_writer, "_ZIP64_LIMIT", 1000)
+    monkeypatch.setattr(zip_writer, "_ZIP64_COUNT_LIMIT", 5)
+    out = _write(tmp_path / "z64.zip")
+
+    with zipfile.ZipFile(out) as z:
+        assert z.testzip() is None
+        assert len(z.namelist()) == 24
+        assert z.read("OEBPS/Text/c19.xhtml") == (TEXT + "19").encode()
+
+
+def test_abort_leaves_no_central_directory(tmp_path: Path):
+    out = tmp_path / "aborted.zip"
+    with pytest.raises(RuntimeError), ZipWriter(out, workers=2) as zw:
+        zw.write("a.txt", TEXT)
+        raise RuntimeError("stop")
+    assert not zipfile.is_zipfile(out)
+
+
+def test_deferred_members_keep_order(tmp_path: Path):
+    late: Future[bytes] = Future()
+    path = tmp_path / "d.zip"
+    with ZipWriter(path, workers=2, date_time=DATE) as zw:
+        zw.write("a.txt", "first")
+        zw.write("b.jpg", late, compress=False)
+        zw.write("c.txt", TEXT)
+        late.set_result(b"\xff\xd8\xff" + b"\x00" * 100)
+
+    with zipfile.ZipFile(path) as z:
+        assert z.namelist() == ["a.txt", "b.jpg", "c.txt"]
+        assert z.getinfo("b.jpg").compress_type == zipfile.ZIP_STORED
+        assert z.read("b.jpg") == b"\xff\xd8\xff" + b"\x00" * 100
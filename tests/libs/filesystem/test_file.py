@@ -1,6 +1,8 @@
+import gzip
+
 import pytest
 
-from novel_downloader.libs.filesystem.file import write_file
+from novel_downloader.libs.filesystem.file import AtomicTextWriter, write_file
 
 
 def test_write_file_text(tmp_path):
@@ -107,3 +109,42 @@ def __exit__(self, *a):
     # ensure temporary file is cleaned up
     assert not tmp_created[0].exists()
     assert not p.exists()
+
+
+def test_atomic_text_writer_commit(tmp_path):
+    p = tmp_path / "book.txt"
+    p.write_text("old")
+
+    writer = AtomicTextWriter(p)
+    writer.write("第一章\n")
+    writer.write("正文")
+    assert p.read_text("utf-8") == "old"  # untouched until commit
+    assert writer.commit() == p
+    assert p.read_text("utf-8") == "第一章\n正文"
+    assert list(tmp_path.iterdir()) == [p]
+
+
+def test_atomic_text_writer_gzip(tmp_path):
+    p = tmp_path / "book.txt.gz"
+    with AtomicTextWriter(p, compression="gzip") as writer:
+        for i in range(100):
+            writer.write(f"line {i}\n")
+
+    assert gzip.decompress(p.read_bytes()).decode() == "".join(
+        f"line {i}\n" for i in range(100)
+    )
+
+
+def test_atomic_text_writer_discard(tmp_path):
+    p = tmp_path / "book.txt"
+    with pytest.raises(RuntimeError), AtomicTextWriter(p) as writer:
+        writer.write("partial")
+        raise RuntimeError("stop")
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_atomic_text_writer_rejects_unknown_compression(tmp_path):
+    with pytest.raises(ValueError):
+        AtomicTextWriter(tmp_path / "book.txt", compression="rar")
+    assert list(tmp_path.iterdir()) == []
@@ -5,6 +5,8 @@
     HtmlChapter,
     HtmlVolume,
 )
+from novel_downloader.libs.media.font import detect_font_format
+from novel_downloader.libs.media.subset import FontSubsetter
 
 
 # ---------------------------------------------------------------------
@@ -212,3 +214,123 @@ def test_export_writes_fonts(tmp_path, fake_templates):
     fdir = out / "fonts"
     assert f
     assert (fdir / f.filename).read_bytes() == b"fontbin"
+
+
+# ---------------------------------------------------------------------
+# re-export into the same folder only touches changed files
+# ---------------------------------------------------------------------
+def _book(chapters: dict[str, str], workers: int = 1) -> HtmlBuilder:
+    b = HtmlBuilder("Book", workers=workers)
+    for name, text in chapters.items():
+        b.add_chapter(HtmlChapter(filename=name, title=name, content=text))
+    return b
+
+
+def test_reexport_skips_unchanged_and_removes_stale(tmp_path, fake_templates):
+    out_root = tmp_path / "out"
+    chapters = {f"{i}.html": f"text {i}" for i in range(6)}
+    out = _book(chapters, workers=4).export(out_root, folder="Book")
+    assert (out / "_manifest.json").is_file()
+    assert sorted(p.name for p in (out / "chapters").iterdir()) == sorted(chapters)
+
+    mtimes = {p.name: p.stat().st_mtime_ns for p in (out / "chapters").iterdir()}
+    (out / "notes.txt").write_text("mine")
+
+    # 2.html changes, 5.html is dropped (so 4.html loses its next link)
+    del chapters["5.html"]
+    chapters["2.html"] = "revised"
+    b = _book(chapters, workers=4)
+    b.export(out_root, folder="Book")
+
+    after = {p.name: p.stat().st_mtime_ns for p in (out / "chapters").iterdir()}
+    assert sorted(after) == sorted(chapters)
+    assert after["0.html"] == mtimes["0.html"]
+    assert after["2.html"] != mtimes["2.html"]
+    assert "revised" in (out / "chapters" / "2.html").read_text("utf-8")
+    assert "5.html" not in (out / "chapters" / "4.html").read_text("utf-8")
+    assert (out / "notes.txt").read_text() == "mine"
+
+
+def test_manifest_cannot_escape_export_dir(tmp_path, fake_templates):
+    victim = tmp_path / "victim.txt"
+    victim.write_text("keep")
+    out = _book({"1.html": "x"}).export(tmp_path / "out", folder="Book")
+    (out / "_manifest.json").write_text('{"../../victim.txt": "0"}')
+
+    _book({"1.html": "x"}).export(tmp_path / "out", folder="Book")
+    assert victim.read_text() == "keep"
+
+
+def test_repeated_filename_keeps_last_chapter(tmp_path, fake_templates):
+    b = HtmlBuilder("Book", workers=4)
+    for text in ("first", "middle", "last"):
+        b.add_chapter(HtmlChapter(filename="same.html", title=text, content=text))
+    out = b.export(tmp_path)
+
+    assert "last" in (out / "chapters" / "same.html").read_text("utf-8")
+
+
+# ---------------------------------------------------------------------
+# fonts are subset to the characters of the chapters using them
+# ---------------------------------------------------------------------
+class _RecordingSubsetter:
+    def __init__(self):
+        self.calls = []
+
+    def output_format(self, data, digest):
+        return "woff2" if detect_font_format(data) == "ttf" else ""
+
+    def subset(self, data, digest, text):
+        self.calls.append((data, set(text)))
+        return b"wOF2" + text.encode(), "key"
+
+
+def test_export_subsets_fonts(tmp_path, fake_templates):
+    subsetter = _RecordingSubsetter()
+    b = HtmlBuilder("Book", font_subsetter=subsetter)
+    shared = b.add_font_bytes(b"\x00\x01\x00\x00" + b"shared" * 4)
+    own = b.add_font_bytes(b"\x00\x01\x00\x00" + b"own" * 8)
+    other = b.add_font_bytes(b"OTTO" + b"x" * 16)
+    assert shared and own and other
+    assert shared.filename.endswith(".woff2")
+    assert other.filename.endswith(".otf")
+
+    b.add_chapter(
+        HtmlChapter(filename="1.html", title="甲", content="乙&amp;", fonts=[shared])
+    )
+    b.add_volume(
+        HtmlVolume(
+            title="V",
+            chapters=[
+                HtmlChapter(
+                    filename="2.html", title="丙", content="丁", fonts=[shared, own]
+                )
+            ],
+        )
+    )
+    out = b.export(tmp_path)
+
+    texts = [chars for _, chars in subsetter.calls]
+    assert texts == [{"甲", "乙", "&", "丙", "丁"}, {"丙", "丁"}]
+    assert (out / "fonts" / other.filename).read_bytes() == b"OTTO" + b"x" * 16
+    assert (out / "fonts" / shared.filename).read_bytes().startswith(b"wOF2")
+
+
+def test_broken_fonts_are_named_after_their_output(tmp_path, fake_templates, make_font):
+    pytest.importorskip("brotli")
+    broken = make_font("甲乙", corrupt="glyf")
+    unsubsettable = make_font("甲乙", corrupt="hmtx")
+
+    subsetter = FontSubsetter(tmp_path / "cache", format="woff2")
+    b = HtmlBuilder("Book", font_subsetter=subsetter)
+    fonts = [b.add_font_bytes(broken), b.add_font_bytes(unsubsettable)]
+    assert [f.filename for f in fonts if f] == ["font_0.ttf", "font_1.woff2"]
+    b.add_chapter(HtmlChapter(filename="1.html", title="甲", content="乙", fonts=fonts))
+    out = b.export(tmp_path / "out")
+
+    assert (out / "fonts" / "font_0.ttf").read_bytes() == broken
+    data = (out / "fonts" / "font_1.woff2").read_bytes()
+    assert detect_font_format(data) == "woff2"
+    page = (out / "chapters" / "1.html").read_text("utf-8")
+    assert 'font_0.ttf") format("truetype")' in page
+    assert 'font_1.woff2") format("woff2")' in page
@@ -1,8 +1,9 @@
+import io
 from pathlib import Path
 
 import pytest
 
-from novel_downloader.libs.media.image import detect_image_format
+from novel_downloader.libs.media.image import detect_image_format, image_size
 
 IMG_TYPES = {
     "bmp",
@@ -46,3 +47,27 @@ def test_detect_image_format_small_input():
 def test_detect_image_format_unknown():
     """Unknown magic number should return None."""
     assert detect_image_format(b"ThisIsNotAnImage....") is None
+
+
+@pytest.mark.parametrize(
+    ("fmt", "options"),
+    [
+        ("PNG", {}),
+        ("GIF", {}),
+        ("JPEG", {}),
+        ("JPEG", {"progressive": True}),
+        ("WEBP", {}),
+        ("WEBP", {"lossless": True}),
+        ("BMP", {}),
+    ],
+)
+def test_image_size(fmt, options):
+    pil_image = pytest.importorskip("PIL.Image")
+    buf = io.BytesIO()
+    pil_image.new("RGB", (123, 45)).save(buf, fmt, **options)
+    assert image_size(buf.getvalue()) == (123, 45)
+
+
+@pytest.mark.parametrize("data", [b"", b"\xff\xd8\xff", b"\x89PNG\r\n\x1a\n", b"abc"])
+def test_image_size_unknown(data):
+    assert image_size(data) is None
@@ -0,0 +1,42 @@
+from concurrent.futures import Future
+from pathlib import Path
+
+import pytest
+
+from novel_downloader.libs.media.jobs import MediaJobPool
+
+
+def _upper(data: bytes, suffix: bytes) -> bytes:
+    return data.upper() + suffix
+
+
+def _fail(data: bytes) -> bytes:
+    raise ValueError("broken")
+
+
+class _Pool(MediaJobPool):
+    def run(self, fn, data: bytes, *args, key: str) -> bytes:
+        cached = self._cached("ab" * 32, key)
+        if cached is not None:
+            return cached
+        result = self._submit(fn, data, *args, digest="ab" * 32, key=key)
+        return result.result() if isinstance(result, Future) else result
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_result_is_cached(tmp_path: Path, workers: int):
+    with _Pool(tmp_path, workers=workers) as pool:
+        assert pool.run(_upper, b"abc", b"!", key="k1") == b"ABC!"
+        assert pool.cached == 0
+        assert pool.run(_upper, b"xyz", b"?", key="k1") == b"ABC!"
+        assert pool.cached == 1
+    assert (tmp_path / "ab" / "k1").read_bytes() == b"ABC!"
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_failure_returns_source(tmp_path: Path, workers: int):
+    with _Pool(tmp_path, workers=workers) as pool:
+        assert pool.run(_fail, b"abc", key="k1") == b"abc"
+        assert pool.run(_fail, b"abc", key="k1") == b"abc"
+        assert pool.cached == 0
+    assert not (tmp_path / "ab").exists()
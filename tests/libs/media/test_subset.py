@@ -0,0 +1,121 @@
+import io
+from concurrent.futures import Future
+from pathlib import Path
+
+import pytest
+
+from novel_downloader.libs.crypto.hash_utils import hash_bytes
+from novel_downloader.libs.media.font import detect_font_format
+from novel_downloader.libs.media.subset import FontSubsetter
+
+pytest.importorskip("fontTools")
+from fontTools.ttLib import TTFont  # noqa: E402
+
+
+def _charset(data: bytes) -> set[str]:
+    with TTFont(io.BytesIO(data)) as font:
+        return {chr(cp) for cp in font.getBestCmap()}
+
+
+@pytest.mark.parametrize(
+    ("format", "fmt", "expected"),
+    [
+        ("original", "ttf", "ttf"),
+        ("original", "woff", "woff"),
+        ("woff2", "ttf", "woff2"),
+        ("woff2", "otf", "woff2"),
+        ("woff2", "ttc", ""),
+        ("woff2", None, ""),
+    ],
+)
+def test_target_format(tmp_path: Path, format, fmt, expected):
+    subsetter = FontSubsetter(tmp_path, format=format)
+    assert subsetter.target_format(fmt) == expected
+
+
+def test_unknown_format_rejected(tmp_path: Path):
+    with pytest.raises(ValueError):
+        FontSubsetter(tmp_path, format="eot")
+
+
+def test_subset_keeps_used_characters_and_caches(tmp_path: Path, make_font):
+    src = make_font("天地玄黄宇宙洪荒")
+    subsetter = FontSubsetter(tmp_path)
+    data, key = subsetter.subset(src, hash_bytes(src), "玄黄玄")
+    assert isinstance(data, bytes)
+    assert detect_font_format(data) == "ttf"
+    assert _charset(data) == {"玄", "黄"}
+    assert len(data) < len(src)
+
+    # same characters in another order hit the cache
+    again = FontSubsetter(tmp_path)
+    assert again.subset(src, hash_bytes(src), "黄玄") == (data, key)
+    assert again.cached == 1
+
+    # another glyph set is cached separately
+    _, other = again.subset(src, hash_bytes(src), "天")
+    assert other != key
+    assert again.subsetted == 1
+
+
+def test_woff2_conversion(tmp_path: Path, make_font):
+    pytest.importorskip("brotli")
+    src = make_font("天地玄黄")
+
+    subsetter = FontSubsetter(tmp_path, subset=False, format="woff2")
+    data, _ = subsetter.subset(src, hash_bytes(src), "天")
+    assert detect_font_format(data) == "woff2"
+    assert _charset(data) == set("天地玄黄")
+
+    subsetter = FontSubsetter(tmp_path, format="woff2")
+    data, _ = subsetter.subset(src, hash_bytes(src), "天")
+    assert detect_font_format(data) == "woff2"
+    assert _charset(data) == {"天"}
+
+
+def test_invalid_font_is_embedded_as_is(tmp_path: Path):
+    src = b"\x00\x01\x00\x00NOTAFONT"
+    data, _ = FontSubsetter(tmp_path, format="woff2").subset(src, hash_bytes(src), "天")
+    assert data == src
+    # failures are not cached
+    assert not any(p.is_file() for p in tmp_path.rglob("*"))
+
+
+def test_subset_in_worker_processes(tmp_path: Path, make_font):
+    src = make_font("天地玄黄")
+    with FontSubsetter(tmp_path, workers=2) as subsetter:
+        data, _ = subsetter.subset(src, hash_bytes(src), "地")
+        assert isinstance(data, Future)
+        assert _charset(data.result()) == {"地"}
+
+
+def test_output_format_checks_converted_fonts(
+    tmp_path: Path, make_font, monkeypatch: pytest.MonkeyPatch
+):
+    from novel_downloader.libs import font_utils
+
+    good = make_font("天地")
+    broken = make_font("天地", corrupt="glyf")
+    subsetter = FontSubsetter(tmp_path, format="woff2")
+    assert subsetter.output_format(good, hash_bytes(good)) == "woff2"
+    assert subsetter.output_format(broken, hash_bytes(broken)) == ""
+    # the container is kept, so there is nothing to check
+    original = FontSubsetter(tmp_path)
+    assert original.output_format(broken, hash_bytes(broken)) == "ttf"
+
+    # fonts that passed are not checked again
+    monkeypatch.setattr(font_utils, "font_is_readable", lambda data: False)
+    again = FontSubsetter(tmp_path, format="woff2")
+    assert again.output_format(good, hash_bytes(good)) == "woff2"
+
+
+def test_failed_subset_converts_whole_font(tmp_path: Path, make_font):
+    pytest.importorskip("brotli")
+    # readable tables, but subsetting the metrics fails
+    src = make_font("天地", corrupt="hmtx")
+    subsetter = FontSubsetter(tmp_path, format="woff2")
+    assert subsetter.output_format(src, hash_bytes(src)) == "woff2"
+
+    data, _ = subsetter.subset(src, hash_bytes(src), "天")
+    assert detect_font_format(data) == "woff2"
+    assert _charset(data) == set("天地")
@@ -0,0 +1,99 @@
+import io
+from concurrent.futures import Future
+from pathlib import Path
+
+import pytest
+
+from novel_downloader.libs.crypto.hash_utils import hash_bytes
+from novel_downloader.libs.media.transcode import ImageTranscoder, TranscodeParams
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def _image(fmt: str, size: tuple[int, int] = (800, 600)) -> bytes:
+    buf = io.BytesIO()
+    Image.new("RGB", size, (200, 30, 30)).save(buf, fmt)
+    return buf.getvalue()
+
+
+def _size(data: bytes) -> tuple[int, int]:
+    with Image.open(io.BytesIO(data)) as img:
+        return img.size
+
+
+@pytest.mark.parametrize(
+    ("params", "fmt", "size", "expected"),
+    [
+        (TranscodeParams(max_width=1000), "jpeg", (800, 600), ""),
+        (TranscodeParams(max_width=400), "jpeg", (800, 600), "jpeg"),
+        (TranscodeParams(max_height=400), "png", (800, 600), "png"),
+        (TranscodeParams(format="webp"), "jpeg", (800, 600), "webp"),
+        (TranscodeParams(format="jpeg"), "jpeg", (800, 600), ""),
+        (TranscodeParams(format="jpeg"), "gif", (800, 600), ""),
+        (TranscodeParams(format="jpeg"), "png", None, ""),
+        (TranscodeParams(max_width=10), "bmp", (800, 600), "png"),
+    ],
+)
+def test_target_format(tmp_path: Path, params, fmt, size, expected):
+    transcoder = ImageTranscoder(tmp_path, params)
+    assert transcoder.target_format(fmt, size) == expected
+
+
+def test_unknown_format_rejected(tmp_path: Path):
+    with pytest.raises(ValueError):
+        ImageTranscoder(tmp_path, TranscodeParams(format="avif"))
+
+
+def test_prepare_caches_result(tmp_path: Path):
+    src = _image("PNG")
+    params = TranscodeParams(format="jpeg", max_width=200, quality=70)
+
+    transcoder = ImageTranscoder(tmp_path, params)
+    first = transcoder.prepare(src, hash_bytes(src))
+    assert first is not None and isinstance(first.data, bytes)
+    assert first.fmt == "jpeg"
+    assert _size(first.data) == (200, 150)
+    assert transcoder.transcoded == 1
+
+    again = ImageTranscoder(tmp_path, params).prepare(src, hash_bytes(src))
+    assert again is not None
+    assert (again.data, again.key) == (first.data, first.key)
+
+    # other parameters are cached separately
+    other = ImageTranscoder(tmp_path, TranscodeParams(format="jpeg", max_width=100))
+    prepared = other.prepare(src, hash_bytes(src))
+    assert prepared is not None and prepared.key != first.key
+    assert other.transcoded == 1
+
+
+def test_prepare_keeps_fitting_images(tmp_path: Path):
+    src = _image("JPEG", (100, 100))
+    transcoder = ImageTranscoder(tmp_path, TranscodeParams(max_width=200))
+    assert transcoder.prepare(src, hash_bytes(src)) is None
+
+
+def test_prepare_in_worker_processes(tmp_path: Path):
+    src = _image("JPEG")
+    with ImageTranscoder(
+        tmp_path, TranscodeParams(format="webp", max_height=300), workers=2
+    ) as transcoder:
+        prepared = transcoder.prepare(src, hash_bytes(src))
+        assert prepared is not None and isinstance(prepared.data, Future)
+        assert _size(prepared.data.result()) == (400, 300)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_failed_transcode_keeps_source(tmp_path: Path, workers: int):
+    # the header is readable, decoding the pixels is not
+    src = _image("PNG")[:64]
+    with ImageTranscoder(
+        tmp_path, TranscodeParams(format="jpeg"), workers=workers
+    ) as transcoder:
+        prepared = transcoder.prepare(src, hash_bytes(src))
+        assert prepared is not None and prepared.fmt == "jpeg"
+        data = prepared.data
+        if isinstance(data, Future):
+            data = data.result()
+    assert data == src
+    # failures are not cached
+    assert not any(p.is_file() for p in tmp_path.rglob("*"))
@@ -16,6 +16,7 @@
     load_image_array_path,
     split_by_height,
     split_by_white_lines,
+    transcode_image,
 )
 
 
@@ -215,3 +216,24 @@ def test_concat_image_slices_vertical_one_slice():
     loaded = np.array(Image.open(io.BytesIO(encoded)))
 
     np.testing.assert_array_equal(loaded, img)
+
+
+def test_transcode_image_downscales_and_flattens():
+    src = pil_to_bytes(Image.new("RGBA", (400, 200), (0, 0, 255, 0)))
+    out = transcode_image(src, format="JPEG", quality=80, max_width=100)
+
+    with Image.open(io.BytesIO(out)) as img:
+        assert img.format == "JPEG"
+        assert img.size == (100, 50)
+        # transparent pixels end up white
+        r, g, b = img.convert("RGB").getpixel((50, 25))
+        assert min(r, g, b) > 240
+
+
+def test_transcode_image_never_enlarges():
+    src = pil_to_bytes(create_rgb_image(50, 40), fmt="JPEG")
+    out = transcode_image(src, format="WEBP", max_width=500, max_height=500)
+
+    with Image.open(io.BytesIO(out)) as img:
+        assert img.format == "WEBP"
+        assert img.size == (50, 40)
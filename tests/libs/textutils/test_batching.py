@@ -0,0 +1,11 @@
+from novel_downloader.libs.textutils import pack_texts
+
+
+def test_pack_texts_by_chars():
+    texts = ["aaa", "bb", "cccc", "d", "eeeeeeeeee", "f"]
+    assert pack_texts(texts, 5) == [[0, 1], [2, 3], [4], [5]]
+
+
+def test_pack_texts_by_items():
+    assert pack_texts(["a"] * 5, 100, max_items=2) == [[0, 1], [2, 3], [4]]
+    assert pack_texts([], 10) == []
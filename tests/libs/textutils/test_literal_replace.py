@@ -0,0 +1,68 @@
+import pickle
+import random
+
+import pytest
+
+from novel_downloader.libs.textutils import LiteralReplacer, is_literal_pattern
+from novel_downloader.libs.textutils import literal_replace as lr_mod
+
+
+def _brute(mapping: dict[str, str], text: str) -> str:
+    keys = sorted(mapping, key=len, reverse=True)
+    out, pos = [], 0
+    while pos < len(text):
+        for key in keys:
+            if text.startswith(key, pos):
+                out.append(mapping[key])
+                pos += len(key)
+                break
+        else:
+            out.append(text[pos])
+            pos += 1
+    return "".join(out)
+
+
+def _random_case(seed: int) -> tuple[dict[str, str], list[str]]:
+    rng = random.Random(seed)
+    alphabet = "ab.c*"
+    mapping = {
+        "".join(rng.choices(alphabet, k=rng.randint(1, 4))): rng.choice(["", "X", "yy"])
+        for _ in range(rng.randint(1, 12))
+    }
+    texts = ["".join(rng.choices(alphabet, k=rng.randint(0, 30))) for _ in range(20)]
+    return mapping, texts
+
+
+def test_is_literal_pattern():
+    assert is_literal_pattern("广告")
+    assert not is_literal_pattern("")
+    assert not is_literal_pattern(r"第\d+章")
+    assert not is_literal_pattern("a.b")
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_brute_force(seed: int):
+    mapping, texts = _random_case(seed)
+    replacer = LiteralReplacer(mapping)
+    for text in texts:
+        assert replacer.sub(text) == _brute(mapping, text)
+        assert replacer.occurring(text) == {k for k in mapping if k in text}
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_regex_backend_matches_brute_force(seed: int, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(lr_mod, "ahocorasick", None)
+    mapping, texts = _random_case(seed)
+    replacer = LiteralReplacer(mapping)
+    assert replacer.backend == "regex"
+    for text in texts:
+        assert replacer.sub(text) == _brute(mapping, text)
+
+
+def test_pickle_round_trip():
+    replacer = LiteralReplacer({"广告": "", "广告词": "*", "a": "b"})
+    loaded = pickle.loads(pickle.dumps(replacer))
+    assert loaded.mapping == replacer.mapping
+    assert loaded.backend == replacer.backend
+    assert loaded.sub("广告词广告a") == "*b"
+    assert not LiteralReplacer({"": "x"})
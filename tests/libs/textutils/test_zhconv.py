@@ -0,0 +1,63 @@
+import pickle
+from pathlib import Path
+
+import pytest
+
+from novel_downloader.libs.textutils import ZhConverter
+
+
+def test_forward_maximum_matching():
+    conv = ZhConverter(
+        [
+            {
+                "头": "頭",
+                "发": "發",
+                "干": "幹",
+                "头发": "頭髮",
+                "干净": "乾淨",
+                "发干净": "X",
+            }
+        ]
+    )
+    # the longest phrase at the leftmost position wins; covered text is skipped
+    assert conv.convert("头发干净") == "頭髮乾淨"
+    assert conv.convert("发干净了") == "X了"
+    assert conv.convert("干") == "幹"
+    assert conv.convert("") == ""
+    assert conv.convert("abc") == "abc"
+
+
+def test_stages_apply_in_order():
+    conv = ZhConverter([{"台湾": "臺灣"}, {"臺": "台"}])
+    assert conv.convert("台湾") == "台灣"
+    assert pickle.loads(pickle.dumps(conv)).convert("台湾") == "台灣"
+
+
+def test_multi_char_mappings():
+    conv = ZhConverter([{"a": "xy", "ab": "Z", "c": ""}])
+    assert conv.convert("aabca") == "xyZxy"
+
+
+def test_from_opencc_dicts(tmp_path: Path):
+    (tmp_path / "TSPhrases.txt").write_text("乾淨\t干净\n", encoding="utf-8")
+    (tmp_path / "TSCharacters.txt").write_text(
+        "乾\t干 乾\n淨\t净\n頭\t头\n", encoding="utf-8"
+    )
+    conv = ZhConverter.from_opencc("t2s", tmp_path)
+    assert conv.convert("頭乾淨乾") == "头干净干"
+    with pytest.raises(ValueError):
+        ZhConverter.from_opencc("x2y", tmp_path)
+
+
+def test_matches_opencc_package():
+    opencc = pytest.importorskip("opencc")
+    from novel_downloader.plugins.processors.zh_convert import ZhConvertProcessor
+
+    dict_dir = ZhConvertProcessor._opencc_dict_dir()
+    assert dict_dir is not None
+    text = (
+        "我们在上海的头发里面找到了一只干净的面包。这个后台程序的计算机系统出了问题。"
+    )
+    for direction in ("s2t", "s2twp"):
+        conv = ZhConverter.from_opencc(direction, dict_dir)
+        assert conv.convert(text) == opencc.OpenCC(direction).convert(text)
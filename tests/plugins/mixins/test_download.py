@@ -0,0 +1,106 @@
+import asyncio
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from novel_downloader.plugins import registrar
+from novel_downloader.schemas import (
+    BookConfig,
+    BookInfoDict,
+    ChapterDict,
+    ClientConfig,
+    ProcessorConfig,
+)
+
+N_CHAPTERS = 12
+
+
+def _client(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, **kwargs: Any) -> Any:
+    cfg = ClientConfig(
+        raw_data_dir=str(tmp_path / "raw"),
+        cache_dir=str(tmp_path / "cache"),
+        request_interval=0,
+        storage_batch_size=3,
+        **kwargs,
+    )
+    client = registrar.get_client("common_test", cfg)
+    info: BookInfoDict = {
+        "book_name": "B",
+        "author": "A",
+        "cover_url": "",
+        "update_time": "",
+        "summary": "",
+        "volumes": [
+            {
+                "volume_name": "V",
+                "chapters": [
+                    {"title": f"c{i}", "url": "", "chapterId": str(i)}
+                    for i in range(N_CHAPTERS)
+                ],
+            }
+        ],
+        "extra": {},
+    }
+
+    async def _book_info(book_id: str, **kw: Any) -> BookInfoDict:
+        client._save_book_info(book_id, info)
+        return info
+
+    async def _chapter(book_id: str, cid: str, **kw: Any) -> ChapterDict:
+        await asyncio.sleep(0)
+        return ChapterDict(id=cid, title=f"c{cid}", content=f"AD text {cid}", extra={})
+
+    async def _no_images(*args: Any) -> None:
+        return None
+
+    monkeypatch.setattr(client, "get_book_info", _book_info)
+    monkeypatch.setattr(client, "get_chapter", _chapter)
+    monkeypatch.setattr(client, "_dl_cache_info_images", _no_images)
+    return client
+
+
+def _processed(client: Any, book_id: str) -> int:
+    with client._stage_storage(book_id, "cleaner") as outstore:
+        return len(outstore.input_hashes())
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_download_streams_processing(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, stream: bool
+):
+    client = _client(tmp_path, monkeypatch, stream_processing=stream)
+    rules = tmp_path / "rules.json"
+    rules.write_text(json.dumps(["AD "]), encoding="utf-8")
+    pconfs = [ProcessorConfig(name="cleaner", options={"content_removes": str(rules)})]
+    book = BookConfig(book_id="b1")
+
+    asyncio.run(client.download_book(book, processors=pconfs))
+
+    streamed = client._has_stage_data("b1", "cleaner")
+    assert streamed is stream
+    if stream:
+        assert _processed(client, "b1") == N_CHAPTERS
+
+    client.process_book(book, pconfs)
+    with client._open_stage_storage("b1", "cleaner") as view:
+        chap = view.get_chapter("7")
+        assert chap is not None
+        assert chap["content"] == "text 7"
+
+
+def test_download_stream_failure_is_not_fatal(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    client = _client(tmp_path, monkeypatch, stream_processing=True)
+
+    def _fail(*args: Any) -> None:
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(client, "_pc_process_chapters", _fail)
+    book = BookConfig(book_id="b1")
+    asyncio.run(client.download_book(book, processors=[ProcessorConfig("cleaner")]))
+
+    with client._chapter_storage("b1") as storage:
+        assert len(storage.existing_ids()) == N_CHAPTERS
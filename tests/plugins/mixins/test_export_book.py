@@ -0,0 +1,307 @@
+import gzip
+import io
+import json
+import re
+import zipfile
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from novel_downloader.infra.persistence.media_index import MEDIA_INDEX_FILENAME
+from novel_downloader.infra.persistence.stage_storage import LayeredChapterStorage
+from novel_downloader.libs.filesystem import font_filename, image_filename
+from novel_downloader.plugins import registrar
+from novel_downloader.plugins.mixins import export_epub
+from novel_downloader.schemas import (
+    BookConfig,
+    ChapterDict,
+    ClientConfig,
+    ExporterConfig,
+)
+
+CFG = ExporterConfig(append_timestamp=False)
+
+
+def _client(tmp_path: Path) -> Any:
+    cfg = ClientConfig(
+        raw_data_dir=str(tmp_path / "raw"),
+        cache_dir=str(tmp_path / "cache"),
+        output_dir=str(tmp_path / "out"),
+    )
+    client = registrar.get_client("common_test", cfg)
+    book_dir = tmp_path / "raw" / "common_test" / "b1"
+    book_dir.mkdir(parents=True)
+
+    info = {
+        "book_name": "B",
+        "author": "A",
+        "volumes": [
+            {
+                "volume_name": "V1",
+                "chapters": [
+                    {"title": f"c{i}", "url": "", "chapterId": str(i)} for i in range(3)
+                ],
+            },
+            {
+                "volume_name": "V2",
+                "chapters": [{"title": "gone", "url": "", "chapterId": "9"}],
+            },
+        ],
+    }
+    (book_dir / "book_info.raw.json").write_text(json.dumps(info), encoding="utf-8")
+    with client._chapter_storage("b1") as storage:
+        storage.upsert_chapters(
+            [
+                ChapterDict(id=str(i), title=f"c{i}", content=f"text {i}", extra={})
+                for i in range(3)
+            ]
+        )
+    return client
+
+
+def test_formats_share_one_read(tmp_path, monkeypatch: pytest.MonkeyPatch):
+    client = _client(tmp_path)
+    calls: list[list[str]] = []
+    get_chapters = LayeredChapterStorage.get_chapters
+
+    def _spy(self: LayeredChapterStorage, cids: list[str]) -> Any:
+        calls.append(list(cids))
+        return get_chapters(self, cids)
+
+    monkeypatch.setattr(LayeredChapterStorage, "get_chapters", _spy)
+
+    results = client.export_book(
+        BookConfig(book_id="b1"), CFG, formats=["txt", "epub", "html", "pdf"]
+    )
+
+    # one batch per volume, whatever the number of formats
+    assert calls == [["0", "1", "2"], ["9"]]
+    assert results["pdf"] == []
+    (txt,) = results["txt"]
+    text = txt.read_text(encoding="utf-8")
+    assert "=== V1 ===" in text and "text 2" in text
+    assert "本章内容暂不可用" in text
+    (epub,) = results["epub"]
+    with zipfile.ZipFile(epub) as z:
+        assert "OEBPS/Text/c1.xhtml" in z.namelist()
+    (html,) = results["html"]
+    assert (html / "chapters" / "c1.html").is_file()
+
+
+def test_failing_format_does_not_stop_others(tmp_path):
+    client = _client(tmp_path)
+
+    def _broken(chap_title: str | None, chap: ChapterDict) -> str:
+        raise RuntimeError("boom")
+
+    client._xp_txt_chapter = _broken
+    results = client.export_book(BookConfig(book_id="b1"), CFG, formats=["txt", "epub"])
+
+    assert results["txt"] == []
+    (epub,) = results["epub"]
+    assert epub.is_file()
+    assert not list((tmp_path / "out").glob("*.txt"))
+
+
+def test_single_format_raises(tmp_path):
+    client = _client(tmp_path)
+    client._xp_txt_chapter = lambda *a: 1 / 0
+
+    with pytest.raises(ZeroDivisionError):
+        client._export_book_txt(BookConfig(book_id="b1"), CFG)
+
+
+def test_txt_gzip_output(tmp_path):
+    client = _client(tmp_path)
+    plain = client._export_book_txt(BookConfig(book_id="b1"), CFG)[0]
+    cfg = ExporterConfig(append_timestamp=False, txt_compression="gzip")
+    (packed,) = client._export_book_txt(BookConfig(book_id="b1"), cfg)
+
+    assert packed.name == "B_A.txt.gz"
+    assert gzip.decompress(packed.read_bytes()) == plain.read_bytes()
+
+
+def test_media_is_hashed_once(tmp_path, monkeypatch: pytest.MonkeyPatch):
+    client = _client(tmp_path)
+    url = "https://example.com/a.png"
+    media_dir = tmp_path / "raw" / "common_test" / "b1" / "media"
+    media_dir.mkdir()
+    (media_dir / image_filename(url)).write_bytes(b"\x89PNG\r\n\x1a\n" + b"\x00" * 64)
+    with client._chapter_storage("b1") as storage:
+        storage.upsert_chapter(
+            ChapterDict(
+                id="1",
+                title="c1",
+                content="text 1",
+                extra={"resources": [{"type": "image", "url": url}]},
+            )
+        )
+
+    # the first export indexes the file left by an older download
+    client.export_book(BookConfig(book_id="b1"), CFG, formats=["epub"])
+    assert (media_dir / MEDIA_INDEX_FILENAME).is_file()
+
+    def _no_hash(path: Path) -> str:
+        raise AssertionError(f"hashed again: {path}")
+
+    monkeypatch.setattr("novel_downloader.libs.epub_builder.core.hash_file", _no_hash)
+    monkeypatch.setattr("novel_downloader.libs.html_builder.core.hash_file", _no_hash)
+    results = client.export_book(
+        BookConfig(book_id="b1"), CFG, formats=["epub", "html"]
+    )
+
+    (epub,) = results["epub"]
+    with zipfile.ZipFile(epub) as z:
+        assert "OEBPS/Images/img_0.png" in z.namelist()
+    (html,) = results["html"]
+    assert (html / "media" / "img_0.png").is_file()
+
+
+def test_epub_image_optimization(tmp_path):
+    pil_image = pytest.importorskip("PIL.Image")
+    client = _client(tmp_path)
+    url = "https://example.com/big.png"
+    buf = io.BytesIO()
+    pil_image.new("RGB", (2000, 1000), (90, 90, 90)).save(buf, "PNG")
+    media_dir = tmp_path / "raw" / "common_test" / "b1" / "media"
+    media_dir.mkdir()
+    (media_dir / image_filename(url)).write_bytes(buf.getvalue())
+    with client._chapter_storage("b1") as storage:
+        storage.upsert_chapter(
+            ChapterDict(
+                id="0",
+                title="c0",
+                content="text 0",
+                extra={"resources": [{"type": "image", "url": url}]},
+            )
+        )
+
+    cfg = ExporterConfig(
+        append_timestamp=False, image_format="webp", image_max_width=500
+    )
+    (epub,) = client._export_book_epub(BookConfig(book_id="b1"), cfg)
+
+    with zipfile.ZipFile(epub) as z:
+        data = z.read("OEBPS/Images/img_0.webp")
+    with pil_image.open(io.BytesIO(data)) as img:
+        assert img.size == (500, 250)
+    assert list((tmp_path / "cache" / "common_test" / "images").rglob("*.webp"))
+
+
+def test_fonts_are_subset(tmp_path):
+    pytest.importorskip("brotli")
+    pytest.importorskip("fontTools")
+    from fontTools.fontBuilder import FontBuilder
+    from fontTools.pens.ttGlyphPen import TTGlyphPen
+    from fontTools.ttLib import TTFont
+
+    chars = "tex0123456789章节"
+    names = [".notdef", *(f"uni{ord(c):04X}" for c in chars)]
+    fb = FontBuilder(1000, isTTF=True)
+    fb.setupGlyphOrder(names)
+    fb.setupCharacterMap({ord(c): f"uni{ord(c):04X}" for c in chars})
+    fb.setupGlyf({name: TTGlyphPen(None).glyph() for name in names})
+    fb.setupHorizontalMetrics(dict.fromkeys(names, (600, 0)))
+    fb.setupHorizontalHeader(ascent=800, descent=-200)
+    fb.setupNameTable({"familyName": "Test", "styleName": "Regular"})
+    fb.setupOS2()
+    fb.setupPost()
+    buf = io.BytesIO()
+    fb.save(buf)
+
+    client = _client(tmp_path)
+    url = "https://example.com/shared.ttf"
+    media_dir = tmp_path / "raw" / "common_test" / "b1" / "media"
+    media_dir.mkdir()
+    (media_dir / font_filename(url)).write_bytes(buf.getvalue())
+    with client._chapter_storage("b1") as storage:
+        for i in range(2):
+            storage.upsert_chapter(
+                ChapterDict(
+                    id=str(i),
+                    title=f"c{i}",
+                    content=f"text {i}",
+                    extra={"resources": [{"type": "font", "url": url}]},
+                )
+            )
+
+    cfg = ExporterConfig(append_timestamp=False, font_subset=True, font_format="woff2")
+    results = client.export_book(
+        BookConfig(book_id="b1"), cfg, formats=["epub", "html"]
+    )
+
+    (epub,) = results["epub"]
+    with zipfile.ZipFile(epub) as z:
+        epub_font = z.read("OEBPS/Fonts/font_0.woff2")
+    (html,) = results["html"]
+    html_font = (html / "fonts" / "font_0.woff2").read_bytes()
+    for data in (epub_font, html_font):
+        with TTFont(io.BytesIO(data)) as font:
+            assert font.flavor == "woff2"
+            assert set(map(chr, font.getBestCmap())) == set("text01")
+    assert list((tmp_path / "cache" / "common_test" / "font_subsets").rglob("*"))
+
+
+_MODIFIED = re.compile(rb'<meta property="dcterms:modified">[^<]*</meta>')
+
+
+def test_volume_epubs_in_worker_processes(tmp_path):
+    client = _client(tmp_path)
+
+    def _export(workers: int) -> dict[str, dict[str, bytes]]:
+        cfg = ExporterConfig(
+            append_timestamp=False, split_mode="volume", export_workers=workers
+        )
+        paths = client._export_volume_epub(BookConfig(book_id="b1"), cfg)
+        members = {}
+        for path in paths:
+            with zipfile.ZipFile(path) as z:
+                members[path.name] = {
+                    # the modification time differs between runs
+                    n: _MODIFIED.sub(b"", z.read(n))
+                    for n in z.namelist()
+                }
+        return members
+
+    sequential = _export(1)
+    assert list(sequential) == ["V1_A.epub", "V2_A.epub"]
+    assert _export(2) == sequential
+
+
+def test_volumes_sharing_a_name_are_written_in_turn(
+    tmp_path, monkeypatch: pytest.MonkeyPatch
+):
+    client = _client(tmp_path)
+    info_path = tmp_path / "raw" / "common_test" / "b1" / "book_info.raw.json"
+    info = json.loads(info_path.read_text(encoding="utf-8"))
+    info["volumes"][1]["volume_name"] = "V1"
+    info_path.write_text(json.dumps(info), encoding="utf-8")
+
+    overlaps: list[bool] = []
+
+    class _Pool(export_epub.ProcessPoolExecutor):
+        futures: list[Future[Any]] = []
+
+        def submit(self, fn, /, *args, **kwargs):
+            overlaps.append(not all(f.done() for f in self.futures))
+            future = super().submit(fn, *args, **kwargs)
+            self.futures.append(future)
+            return future
+
+    monkeypatch.setattr(export_epub, "ProcessPoolExecutor", _Pool)
+
+    def _export(workers: int) -> dict[str, bytes]:
+        cfg = ExporterConfig(
+            append_timestamp=False, split_mode="volume", export_workers=workers
+        )
+        paths = client._export_volume_epub(BookConfig(book_id="b1"), cfg)
+        assert [p.name for p in paths] == ["V1_A.epub", "V1_A.epub"]
+        with zipfile.ZipFile(paths[0]) as z:
+            assert z.testzip() is None
+            return {n: _MODIFIED.sub(b"", z.read(n)) for n in z.namelist()}
+
+    sequential = _export(1)
+    assert _export(2) == sequential
+    assert overlaps == [False, False]
@@ -0,0 +1,316 @@
+import json
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from novel_downloader.plugins import registrar
+from novel_downloader.plugins.mixins import process as process_mod
+from novel_downloader.schemas import (
+    BookConfig,
+    ChapterDict,
+    ClientConfig,
+    ProcessorConfig,
+)
+
+N_CHAPTERS = 40
+
+
+def _client(tmp_path: Path, **kwargs: Any) -> Any:
+    cfg = ClientConfig(
+        raw_data_dir=str(tmp_path / "raw"),
+        cache_dir=str(tmp_path / "cache"),
+        **kwargs,
+    )
+    client = registrar.get_client("common_test", cfg)
+    book_dir = tmp_path / "raw" / "common_test" / "b1"
+    book_dir.mkdir(parents=True)
+
+    ids = [str(i) for i in range(N_CHAPTERS)]
+    info = {
+        "book_name": "B",
+        "volumes": [
+            {
+                "volume_name": "V",
+                "chapters": [
+                    {"title": f"c{i}", "url": "", "chapterId": i} for i in ids
+                ],
+            }
+        ],
+    }
+    (book_dir / "book_info.raw.json").write_text(json.dumps(info), encoding="utf-8")
+    with client._chapter_storage("b1") as storage:
+        storage.upsert_chapters(
+            [
+                ChapterDict(
+                    id=i,
+                    title=f"c{i}",
+                    content=("AD " if int(i) % 3 == 0 else "") + f"text {i}",
+                    extra={},
+                )
+                for i in ids
+            ]
+        )
+
+    return client
+
+
+def _cleaner(tmp_path: Path, name: str, **kwargs: Any) -> ProcessorConfig:
+    rules = tmp_path / f"{name}.json"
+    rules.write_text(json.dumps([name]), encoding="utf-8")
+    return ProcessorConfig(
+        name="cleaner", options={"content_removes": str(rules)}, **kwargs
+    )
+
+
+def _run(tmp_path: Path, workers: int) -> dict[str, ChapterDict | None]:
+    client = _client(tmp_path, process_workers=workers)
+    client.process_book(BookConfig(book_id="b1"), [_cleaner(tmp_path, "AD ")])
+
+    ids = [str(i) for i in range(N_CHAPTERS)]
+    with client._open_stage_storage("b1", "cleaner") as view:
+        return view.get_chapters(ids)
+
+
+def test_parallel_matches_serial(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    pools: list[tuple[int, str]] = []
+
+    def _pool(**kwargs: Any) -> ProcessPoolExecutor:
+        pools.append((kwargs["max_workers"], kwargs["mp_context"].get_start_method()))
+        return ProcessPoolExecutor(**kwargs)
+
+    # spawned workers do not see patched module globals, only the environment
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg"))
+    monkeypatch.setattr(process_mod, "PARALLEL_MIN_CHAPTERS", 4)
+    monkeypatch.setattr(process_mod, "ProcessPoolExecutor", _pool)
+
+    serial = _run(tmp_path / "serial", workers=1)
+    assert pools == []
+    parallel = _run(tmp_path / "parallel", workers=3)
+    assert pools == [(3, "spawn")]
+
+    assert parallel == serial
+    first = serial["0"]
+    assert first is not None
+    assert first["content"] == "text 0"
+
+
+def test_fused_pipeline_matches_staged(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    # Register the cleaner a second time so two stages can be chained
+    cleaner_cls = type(registrar.get_processor("cleaner", {}))
+    monkeypatch.setitem(registrar._processors, "cleaner2", cleaner_cls)
+
+    ids = [str(i) for i in range(N_CHAPTERS)]
+    outputs = []
+    for fuse in (False, True):
+        base = tmp_path / str(fuse)
+        client = _client(base, fuse_processors=fuse)
+        second = _cleaner(base, "text")
+        client.process_book(
+            BookConfig(book_id="b1"),
+            [
+                _cleaner(base, "AD "),
+                ProcessorConfig(name="cleaner2", options=second.options),
+            ],
+        )
+        with client._open_stage_storage("b1", "cleaner2") as view:
+            outputs.append(view.get_chapters(ids))
+
+        meta = client._load_pipeline_meta("b1")
+        assert meta["executed"]["cleaner"]["materialized"] is not fuse
+        assert client._has_stage_data("b1", "cleaner") is not fuse
+        assert client._detect_latest_stage("b1") == "cleaner2"
+
+    assert outputs[0] == outputs[1]
+    chap = outputs[1]["3"]
+    assert chap is not None
+    assert chap["content"] == "3"
+
+
+def test_fused_pipeline_checkpoint(tmp_path: Path):
+    client = _client(tmp_path, fuse_processors=True)
+    pconfs = [
+        _cleaner(tmp_path, "AD ", checkpoint=True),
+        _cleaner(tmp_path, "text"),
+    ]
+    assert [[p.name for p in seg] for seg in client._pc_plan_segments(pconfs)] == [
+        ["cleaner"],
+        ["cleaner"],
+    ]
+    assert client._pc_plan_segments(pconfs[1:] + pconfs[:1]) == [[pconfs[1], pconfs[0]]]
+
+
+def test_per_chapter_incremental(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    client = _client(tmp_path)
+    book = BookConfig(book_id="b1")
+    rules = tmp_path / "rules.json"
+    pconf = ProcessorConfig(name="cleaner", options={"content_removes": str(rules)})
+
+    seen: list[str] = []
+    apply_chain = process_mod._apply_chain
+
+    def _record(processors: Any, chapters: list[ChapterDict]) -> Any:
+        seen.extend(chap["id"] for chap in chapters)
+        return apply_chain(processors, chapters)
+
+    monkeypatch.setattr(process_mod, "_apply_chain", _record)
+
+    def _process(remove: list[str]) -> list[str]:
+        rules.write_text(json.dumps(remove), encoding="utf-8")
+        seen.clear()
+        client.process_book(book, [pconf])
+        return sorted(seen, key=int)
+
+    assert len(_process(["AD "])) == N_CHAPTERS
+    assert _process(["AD "]) == []
+
+    # A refetched chapter is the only one processed again
+    with client._chapter_storage("b1") as storage:
+        storage.upsert_chapter(
+            ChapterDict(id="5", title="c5", content="AD new 5", extra={})
+        )
+    assert _process(["AD "]) == ["5"]
+
+    # Rules that match nowhere in a chapter cannot change it
+    assert _process(["AD ", "text 1"]) == ["1"] + [str(i) for i in range(10, 20)]
+
+    with client._open_stage_storage("b1", "cleaner") as view:
+        chap = view.get_chapter("12")
+        assert chap is not None
+        assert chap["content"] == "2"
+        chap = view.get_chapter("5")
+        assert chap is not None
+        assert chap["content"] == "new 5"
+
+
+class _BatchUpper:
+    calls: list[int] = []
+
+    def __init__(self, config: dict[str, Any]) -> None:
+        pass
+
+    def process_book_info(self, book_info: Any) -> Any:
+        return book_info
+
+    def process_chapter(self, chapter: ChapterDict) -> ChapterDict:
+        raise AssertionError("process_chapters should be preferred")
+
+    def process_chapters(self, chapters: list[ChapterDict]) -> list[ChapterDict]:
+        self.calls.append(len(chapters))
+        return [{**chap, "content": chap["content"].upper()} for chap in chapters]
+
+
+def test_batch_processor_preferred(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setitem(registrar._processors, "batch_upper", _BatchUpper)
+    monkeypatch.setattr(process_mod, "PROCESS_BATCH", 16)
+    _BatchUpper.calls = []
+
+    client = _client(tmp_path)
+    client.process_book(BookConfig(book_id="b1"), [ProcessorConfig("batch_upper")])
+
+    assert _BatchUpper.calls == [16, 16, 8]
+    with client._open_stage_storage("b1", "batch_upper") as view:
+        chap = view.get_chapter("3")
+        assert chap is not None
+        assert chap["content"] == "AD TEXT 3"
+
+
+def test_streamed_chapters_are_reused(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    client = _client(tmp_path)
+    pconfs = [_cleaner(tmp_path, "AD "), _cleaner(tmp_path, "text ")]
+    pconfs[1].name = "cleaner2"
+    cleaner_cls = type(registrar.get_processor("cleaner", {}))
+    monkeypatch.setitem(registrar._processors, "cleaner2", cleaner_cls)
+
+    seen: list[str] = []
+    apply_chain = process_mod._apply_chain
+
+    def _record(processors: Any, chapters: list[ChapterDict]) -> Any:
+        seen.extend(chap["id"] for chap in chapters)
+        return apply_chain(processors, chapters)
+
+    monkeypatch.setattr(process_mod, "_apply_chain", _record)
+
+    segments = client._pc_stream_segments(pconfs)
+    assert [seg.stage for seg in segments] == ["cleaner", "cleaner2"]
+    client._pc_process_chapters("b1", segments, ["0", "1", "2"])
+    client._pc_process_chapters("b1", segments, ["0", "3"])
+    assert seen == ["0", "1", "2"] * 2 + ["3"] * 2
+
+    seen.clear()
+    client.process_book(BookConfig(book_id="b1"), pconfs)
+    assert len(seen) == 2 * (N_CHAPTERS - 4)
+    assert not {"0", "1", "2", "3"} & set(seen)
+
+    with client._open_stage_storage("b1", "cleaner2") as view:
+        chap = view.get_chapter("3")
+        assert chap is not None
+        assert chap["content"] == "3"
+
+
+def test_stream_segments_stop_at_overwrite(tmp_path: Path):
+    client = _client(tmp_path)
+    pconfs = [_cleaner(tmp_path, "AD "), _cleaner(tmp_path, "x", overwrite=True)]
+    assert [seg.stage for seg in client._pc_stream_segments(pconfs)] == ["cleaner"]
+    assert client._pc_stream_segments(pconfs[1:]) == []
+
+
+@pytest.mark.parametrize(
+    ("n_chapters", "workers", "expected"),
+    [(40, 2, [20, 20]), (100, 2, [17, 17, 17, 17, 17, 15]), (40, 3, [14, 14, 12])],
+)
+def test_worker_batches_fill_process_batch(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    n_chapters: int,
+    workers: int,
+    expected: list[int],
+):
+    batches: list[int] = []
+
+    class _Pool:
+        def __init__(self, **kwargs: Any) -> None:
+            pass
+
+        def __enter__(self) -> "_Pool":
+            return self
+
+        def __exit__(self, *exc: Any) -> None:
+            pass
+
+        def map(self, fn: Any, items: list[list[ChapterDict]]) -> Any:
+            batches.extend(len(batch) for batch in items)
+            return ([(chap, "") for chap in batch] for batch in items)
+
+    monkeypatch.setattr(process_mod, "PARALLEL_MIN_CHAPTERS", 4)
+    monkeypatch.setattr(process_mod, "PROCESS_BATCH", 20)
+    monkeypatch.setattr(process_mod, "ProcessPoolExecutor", _Pool)
+
+    client = _client(tmp_path, process_workers=workers)
+    chapters = [
+        ChapterDict(id=str(i), title="", content="", extra={})
+        for i in range(n_chapters)
+    ]
+    out = list(client._pc_map_chapters([_BatchUpper({})], [{}], chapters))
+    assert batches == expected
+    assert [chap["id"] for chap, _ in out] == [chap["id"] for chap in chapters]
+
+
+def test_single_process_processors_run_inline(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    class _Model(_BatchUpper):
+        single_process = True
+
+    def _pool(**kwargs: Any) -> ProcessPoolExecutor:
+        raise AssertionError("no process pool expected")
+
+    monkeypatch.setitem(registrar._processors, "model", _Model)
+    monkeypatch.setattr(process_mod, "PARALLEL_MIN_CHAPTERS", 4)
+    monkeypatch.setattr(process_mod, "ProcessPoolExecutor", _pool)
+    _BatchUpper.calls = []
+
+    client = _client(tmp_path, process_workers=4)
+    client.process_book(BookConfig(book_id="b1"), [ProcessorConfig("model")])
+    assert _BatchUpper.calls == [N_CHAPTERS]
@@ -0,0 +1,122 @@
+import json
+import random
+import re
+from pathlib import Path
+
+import pytest
+
+from novel_downloader.libs.textutils import literal_replace as lr_mod
+from novel_downloader.plugins.processors import cleaner as cleaner_mod
+from novel_downloader.plugins.processors.cleaner import CleanerProcessor
+from novel_downloader.schemas import ChapterDict
+
+
+def _processor(tmp_path: Path, removes: list[str], replace: dict[str, str]):
+    removes_file = tmp_path / "removes.json"
+    replace_file = tmp_path / "replace.json"
+    removes_file.write_text(json.dumps(removes), encoding="utf-8")
+    replace_file.write_text(json.dumps(replace), encoding="utf-8")
+    return CleanerProcessor(
+        {"content_removes": str(removes_file), "content_replace": str(replace_file)}
+    )
+
+
+def test_literal_and_regex_rules(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(cleaner_mod, "RULE_CACHE_DIR", tmp_path / "cache")
+    proc = _processor(
+        tmp_path,
+        ["广告", "广告位", r"^第\d+页$", "﻿"],
+        {"广告位": "[位]", "旧词": "新词"},
+    )
+    chap = ChapterDict(
+        id="1",
+        title="t",
+        content="​广告正文广告位\n第3页\n旧词结尾",
+        extra={},
+    )
+    out = proc.process_chapter(chap)
+    assert out["content"] == "正文[位]\n\n新词结尾"
+    assert chap["content"].startswith("​")
+
+
+def test_rule_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr(cleaner_mod, "RULE_CACHE_DIR", cache_dir)
+    proc = _processor(tmp_path, ["AD"], {"x": "y"})
+    files = list(cache_dir.iterdir())
+    assert len(files) == 1
+
+    # A cached matcher is reused; changed rules get their own entry
+    cached = _processor(tmp_path, ["AD"], {"x": "y"})
+    assert cached.config_fingerprint() == proc.config_fingerprint()
+    assert list(cache_dir.iterdir()) == files
+    changed = _processor(tmp_path, ["AD", "BC"], {"x": "y"})
+    assert len(list(cache_dir.iterdir())) == 2
+    assert changed.config_fingerprint() != proc.config_fingerprint()
+
+    # A corrupt cache entry is rebuilt
+    files[0].write_bytes(b"garbage")
+    rebuilt = _processor(tmp_path, ["AD"], {"x": "y"})
+    chap = ChapterDict(id="1", title="t", content="ADx", extra={})
+    assert rebuilt.process_chapter(chap)["content"] == "y"
+
+
+def _combined(removes: list[str], replace: dict[str, str], text: str) -> str:
+    # every rule in one longest-first regex, as the cleaner used to work
+    rules = list(dict.fromkeys(removes)) + [re.escape(k) for k in replace]
+    rules.sort(key=len, reverse=True)
+    rx = re.compile("|".join(rules), flags=re.MULTILINE)
+    return rx.sub(lambda m: replace.get(m.group(0), ""), text).strip()
+
+
+def test_regex_rules_do_not_see_replaced_text(tmp_path: Path):
+    proc = _processor(tmp_path, [r"AD\d+"], {"广告": "AD"})
+    chap = ChapterDict(id="1", title="t", content="正文广告123结束", extra={})
+    assert proc.process_chapter(chap)["content"] == "正文AD123结束"
+
+
+def test_empty_regex_match_does_not_hide_later_rules(tmp_path: Path):
+    removes = ["(ab|ba)", "x*", "^a"]
+    proc = _processor(tmp_path, removes, {"c": "C"})
+    chap = ChapterDict(id="1", title="t", content="acab\naxc", extra={})
+    expected = _combined(removes, {"c": "C"}, chap["content"])
+    assert expected == "C\nC"
+    assert proc.process_chapter(chap)["content"] == expected
+
+
+@pytest.mark.parametrize("backend", ["ahocorasick", "regex"])
+@pytest.mark.parametrize("seed", range(20))
+def test_mixed_rules_match_single_regex(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, seed: int, backend: str
+):
+    if backend == "regex":
+        monkeypatch.setattr(lr_mod, "ahocorasick", None)
+        monkeypatch.setattr(cleaner_mod, "LITERAL_BACKEND", "regex")
+    rng = random.Random(seed)
+    alphabet = "ab1\n"
+    removes = rng.sample(
+        [
+            *("a", "ab", "b1", "ba", r"a\d+", r"b+", r"^a", r"1$", r"[ab]1", r"\d"),
+            *(r"x*", r"(|ab)", r"b?", r"(?=a)"),
+        ],
+        k=rng.randint(1, 6),
+    )
+    replace = {
+        "".join(rng.choices("ab1", k=rng.randint(1, 3))): rng.choice(["", "X", "b1"])
+        for _ in range(rng.randint(1, 4))
+    }
+    proc = _processor(tmp_path, removes, replace)
+    for _ in range(20):
+        text = "".join(rng.choices(alphabet, k=rng.randint(0, 20)))
+        chap = ChapterDict(id="1", title="t", content=text, extra={})
+        expected = _combined(removes, replace, text)
+        assert proc.process_chapter(chap)["content"] == expected, (text, removes)
+
+
+def test_unwritable_rule_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    blocker = tmp_path / "file"
+    blocker.write_text("x", encoding="utf-8")
+    monkeypatch.setattr(cleaner_mod, "RULE_CACHE_DIR", blocker / "cache")
+    proc = _processor(tmp_path, ["AD"], {"x": "y"})
+    chap = ChapterDict(id="1", title="t", content="ADx", extra={})
+    assert proc.process_chapter(chap)["content"] == "y"
@@ -0,0 +1,56 @@
+from typing import Any
+
+import pytest
+
+from novel_downloader.plugins.processors import corrector as corrector_mod
+from novel_downloader.plugins.processors.corrector import CorrectorProcessor
+from novel_downloader.schemas import ChapterDict
+
+
+@pytest.fixture
+def model(monkeypatch: pytest.MonkeyPatch) -> dict[str, Any]:
+    state: dict[str, Any] = {"loads": 0, "seen": []}
+
+    def _build(self: Any, engine: str, cfg: dict[str, Any]) -> Any:
+        state["loads"] += 1
+
+        def _batch(texts: list[str]) -> list[str]:
+            state["seen"].extend(texts)
+            return [t.replace("因该", "应该") for t in texts]
+
+        return _batch
+
+    monkeypatch.setattr(corrector_mod, "_MODELS", {})
+    monkeypatch.setattr(CorrectorProcessor, "_build_batch_handler", _build)
+    return state
+
+
+def _chapter(content: str) -> ChapterDict:
+    return ChapterDict(id="1", title="第一章", content=content, extra={})
+
+
+def test_sentences_cached_and_model_kept(model: dict[str, Any]):
+    content = "他因该来了。「你好！」她说\n因该吧？\n\n他因该来了。"
+    proc = CorrectorProcessor({})
+    out = proc.process_chapter(_chapter(content))
+
+    assert out["content"] == "他应该来了。「你好！」她说\n应该吧？\n\n他应该来了。"
+    assert model["seen"] == ["第一章", "他因该来了。", "「你好！」", "她说", "因该吧？"]
+
+    # A second processor reuses the loaded model and the cached sentences
+    model["seen"].clear()
+    again = CorrectorProcessor({})
+    assert again.process_chapter(_chapter(content + "\n新句子。")) == {
+        **out,
+        "content": out["content"] + "\n新句子。",
+    }
+    assert model["loads"] == 1
+    assert model["seen"] == ["新句子。"]
+
+
+def test_cache_and_warm_model_can_be_disabled(model: dict[str, Any]):
+    opts = {"keep_model": False, "correction_cache": False}
+    for _ in range(2):
+        CorrectorProcessor(opts).process_chapter(_chapter("因该。"))
+    assert model["loads"] == 2
+    assert model["seen"] == ["第一章", "因该。"] * 2
@@ -0,0 +1,86 @@
+import threading
+import time
+from typing import Any
+
+from novel_downloader.plugins.processors.translator.engine import (
+    TranslationEngine,
+    translate_book_info,
+)
+
+
+class _Provider:
+    def __init__(self, fail: set[str] | None = None) -> None:
+        self.requests: list[list[str]] = []
+        self.active = 0
+        self.peak = 0
+        self.fail = fail or set()
+        self._lock = threading.Lock()
+
+    def pack(self, texts: list[str]) -> list[list[int]]:
+        return [[i] for i in range(len(texts))]
+
+    def request(self, texts: list[str]) -> list[str | None]:
+        with self._lock:
+            self.requests.append(texts)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(0.02)
+        with self._lock:
+            self.active -= 1
+        return [None if t in self.fail else t.upper() for t in texts]
+
+
+def _engine(**config: Any) -> TranslationEngine:
+    return TranslationEngine("fake", "auto", "en", config, default_rate=0)
+
+
+def test_concurrent_and_deduplicated():
+    provider = _Provider()
+    engine = _engine(concurrency=3, translation_memory=False)
+    texts = ["a", "b", "a", " ", "c", "d", "e", "f"]
+
+    out = engine.translate(texts, provider.pack, provider.request)
+
+    assert out == ["A", "B", "A", " ", "C", "D", "E", "F"]
+    assert sorted(t for req in provider.requests for t in req) == list("abcdef")
+    assert 1 < provider.peak <= 3
+
+
+def test_memory_skips_known_texts():
+    provider = _Provider(fail={"b"})
+    engine = _engine()
+    assert engine.translate(["a", "b"], provider.pack, provider.request) == [
+        "A",
+        "b",
+    ]
+
+    # a fresh engine recalls "a"; the failed "b" is retried
+    provider = _Provider()
+    engine = _engine()
+    assert engine.translate(["a", "b"], provider.pack, provider.request) == [
+        "A",
+        "B",
+    ]
+    assert provider.requests == [["b"]]
+
+
+def test_translate_book_info_single_batch():
+    calls: list[list[str]] = []
+
+    def _many(texts: list[str]) -> list[str]:
+        calls.append(texts)
+        return [t.upper() for t in texts]
+
+    info: Any = {
+        "book_name": "book",
+        "summary": "sum",
+        "summary_brief": "brief",
+        "volumes": [{"volume_name": "vol", "chapters": [{"title": "ch"}]}],
+    }
+    out = translate_book_info(info, _many)
+
+    assert len(calls) == 1
+    assert out["book_name"] == "BOOK"
+    assert out["summary_brief"] == "BRIEF"
+    assert out["volumes"][0]["chapters"][0]["title"] == "CH"
+    assert info["book_name"] == "book"
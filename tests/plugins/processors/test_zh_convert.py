@@ -0,0 +1,85 @@
+from pathlib import Path
+
+import pytest
+
+from novel_downloader.plugins.processors import zh_convert as zh_mod
+from novel_downloader.plugins.processors.zh_convert import ZhConvertProcessor
+from novel_downloader.schemas import ChapterDict
+
+
+def test_builtin_tables_cached(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr(zh_mod, "TABLE_CACHE_DIR", cache_dir)
+    dict_dir = tmp_path / "dict"
+    dict_dir.mkdir()
+    (dict_dir / "TSPhrases.txt").write_text("乾淨\t干净\n", encoding="utf-8")
+    chars = dict_dir / "TSCharacters.txt"
+    chars.write_text("乾\t干\n頭\t头\n", encoding="utf-8")
+
+    config = {"direction": "t2s", "engine": "builtin", "dict_dir": str(dict_dir)}
+    chap = ChapterDict(id="1", title="頭", content="乾淨的頭", extra={})
+    assert ZhConvertProcessor(config).process_chapter(chap)["content"] == "干净的头"
+    assert len(list(cache_dir.iterdir())) == 1
+
+    # edited dictionaries get a fresh entry
+    chars.write_text("乾\t干\n頭\t首\n", encoding="utf-8")
+    assert ZhConvertProcessor(config).process_chapter(chap)["content"] == "干净的首"
+    assert len(list(cache_dir.iterdir())) == 2
+
+    with pytest.raises(ValueError):
+        ZhConvertProcessor({**config, "engine": "nope"})
+
+
+_SAMPLE = {
+    "s": (
+        "头发干净了，他在台湾的计算机上打印文件。"
+        "一只猫在里面吃面，后天我们去图书馆借几本书。"
+    ),
+    "t": "乾隆皇帝的頭髮很乾淨，於是說：「這個軟體真好用。」著名的理髮師傅後來出發了。",
+}
+
+
+@pytest.mark.parametrize(
+    "direction",
+    ["hk2s", "s2hk", "s2t", "s2tw", "s2twp", "t2hk", "t2s", "t2tw", "tw2s", "tw2sp"],
+)
+def test_builtin_matches_opencc(direction: str):
+    pytest.importorskip("opencc")
+    if ZhConvertProcessor._opencc_dict_dir() is None:
+        pytest.skip("opencc package ships no text dictionaries")
+    builtin = ZhConvertProcessor({"direction": direction, "engine": "builtin"})
+    opencc = ZhConvertProcessor({"direction": direction, "engine": "opencc"})
+    text = _SAMPLE["s" if direction.startswith("s") else "t"]
+    chap = ChapterDict(id="1", title="t", content=text, extra={})
+    assert (
+        builtin.process_chapter(chap)["content"]
+        == opencc.process_chapter(chap)["content"]
+    )
+
+
+def test_builtin_falls_back_to_opencc(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    calls: list[str] = []
+
+    def _fake(self, direction: str):
+        calls.append(direction)
+        return str.upper
+
+    monkeypatch.setattr(ZhConvertProcessor, "_build_converter", _fake)
+    chap = ChapterDict(id="1", title="t", content="abc", extra={})
+
+    # no dictionaries for this direction
+    proc = ZhConvertProcessor(
+        {"direction": "t2jp", "engine": "builtin", "dict_dir": str(tmp_path)}
+    )
+    assert proc.process_chapter(chap)["content"] == "ABC"
+
+    # no dictionary directory at all
+    monkeypatch.setattr(
+        ZhConvertProcessor, "_opencc_dict_dir", staticmethod(lambda: None)
+    )
+    ZhConvertProcessor({"direction": "t2s", "engine": "builtin"})
+    # directions the built-in engine does not know
+    ZhConvertProcessor({"direction": "x2y", "engine": "builtin"})
+    # the default engine
+    ZhConvertProcessor({"direction": "t2s"})
+    assert calls == ["t2jp", "t2s", "x2y", "t2s"]
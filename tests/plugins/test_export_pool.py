@@ -0,0 +1,159 @@
+import json
+import zipfile
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from novel_downloader.plugins import export_pool, registrar
+from novel_downloader.plugins.export_pool import ExportPool
+from novel_downloader.schemas import (
+    BookConfig,
+    ChapterDict,
+    ClientConfig,
+    ExporterConfig,
+)
+
+
+class _UI:
+    def __init__(self) -> None:
+        self.calls: list[tuple[Any, ...]] = []
+
+    def on_start(self, book, fmt=None):
+        self.calls.append(("start", book.book_id, fmt))
+
+    def on_success(self, book, fmt, path):
+        self.calls.append(("success", book.book_id, fmt, path.name))
+
+    def on_error(self, book, fmt, error):
+        self.calls.append(("error", book.book_id, fmt))
+
+    def on_unsupported(self, book, fmt):
+        self.calls.append(("unsupported", book.book_id, fmt))
+
+
+def _client(tmp_path: Path, book_ids: list[str]) -> Any:
+    cfg = ClientConfig(
+        raw_data_dir=str(tmp_path / "raw"),
+        cache_dir=str(tmp_path / "cache"),
+        output_dir=str(tmp_path / "out"),
+    )
+    client = registrar.get_client("common_test", cfg)
+    for book_id in book_ids:
+        book_dir = tmp_path / "raw" / "common_test" / book_id
+        book_dir.mkdir(parents=True)
+        info = {
+            "book_name": f"B{book_id}",
+            "author": "A",
+            "volumes": [
+                {
+                    "volume_name": "V1",
+                    "chapters": [{"title": "c0", "url": "", "chapterId": "0"}],
+                }
+            ],
+        }
+        (book_dir / "book_info.raw.json").write_text(json.dumps(info), encoding="utf-8")
+        with client._chapter_storage(book_id) as storage:
+            storage.upsert_chapter(
+                ChapterDict(id="0", title="c0", content=f"text {book_id}", extra={})
+            )
+    return client
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_books_are_exported(tmp_path, workers):
+    client = _client(tmp_path, ["b1", "b2"])
+    ui = _UI()
+    cfg = ExporterConfig(append_timestamp=False)
+
+    with ExportPool(workers) as pool:
+        futures = [
+            pool.submit(client, BookConfig(book_id=b), cfg, formats=fmts, ui=ui)
+            for b, fmts in [("b1", ["txt", "epub"]), ("b2", ["txt", "mobi"])]
+        ]
+        results = [future.result() for future in futures]
+
+    assert results[0]["txt"] == [tmp_path / "out" / "Bb1_A.txt"]
+    assert results[0]["epub"] == [tmp_path / "out" / "Bb1_A.epub"]
+    assert results[1]["mobi"] == []
+    assert "text b2" in results[1]["txt"][0].read_text(encoding="utf-8")
+
+    # each book's callbacks arrive in order
+    for book_id, expected in [
+        (
+            "b1",
+            [
+                ("start", "b1", "txt"),
+                ("start", "b1", "epub"),
+                ("success", "b1", "txt", "Bb1_A.txt"),
+                ("success", "b1", "epub", "Bb1_A.epub"),
+            ],
+        ),
+        (
+            "b2",
+            [
+                ("start", "b2", "txt"),
+                ("success", "b2", "txt", "Bb2_A.txt"),
+                ("unsupported", "b2", "mobi"),
+            ],
+        ),
+    ]:
+        assert [c for c in ui.calls if c[1] == book_id] == expected
+
+
+def test_failed_worker_is_reported(tmp_path):
+    client = _client(tmp_path, [])
+    client._config = lambda: None  # cannot be sent to the worker
+    ui = _UI()
+
+    with ExportPool(2) as pool:
+        future: Future[Any] = pool.submit(client, BookConfig(book_id="b1"), ui=ui)
+        with pytest.raises(Exception):  # noqa: B017
+            future.result()
+
+    assert ui.calls == [("error", "b1", None)]
+
+
+def test_books_sharing_a_title_wait_for_each_other(
+    tmp_path, monkeypatch: pytest.MonkeyPatch
+):
+    client = _client(tmp_path, ["b1", "b2", "b3"])
+    info_path = tmp_path / "raw" / "common_test" / "b2" / "book_info.raw.json"
+    info = json.loads(info_path.read_text(encoding="utf-8"))
+    info["book_name"] = "Bb1"
+    info_path.write_text(json.dumps(info), encoding="utf-8")
+
+    # book id -> whether each earlier job was done when it was submitted
+    submitted: dict[str, dict[str, bool]] = {}
+
+    class _Pool(export_pool.ProcessPoolExecutor):
+        futures: dict[str, Future[Any]] = {}
+
+        def submit(self, fn, /, *args, **kwargs):
+            book_id = args[1].book_id
+            submitted[book_id] = {b: f.done() for b, f in self.futures.items()}
+            future = super().submit(fn, *args, **kwargs)
+            self.futures[book_id] = future
+            return future
+
+    monkeypatch.setattr(export_pool, "ProcessPoolExecutor", _Pool)
+    cfg = ExporterConfig(append_timestamp=False)
+
+    with ExportPool(2) as pool:
+        futures = [
+            pool.submit(client, BookConfig(book_id=b), cfg, formats=["epub"])
+            for b in ["b1", "b2", "b3"]
+        ]
+
+    out = tmp_path / "out" / "Bb1_A.epub"
+    assert [f.result()["epub"] for f in futures] == [
+        [out],
+        [out],
+        [tmp_path / "out" / "Bb3_A.epub"],
+    ]
+    with zipfile.ZipFile(out) as z:
+        assert z.testzip() is None
+    # b3 does not wait; b2 starts only once b1 is done
+    assert list(submitted) == ["b1", "b3", "b2"]
+    assert submitted["b2"]["b1"]
@@ -0,0 +1,57 @@
+from typing import Any
+
+from novel_downloader.plugins.utils.book_info import map_book_info
+
+
+def _book() -> Any:
+    return {
+        "book_name": "ad name",
+        "author": "ad author",
+        "cover_url": "",
+        "update_time": "",
+        "summary": "ad summary",
+        "extra": {"big": list(range(10))},
+        "tags": ["ad tag", 1],
+        "volumes": [
+            {
+                "volume_name": "v1",
+                "chapters": [
+                    {"title": "ad c1", "url": "", "chapterId": "1"},
+                    {"title": "c2", "url": "", "chapterId": "2"},
+                ],
+            },
+            {
+                "volume_name": "v2",
+                "volume_intro": "intro",
+                "chapters": [{"title": "c3", "url": "", "chapterId": "3"}],
+            },
+        ],
+    }
+
+
+def _strip(text: str) -> str:
+    return text.removeprefix("ad ")
+
+
+def test_map_book_info_copy_on_write():
+    book = _book()
+    out = map_book_info(book, title=_strip, content=_strip, tags=_strip)
+
+    assert book == _book()  # input untouched
+    assert out["book_name"] == "name"
+    assert out["author"] == "ad author"
+    assert out["summary"] == "summary"
+    assert out["tags"] == ["tag", 1]
+    assert out["volumes"][0]["chapters"][0]["title"] == "c1"
+
+    # Unchanged parts are shared rather than copied
+    assert out["extra"] is book["extra"]
+    assert out["volumes"][1] is book["volumes"][1]
+    assert out["volumes"][0]["chapters"][1] is book["volumes"][0]["chapters"][1]
+
+
+def test_map_book_info_no_changes():
+    book = _book()
+    out = map_book_info(book, title=str.strip)
+    assert out is not book
+    assert out["volumes"] is book["volumes"]